@@ -1,3 +1,4 @@
+import { draftMode } from 'next/headers';
 import { fetchPageData } from '@/lib/directus/fetchers';
 import { PageBlock } from '@/types/directus-schema';
 import { notFound } from 'next/navigation';
@@ -9,7 +10,8 @@ export async function generateMetadata({ params }: { params: Promise<{ permalink
 	const resolvedPermalink = `/${permalinkSegments.join('/')}`.replace(/\/$/, '') || '/';
 
 	try {
-		const page = await fetchPageData(resolvedPermalink);
+		const { isEnabled: draft } = await draftMode();
+		const page = await fetchPageData(resolvedPermalink, 1, draft);
 
 		if (!page) return;
 
@@ -36,7 +38,8 @@ export default async function Page({ params }: { params: Promise<{ permalink?: s
 	const resolvedPermalink = `/${permalinkSegments.join('/')}`.replace(/\/$/, '') || '/';
 
 	try {
-		const page = await fetchPageData(resolvedPermalink);
+		const { isEnabled: draft } = await draftMode();
+		const page = await fetchPageData(resolvedPermalink, 1, draft);
 
 		if (!page || !page.blocks) {
 			notFound();
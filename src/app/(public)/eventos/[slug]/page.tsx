@@ -1,5 +1,6 @@
 import { Metadata } from 'next';
 import { notFound } from 'next/navigation';
+import { draftMode } from 'next/headers';
 import { fetchEventBySlug } from '@/lib/directus/fetchers';
 import DirectusImage from '@/components/shared/DirectusImage';
 import Link from 'next/link';
@@ -14,8 +15,9 @@ interface EventPageProps {
 
 export async function generateMetadata({ params }: EventPageProps): Promise<Metadata> {
 	const { slug } = await params;
+	const { isEnabled: draft } = await draftMode();
 	try {
-		const event = await fetchEventBySlug(slug);
+		const event = await fetchEventBySlug(slug, draft);
 
 		return {
 			title: event.title,
@@ -30,10 +32,11 @@ export async function generateMetadata({ params }: EventPageProps): Promise<Meta
 
 export default async function EventPage({ params }: EventPageProps) {
 	const { slug } = await params;
+	const { isEnabled: draft } = await draftMode();
 	let event;
 
 	try {
-		event = await fetchEventBySlug(slug);
+		event = await fetchEventBySlug(slug, draft);
 	} catch (error) {
 		notFound();
 	}
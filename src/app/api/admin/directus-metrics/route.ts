@@ -0,0 +1,29 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { withApi } from '@/lib/api';
+import { createUnauthorizedError } from '@/lib/errors';
+import { getSingleFlightStats } from '@/lib/directus/single-flight';
+import { getContentCacheStats } from '@/lib/directus/content-cache';
+import { getDirectusSchedulerStats } from '@/lib/directus/scheduler';
+import { getDirectusTransportStats } from '@/lib/directus/transport';
+
+/**
+ * GET /api/admin/directus-metrics
+ * Métricas do acesso ao Directus desta instância: leituras coalescidas (`singleFlight.hits` são
+ * round trips economizados), fila e limite de cada lane (`scheduler`), reuso de conexões
+ * (`connections`) e o cache de conteúdo (`contentCache`). Exige o header `x-metrics-secret` com
+ * `METRICS_SECRET`.
+ */
+export const GET = withApi(async (request: NextRequest) => {
+	const secret = process.env.METRICS_SECRET;
+
+	if (!secret || request.headers.get('x-metrics-secret') !== secret) {
+		throw createUnauthorizedError('Segredo de métricas inválido');
+	}
+
+	return NextResponse.json({
+		singleFlight: getSingleFlightStats(),
+		scheduler: getDirectusSchedulerStats(),
+		connections: await getDirectusTransportStats(),
+		contentCache: getContentCacheStats(),
+	});
+});
@@ -1,5 +1,6 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { getAuthenticatedClient } from '@/lib/directus/directus';
+import { directusTransport } from '@/lib/directus/transport';
 import { readMe, readItem } from '@directus/sdk';
 import { getOrganizerByUserId } from '@/app/admin/participantes/_lib/queries';
 
@@ -91,7 +92,7 @@ export async function POST(
     // O Flow busca os dados completos da inscrição e envia o email formatado
     try {
       // Trigger flow usando REST API do Directus
-      const flowResponse = await fetch(`${DIRECTUS_URL}/flows/trigger/${RESEND_EMAIL_FLOW_ID}`, {
+      const flowResponse = await directusTransport(`${DIRECTUS_URL}/flows/trigger/${RESEND_EMAIL_FLOW_ID}`, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
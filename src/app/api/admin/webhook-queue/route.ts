@@ -0,0 +1,59 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { z } from 'zod';
+import { validateBody, withApi } from '@/lib/api';
+import { createUnauthorizedError, fromDirectusError } from '@/lib/errors';
+import { getAuthenticatedClient } from '@/lib/directus/directus';
+import { getWebhookQueueStats, requeueDeadEvents } from '@/lib/stripe/webhook-queue';
+
+const requeueSchema = z.object({
+	ids: z.array(z.string().min(1)).min(1).max(100),
+});
+
+/**
+ * Client do usuário da requisição (cookie ou Bearer). Quem pode ler ou alterar
+ * `stripe_webhook_events` é decidido pelas permissões do Directus.
+ */
+function getRequestClient(request: NextRequest) {
+	const authHeader = request.headers.get('Authorization');
+	const token = authHeader?.startsWith('Bearer ')
+		? authHeader.slice('Bearer '.length)
+		: request.cookies.get('access_token')?.value;
+
+	if (!token) {
+		throw createUnauthorizedError();
+	}
+
+	return getAuthenticatedClient(token);
+}
+
+/**
+ * GET /api/admin/webhook-queue
+ * Profundidade da fila de webhooks por status, atraso do evento pendente mais antigo,
+ * dead-letters recentes e métricas do pool de workers desta instância
+ */
+export const GET = withApi(async (request: NextRequest) => {
+	const client = getRequestClient(request);
+
+	try {
+		return NextResponse.json(await getWebhookQueueStats(client));
+	} catch (error) {
+		throw fromDirectusError(error, request.headers.get('x-request-id') ?? undefined);
+	}
+});
+
+/**
+ * POST /api/admin/webhook-queue
+ * Reenfileira eventos da dead-letter: `{ "ids": ["evt_..."] }`
+ */
+export const POST = withApi(async (request: NextRequest) => {
+	const client = getRequestClient(request);
+	const { ids } = await validateBody(request, requeueSchema);
+
+	try {
+		const requeued = await requeueDeadEvents(client, ids);
+
+		return NextResponse.json({ requeued });
+	} catch (error) {
+		throw fromDirectusError(error, request.headers.get('x-request-id') ?? undefined);
+	}
+});
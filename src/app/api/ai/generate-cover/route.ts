@@ -3,6 +3,7 @@ import { withApi } from '@/lib/api';
 import { AppError } from '@/lib/errors';
 import OpenAI from 'openai';
 import { Buffer } from 'node:buffer';
+import { directusTransport } from '@/lib/directus/transport';
 
 const DIRECTUS_URL = process.env.NEXT_PUBLIC_DIRECTUS_URL || 'http://localhost:8055';
 const FORM_TOKEN = process.env.DIRECTUS_FORM_TOKEN;
@@ -30,7 +31,7 @@ interface CategoryData {
 async function ensureFolder(formToken: string, folderName: string): Promise<string | null> {
 	try {
 		// Check if folder exists
-		const foldersResponse = await fetch(`${DIRECTUS_URL}/folders?filter[name][_eq]=${folderName}`, {
+		const foldersResponse = await directusTransport(`${DIRECTUS_URL}/folders?filter[name][_eq]=${folderName}`, {
 			headers: {
 				Authorization: `Bearer ${formToken}`,
 			},
@@ -48,7 +49,7 @@ async function ensureFolder(formToken: string, folderName: string): Promise<stri
 		}
 
 		// Create folder if it doesn't exist
-		const createFolderResponse = await fetch(`${DIRECTUS_URL}/folders`, {
+		const createFolderResponse = await directusTransport(`${DIRECTUS_URL}/folders`, {
 			method: 'POST',
 			headers: {
 				Authorization: `Bearer ${formToken}`,
@@ -77,7 +78,7 @@ async function ensureFolder(formToken: string, folderName: string): Promise<stri
  */
 async function fetchCategoryData(categoryId: string, formToken: string): Promise<CategoryData | null> {
 	try {
-		const response = await fetch(`${DIRECTUS_URL}/items/event_categories/${categoryId}`, {
+		const response = await directusTransport(`${DIRECTUS_URL}/items/event_categories/${categoryId}`, {
 			headers: {
 				Authorization: `Bearer ${formToken}`,
 			},
@@ -271,7 +272,7 @@ async function uploadToDirectus(
 	const uploadFormData = new FormData();
 	uploadFormData.append('file', new Blob([new Uint8Array(imageBuffer)], { type: 'image/png' }), fileName);
 
-	const uploadResponse = await fetch(`${DIRECTUS_URL}/files`, {
+	const uploadResponse = await directusTransport(`${DIRECTUS_URL}/files`, {
 		method: 'POST',
 		headers: {
 			Authorization: `Bearer ${formToken}`,
@@ -304,7 +305,7 @@ async function uploadToDirectus(
 
 	// Move file to folder if folder exists
 	if (folderId) {
-		await fetch(`${DIRECTUS_URL}/files/${fileId}`, {
+		await directusTransport(`${DIRECTUS_URL}/files/${fileId}`, {
 			method: 'PATCH',
 			headers: {
 				Authorization: `Bearer ${formToken}`,
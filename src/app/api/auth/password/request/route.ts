@@ -1,6 +1,7 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { z } from 'zod';
 import { withApi, validateBody } from '@/lib/api';
+import { directusTransport } from '@/lib/directus/transport';
 
 const schema = z.object({
 	email: z.string().email('Email inválido'),
@@ -14,7 +15,7 @@ export const POST = withApi(async (request: NextRequest) => {
 
 	// Request password reset email from Directus
 	// This sends an email with a reset link to the user
-	const response = await fetch(`${directusUrl}/auth/password/request`, {
+	const response = await directusTransport(`${directusUrl}/auth/password/request`, {
 		method: 'POST',
 		headers: {
 			'Content-Type': 'application/json',
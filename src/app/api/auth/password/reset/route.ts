@@ -2,6 +2,7 @@ import { NextRequest, NextResponse } from 'next/server';
 import { z } from 'zod';
 import { withApi, validateBody } from '@/lib/api';
 import { AppError } from '@/lib/errors';
+import { directusTransport } from '@/lib/directus/transport';
 
 const schema = z.object({
 	token: z.string().min(1, 'Token é obrigatório'),
@@ -14,7 +15,7 @@ export const POST = withApi(async (request: NextRequest) => {
 	const directusUrl = process.env.NEXT_PUBLIC_DIRECTUS_URL as string;
 
 	// Reset the password using the token from the email
-	const response = await fetch(`${directusUrl}/auth/password/reset`, {
+	const response = await directusTransport(`${directusUrl}/auth/password/reset`, {
 		method: 'POST',
 		headers: {
 			'Content-Type': 'application/json',
@@ -3,6 +3,7 @@ import { z } from 'zod';
 import { withApi, validateBody } from '@/lib/api';
 import { AppError } from '@/lib/errors';
 import { getDefaultClientRoleId } from '@/lib/auth/roles';
+import { directusTransport } from '@/lib/directus/transport';
 
 const registerSchema = z.object({
 	email: z.string().email('Email inválido'),
@@ -40,7 +41,7 @@ export const POST = withApi(async (request: NextRequest) => {
 
 	try {
 		// Create user with direct fetch
-		const createUserResponse = await fetch(`${directusUrl}/users`, {
+		const createUserResponse = await directusTransport(`${directusUrl}/users`, {
 			method: 'POST',
 			headers: {
 				'Content-Type': 'application/json',
@@ -1,4 +1,5 @@
 import { NextResponse } from 'next/server';
+import { directusTransport } from '@/lib/directus/transport';
 
 export const dynamic = 'force-dynamic';
 export const revalidate = 0;
@@ -26,7 +27,7 @@ return NextResponse.json(
 		const url = `${directusUrl}/items/event_configurations?limit=1&fields=platform_fee_percentage,stripe_percentage_fee,stripe_fixed_fee`;
 		console.log('[event-config] Fetching from URL:', url);
 
-		const response = await fetch(url, {
+		const response = await directusTransport(url, {
 			headers: {
 				Authorization: `Bearer ${publicToken}`,
 			},
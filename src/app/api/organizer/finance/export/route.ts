@@ -1,5 +1,6 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { readItems } from '@directus/sdk';
+import { getAuthenticatedClient } from '@/lib/directus/directus';
 import { buildTransactionFilter, getOrganizerContext, type TransactionFilterInput } from '../utils';
 
 const EXPORT_BATCH_SIZE = 200;
@@ -90,7 +91,9 @@ export async function POST(request: NextRequest) {
 		return context.response;
 	}
 
-	const { client, organizer } = context;
+	const { organizer } = context;
+	// Lane de exportação: as leituras em lote não disputam vaga com a navegação
+	const client = getAuthenticatedClient(context.token, { lane: 'export' });
 
 	let payload: any = {};
 
@@ -1,6 +1,7 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { getAuthenticatedClient } from '@/lib/directus/directus';
 import { uploadFiles, updateItem } from '@directus/sdk';
+import { invalidateServerAuth } from '@/lib/auth/auth-cache';
 
 export async function POST(request: NextRequest) {
 	try {
@@ -39,6 +40,7 @@ export async function POST(request: NextRequest) {
 				logo: uploadedFile.id,
 			})
 		);
+		invalidateServerAuth(updatedOrganizer.user_id);
 
 		return NextResponse.json({
 			success: true,
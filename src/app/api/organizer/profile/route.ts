@@ -1,6 +1,7 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { getAuthenticatedClient } from '@/lib/directus/directus';
 import { updateItem, createItem } from '@directus/sdk';
+import { invalidateServerAuth } from '@/lib/auth/auth-cache';
 
 export async function PATCH(request: NextRequest) {
 	try {
@@ -31,6 +32,7 @@ export async function PATCH(request: NextRequest) {
 				description,
 			})
 		);
+		invalidateServerAuth(updatedOrganizer.user_id);
 
 		return NextResponse.json({ success: true, organizer: updatedOrganizer });
 	} catch (error) {
@@ -74,6 +76,7 @@ export async function POST(request: NextRequest) {
 				status: 'active',
 			})
 		);
+		invalidateServerAuth(userId);
 
 		return NextResponse.json({ success: true, organizer: newOrganizer });
 	} catch (error) {
@@ -3,6 +3,7 @@ import { cookies } from 'next/headers';
 import { createItem, readItems } from '@directus/sdk';
 import { getAuthenticatedClient } from '@/lib/directus/directus';
 import { getServerAuth } from '@/lib/auth/server-auth';
+import { invalidateServerAuth } from '@/lib/auth/auth-cache';
 
 export async function POST(request: NextRequest) {
 	try {
@@ -66,6 +67,7 @@ export async function POST(request: NextRequest) {
 				status: 'pending',
 			})
 		);
+		invalidateServerAuth(auth.user.id);
 
 		return NextResponse.json({ success: true, organizer });
 	} catch (error) {
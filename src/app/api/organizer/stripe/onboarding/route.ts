@@ -2,6 +2,8 @@ import { NextResponse } from 'next/server';
 import { createDirectus, rest, readItems, updateItem, staticToken } from '@directus/sdk';
 import Stripe from 'stripe';
 import type { Schema } from '@/types/directus-schema';
+import { directusTransport } from '@/lib/directus/transport';
+import { invalidateServerAuth } from '@/lib/auth/auth-cache';
 
 const stripe = new Stripe(process.env.STRIPE_SECRET_KEY!, {
 	apiVersion: '2025-09-30.clover',
@@ -9,7 +11,7 @@ const stripe = new Stripe(process.env.STRIPE_SECRET_KEY!, {
 
 const directusUrl = process.env.NEXT_PUBLIC_DIRECTUS_URL!;
 const directusToken = process.env.DIRECTUS_ADMIN_TOKEN!;
-const directus = createDirectus<Schema>(directusUrl)
+const directus = createDirectus<Schema>(directusUrl, { globals: { fetch: directusTransport } })
 	.with(rest())
 	.with(staticToken(directusToken));
 
@@ -98,6 +100,7 @@ export async function POST(req: Request) {
 					stripe_account_id: accountId,
 				})
 			);
+			invalidateServerAuth(organizer.user_id);
 		}
 
 		// Create account link for onboarding
@@ -0,0 +1,96 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { z } from 'zod';
+import { validateBody, withApi } from '@/lib/api';
+import { createUnauthorizedError } from '@/lib/errors';
+import { clearContentCache, invalidateContentTags, itemTags } from '@/lib/directus/content-cache';
+
+const key = z.union([z.string(), z.number()]).transform(String);
+
+/**
+ * Corpo enviado pela operação "Webhook / Request URL" de um Flow do Directus com gatilho "Event Hook"
+ * (`items.create`, `items.update`, `items.delete`): o próprio `{{$trigger}}`. `tags` permite evictar
+ * tags avulsas; sem `collection` nem `tags`, esvazia o cache.
+ */
+const changeSchema = z.object({
+	event: z.string().optional(),
+	collection: z.string().min(1).optional(),
+	key: key.optional(),
+	keys: z.array(key).optional(),
+	payload: z.unknown().optional(),
+	tags: z.array(z.string().min(1)).optional(),
+});
+
+const encoder = new TextEncoder();
+
+let signingKey: Promise<CryptoKey> | null = null;
+
+function getSigningKey(secret: string): Promise<CryptoKey> {
+	signingKey ??= crypto.subtle.importKey('raw', encoder.encode(secret), { name: 'HMAC', hash: 'SHA-256' }, false, [
+		'sign',
+	]);
+
+	return signingKey;
+}
+
+function safeEqual(a: string, b: string): boolean {
+	if (a.length !== b.length) {
+		return false;
+	}
+
+	let diff = 0;
+	for (let i = 0; i < a.length; i++) {
+		diff |= a.charCodeAt(i) ^ b.charCodeAt(i);
+	}
+
+	return diff === 0;
+}
+
+/**
+ * Aceita `x-revalidate-signature: sha256=<hex>` (HMAC-SHA256 do corpo com `REVALIDATE_SECRET`) ou,
+ * para Flows do Directus, que só enviam headers fixos, `x-revalidate-secret: <REVALIDATE_SECRET>`.
+ */
+async function assertSigned(request: NextRequest) {
+	const secret = process.env.REVALIDATE_SECRET;
+	if (!secret) {
+		throw createUnauthorizedError('Revalidação não configurada');
+	}
+
+	const signature = request.headers.get('x-revalidate-signature');
+	if (signature) {
+		const body = await request.clone().text();
+		const digest = await crypto.subtle.sign('HMAC', await getSigningKey(secret), encoder.encode(body));
+		const expected = `sha256=${Buffer.from(digest).toString('hex')}`;
+
+		if (safeEqual(signature, expected)) return;
+	} else if (safeEqual(request.headers.get('x-revalidate-secret') ?? '', secret)) {
+		return;
+	}
+
+	throw createUnauthorizedError('Assinatura de revalidação inválida');
+}
+
+/**
+ * POST /api/revalidate
+ * Remove do cache de conteúdo as entradas afetadas por uma alteração no Directus: a tag da collection
+ * (listas e buscas por filtro) e as tags de cada item alterado.
+ */
+export const POST = withApi(async (request: NextRequest) => {
+	await assertSigned(request);
+	const change = await validateBody(request, changeSchema);
+
+	if (!change.collection && !change.tags?.length) {
+		return NextResponse.json({ cleared: true, evicted: clearContentCache() });
+	}
+
+	const tags = [...(change.tags ?? [])];
+	if (change.collection) {
+		// Em `items.delete` o Directus manda as chaves apagadas em `payload`
+		const deleted = change.event?.endsWith('.delete') ?? false;
+		const payloadKeys = deleted && Array.isArray(change.payload) ? change.payload.map(String) : [];
+		const keys = new Set([...(change.keys ?? []), ...(change.key ? [change.key] : []), ...payloadKeys]);
+
+		tags.push(change.collection, ...itemTags(change.collection, keys));
+	}
+
+	return NextResponse.json({ tags, evicted: invalidateContentTags(tags) });
+});
@@ -0,0 +1,67 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { z } from 'zod';
+import { validateBody, withApi } from '@/lib/api';
+import { createUnauthorizedError } from '@/lib/errors';
+import {
+	SEARCH_COLLECTIONS,
+	applySearchIndexChange,
+	buildSearchIndex,
+	getSearchIndexStats,
+} from '@/lib/search/site-index';
+
+const key = z.union([z.string(), z.number()]).transform(String);
+
+/**
+ * Corpo enviado pela operação "Webhook / Request URL" de um Flow do Directus com gatilho
+ * "Event Hook" (`items.create`, `items.update`, `items.delete`) em pages, posts e events:
+ * o próprio `{{$trigger}}`. Sem `collection`, refaz o índice inteiro.
+ */
+const changeSchema = z.object({
+	event: z.string().optional(),
+	collection: z.enum(SEARCH_COLLECTIONS).optional(),
+	key: key.optional(),
+	keys: z.array(key).optional(),
+	payload: z.unknown().optional(),
+});
+
+function assertSecret(request: NextRequest) {
+	const secret = process.env.SEARCH_INDEX_SECRET;
+
+	if (!secret || request.headers.get('x-search-index-secret') !== secret) {
+		throw createUnauthorizedError('Segredo do índice de busca inválido');
+	}
+}
+
+/**
+ * POST /api/search/index
+ * Atualiza o índice de busca a partir dos hooks do Directus
+ */
+export const POST = withApi(async (request: NextRequest) => {
+	assertSecret(request);
+	const change = await validateBody(request, changeSchema);
+
+	if (!change.collection) {
+		await buildSearchIndex();
+
+		return NextResponse.json({ rebuilt: true, ...getSearchIndexStats() });
+	}
+
+	// Em `items.delete` o Directus manda as chaves apagadas em `payload`
+	const deleted = change.event?.endsWith('.delete') ?? false;
+	const payloadKeys = deleted && Array.isArray(change.payload) ? change.payload.map(String) : [];
+	const keys = [...new Set([...(change.keys ?? []), ...(change.key ? [change.key] : []), ...payloadKeys])];
+
+	const result = await applySearchIndexChange(change.collection, keys, deleted);
+
+	return NextResponse.json(result);
+});
+
+/**
+ * GET /api/search/index
+ * Tamanho e idade do índice desta instância
+ */
+export const GET = withApi(async (request: NextRequest) => {
+	assertSecret(request);
+
+	return NextResponse.json(getSearchIndexStats());
+});
@@ -1,5 +1,8 @@
-import { useDirectus } from '@/lib/directus/directus';
 import { NextResponse } from 'next/server';
+import { searchSite } from '@/lib/search/site-index';
+
+const DEFAULT_LIMIT = 20;
+const MAX_LIMIT = 50;
 
 export async function GET(request: Request) {
 	const { searchParams } = new URL(request.url);
@@ -9,82 +12,11 @@ export async function GET(request: Request) {
 		return NextResponse.json({ error: 'Query must be at least 3 characters.' }, { status: 400 });
 	}
 
-	const { directus, readItems } = useDirectus();
+	const limit = Math.min(MAX_LIMIT, Math.max(1, Number(searchParams.get('limit')) || DEFAULT_LIMIT));
 
 	try {
-		const [pages, posts, events] = await Promise.all([
-			directus.request(
-				readItems('pages', {
-					filter: {
-						_or: [{ title: { _contains: search } }, { permalink: { _contains: search } }],
-					},
-					fields: ['id', 'title', 'permalink', 'seo'],
-				}),
-			),
-
-			directus.request(
-				readItems('posts', {
-					filter: {
-						_and: [
-							{ status: { _eq: 'published' } },
-							{
-								_or: [
-									{ title: { _contains: search } },
-									{ description: { _contains: search } },
-									{ slug: { _contains: search } },
-									{ content: { _contains: search } },
-								],
-							},
-						],
-					},
-					fields: ['id', 'title', 'description', 'slug', 'content', 'status'],
-				}),
-			),
-
-			directus.request(
-				readItems('events', {
-					filter: {
-						_and: [
-							{ status: { _eq: 'published' } },
-							{
-								_or: [
-									{ title: { _contains: search } },
-									{ description: { _contains: search } },
-									{ slug: { _contains: search } },
-								],
-							},
-						],
-					},
-					fields: ['id', 'title', 'description', 'slug', 'status', 'start_date'],
-				}),
-			),
-		]);
-
-		const results = [
-			...pages.map((page: any) => ({
-				id: page.id,
-				title: page.title,
-				description: page?.seo?.meta_description || page.title,
-				type: 'Página',
-				link: `/${page.permalink.replace(/^\/+/, '')}`,
-			})),
-
-			...posts.map((post: any) => ({
-				id: post.id,
-				title: post.title,
-				description: post.description || '',
-				type: 'Blog',
-				link: `/blog/${post.slug}`,
-			})),
-
-			...events.map((event: any) => ({
-				id: event.id,
-				title: event.title,
-				description: event.description || '',
-				type: 'Evento',
-				link: `/eventos/${event.slug}`,
-			})),
-		];
+		// Páginas, posts e eventos vêm do índice em memória (src/lib/search), sem consultar o Directus
+		const results = await searchSite(search, limit);
 
 		return NextResponse.json(results);
 	} catch (error) {
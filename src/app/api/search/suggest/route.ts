@@ -0,0 +1,68 @@
+import { NextRequest } from 'next/server';
+import { z } from 'zod';
+import { validateQuery, withApi } from '@/lib/api';
+import { SEARCH_COLLECTIONS, suggestTitles } from '@/lib/search/site-index';
+
+const querySchema = z.object({
+	q: z.string().trim().min(1).max(100),
+	limit: z.coerce.number().int().min(1).max(20).default(5),
+});
+
+/**
+ * GET /api/search/suggest?q=<prefixo>&limit=5
+ *
+ * Typeahead de títulos de eventos, posts e páginas, a partir do primeiro caractere. A resposta é
+ * NDJSON com uma linha por collection, escrita assim que aquela collection responde:
+ *
+ * ```
+ * {"collection":"events","results":[{"id":"...","title":"...","type":"Evento","link":"..."}]}
+ * {"collection":"posts","results":[]}
+ * {"collection":"pages","error":"..."}
+ * {"done":true}
+ * ```
+ */
+export const GET = withApi(async (request: NextRequest) => {
+	const { q, limit } = validateQuery(request, querySchema);
+	const encoder = new TextEncoder();
+	// Cliente cancelou (nova tecla no typeahead): para de escrever
+	let closed = false;
+
+	const stream = new ReadableStream<Uint8Array>({
+		async start(controller) {
+			const write = (line: unknown) => {
+				if (!closed && !request.signal.aborted) {
+					controller.enqueue(encoder.encode(`${JSON.stringify(line)}\n`));
+				}
+			};
+
+			await Promise.all(
+				SEARCH_COLLECTIONS.map(async (collection) => {
+					try {
+						write({ collection, results: await suggestTitles(collection, q, limit) });
+					} catch (error) {
+						console.error(`[Search] Error suggesting ${collection}:`, error);
+						write({ collection, error: 'Falha ao buscar sugestões' });
+					}
+				}),
+			);
+
+			write({ done: true });
+			if (!closed) {
+				closed = true;
+				controller.close();
+			}
+		},
+		cancel() {
+			closed = true;
+		},
+	});
+
+	return new Response(stream, {
+		headers: {
+			'Content-Type': 'application/x-ndjson; charset=utf-8',
+			'Cache-Control': 'no-store',
+			// Sem buffer em proxies (nginx), para cada linha chegar assim que é escrita
+			'X-Accel-Buffering': 'no',
+		},
+	});
+});
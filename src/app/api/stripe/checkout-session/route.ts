@@ -4,9 +4,20 @@ import { stripe, formatAmountForStripe } from '@/lib/stripe/server';
 import { createDirectus, rest, staticToken, readItems, createItem, updateItem, readItem } from '@directus/sdk';
 import type { Schema } from '@/types/directus-schema';
 import { calculateFees, type FeeConfig } from '@/lib/fees';
+import { getSoldQuantities } from '@/lib/inventory/ledger';
+import {
+  commitReservation,
+  confirmReservation,
+  getHeldQuantities,
+  heldQuantity,
+  releaseHolds,
+  reserveTickets,
+  sessionExpiresAt,
+} from '@/lib/inventory/holds';
 import { getServerAuth, getAuthenticatedServerClient } from '@/lib/auth/server-auth';
 import { withApi, validateBody } from '@/lib/api';
 import { AppError, createUnauthorizedError, createNotFoundError } from '@/lib/errors';
+import { directusTransport } from '@/lib/directus/transport';
 
 const directusUrl = process.env.NEXT_PUBLIC_DIRECTUS_URL || 'http://localhost:8055';
 
@@ -88,7 +99,7 @@ export const POST = withApi(async (request: NextRequest) => {
     });
   }
 
-  const adminClient = createDirectus<Schema>(directusUrl)
+  const adminClient = createDirectus<Schema>(directusUrl, { globals: { fetch: directusTransport } })
     .with(rest())
     .with(staticToken(adminToken));
 
@@ -203,6 +214,16 @@ export const POST = withApi(async (request: NextRequest) => {
     total_amount: number;
   }> = [];
 
+  // Vendidos vêm do ledger de estoque e reservas de `ticket_holds` (de todas as instâncias): uma
+  // consulta agregada de cada para todos os ingressos do pedido
+  const requestedTickets = (event.tickets ?? []).filter((t) =>
+    body.tickets.some((selected) => selected.ticketId === t.id)
+  );
+  const [soldByTicket, heldByTicket] = await Promise.all([
+    getSoldQuantities(adminClient, requestedTickets),
+    getHeldQuantities(adminClient, requestedTickets.map((t) => t.id)),
+  ]);
+
   for (const selectedTicket of body.tickets) {
     const ticket = event.tickets?.find((t) => t.id === selectedTicket.ticketId);
 
@@ -220,8 +241,8 @@ export const POST = withApi(async (request: NextRequest) => {
 
     // Validar estoque disponível
     const totalQuantity = ticket.quantity ?? 0;
-    const soldQuantity = ticket.quantity_sold ?? 0;
-    const available = totalQuantity - soldQuantity;
+    const soldQuantity = soldByTicket.get(ticket.id) ?? ticket.quantity_sold ?? 0;
+    const available = totalQuantity - soldQuantity - (heldByTicket.get(ticket.id) ?? 0) - heldQuantity(ticket.id);
     if (selectedTicket.quantity > available) {
       throw new AppError({
         message: `Quantidade solicitada de "${ticket.title}" não disponível. Disponível: ${available}`,
@@ -288,93 +309,134 @@ export const POST = withApi(async (request: NextRequest) => {
     });
   }
 
+  // Reservar os ingressos até a sessão expirar (checagem + reserva sem await no meio), depois gravar
+  // e conferir contra as reservas das outras instâncias
+  const localReservation = reserveTickets(
+    registrationTickets.map((ticketData) => {
+      const ticket = requestedTickets.find((t) => t.id === ticketData.ticket_type_id)!;
+
+      return {
+        ticketId: ticketData.ticket_type_id,
+        quantity: ticketData.quantity,
+        available: (ticket.quantity ?? 0) - (soldByTicket.get(ticket.id) ?? ticket.quantity_sold ?? 0),
+        held: heldByTicket.get(ticket.id) ?? 0,
+      };
+    })
+  );
+  const reservation = localReservation.ok
+    ? await commitReservation(adminClient, localReservation.key)
+    : localReservation;
+
+  if (!reservation.ok) {
+    throw new AppError({
+      message: `Ingressos esgotados ou reservados por outros compradores. Disponível: ${reservation.available}`,
+      status: 400,
+      code: 'INSUFFICIENT_STOCK',
+      context: { ticketId: reservation.ticketId, available: reservation.available },
+    });
+  }
+
   // Criar registrations (um para cada tipo de ingresso)
   const createdRegistrations = [];
 
-  for (const ticketData of registrationTickets) {
-    console.log('[Checkout] Criando registration:', {
-      event_id: body.eventId,
-      ticket_type_id: ticketData.ticket_type_id,
-      user_id: auth.user.id,
-      quantity: ticketData.quantity,
-    });
+  let session: Awaited<ReturnType<typeof stripe.checkout.sessions.create>>;
 
-    try {
-      const registration = await directus.request(
-        createItem('event_registrations', {
-          event_id: body.eventId,
-          ticket_type_id: ticketData.ticket_type_id,
-          participant_name: body.participantInfo.name,
-          participant_email: body.participantInfo.email,
-          participant_phone: body.participantInfo.phone || null,
-          participant_document: body.participantInfo.document || null,
-          user_id: auth.user.id,
-          payment_status: 'pending',
-          status: 'pending',
-          payment_amount: ticketData.total_amount * ticketData.quantity,
-          quantity: ticketData.quantity,
-          unit_price: ticketData.unit_price,
-          service_fee: ticketData.convenience_fee,
-          total_amount: ticketData.total_amount * ticketData.quantity,
-          payment_method: 'card',
-        })
-      );
-
-      console.log('[Checkout] Registration retornado do Directus:', JSON.stringify(registration, null, 2));
-      console.log('[Checkout] Tipo de registration:', typeof registration);
-      console.log('[Checkout] registration.id:', registration?.id);
-
-      if (!registration || !registration.id) {
+  try {
+    for (const ticketData of registrationTickets) {
+      console.log('[Checkout] Criando registration:', {
+        event_id: body.eventId,
+        ticket_type_id: ticketData.ticket_type_id,
+        user_id: auth.user.id,
+        quantity: ticketData.quantity,
+      });
+
+      try {
+        const registration = await directus.request(
+          createItem('event_registrations', {
+            event_id: body.eventId,
+            ticket_type_id: ticketData.ticket_type_id,
+            participant_name: body.participantInfo.name,
+            participant_email: body.participantInfo.email,
+            participant_phone: body.participantInfo.phone || null,
+            participant_document: body.participantInfo.document || null,
+            user_id: auth.user.id,
+            payment_status: 'pending',
+            status: 'pending',
+            payment_amount: ticketData.total_amount * ticketData.quantity,
+            quantity: ticketData.quantity,
+            unit_price: ticketData.unit_price,
+            service_fee: ticketData.convenience_fee,
+            total_amount: ticketData.total_amount * ticketData.quantity,
+            payment_method: 'card',
+          })
+        );
+
+        console.log('[Checkout] Registration retornado do Directus:', JSON.stringify(registration, null, 2));
+        console.log('[Checkout] Tipo de registration:', typeof registration);
+        console.log('[Checkout] registration.id:', registration?.id);
+
+        if (!registration || !registration.id) {
+          throw new AppError({
+            message: 'Falha ao criar registration - sem permissão ou resposta inválida do Directus',
+            status: 500,
+            code: 'REGISTRATION_CREATION_FAILED',
+          });
+        }
+
+        createdRegistrations.push(registration);
+      } catch (regError) {
+        console.error('[Checkout] Erro ao criar registration:', regError);
         throw new AppError({
-          message: 'Falha ao criar registration - sem permissão ou resposta inválida do Directus',
+          message: `Erro ao criar ingresso: ${regError instanceof Error ? regError.message : 'Verifique as permissões no Directus'}`,
           status: 500,
-          code: 'REGISTRATION_CREATION_FAILED',
+          code: 'REGISTRATION_ERROR',
+          cause: regError,
         });
       }
-
-      createdRegistrations.push(registration);
-    } catch (regError) {
-      console.error('[Checkout] Erro ao criar registration:', regError);
-      throw new AppError({
-        message: `Erro ao criar ingresso: ${regError instanceof Error ? regError.message : 'Verifique as permissões no Directus'}`,
-        status: 500,
-        code: 'REGISTRATION_ERROR',
-        cause: regError,
-      });
     }
-  }
 
-  // Criar Checkout Session no Stripe
-  const successUrl = `${process.env.NEXT_PUBLIC_SITE_URL || 'http://localhost:3000'}/eventos/${event.slug}/checkout/success?session_id={CHECKOUT_SESSION_ID}`;
-  const cancelUrl = `${process.env.NEXT_PUBLIC_SITE_URL || 'http://localhost:3000'}/eventos/${event.slug}/checkout/cancel`;
-
-  const session = await stripe.checkout.sessions.create({
-    mode: 'payment',
-    line_items: lineItems,
-    success_url: successUrl,
-    cancel_url: cancelUrl,
-    customer_email: body.participantInfo.email,
-    payment_intent_data: {
-      application_fee_amount: formatAmountForStripe(totalPlatformFee),
-      transfer_data: {
-        destination: organizer.stripe_account_id,
+    // Criar Checkout Session no Stripe
+    const successUrl = `${process.env.NEXT_PUBLIC_SITE_URL || 'http://localhost:3000'}/eventos/${event.slug}/checkout/success?session_id={CHECKOUT_SESSION_ID}`;
+    const cancelUrl = `${process.env.NEXT_PUBLIC_SITE_URL || 'http://localhost:3000'}/eventos/${event.slug}/checkout/cancel`;
+
+    session = await stripe.checkout.sessions.create({
+      mode: 'payment',
+      line_items: lineItems,
+      success_url: successUrl,
+      cancel_url: cancelUrl,
+      customer_email: body.participantInfo.email,
+      payment_intent_data: {
+        application_fee_amount: formatAmountForStripe(totalPlatformFee),
+        transfer_data: {
+          destination: organizer.stripe_account_id,
+        },
+        metadata: {
+          registration_ids: createdRegistrations.map(r => r.id).join(','),
+          event_id: body.eventId,
+          organizer_id: organizer.id,
+          total_stripe_fee: totalStripeFee.toFixed(2),
+          total_platform_fee: totalPlatformFee.toFixed(2),
+        },
       },
       metadata: {
         registration_ids: createdRegistrations.map(r => r.id).join(','),
         event_id: body.eventId,
         organizer_id: organizer.id,
-        total_stripe_fee: totalStripeFee.toFixed(2),
-        total_platform_fee: totalPlatformFee.toFixed(2),
       },
-    },
-    metadata: {
-      registration_ids: createdRegistrations.map(r => r.id).join(','),
-      event_id: body.eventId,
-      organizer_id: organizer.id,
-    },
-    payment_method_types: ['card'],
-    locale: 'pt-BR',
-  });
+      payment_method_types: ['card'],
+      locale: 'pt-BR',
+      // A reserva foi feita antes das inscrições: garante o mínimo do Stripe a partir de agora
+      expires_at: Math.floor(sessionExpiresAt(reservation.key) / 1000),
+    });
+  } catch (error) {
+    // Sem sessão não há como pagar: devolve a reserva imediatamente
+    await releaseHolds(adminClient, reservation.key).catch((releaseError) => {
+      console.error('[Checkout] Erro ao liberar reserva:', releaseError);
+    });
+    throw error;
+  }
+
+  await confirmReservation(adminClient, reservation.key, session.id);
 
   // Atualizar registrations com checkout_session_id
   for (const registration of createdRegistrations) {
@@ -1,14 +1,7 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { headers } from 'next/headers';
-import Stripe from 'stripe';
-import {
-	verifyWebhookSignature,
-	handlePaymentIntentSucceeded,
-	handlePaymentIntentFailed,
-	handleCheckoutSessionCompleted,
-	handleChargeRefunded,
-	handleAccountUpdated,
-} from '@/lib/stripe/webhooks';
+import { verifyWebhookSignature } from '@/lib/stripe/webhooks';
+import { enqueueWebhookEvent } from '@/lib/stripe/webhook-queue';
 
 /**
  * Stripe Webhook Handler
@@ -24,6 +17,10 @@ import {
  * For production:
  * 1. Configure webhook in Stripe Dashboard
  * 2. Add production webhook secret to environment variables
+ *
+ * The handler only verifies the signature and stores the event in the ingestion queue
+ * (`src/lib/stripe/webhook-queue.ts`) before answering, so slow Directus writes never hold the
+ * response past Stripe's timeout. Events are processed right after by the worker pool.
  */
 export async function POST(request: NextRequest) {
 	try {
@@ -53,33 +50,17 @@ return NextResponse.json(
 
 		console.log(`[Stripe Webhook] Received event: ${event.type}`);
 
-		// Handle the event
-		switch (event.type) {
-			case 'payment_intent.succeeded':
-				await handlePaymentIntentSucceeded(event.data.object as Stripe.PaymentIntent);
-				break;
-
-			case 'payment_intent.payment_failed':
-				await handlePaymentIntentFailed(event.data.object as Stripe.PaymentIntent);
-				break;
-
-			case 'checkout.session.completed':
-				await handleCheckoutSessionCompleted(event.data.object as Stripe.Checkout.Session);
-				break;
+		try {
+			// Event id is the dedupe key: a redelivery is acknowledged without being processed again
+			const result = await enqueueWebhookEvent(event);
 
-			case 'charge.refunded':
-				await handleChargeRefunded(event.data.object as Stripe.Charge);
-				break;
+			return NextResponse.json({ received: true, duplicate: result === 'duplicate' });
+		} catch (error) {
+			// Not stored: answer 500 so Stripe redelivers it later
+			console.error(`[Stripe Webhook] Failed to enqueue ${event.id}:`, error);
 
-			case 'account.updated':
-				await handleAccountUpdated(event.data.object as Stripe.Account);
-				break;
-
-			default:
-				console.log(`[Stripe Webhook] Unhandled event type: ${event.type}`);
+			return NextResponse.json({ error: 'Failed to enqueue event' }, { status: 500 });
 		}
-
-		return NextResponse.json({ received: true });
 	} catch (error) {
 		console.error('[Stripe Webhook] Error:', error);
 		const message = error instanceof Error ? error.message : 'Unknown error';
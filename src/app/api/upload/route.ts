@@ -1,6 +1,7 @@
 import { cookies } from 'next/headers';
 import { withApi } from '@/lib/api';
 import { AppError } from '@/lib/errors';
+import { directusTransport } from '@/lib/directus/transport';
 
 const DIRECTUS_URL = process.env.NEXT_PUBLIC_DIRECTUS_URL || 'http://localhost:8055';
 
@@ -26,7 +27,7 @@ export const POST = withApi(async (request) => {
 	// Check if folder exists
 	let folderId: string | null = null;
 
-	const foldersResponse = await fetch(`${DIRECTUS_URL}/folders?filter[name][_eq]=${encodeURIComponent(folderName)}`, {
+	const foldersResponse = await directusTransport(`${DIRECTUS_URL}/folders?filter[name][_eq]=${encodeURIComponent(folderName)}`, {
 		headers: {
 			Authorization: `Bearer ${authToken}`,
 		},
@@ -98,7 +99,7 @@ export const POST = withApi(async (request) => {
 		uploadFormData.append('folder', folderId);
 	}
 
-	const uploadResponse = await fetch(`${DIRECTUS_URL}/files`, {
+	const uploadResponse = await directusTransport(`${DIRECTUS_URL}/files`, {
 		method: 'POST',
 		headers: {
 			Authorization: `Bearer ${authToken}`,
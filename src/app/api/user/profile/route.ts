@@ -3,6 +3,7 @@ import { getAuthenticatedClient } from '@/lib/directus/directus';
 import { updateUser } from '@directus/sdk';
 import { withApi, validateBody } from '@/lib/api';
 import { AppError, createUnauthorizedError } from '@/lib/errors';
+import { invalidateServerAuth } from '@/lib/auth/auth-cache';
 import { z } from 'zod';
 
 const updateProfileSchema = z.object({
@@ -33,6 +34,7 @@ export const PATCH = withApi(async (request: NextRequest) => {
 			email: body.email,
 		})
 	);
+	invalidateServerAuth(body.userId);
 
 	return Response.json({ success: true, user: updatedUser });
 });
@@ -0,0 +1,78 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { withApi } from '@/lib/api';
+import { getWaitingRoomConfig } from '@/lib/waiting-room/config';
+import { joinQueue, queueDepth, queueStatus } from '@/lib/waiting-room/queue';
+import {
+	ADMISSION_TTL_MS,
+	admissionCookieName,
+	queueCookieName,
+	signToken,
+	verifyToken,
+} from '@/lib/waiting-room/tokens';
+
+/** Um número na fila vale por até 6 horas (aberturas de venda longas) */
+const QUEUE_TICKET_TTL_MS = 6 * 60 * 60_000;
+
+const cookieOptions = (maxAgeMs: number) => ({
+	httpOnly: true,
+	secure: process.env.NODE_ENV === 'production',
+	sameSite: 'lax' as const,
+	maxAge: Math.floor(maxAgeMs / 1000),
+	path: '/',
+});
+
+/**
+ * POST /api/waiting-room/[slug]
+ * Entra na sala de espera do evento (ou consulta a posição, se já estiver na fila).
+ *
+ * Quando a vez do comprador chega, grava o cookie de admissão assinado que o middleware exige
+ * em `/eventos/[slug]`, no checkout e em `/api/stripe/checkout-session`.
+ */
+export const POST = withApi(async (request: NextRequest, context: { params: Promise<Record<string, string | string[]>> }) => {
+	const { slug } = (await context.params) as { slug: string };
+	const config = await getWaitingRoomConfig('slug', slug);
+
+	// Evento sem fila (ou sala de espera desligada): acesso direto
+	if (!config) {
+		return NextResponse.json({ slug, enabled: false, admitted: true, position: 0, etaSeconds: 0 });
+	}
+
+	const { eventId, ratePerMinute } = config;
+	const now = Date.now();
+
+	if (await verifyToken(request.cookies.get(admissionCookieName(eventId))?.value, 'admit', eventId, now)) {
+		return NextResponse.json({ slug, enabled: true, admitted: true, position: 0, etaSeconds: 0 });
+	}
+
+	// Cookies de antes da fila compartilhada não têm `admitAt`: o comprador entra de novo
+	const cookie = await verifyToken(request.cookies.get(queueCookieName(eventId))?.value, 'queue', eventId, now);
+	const ticket = typeof cookie?.admitAt === 'number' ? cookie : null;
+	const status = ticket ? queueStatus(ticket, ratePerMinute, now) : await joinQueue(eventId, ratePerMinute);
+
+	const response = NextResponse.json({
+		slug,
+		enabled: true,
+		admitted: status.admitted,
+		position: status.position,
+		etaSeconds: status.etaSeconds,
+		queueLength: queueDepth(eventId, now),
+		ratePerMinute,
+	});
+
+	if (status.admitted) {
+		const admission = await signToken({ kind: 'admit', eventId, exp: now + ADMISSION_TTL_MS });
+		response.cookies.set(admissionCookieName(eventId), admission, cookieOptions(ADMISSION_TTL_MS));
+		response.cookies.delete(queueCookieName(eventId));
+	} else if (!ticket) {
+		const queued = await signToken({
+			kind: 'queue',
+			eventId,
+			n: status.n,
+			admitAt: status.admitAt,
+			exp: now + QUEUE_TICKET_TTL_MS,
+		});
+		response.cookies.set(queueCookieName(eventId), queued, cookieOptions(QUEUE_TICKET_TTL_MS));
+	}
+
+	return response;
+});
@@ -0,0 +1,32 @@
+import type { Metadata } from 'next';
+import WaitingRoom from '@/components/events/WaitingRoom';
+
+interface WaitingRoomPageProps {
+  params: Promise<{
+    slug: string;
+  }>;
+  searchParams: Promise<{
+    next?: string;
+  }>;
+}
+
+export const metadata: Metadata = {
+  title: 'Sala de espera',
+  robots: { index: false },
+};
+
+/**
+ * Sala de espera de eventos com alta demanda.
+ *
+ * Fica fora do grupo (public) de propósito: não carrega o evento nem a navegação do Directus, então
+ * segura a fila sem gerar consultas enquanto o comprador espera.
+ */
+export default async function WaitingRoomPage({ params, searchParams }: WaitingRoomPageProps) {
+  const { slug } = await params;
+  const { next } = await searchParams;
+
+  // Só volta para páginas do próprio evento (evita open redirect via ?next=)
+  const target = next?.startsWith(`/eventos/${slug}`) ? next : `/eventos/${slug}`;
+
+  return <WaitingRoom slug={slug} next={target} />;
+}
@@ -6,6 +6,7 @@ import { Metadata } from 'next';
 import { ThemeProvider } from '@/components/ui/ThemeProvider';
 import { Toaster } from '@/components/ui/toaster';
 import { ToastConfig } from '@/components/ToastConfig';
+import { HydrationMarker } from '@/components/HydrationMarker';
 import { AuthProvider } from '@/contexts/AuthContext';
 import { fetchSiteData } from '@/lib/directus/fetchers';
 import { getDirectusAssetURL } from '@/lib/directus/directus-utils';
@@ -39,6 +40,7 @@ export default async function RootLayout({ children }: { children: ReactNode })
 				<ThemeProvider>
 					<AuthProvider>
 						<ToastConfig />
+						<HydrationMarker />
 						{children}
 						<Toaster />
 					</AuthProvider>
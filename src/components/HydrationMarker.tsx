@@ -0,0 +1,20 @@
+/**
+ * @fileoverview Marca o documento como hidratado
+ *
+ * Define `data-hydrated="true"` no elemento <html> assim que o React termina
+ * de hidratar a árvore do cliente. Os testes E2E aguardam esse atributo em vez
+ * de usar pausas fixas antes de interagir com a página.
+ */
+
+'use client';
+
+import { useEffect } from 'react';
+
+export function HydrationMarker() {
+	useEffect(() => {
+		document.documentElement.dataset.hydrated = 'true';
+	}, []);
+
+	// Este componente não renderiza nada
+	return null;
+}
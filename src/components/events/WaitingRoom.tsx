@@ -0,0 +1,111 @@
+'use client';
+
+import { useEffect, useState } from 'react';
+import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card';
+import { Progress } from '@/components/ui/progress';
+
+interface WaitingRoomProps {
+  slug: string;
+  /** Para onde ir quando a vez chegar (/eventos/[slug] ou o checkout) */
+  next: string;
+}
+
+interface WaitingRoomStatus {
+  admitted: boolean;
+  position: number;
+  etaSeconds: number;
+}
+
+/** Intervalo entre consultas: mais espaçado quanto mais longe da vez */
+function pollDelay(etaSeconds: number): number {
+  return Math.min(10_000, Math.max(2_000, (etaSeconds * 1000) / 4));
+}
+
+function formatEta(seconds: number): string {
+  if (seconds < 60) return 'menos de 1 minuto';
+  const minutes = Math.ceil(seconds / 60);
+
+  return minutes === 1 ? 'cerca de 1 minuto' : `cerca de ${minutes} minutos`;
+}
+
+export default function WaitingRoom({ slug, next }: WaitingRoomProps) {
+  const [status, setStatus] = useState<WaitingRoomStatus | null>(null);
+  const [initialPosition, setInitialPosition] = useState<number | null>(null);
+  const [error, setError] = useState(false);
+
+  useEffect(() => {
+    let timer: ReturnType<typeof setTimeout>;
+    const controller = new AbortController();
+
+    const poll = async () => {
+      try {
+        const response = await fetch(`/api/waiting-room/${encodeURIComponent(slug)}`, {
+          method: 'POST',
+          signal: controller.signal,
+        });
+        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+
+        const data: WaitingRoomStatus = await response.json();
+        setStatus(data);
+        setError(false);
+        setInitialPosition((current) => current ?? data.position);
+
+        if (data.admitted) {
+          window.location.replace(next);
+
+          return;
+        }
+        timer = setTimeout(poll, pollDelay(data.etaSeconds));
+      } catch {
+        if (controller.signal.aborted) return;
+        setError(true);
+        timer = setTimeout(poll, 5_000);
+      }
+    };
+
+    poll();
+
+    return () => {
+      controller.abort();
+      clearTimeout(timer);
+    };
+  }, [slug, next]);
+
+  const progress =
+    status && initialPosition ? Math.round(((initialPosition - status.position) / initialPosition) * 100) : 0;
+
+  return (
+    <div className="min-h-screen flex items-center justify-center p-6">
+      <Card className="max-w-md w-full text-center">
+        <CardHeader>
+          <CardTitle>Você está na fila</CardTitle>
+          <CardDescription>
+            Muita gente está tentando comprar agora. Mantenha esta página aberta: você será redirecionado
+            automaticamente quando chegar a sua vez.
+          </CardDescription>
+        </CardHeader>
+        <CardContent className="space-y-4">
+          {status?.admitted ? (
+            <p className="font-semibold">Sua vez chegou! Redirecionando...</p>
+          ) : status ? (
+            <>
+              <p className="text-4xl font-bold">{status.position}</p>
+              <p className="text-muted-foreground">
+                {status.position === 1 ? 'pessoa à sua frente' : 'pessoas à sua frente'} · espera estimada de{' '}
+                {formatEta(status.etaSeconds)}
+              </p>
+              <Progress value={progress} />
+            </>
+          ) : (
+            <p className="text-muted-foreground">Entrando na fila...</p>
+          )}
+          {error && (
+            <p className="text-sm text-muted-foreground">
+              Não foi possível atualizar sua posição. Tentando novamente...
+            </p>
+          )}
+        </CardContent>
+      </Card>
+    </div>
+  );
+}
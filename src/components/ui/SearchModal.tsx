@@ -1,6 +1,6 @@
 'use client';
 
-import { useEffect, useState } from 'react';
+import { useEffect, useMemo, useState } from 'react';
 import {
 	CommandDialog,
 	CommandEmpty,
@@ -15,20 +15,11 @@ import { Badge } from '@/components/ui/badge';
 import { debounce } from '@/lib/utils';
 import { DialogDescription, DialogTitle } from './dialog';
 import { useRouter } from 'next/navigation';
-
-type SearchResult = {
-	id: string;
-	title: string;
-	description: string;
-	type: string;
-	link: string;
-};
+import { useSearchSuggestions } from '@/hooks/useSearchSuggestions';
 
 export default function SearchModal() {
 	const [open, setOpen] = useState(false);
-	const [results, setResults] = useState<SearchResult[]>([]);
-	const [loading, setLoading] = useState(false);
-	const [searched, setSearched] = useState(false);
+	const { results, loading, searched, search, reset } = useSearchSuggestions();
 
 	const router = useRouter();
 
@@ -46,37 +37,12 @@ export default function SearchModal() {
 
 	useEffect(() => {
 		if (!open) {
-			setResults([]);
-			setSearched(false);
-			setLoading(false);
-		}
-	}, [open]);
-
-	const fetchResults = async (search: string) => {
-		if (search.length < 3) {
-			setResults([]);
-			setSearched(false);
-
-			return;
+			reset();
 		}
+	}, [open, reset]);
 
-		setLoading(true);
-		setSearched(true);
-
-		try {
-			const res = await fetch(`/api/search?search=${encodeURIComponent(search)}`);
-			if (!res.ok) throw new Error('Failed to fetch results');
-			const data: SearchResult[] = await res.json();
-			setResults(data.filter((r) => r.link));
-		} catch (error) {
-			console.error('Error fetching search results:', error);
-			setResults([]);
-		} finally {
-			setLoading(false);
-		}
-	};
-
-	const debouncedFetchResults = debounce(fetchResults, 300);
+	// Typeahead responde a partir do primeiro caractere; o hook cancela a consulta anterior
+	const debouncedSearch = useMemo(() => debounce(search, 100), [search]);
 
 	return (
 		<div className="sm:max-w-[540px] max-w-full">
@@ -84,13 +50,13 @@ export default function SearchModal() {
 				<Search className="size-5" />
 			</Button>
 
-			<CommandDialog open={open} onOpenChange={setOpen}>
+			<CommandDialog open={open} onOpenChange={setOpen} shouldFilter={false}>
 				<DialogTitle className="p-2 sr-only">Search</DialogTitle>
 				<DialogDescription className="px-2 sr-only">Search for pages or posts</DialogDescription>
 
 				<CommandInput
 					placeholder="Search for pages or posts"
-					onValueChange={(value) => debouncedFetchResults(value)}
+					onValueChange={(value) => debouncedSearch(value)}
 					className="m-2 p-4 focus:outline-none text-base leading-normal"
 				/>
 
@@ -98,15 +64,17 @@ export default function SearchModal() {
 					{!loading && !searched && (
 						<CommandEmpty className="py-2 text-sm text-center">Enter a search term above to see results</CommandEmpty>
 					)}
-					{loading && <CommandEmpty className="py-2 text-sm text-center">Loading...</CommandEmpty>}
+					{loading && results.length === 0 && (
+						<CommandEmpty className="py-2 text-sm text-center">Loading...</CommandEmpty>
+					)}
 					{!loading && searched && results.length === 0 && (
 						<CommandEmpty className="py-2 text-sm text-center">No results found</CommandEmpty>
 					)}
-					{!loading && results.length > 0 && (
+					{results.length > 0 && (
 						<CommandGroup heading="Search Results" className="pt-2" forceMount>
 							{results.map((result) => (
 								<CommandItem
-									key={result.id}
+									key={result.link}
 									className="flex items-start gap-4 px-2 py-3"
 									onSelect={() => {
 										router.push(result.link);
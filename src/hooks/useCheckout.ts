@@ -52,8 +52,15 @@ export function useCheckout({ eventId, userId }: CheckoutOptions) {
 
       const data = await response.json();
 
+      // Evento com sala de espera e admissão vencida: volta para a fila
+      if (response.status === 403 && data.context?.waitingRoomUrl) {
+        window.location.href = data.context.waitingRoomUrl;
+
+        return;
+      }
+
       if (!response.ok) {
-        throw new Error(data.error || 'Erro ao criar sessão de checkout');
+        throw new Error(data.error || data.detail || 'Erro ao criar sessão de checkout');
       }
 
       // Redirecionar para o Stripe Checkout
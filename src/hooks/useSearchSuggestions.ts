@@ -0,0 +1,128 @@
+import { useCallback, useEffect, useRef, useState } from 'react';
+
+export type SearchSuggestion = {
+	id: string;
+	title: string;
+	description: string;
+	type: string;
+	link: string;
+};
+
+/** Ordem de exibição dos grupos; `search` é a busca completa, a partir de 3 caracteres */
+const GROUPS = ['events', 'posts', 'pages', 'search'] as const;
+
+type Group = (typeof GROUPS)[number];
+
+const FULL_SEARCH_MIN_LENGTH = 3;
+
+/**
+ * Typeahead do modal de busca.
+ *
+ * Lê `/api/search/suggest` em streaming (NDJSON, uma linha por collection) e mostra cada collection
+ * assim que ela chega. A partir de 3 caracteres também consulta `/api/search` (texto completo) e
+ * acrescenta o que os títulos não trouxeram. Cada nova consulta cancela a anterior com
+ * AbortController, então respostas atrasadas nunca sobrescrevem as mais novas.
+ */
+export function useSearchSuggestions() {
+	const [groups, setGroups] = useState<Partial<Record<Group, SearchSuggestion[]>>>({});
+	const [loading, setLoading] = useState(false);
+	const [searched, setSearched] = useState(false);
+	const controllerRef = useRef<AbortController | null>(null);
+
+	const reset = useCallback(() => {
+		controllerRef.current?.abort();
+		controllerRef.current = null;
+		setGroups({});
+		setLoading(false);
+		setSearched(false);
+	}, []);
+
+	useEffect(() => () => controllerRef.current?.abort(), []);
+
+	const search = useCallback(
+		async (query: string) => {
+			const term = query.trim();
+			if (!term) {
+				reset();
+
+				return;
+			}
+
+			controllerRef.current?.abort();
+			const controller = new AbortController();
+			controllerRef.current = controller;
+			const { signal } = controller;
+
+			setGroups({});
+			setLoading(true);
+			setSearched(true);
+
+			const setGroup = (group: Group, results: SearchSuggestion[]) => {
+				if (!signal.aborted) {
+					setGroups((current) => ({ ...current, [group]: results }));
+				}
+			};
+
+			const streamSuggestions = async () => {
+				const res = await fetch(`/api/search/suggest?q=${encodeURIComponent(term)}`, { signal });
+				if (!res.ok || !res.body) throw new Error('Failed to fetch suggestions');
+
+				const reader = res.body.getReader();
+				const decoder = new TextDecoder();
+				let buffer = '';
+
+				for (;;) {
+					const { done, value } = await reader.read();
+					if (done) break;
+
+					buffer += decoder.decode(value, { stream: true });
+					const lines = buffer.split('\n');
+					buffer = lines.pop() ?? '';
+
+					for (const line of lines) {
+						if (!line.trim()) continue;
+						const message = JSON.parse(line);
+						if (message.collection && Array.isArray(message.results)) {
+							setGroup(message.collection, message.results);
+						}
+					}
+				}
+			};
+
+			const fullSearch = async () => {
+				if (term.length < FULL_SEARCH_MIN_LENGTH) return;
+
+				const res = await fetch(`/api/search?search=${encodeURIComponent(term)}`, { signal });
+				if (!res.ok) throw new Error('Failed to fetch results');
+				setGroup('search', await res.json());
+			};
+
+			const outcomes = await Promise.allSettled([streamSuggestions(), fullSearch()]);
+
+			for (const outcome of outcomes) {
+				if (outcome.status === 'rejected' && !signal.aborted) {
+					console.error('Error fetching search results:', outcome.reason);
+				}
+			}
+
+			if (!signal.aborted) {
+				setLoading(false);
+			}
+		},
+		[reset],
+	);
+
+	// Títulos primeiro; da busca completa só entra o que ainda não apareceu
+	const seen = new Set<string>();
+	const results: SearchSuggestion[] = [];
+	for (const group of GROUPS) {
+		for (const result of groups[group] ?? []) {
+			if (result.link && !seen.has(result.link)) {
+				seen.add(result.link);
+				results.push(result);
+			}
+		}
+	}
+
+	return { results, loading, searched, search, reset };
+}
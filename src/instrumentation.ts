@@ -0,0 +1,17 @@
+/**
+ * Roda uma vez quando o servidor do Next.js sobe.
+ */
+export async function register() {
+	if (process.env.NEXT_RUNTIME !== 'nodejs') {
+		return;
+	}
+
+	// Monta o índice de busca antes da primeira consulta; se o Directus estiver fora, a primeira
+	// busca tenta de novo
+	const { buildSearchIndex } = await import('@/lib/search/site-index');
+	buildSearchIndex().catch((error) => console.error('[Search] Error building index on startup:', error));
+
+	// Retoma os webhooks do Stripe pendentes de antes do restart sem esperar o próximo chegar
+	const { startWebhookWorkers } = await import('@/lib/stripe/webhook-queue');
+	startWebhookWorkers();
+}
@@ -0,0 +1,112 @@
+/**
+ * Cache de `getServerAuth` entre requests (só Node.js).
+ *
+ * O resultado (usuário + perfil de organizador) fica guardado por `AUTH_CACHE_TTL_SECONDS` (padrão
+ * 5; `0` desliga) sob o SHA-256 do access token, nunca o token em si, num LRU de `MAX_ENTRIES`.
+ * Chamadas iguais em paralelo compartilham a mesma leitura. As rotas que alteram o perfil do usuário
+ * ou o organizador chamam `invalidateServerAuth(userId)`; uma leitura que começou antes da
+ * invalidação não é guardada.
+ */
+
+import { createHash } from 'node:crypto';
+
+const MAX_ENTRIES = 500;
+const TTL_MS = Math.max(0, Number(process.env.AUTH_CACHE_TTL_SECONDS ?? 5) || 0) * 1000;
+
+interface CachedAuth {
+	value: unknown;
+	userId: string;
+	expiresAt: number;
+}
+
+const entries = new Map<string, CachedAuth>();
+const loading = new Map<string, Promise<unknown>>();
+/** userId → chaves das entradas do usuário (um usuário pode ter várias sessões) */
+const userIndex = new Map<string, Set<string>>();
+let invalidations = 0;
+
+function tokenKey(accessToken: string): string {
+	return createHash('sha256').update(accessToken).digest('hex');
+}
+
+function deleteEntry(key: string): void {
+	const entry = entries.get(key);
+	if (!entry) {
+		return;
+	}
+
+	entries.delete(key);
+	const keys = userIndex.get(entry.userId);
+	keys?.delete(key);
+	if (keys?.size === 0) {
+		userIndex.delete(entry.userId);
+	}
+}
+
+function store(key: string, userId: string, value: unknown): void {
+	deleteEntry(key);
+	if (entries.size >= MAX_ENTRIES) {
+		deleteEntry(entries.keys().next().value as string);
+	}
+
+	entries.set(key, { value, userId, expiresAt: Date.now() + TTL_MS });
+	let keys = userIndex.get(userId);
+	if (!keys) {
+		keys = new Set();
+		userIndex.set(userId, keys);
+	}
+	keys.add(key);
+}
+
+/**
+ * Resultado de `load` para o token, em cache. `null` (token inválido) e erros não são guardados.
+ */
+export async function cachedServerAuth<T extends { user: { id: string } }>(
+	accessToken: string,
+	load: () => Promise<T | null>,
+): Promise<T | null> {
+	if (TTL_MS <= 0) {
+		return load();
+	}
+
+	const key = tokenKey(accessToken);
+	const entry = entries.get(key);
+	if (entry && entry.expiresAt > Date.now()) {
+		// Reinsere no fim do Map (LRU)
+		entries.delete(key);
+		entries.set(key, entry);
+
+		return entry.value as T;
+	}
+
+	const current = loading.get(key);
+	if (current) {
+		return current as Promise<T | null>;
+	}
+
+	const startedAt = invalidations;
+	const promise = load()
+		.then((value) => {
+			if (value && startedAt === invalidations) {
+				store(key, value.user.id, value);
+			}
+
+			return value;
+		})
+		.finally(() => loading.delete(key));
+	loading.set(key, promise);
+
+	return promise;
+}
+
+/**
+ * Descarta o estado em cache de todas as sessões do usuário. Chame depois de alterar o perfil do
+ * usuário ou o registro de organizador dele.
+ */
+export function invalidateServerAuth(user: string | { id: string } | null | undefined): void {
+	invalidations++;
+	const userId = typeof user === 'string' ? user : user?.id;
+	for (const key of [...(userIndex.get(userId ?? '') ?? [])]) {
+		deleteEntry(key);
+	}
+}
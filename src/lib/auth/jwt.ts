@@ -0,0 +1,106 @@
+/**
+ * Verificação local dos access tokens emitidos pelo Directus (compatível com Edge Runtime).
+ *
+ * O Directus assina os JWTs de sessão com HS256 usando a variável `SECRET` do próprio Directus;
+ * com o mesmo valor em `DIRECTUS_SECRET` o middleware valida assinatura, emissor e expiração sem
+ * chamar `/users/me`. Sem `DIRECTUS_SECRET` nada é verificado aqui e o chamador volta a validar no
+ * Directus.
+ */
+
+export interface DirectusTokenClaims {
+	/** Id do usuário */
+	id: string;
+	/** Id da role do usuário (`null` para usuários sem role) */
+	role: string | null;
+	app_access: boolean;
+	admin_access: boolean;
+	/** Expiração em segundos (epoch) */
+	exp: number;
+	iat?: number;
+}
+
+const ISSUER = 'directus';
+
+const encoder = new TextEncoder();
+const decoder = new TextDecoder();
+
+let verifyingKey: Promise<CryptoKey> | null = null;
+
+export function isLocalTokenVerificationEnabled(): boolean {
+	return Boolean(process.env.DIRECTUS_SECRET);
+}
+
+function getVerifyingKey(): Promise<CryptoKey> {
+	verifyingKey ??= crypto.subtle.importKey(
+		'raw',
+		encoder.encode(process.env.DIRECTUS_SECRET as string),
+		{ name: 'HMAC', hash: 'SHA-256' },
+		false,
+		['verify'],
+	);
+
+	return verifyingKey;
+}
+
+function fromBase64Url(value: string): Uint8Array {
+	const binary = atob(value.replace(/-/g, '+').replace(/_/g, '/'));
+
+	return Uint8Array.from(binary, (char) => char.charCodeAt(0));
+}
+
+function decodeSegment<T>(segment: string): T {
+	return JSON.parse(decoder.decode(fromBase64Url(segment))) as T;
+}
+
+/**
+ * Valida um access token do Directus. Retorna `null` para assinatura, algoritmo, emissor ou
+ * formato inválidos e para tokens expirados.
+ */
+export async function verifyDirectusToken(
+	token: string | undefined,
+	now = Date.now(),
+): Promise<DirectusTokenClaims | null> {
+	if (!token || !isLocalTokenVerificationEnabled()) {
+		return null;
+	}
+
+	const [header, payload, signature] = token.split('.');
+	if (!header || !payload || !signature) {
+		return null;
+	}
+
+	try {
+		if (decodeSegment<{ alg?: string }>(header).alg !== 'HS256') {
+			return null;
+		}
+
+		const valid = await crypto.subtle.verify(
+			'HMAC',
+			await getVerifyingKey(),
+			fromBase64Url(signature),
+			encoder.encode(`${header}.${payload}`),
+		);
+		if (!valid) {
+			return null;
+		}
+
+		const claims = decodeSegment<Partial<DirectusTokenClaims> & { iss?: string }>(payload);
+		if (claims.iss !== ISSUER || typeof claims.id !== 'string' || typeof claims.exp !== 'number') {
+			return null;
+		}
+		if (claims.exp * 1000 <= now) {
+			return null;
+		}
+
+		return {
+			id: claims.id,
+			role: claims.role ?? null,
+			app_access: Boolean(claims.app_access),
+			admin_access: Boolean(claims.admin_access),
+			exp: claims.exp,
+			iat: claims.iat,
+		};
+	} catch {
+		return null;
+	}
+}
@@ -0,0 +1,73 @@
+/**
+ * Coalescência de refresh de sessão (compatível com Edge Runtime).
+ *
+ * Quando o access token vence, o navegador dispara vários requests ao mesmo tempo (payloads RSC,
+ * prefetches, chamadas de API), todos com o mesmo refresh token. O Directus rotaciona o refresh token
+ * a cada uso, então só o primeiro `refresh()` funcionaria e os outros derrubariam a sessão. Aqui o
+ * primeiro request faz o refresh e os demais com o mesmo token esperam a mesma promise; o resultado
+ * fica guardado por `RESULT_TTL_MS` para os requests que chegam logo depois, ainda com o cookie
+ * antigo. Falhas não ficam guardadas.
+ *
+ * A chave é o SHA-256 do refresh token, nunca o token em si.
+ */
+
+export interface RefreshedTokens {
+	access_token: string;
+	refresh_token: string;
+	expires: number;
+}
+
+const RESULT_TTL_MS = 10_000;
+const MAX_RESULTS = 1000;
+
+const inFlight = new Map<string, Promise<RefreshedTokens | null>>();
+const results = new Map<string, { tokens: RefreshedTokens; expiresAt: number }>();
+
+const encoder = new TextEncoder();
+
+async function hashToken(token: string): Promise<string> {
+	const digest = await crypto.subtle.digest('SHA-256', encoder.encode(token));
+
+	return Array.from(new Uint8Array(digest), (byte) => byte.toString(16).padStart(2, '0')).join('');
+}
+
+function remember(key: string, tokens: RefreshedTokens): void {
+	const now = Date.now();
+	for (const [cachedKey, cached] of results) {
+		if (cached.expiresAt > now && results.size < MAX_RESULTS) break;
+		results.delete(cachedKey);
+	}
+	results.set(key, { tokens, expiresAt: now + RESULT_TTL_MS });
+}
+
+/**
+ * Executa `refresh` uma única vez por refresh token, compartilhando o resultado entre os requests
+ * concorrentes e os que chegam em até `RESULT_TTL_MS`.
+ */
+export async function coalesceRefresh(
+	refreshToken: string,
+	refresh: (refreshToken: string) => Promise<RefreshedTokens | null>,
+): Promise<RefreshedTokens | null> {
+	const key = await hashToken(refreshToken);
+
+	const cached = results.get(key);
+	if (cached && cached.expiresAt > Date.now()) {
+		return cached.tokens;
+	}
+
+	const current = inFlight.get(key);
+	if (current) {
+		return current;
+	}
+
+	const promise = refresh(refreshToken)
+		.then((tokens) => {
+			if (tokens) remember(key, tokens);
+
+			return tokens;
+		})
+		.finally(() => inFlight.delete(key));
+	inFlight.set(key, promise);
+
+	return promise;
+}
@@ -7,12 +7,14 @@
  * @module server-auth
  */
 
+import { cache } from 'react';
 import { cookies } from 'next/headers';
 import { redirect } from 'next/navigation';
 import { readMe } from '@directus/sdk';
 import { getAuthenticatedClient } from '@/lib/directus/directus';
 import { checkIfUserIsOrganizer } from './permissions';
 import { isOrganizerRole } from './roles';
+import { cachedServerAuth } from './auth-cache';
 import type { Schema } from '@/types/directus-schema';
 
 /**
@@ -63,32 +65,14 @@ export type AuthState = {
 };
 
 /**
- * Get authentication state from server-side cookies
- *
- * @returns AuthState if authenticated, null if not
- *
- * @example
- * ```tsx
- * // In a Server Component
- * export default async function MyPage() {
- *   const auth = await getServerAuth();
- *
- *   if (!auth) {
- *     return <LoginPrompt />;
- *   }
- *
- *   return <div>Welcome {auth.user.email}</div>;
- * }
- * ```
+ * Fields of the user read on every authenticated render (see AuthUser)
  */
-export async function getServerAuth(): Promise<AuthState | null> {
-	const cookieStore = await cookies();
-	const accessToken = cookieStore.get('access_token')?.value;
-
-	if (!accessToken) {
-		return null;
-	}
+const AUTH_USER_FIELDS = ['id', 'email', 'first_name', 'last_name', 'avatar', 'status', { role: ['id', 'name'] }];
 
+/**
+ * Read the user and organizer profile of an access token from Directus
+ */
+async function loadServerAuth(accessToken: string): Promise<AuthState | null> {
 	try {
 		// Create authenticated Directus client
 		const client = getAuthenticatedClient(accessToken);
@@ -96,7 +80,7 @@ export async function getServerAuth(): Promise<AuthState | null> {
 		// Fetch user data with relations
 		const userData = await client.request(
 			readMe({
-				fields: ['*', { role: ['id', 'name'] }],
+				fields: AUTH_USER_FIELDS as any,
 			})
 		);
 
@@ -129,6 +113,40 @@ return null;
 	}
 }
 
+/**
+ * Get authentication state from server-side cookies
+ *
+ * Memoized per request (layouts, pages and server actions of one render share one lookup) and
+ * cached for a few seconds per access token across requests (see auth-cache). Routes that change
+ * the user profile or organizer status call `invalidateServerAuth(userId)`.
+ *
+ * @returns AuthState if authenticated, null if not
+ *
+ * @example
+ * ```tsx
+ * // In a Server Component
+ * export default async function MyPage() {
+ *   const auth = await getServerAuth();
+ *
+ *   if (!auth) {
+ *     return <LoginPrompt />;
+ *   }
+ *
+ *   return <div>Welcome {auth.user.email}</div>;
+ * }
+ * ```
+ */
+export const getServerAuth = cache(async (): Promise<AuthState | null> => {
+	const cookieStore = await cookies();
+	const accessToken = cookieStore.get('access_token')?.value;
+
+	if (!accessToken) {
+		return null;
+	}
+
+	return cachedServerAuth(accessToken, () => loadServerAuth(accessToken));
+});
+
 /**
  * Require authentication - redirects to login if not authenticated
  *
@@ -0,0 +1,51 @@
+/**
+ * Cache, por usuário, do que o middleware precisa além do JWT: e-mail e status de organizador.
+ *
+ * O access token do Directus só carrega `id` e o id da `role`; e-mail, nome da role e o registro em
+ * `organizers` vêm de `/users/me` e `/items/organizers`. Esse resultado fica guardado por
+ * `SESSION_CACHE_TTL_SECONDS` (padrão 60) por instância e só vale enquanto a role do token for a
+ * mesma da leitura: um token novo com outra role força a releitura.
+ */
+
+export interface SessionProfile {
+	userId: string;
+	roleId: string | null;
+	email: string;
+	isOrganizer: boolean;
+	organizerId: string | null;
+}
+
+interface CachedProfile {
+	profile: SessionProfile;
+	expiresAt: number;
+}
+
+const MAX_ENTRIES = 1000;
+const TTL_MS = Math.max(0, Number(process.env.SESSION_CACHE_TTL_SECONDS ?? 60) || 0) * 1000;
+
+const profiles = new Map<string, CachedProfile>();
+
+/**
+ * Perfil em cache do usuário, ou `null` se não houver, tiver expirado ou a role mudou.
+ */
+export function getCachedSessionProfile(userId: string, roleId: string | null): SessionProfile | null {
+	const cached = profiles.get(userId);
+
+	if (!cached || cached.expiresAt <= Date.now() || cached.profile.roleId !== roleId) {
+		return null;
+	}
+
+	return cached.profile;
+}
+
+export function cacheSessionProfile(profile: SessionProfile): void {
+	if (TTL_MS <= 0) {
+		return;
+	}
+
+	profiles.delete(profile.userId);
+	if (profiles.size >= MAX_ENTRIES) {
+		profiles.delete(profiles.keys().next().value as string);
+	}
+	profiles.set(profile.userId, { profile, expiresAt: Date.now() + TTL_MS });
+}
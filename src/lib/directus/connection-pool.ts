@@ -0,0 +1,124 @@
+import http from 'node:http';
+import https from 'node:https';
+import type { Socket } from 'node:net';
+import { Readable } from 'node:stream';
+
+/**
+ * Pool de conexões keep-alive para o Directus (só Node.js; carregado por `transport.ts`).
+ *
+ * Um `Agent` do `node:http` (e um do `node:https`) atende todos os clients do Directus: conexões
+ * ficam abertas entre requests (até `KEEP_ALIVE_MS` ociosas) e o número de sockets por origem é
+ * limitado (`DIRECTUS_POOL_CONNECTIONS`). A criação de conexão é embrulhada para contar cada socket
+ * novo, que é um handshake TCP (e TLS, em https) pago.
+ */
+
+const CONNECTIONS_PER_ORIGIN = Math.max(1, Number(process.env.DIRECTUS_POOL_CONNECTIONS) || 32);
+const KEEP_ALIVE_MS = 30_000;
+
+const counters = {
+	requests: 0,
+	socketsOpened: 0,
+	socketsClosed: 0,
+	connectErrors: 0,
+};
+
+function countingAgent<A extends http.Agent>(agent: A): A {
+	const createConnection = (agent as any).createConnection.bind(agent);
+
+	(agent as any).createConnection = (...args: unknown[]) => {
+		const socket: Socket = createConnection(...args);
+		counters.socketsOpened++;
+		socket.once('error', () => {
+			if (socket.connecting) counters.connectErrors++;
+		});
+		socket.once('close', () => counters.socketsClosed++);
+
+		return socket;
+	};
+
+	return agent;
+}
+
+const agentOptions = {
+	keepAlive: true,
+	maxSockets: CONNECTIONS_PER_ORIGIN,
+	maxFreeSockets: CONNECTIONS_PER_ORIGIN,
+	/** Tempo ocioso até o socket livre ser fechado */
+	timeout: KEEP_ALIVE_MS,
+	scheduling: 'lifo' as const,
+};
+
+const httpAgent = countingAgent(new http.Agent(agentOptions));
+const httpsAgent = countingAgent(new https.Agent(agentOptions));
+
+function toHeaders(incoming: http.IncomingHttpHeaders): Headers {
+	const headers = new Headers();
+	for (const [name, value] of Object.entries(incoming)) {
+		if (Array.isArray(value)) {
+			value.forEach((item) => headers.append(name, item));
+		} else if (value !== undefined) {
+			headers.set(name, value);
+		}
+	}
+
+	return headers;
+}
+
+/**
+ * `fetch` pelo pool. O corpo é normalizado por `Request` (string, JSON, `FormData` de uploads) e
+ * enviado com `Content-Length`; a resposta volta como `Response` com o corpo em stream.
+ */
+export async function pooledFetch(input: RequestInfo | URL, init?: RequestInit): Promise<Response> {
+	counters.requests++;
+
+	const request = new Request(input, init);
+	const url = new URL(request.url);
+	const secure = url.protocol === 'https:';
+	const body = request.body ? Buffer.from(await request.arrayBuffer()) : null;
+	const headers = Object.fromEntries(request.headers);
+	if (body) {
+		headers['content-length'] = String(body.length);
+	}
+
+	return new Promise((resolve, reject) => {
+		const outgoing = (secure ? https : http).request(
+			url,
+			{
+				method: request.method,
+				headers,
+				agent: secure ? httpsAgent : httpAgent,
+				signal: init?.signal ?? undefined,
+			},
+			(incoming) => {
+				const status = incoming.statusCode ?? 502;
+				const empty = request.method === 'HEAD' || status === 204 || status === 304;
+				if (empty) {
+					incoming.resume();
+				}
+
+				resolve(
+					new Response(empty ? null : (Readable.toWeb(incoming) as ReadableStream), {
+						status,
+						statusText: incoming.statusMessage,
+						headers: toHeaders(incoming.headers),
+					}),
+				);
+			},
+		);
+
+		outgoing.once('error', reject);
+		outgoing.end(body ?? undefined);
+	});
+}
+
+/**
+ * Sockets abertos e requests feitos desde o boot. `requestsPerSocket` alto = conexões reaproveitadas.
+ */
+export function getConnectionPoolStats() {
+	return {
+		...counters,
+		openSockets: counters.socketsOpened - counters.socketsClosed,
+		requestsPerSocket: counters.socketsOpened ? Number((counters.requests / counters.socketsOpened).toFixed(2)) : 0,
+		connectionsPerOrigin: CONNECTIONS_PER_ORIGIN,
+	};
+}
@@ -0,0 +1,246 @@
+/**
+ * Cache de conteúdo público do Directus entre requests (páginas, posts, eventos, globals, redirects).
+ *
+ * Cada entrada guarda o resultado de um fetcher com tags:
+ * - `<collection>:<id>` para itens que a entrada contém (`pages:12`, `events:abc`)
+ * - `<collection>` para listas e buscas por filtro, cujo conteúdo muda quando qualquer item da
+ *   collection é criado, publicado ou apagado (`posts` no bloco de posts, `event_tickets` nos
+ *   ingressos de um evento)
+ *
+ * `/api/revalidate` recebe os hooks do Directus e chama `invalidateContentTags` com a collection e as
+ * chaves alteradas, removendo só as entradas afetadas. Como cada instância do Next.js tem o próprio
+ * cache e o Flow só atinge uma delas, nas demais a entrada alterada continua valendo até o fim do
+ * `ttl`; o primeiro request depois disso ainda recebe a versão antiga enquanto a releitura roda.
+ *
+ * Fresca por `ttl`; depois disso, por mais `staleWhileRevalidate`, a entrada ainda é servida enquanto
+ * uma única releitura roda em segundo plano. Erros nunca são guardados: se a releitura falhar, a
+ * versão antiga continua valendo até o fim da janela. Leituras iguais em paralelo compartilham a
+ * mesma promise. O cache é por instância e limitado a `MAX_ENTRIES` (LRU).
+ */
+
+export interface ContentCachePolicy<T> {
+	/** Segundos em que a entrada é servida sem releitura */
+	ttl: number;
+	/** Segundos adicionais em que a entrada vencida é servida enquanto é relida */
+	staleWhileRevalidate: number;
+	/** Tags da entrada, calculadas a partir do resultado */
+	tags: (value: T) => string[];
+}
+
+interface CacheEntry {
+	value: unknown;
+	tags: string[];
+	freshUntil: number;
+	staleUntil: number;
+	refreshing: boolean;
+}
+
+interface CacheCounters {
+	hits: number;
+	staleHits: number;
+	misses: number;
+	bypasses: number;
+	refreshes: number;
+	refreshFailures: number;
+	evictions: number;
+}
+
+const MAX_ENTRIES = 1000;
+/** Tags invalidadas lembradas para descartar leituras que começaram antes da invalidação */
+const MAX_INVALIDATION_LOG = 5000;
+
+/** `CONTENT_CACHE_TTL_SECONDS=0` desliga o cache */
+export const CONTENT_CACHE_TTL_SECONDS = Math.max(0, Number(process.env.CONTENT_CACHE_TTL_SECONDS ?? 60) || 0);
+export const CONTENT_CACHE_STALE_SECONDS = Math.max(0, Number(process.env.CONTENT_CACHE_STALE_SECONDS ?? 600) || 0);
+
+const entries = new Map<string, CacheEntry>();
+const tagIndex = new Map<string, Set<string>>();
+const loading = new Map<string, Promise<unknown>>();
+/** tag → número da invalidação mais recente */
+const invalidatedAt = new Map<string, number>();
+let invalidations = 0;
+
+const counters: CacheCounters = {
+	hits: 0,
+	staleHits: 0,
+	misses: 0,
+	bypasses: 0,
+	refreshes: 0,
+	refreshFailures: 0,
+	evictions: 0,
+};
+
+/** Tags de item para uma lista de ids, ignorando valores vazios */
+export function itemTags(collection: string, ids: Iterable<unknown>): string[] {
+	const tags: string[] = [];
+	for (const id of ids) {
+		if (id !== null && id !== undefined && id !== '') {
+			tags.push(`${collection}:${id}`);
+		}
+	}
+
+	return tags;
+}
+
+function deleteEntry(key: string): void {
+	const entry = entries.get(key);
+	if (!entry) {
+		return;
+	}
+
+	entries.delete(key);
+	for (const tag of entry.tags) {
+		const keys = tagIndex.get(tag);
+		keys?.delete(key);
+		if (keys?.size === 0) {
+			tagIndex.delete(tag);
+		}
+	}
+}
+
+function store(key: string, value: unknown, tags: string[], ttl: number, staleWhileRevalidate: number): void {
+	deleteEntry(key);
+	if (entries.size >= MAX_ENTRIES) {
+		deleteEntry(entries.keys().next().value as string);
+	}
+
+	const now = Date.now();
+	const uniqueTags = [...new Set(tags)];
+	entries.set(key, {
+		value,
+		tags: uniqueTags,
+		freshUntil: now + ttl * 1000,
+		staleUntil: now + (ttl + staleWhileRevalidate) * 1000,
+		refreshing: false,
+	});
+	for (const tag of uniqueTags) {
+		let keys = tagIndex.get(tag);
+		if (!keys) {
+			keys = new Set();
+			tagIndex.set(tag, keys);
+		}
+		keys.add(key);
+	}
+}
+
+/** Lê e guarda, a menos que uma das tags tenha sido invalidada enquanto a leitura estava em voo */
+function load<T>(key: string, policy: ContentCachePolicy<T>, fetcher: () => Promise<T>): Promise<T> {
+	const current = loading.get(key);
+	if (current) {
+		return current as Promise<T>;
+	}
+
+	const startedAt = invalidations;
+	const promise = fetcher()
+		.then((value) => {
+			const tags = policy.tags(value);
+			if (tags.every((tag) => (invalidatedAt.get(tag) ?? 0) <= startedAt)) {
+				store(key, value, tags, policy.ttl, policy.staleWhileRevalidate);
+			}
+
+			return value;
+		})
+		.finally(() => {
+			if (loading.get(key) === promise) {
+				loading.delete(key);
+			}
+		});
+	loading.set(key, promise);
+
+	return promise;
+}
+
+/**
+ * Resultado de `fetcher` em cache sob `key`. Com `bypass` (draft mode, preview com token) ou com o
+ * cache desligado, chama o fetcher direto e não guarda nada.
+ */
+export async function cachedContent<T>(
+	key: string,
+	policy: ContentCachePolicy<T>,
+	fetcher: () => Promise<T>,
+	options?: { bypass?: boolean },
+): Promise<T> {
+	if (options?.bypass || policy.ttl <= 0) {
+		counters.bypasses++;
+
+		return fetcher();
+	}
+
+	const entry = entries.get(key);
+	const now = Date.now();
+
+	if (entry && now < entry.freshUntil) {
+		counters.hits++;
+
+		return entry.value as T;
+	}
+
+	if (entry && now < entry.staleUntil) {
+		counters.staleHits++;
+		if (!entry.refreshing) {
+			entry.refreshing = true;
+			counters.refreshes++;
+			load(key, policy, fetcher).catch((error) => {
+				counters.refreshFailures++;
+				entry.refreshing = false;
+				console.error(`[ContentCache] Error refreshing ${key}:`, error);
+			});
+		}
+
+		return entry.value as T;
+	}
+
+	counters.misses++;
+	deleteEntry(key);
+
+	return load(key, policy, fetcher);
+}
+
+/**
+ * Remove as entradas com qualquer uma das tags. Retorna quantas saíram.
+ */
+export function invalidateContentTags(tags: string[]): number {
+	invalidations++;
+	let evicted = 0;
+
+	for (const tag of new Set(tags)) {
+		invalidatedAt.delete(tag);
+		invalidatedAt.set(tag, invalidations);
+		for (const key of [...(tagIndex.get(tag) ?? [])]) {
+			deleteEntry(key);
+			evicted++;
+		}
+	}
+
+	while (invalidatedAt.size > MAX_INVALIDATION_LOG) {
+		invalidatedAt.delete(invalidatedAt.keys().next().value as string);
+	}
+	counters.evictions += evicted;
+
+	return evicted;
+}
+
+/** Esvazia o cache desta instância */
+export function clearContentCache(): number {
+	const evicted = entries.size;
+	invalidateContentTags([...tagIndex.keys()]);
+	entries.clear();
+
+	return evicted;
+}
+
+/**
+ * Contadores desde o boot. `hitRatio` conta `hits` e `staleHits` como leituras economizadas.
+ */
+export function getContentCacheStats() {
+	const served = counters.hits + counters.staleHits + counters.misses;
+
+	return {
+		...counters,
+		entries: entries.size,
+		tags: tagIndex.size,
+		hitRatio: served ? Number(((counters.hits + counters.staleHits) / served).toFixed(4)) : 0,
+		ttlSeconds: CONTENT_CACHE_TTL_SECONDS,
+		staleSeconds: CONTENT_CACHE_STALE_SECONDS,
+	};
+}
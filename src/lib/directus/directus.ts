@@ -11,28 +11,28 @@ import {
 	authentication,
 } from '@directus/sdk';
 import type { RestClient } from '@directus/sdk';
-import Queue from 'p-queue';
 import type { Schema } from '@/types/directus-schema';
+import { singleFlightFetch } from './single-flight';
+import { scheduleFetch, type DirectusLane } from './scheduler';
 
-// Helper for retrying fetch requests
-const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
-const fetchRetry = async (count: number, ...args: Parameters<typeof fetch>) => {
-	const response = await fetch(...args);
-	if (count > 2 || response.status !== 429) return response;
-	console.warn(`[429] Too Many Requests (Attempt ${count + 1})`);
-	await sleep(500);
-	
-return fetchRetry(count + 1, ...args);
-};
+const directusUrl = process.env.NEXT_PUBLIC_DIRECTUS_URL as string;
 
-// Queue for rate-limited requests
-const queue = new Queue({ intervalCap: 10, interval: 500, carryoverConcurrencyCount: true });
+/**
+ * `fetch` para clients do Directus: leituras vão para `readLane`, escritas para a lane `write`
+ * (ver `scheduler.ts`). GETs idênticos em voo compartilham uma resposta antes de entrar na fila.
+ */
+export function directusFetch(readLane: DirectusLane): typeof fetch {
+	return (input, init) => {
+		const method = (init?.method ?? (input instanceof Request ? input.method : 'GET')).toUpperCase();
+		const lane = method === 'GET' || method === 'HEAD' ? readLane : 'write';
 
-const directusUrl = process.env.NEXT_PUBLIC_DIRECTUS_URL as string;
+		return singleFlightFetch(input, init, () => scheduleFetch(lane, input, init));
+	};
+}
 
 const directus = createDirectus<Schema>(directusUrl, {
 	globals: {
-		fetch: (...args) => queue.add(() => fetchRetry(0, ...args)),
+		fetch: directusFetch('public'),
 	},
 }).with(rest());
 
@@ -48,14 +48,19 @@ export const useDirectus = () => ({
 
 /**
  * Create authenticated client with static token
- * Use for: /api/auth/me and other authenticated routes
+ * Use for: /api/auth/me and other authenticated routes. Exports and other bulk reads pass
+ * `{ lane: 'export' }` so they never hold up regular navigation.
  */
-export function getAuthenticatedClient(token: string) {
+export function getAuthenticatedClient(
+	token: string,
+	clientOptions?: { lane?: Extract<DirectusLane, 'auth' | 'export'> },
+) {
+	const laneFetch = directusFetch(clientOptions?.lane ?? 'auth');
 	const client = createDirectus<Schema>(directusUrl, {
 		globals: {
 			fetch: async (...args) => {
 				const [url, options] = args;
-				const response = await queue.add(() => fetchRetry(0, ...args));
+				const response = await laneFetch(...args);
 				if (response) {
 					if (!response.ok) {
 						const errorText = await response.clone().text();
@@ -82,7 +87,7 @@ return response;
 export function getAuthClient() {
 	return createDirectus<Schema>(directusUrl, {
 		globals: {
-			fetch: (...args) => queue.add(() => fetchRetry(0, ...args)),
+			fetch: (...args) => scheduleFetch('auth', ...args),
 		},
 	})
 		.with(rest())
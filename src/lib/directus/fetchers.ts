@@ -2,369 +2,447 @@ import { BlockPost, PageBlock, Post, Redirect, Schema } from '@/types/directus-s
 import { useDirectus } from './directus';
 import { readItems, aggregate, readItem, readSingleton, withToken, QueryFilter } from '@directus/sdk';
 import { RedirectError } from '../redirects';
+import { cache } from 'react';
+import { CONTENT_CACHE_STALE_SECONDS, CONTENT_CACHE_TTL_SECONDS, cachedContent, itemTags } from './content-cache';
+
+/** Eventos mostram disponibilidade de ingressos: ficam menos tempo no cache */
+const EVENT_TTL_SECONDS = Math.min(CONTENT_CACHE_TTL_SECONDS, 15);
+
+/** Collections aninhadas em cada tipo de bloco, que também invalidam a página */
+const BLOCK_DEPENDENCIES: Record<string, string[]> = {
+	block_gallery: ['block_gallery_items'],
+	block_pricing: ['block_pricing_cards', 'block_button'],
+	block_hero: ['block_button_group', 'block_button'],
+	block_posts: ['posts'],
+	block_events: ['events'],
+	block_form: ['forms', 'form_fields'],
+};
+
+/** Política do cache entre requests (ver `content-cache.ts`) */
+function contentPolicy<T>(tags: (value: T) => string[], ttl = CONTENT_CACHE_TTL_SECONDS) {
+	return { ttl, staleWhileRevalidate: CONTENT_CACHE_STALE_SECONDS, tags };
+}
+
+const pagePolicy = contentPolicy((page: Awaited<ReturnType<typeof loadPageData>>) => {
+	// Permalink ainda sem página: qualquer página criada pode ocupá-lo
+	if (!page) return ['pages'];
+
+	const tags = [`pages:${page.id}`, 'page_blocks'];
+	for (const block of (page.blocks ?? []) as PageBlock[]) {
+		if (typeof block !== 'object' || !block.collection) continue;
+		if (block.item && typeof block.item === 'object') {
+			tags.push(...itemTags(block.collection, [(block.item as { id?: string }).id]));
+		}
+		tags.push(...(BLOCK_DEPENDENCIES[block.collection] ?? []));
+	}
+
+	return tags;
+});
 
 /**
  * Fetches page data by permalink, including all nested blocks and dynamically fetching blog posts if required.
+ *
+ * Memoized per request with React `cache`: `generateMetadata` and the page share one call. Across
+ * requests the result is kept in the content cache; `draft` skips it.
  */
-export const fetchPageData = async (permalink: string, postPage = 1) => {
-	const { directus, readItems } = useDirectus();
+export const fetchPageData = cache(async (permalink: string, postPage = 1, draft = false) => {
 	try {
-		const pageData = await directus.request(
-			readItems('pages', {
-				filter: { permalink: { _eq: permalink } },
-				limit: 1,
-				fields: [
-					'title',
-					'seo',
-					'id',
-					{
-						blocks: [
-							'id',
-							'background',
-							'collection',
-							'item',
-							'sort',
-							'hide_block',
-							{
-								item: {
-									block_richtext: ['id', 'tagline', 'headline', 'content', 'alignment'],
-									block_gallery: ['id', 'tagline', 'headline', { items: ['id', 'directus_file', 'sort'] as any }],
-									block_pricing: [
-										'id',
-										'tagline',
-										'headline',
-										{
-											pricing_cards: [
-												'id',
-												'title',
-												'description',
-												'price',
-												'badge',
-												'features',
-												'is_highlighted',
-												{
-													button: [
-														'id',
-														'label',
-														'variant',
-														'url',
-														'type',
-														{ page: ['permalink'] },
-														{ post: ['slug'] },
-													],
-												},
-											],
-										},
-									],
-									block_hero: [
-										'id',
-										'tagline',
-										'headline',
-										'description',
-										'layout',
-										'image',
-										{
-											button_group: [
-												'id',
-												{
-													buttons: [
-														'id',
-														'label',
-														'variant',
-														'url',
-														'type',
-														{ page: ['permalink'] },
-														{ post: ['slug'] },
-													],
-												},
-											],
-										},
-									],
-									block_posts: ['id', 'tagline', 'headline', 'collection', 'limit'],
-									block_events: [
-										'id',
-										'headline',
-										'description',
-										'filter_by_category',
-										'filter_featured',
-										'max_items',
-										'show_past_events',
-									],
-									block_form: [
-										'id',
-										'tagline',
-										'headline',
-										{
-											form: [
-												'id',
-												'title',
-												'submit_label',
-												'success_message',
-												'on_success',
-												'success_redirect_url',
-												'is_active',
-												{
-													fields: [
-														'id',
-														'name',
-														'type',
-														'label',
-														'placeholder',
-														'help',
-														'validation',
-														'width',
-														'choices',
-														'required',
-														'sort',
-													],
-												},
-											],
-										},
-									],
-								},
-							},
-						],
-					},
-				],
-				deep: {
-					blocks: { _sort: ['sort'], _filter: { hide_block: { _neq: true } } },
-				},
-			}),
+		const page = await cachedContent(
+			`page:${permalink}:${postPage}`,
+			pagePolicy,
+			() => loadPageData(permalink, postPage),
+			{ bypass: draft },
 		);
 
-		if (!pageData.length) {
+		if (!page) {
 			throw new Error('Page not found');
 		}
 
-		const page = pageData[0];
-
-		if (Array.isArray(page.blocks)) {
-			for (const block of page.blocks as PageBlock[]) {
-				if (
-					block.collection === 'block_posts' &&
-					typeof block.item === 'object' &&
-					(block.item as BlockPost).collection === 'posts'
-				) {
-					const limit = (block.item as BlockPost).limit ?? 6;
-					const posts = await directus.request<Post[]>(
-						readItems('posts', {
-							fields: ['id', 'title', 'description', 'slug', 'image', 'status', 'published_at'],
-							filter: { status: { _eq: 'published' } },
-							sort: ['-published_at'],
-							limit,
-							page: postPage,
-						}),
-					);
-
-					(block.item as BlockPost & { posts: Post[] }).posts = posts;
-				}
-
-				// Fetch events dynamically for block_events
-				if (block.collection === 'block_events' && typeof block.item === 'object' && block.item !== null) {
-					try {
-						const blockItem = block.item as any;
-						const limit = blockItem.max_items ?? 10;
-						const filterFeatured = blockItem.filter_featured ?? false;
-						const showPastEvents = blockItem.show_past_events ?? false;
-						const filterByCategory = blockItem.filter_by_category;
-
-						const filter: any = { status: { _eq: 'published' } };
-
-						if (filterFeatured) {
-							filter.featured = { _eq: true };
-						}
-
-						if (!showPastEvents) {
-							filter.start_date = { _gte: '$NOW' };
-						}
-
-						if (filterByCategory) {
-							filter.category_id = { _eq: filterByCategory };
-						}
-
-						const events = await directus.request(
-							readItems('events', {
-								fields: [
-									'id',
-									'title',
-									'slug',
-									'short_description',
-									'cover_image',
-									'start_date',
-									'end_date',
-									'location_name',
-									'location_address',
-									'event_type',
-									'is_free',
-									'featured',
-								],
-								filter,
-								sort: ['start_date'],
-								limit,
-							}),
-						);
-
-						(block.item as any).events = events;
-					} catch (eventError) {
-						console.error('🎯 Fetcher - Error fetching events:', eventError);
-						console.error('🎯 Fetcher - Error details:', JSON.stringify(eventError, null, 2));
-						// Set empty array to prevent component errors
-						(block.item as any).events = [];
-					}
-				}
-			}
-		}
-
 		return page;
 	} catch (error) {
 		console.error('Error fetching page data:', error);
 		console.error('Error details:', JSON.stringify(error, null, 2));
 		throw error;
 	}
-};
+});
+
+/** Consulta de dados dinâmicos de um bloco (`block_posts`, `block_events`) */
+interface BlockDataPlan {
+	collection: 'posts' | 'events';
+	query: Record<string, unknown>;
+	/** Campo do `block.item` que recebe o resultado */
+	field: 'posts' | 'events';
+	/** Se a consulta falhar, o bloco fica vazio em vez de derrubar a página */
+	optional: boolean;
+}
 
-/**
- * Fetches a single event by slug
- */
-export const fetchEventBySlug = async (slug: string) => {
-	const { directus } = useDirectus();
+function planBlockData(block: PageBlock, postPage: number): BlockDataPlan | null {
+	if (typeof block.item !== 'object' || block.item === null) return null;
 
-	try {
-		const events = await directus.request(
-			readItems('events', {
-				filter: { slug: { _eq: slug }, status: { _eq: 'published' } },
+	if (block.collection === 'block_posts' && (block.item as BlockPost).collection === 'posts') {
+		return {
+			collection: 'posts',
+			field: 'posts',
+			optional: false,
+			query: {
+				fields: ['id', 'title', 'description', 'slug', 'image', 'status', 'published_at'],
+				filter: { status: { _eq: 'published' } },
+				sort: ['-published_at'],
+				limit: (block.item as BlockPost).limit ?? 6,
+				page: postPage,
+			},
+		};
+	}
+
+	if (block.collection === 'block_events') {
+		const blockItem = block.item as any;
+		const filter: any = { status: { _eq: 'published' } };
+
+		if (blockItem.filter_featured ?? false) {
+			filter.featured = { _eq: true };
+		}
+
+		if (!(blockItem.show_past_events ?? false)) {
+			filter.start_date = { _gte: '$NOW' };
+		}
+
+		if (blockItem.filter_by_category) {
+			filter.category_id = { _eq: blockItem.filter_by_category };
+		}
+
+		return {
+			collection: 'events',
+			field: 'events',
+			optional: true,
+			query: {
 				fields: [
 					'id',
 					'title',
 					'slug',
-					'description',
 					'short_description',
 					'cover_image',
 					'start_date',
 					'end_date',
 					'location_name',
 					'location_address',
-					'online_url',
 					'event_type',
-					'max_attendees',
-					'registration_start',
-					'registration_end',
 					'is_free',
 					'featured',
-					'tags',
-					{
-						organizer_id: [
-							'id',
-							'name',
-							'email',
-							'phone',
-							'description',
-							'logo',
-							'website',
-							{ user_id: ['first_name', 'last_name'] }
-						]
-					},
-					{ category_id: ['id', 'name', 'slug', 'icon', 'color', 'description'] },
-					{
-						tickets: [
-							'id',
-							'title',
-							'description',
-							'status',
-							'quantity',
-							'quantity_sold',
-							'price',
-							'buyer_price',
-							'service_fee_type',
-							'sale_start_date',
-							'sale_end_date',
-							'min_quantity_per_purchase',
-							'max_quantity_per_purchase',
-							'visibility',
-							'sort',
-							'allow_installments',
-							'max_installments',
-							'min_amount_for_installments',
-						]
-					},
 				],
-				limit: 1,
-				deep: {
-					tickets: {
-						_sort: ['sort'],
-						_filter: {
-							status: { _eq: 'active' },
-							visibility: { _eq: 'public' }
-						}
-					}
-				}
-			}),
-		);
+				filter,
+				sort: ['start_date'],
+				limit: blockItem.max_items ?? 10,
+			},
+		};
+	}
+
+	return null;
+}
+
+/**
+ * Fills the dynamic blocks of a page. Every block's query is planned first; identical queries (two
+ * event blocks with the same settings) run once, and all of them run concurrently, so the page waits
+ * for the slowest block instead of the sum of all blocks.
+ */
+async function hydrateBlocks(
+	directus: ReturnType<typeof useDirectus>['directus'],
+	blocks: PageBlock[],
+	postPage: number,
+) {
+	const requests = new Map<string, Promise<unknown[]>>();
+
+	const planned = blocks.flatMap((block) => {
+		const plan = planBlockData(block, postPage);
+		if (!plan) return [];
+
+		const key = `${plan.collection}:${JSON.stringify(plan.query)}`;
+		let request = requests.get(key);
+		if (!request) {
+			request = directus.request<unknown[]>((readItems as any)(plan.collection, plan.query));
+			requests.set(key, request);
+		}
+
+		return [{ block, plan, request }];
+	});
+
+	await Promise.all(
+		planned.map(async ({ block, plan, request }) => {
+			try {
+				(block.item as any)[plan.field] = await request;
+			} catch (error) {
+				if (!plan.optional) throw error;
+
+				console.error(`🎯 Fetcher - Error fetching ${plan.collection}:`, error);
+				console.error('🎯 Fetcher - Error details:', JSON.stringify(error, null, 2));
+				// Set empty array to prevent component errors
+				(block.item as any)[plan.field] = [];
+			}
+		}),
+	);
+}
+
+/**
+ * Page by permalink with its blocks hydrated, or `null` when no page has that permalink.
+ */
+async function loadPageData(permalink: string, postPage: number) {
+	const { directus, readItems } = useDirectus();
+	const pageData = await directus.request(
+		readItems('pages', {
+			filter: { permalink: { _eq: permalink } },
+			limit: 1,
+			fields: [
+				'title',
+				'seo',
+				'id',
+				{
+					blocks: [
+						'id',
+						'background',
+						'collection',
+						'item',
+						'sort',
+						'hide_block',
+						{
+							item: {
+								block_richtext: ['id', 'tagline', 'headline', 'content', 'alignment'],
+								block_gallery: ['id', 'tagline', 'headline', { items: ['id', 'directus_file', 'sort'] as any }],
+								block_pricing: [
+									'id',
+									'tagline',
+									'headline',
+									{
+										pricing_cards: [
+											'id',
+											'title',
+											'description',
+											'price',
+											'badge',
+											'features',
+											'is_highlighted',
+											{
+												button: [
+													'id',
+													'label',
+													'variant',
+													'url',
+													'type',
+													{ page: ['permalink'] },
+													{ post: ['slug'] },
+												],
+											},
+										],
+									},
+								],
+								block_hero: [
+									'id',
+									'tagline',
+									'headline',
+									'description',
+									'layout',
+									'image',
+									{
+										button_group: [
+											'id',
+											{
+												buttons: [
+													'id',
+													'label',
+													'variant',
+													'url',
+													'type',
+													{ page: ['permalink'] },
+													{ post: ['slug'] },
+												],
+											},
+										],
+									},
+								],
+								block_posts: ['id', 'tagline', 'headline', 'collection', 'limit'],
+								block_events: [
+									'id',
+									'headline',
+									'description',
+									'filter_by_category',
+									'filter_featured',
+									'max_items',
+									'show_past_events',
+								],
+								block_form: [
+									'id',
+									'tagline',
+									'headline',
+									{
+										form: [
+											'id',
+											'title',
+											'submit_label',
+											'success_message',
+											'on_success',
+											'success_redirect_url',
+											'is_active',
+											{
+												fields: [
+													'id',
+													'name',
+													'type',
+													'label',
+													'placeholder',
+													'help',
+													'validation',
+													'width',
+													'choices',
+													'required',
+													'sort',
+												],
+											},
+										],
+									},
+								],
+							},
+						},
+					],
+				},
+			],
+			deep: {
+				blocks: { _sort: ['sort'], _filter: { hide_block: { _neq: true } } },
+			},
+		}),
+	);
 
-		if (!events.length) {
+	if (!pageData.length) {
+		return null;
+	}
+
+	const page = pageData[0];
+
+	if (Array.isArray(page.blocks)) {
+		await hydrateBlocks(directus, page.blocks as PageBlock[], postPage);
+	}
+
+	return page;
+}
+
+const eventPolicy = contentPolicy((event: Awaited<ReturnType<typeof loadEventBySlug>>) => {
+	if (!event) return ['events'];
+
+	const organizer = event.organizer_id as { id?: string } | null;
+	const category = event.category_id as { id?: string } | null;
+
+	return [
+		`events:${event.id}`,
+		// Lista filtrada por status/visibilidade: qualquer ingresso alterado pode entrar ou sair
+		'event_tickets',
+		...itemTags('organizers', [organizer?.id]),
+		...itemTags('event_categories', [category?.id]),
+	];
+}, EVENT_TTL_SECONDS);
+
+/**
+ * Fetches a single event by slug (memoized per request, like `fetchPageData`, and kept in the
+ * content cache across requests unless `draft`)
+ */
+export const fetchEventBySlug = cache(async (slug: string, draft = false) => {
+	try {
+		const event = await cachedContent(`event:${slug}`, eventPolicy, () => loadEventBySlug(slug), { bypass: draft });
+
+		if (!event) {
 			throw new Error('Event not found');
 		}
 
-		return events[0];
+		return event;
 	} catch (error) {
 		console.error('Error fetching event:', error);
 		throw new Error('Failed to fetch event');
 	}
-};
+});
 
-/**
- * Fetches global site data, header navigation, and footer navigation.
- */
-export const fetchSiteData = async () => {
+async function loadEventBySlug(slug: string) {
 	const { directus } = useDirectus();
 
-	try {
-		const [globals, headerNavigation, footerNavigation] = await Promise.all([
-			directus.request(
-				readSingleton('globals', {
-					fields: ['id', 'title', 'description', 'logo', 'logo_dark_mode', 'social_links', 'accent_color', 'favicon'],
-				}),
-			),
-			directus.request(
-				readItem('navigation', 'main', {
-					fields: [
+	const events = await directus.request(
+		readItems('events', {
+			filter: { slug: { _eq: slug }, status: { _eq: 'published' } },
+			fields: [
+				'id',
+				'title',
+				'slug',
+				'description',
+				'short_description',
+				'cover_image',
+				'start_date',
+				'end_date',
+				'location_name',
+				'location_address',
+				'online_url',
+				'event_type',
+				'max_attendees',
+				'registration_start',
+				'registration_end',
+				'is_free',
+				'featured',
+				'tags',
+				{
+					organizer_id: [
 						'id',
-						'title',
-						{
-							items: [
-								'id',
-								'title',
-								{
-									page: ['permalink'],
-									children: ['id', 'title', 'url', { page: ['permalink'] }],
-								},
-							],
-						},
-					],
-					deep: { items: { _sort: ['sort'] } },
-				}),
-			),
-			directus.request(
-				readItem('navigation', 'footer', {
-					fields: [
+						'name',
+						'email',
+						'phone',
+						'description',
+						'logo',
+						'website',
+						{ user_id: ['first_name', 'last_name'] }
+					]
+				},
+				{ category_id: ['id', 'name', 'slug', 'icon', 'color', 'description'] },
+				{
+					tickets: [
 						'id',
 						'title',
-						{
-							items: [
-								'id',
-								'title',
-								{
-									page: ['permalink'],
-									children: ['id', 'title', 'url', { page: ['permalink'] }],
-								},
-							],
-						},
-					],
-				}),
-			),
-		]);
+						'description',
+						'status',
+						'quantity',
+						'quantity_sold',
+						'price',
+						'buyer_price',
+						'service_fee_type',
+						'sale_start_date',
+						'sale_end_date',
+						'min_quantity_per_purchase',
+						'max_quantity_per_purchase',
+						'visibility',
+						'sort',
+						'allow_installments',
+						'max_installments',
+						'min_amount_for_installments',
+					]
+				},
+			],
+			limit: 1,
+			deep: {
+				tickets: {
+					_sort: ['sort'],
+					_filter: {
+						status: { _eq: 'active' },
+						visibility: { _eq: 'public' }
+					}
+				}
+			}
+		}),
+	);
+
+	return events[0] ?? null;
+}
+
+// Menus mostram o permalink das páginas, por isso `pages`
+const sitePolicy = contentPolicy(() => ['globals', 'navigation', 'navigation_items', 'pages']);
 
-		return { globals, headerNavigation, footerNavigation };
+/**
+ * Fetches global site data, header navigation, and footer navigation (memoized per request and kept
+ * in the content cache across requests).
+ */
+export const fetchSiteData = cache(async () => {
+	try {
+		return await cachedContent('site', sitePolicy, loadSiteData);
 	} catch (error) {
 		console.error('Error fetching site data:', error);
 		// Return minimal site data if there's a permission error
@@ -385,10 +463,65 @@ export const fetchSiteData = async () => {
 			footerNavigation: null,
 		};
 	}
-};
+});
+
+async function loadSiteData() {
+	const { directus } = useDirectus();
+
+	const [globals, headerNavigation, footerNavigation] = await Promise.all([
+		directus.request(
+			readSingleton('globals', {
+				fields: ['id', 'title', 'description', 'logo', 'logo_dark_mode', 'social_links', 'accent_color', 'favicon'],
+			}),
+		),
+		directus.request(
+			readItem('navigation', 'main', {
+				fields: [
+					'id',
+					'title',
+					{
+						items: [
+							'id',
+							'title',
+							{
+								page: ['permalink'],
+								children: ['id', 'title', 'url', { page: ['permalink'] }],
+							},
+						],
+					},
+				],
+				deep: { items: { _sort: ['sort'] } },
+			}),
+		),
+		directus.request(
+			readItem('navigation', 'footer', {
+				fields: [
+					'id',
+					'title',
+					{
+						items: [
+							'id',
+							'title',
+							{
+								page: ['permalink'],
+								children: ['id', 'title', 'url', { page: ['permalink'] }],
+							},
+						],
+					},
+				],
+			}),
+		),
+	]);
+
+	return { globals, headerNavigation, footerNavigation };
+}
+
+const postPolicy = contentPolicy((posts: Post[]) => (posts.length ? itemTags('posts', [posts[0].id]) : ['posts']));
+const relatedPostsPolicy = contentPolicy(() => ['posts']);
 
 /**
- * Fetches a single blog post by slug and related blog posts excluding the given ID. Handles live preview mode.
+ * Fetches a single blog post by slug and related blog posts excluding the given ID. Handles live preview mode
+ * (draft requests skip the content cache).
  */
 export const fetchPostBySlug = async (
 	slug: string,
@@ -433,8 +566,10 @@ export const fetchPostBySlug = async (
 		}
 
 		const [posts, relatedPosts] = await Promise.all([
-			directus.request<Post[]>(postRequest),
-			directus.request<Post[]>(relatedRequest),
+			cachedContent(`post:${slug}`, postPolicy, () => directus.request<Post[]>(postRequest), { bypass: draft }),
+			cachedContent(`post-related:${slug}`, relatedPostsPolicy, () => directus.request<Post[]>(relatedRequest), {
+				bypass: draft,
+			}),
 		]);
 
 		const post: Post | null = posts.length > 0 ? (posts[0] as Post) : null;
@@ -491,23 +626,27 @@ export const fetchTotalPostCount = async (): Promise<number> => {
 	}
 };
 
+const redirectsPolicy = contentPolicy(() => ['redirects']);
+
 export async function fetchRedirects(): Promise<Pick<Redirect, 'url_from' | 'url_to' | 'response_code'>[]> {
 	try {
 		const { directus } = useDirectus();
-		const response = await directus.request(
-			readItems('redirects', {
-				filter: {
-					_and: [
-						{
-							url_from: { _nnull: true },
-						},
-						{
-							url_to: { _nnull: true },
-						},
-					],
-				},
-				fields: ['url_from', 'url_to', 'response_code'],
-			}),
+		const response = await cachedContent('redirects', redirectsPolicy, () =>
+			directus.request(
+				readItems('redirects', {
+					filter: {
+						_and: [
+							{
+								url_from: { _nnull: true },
+							},
+							{
+								url_to: { _nnull: true },
+							},
+						],
+					},
+					fields: ['url_from', 'url_to', 'response_code'],
+				}),
+			),
 		);
 
 		return response || [];
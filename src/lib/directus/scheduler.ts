@@ -0,0 +1,291 @@
+import { directusTransport } from './transport';
+
+/**
+ * Escalonador das chamadas ao Directus, com uma fila (lane) por tipo de tráfego.
+ *
+ * | Lane      | Prioridade | Quem usa                                               |
+ * | --------- | ---------- | ------------------------------------------------------ |
+ * | `write`   | 0          | escritas de qualquer client, webhooks do Stripe        |
+ * | `public`  | 1          | leituras anônimas (`useDirectus`: páginas, eventos)    |
+ * | `auth`    | 2          | leituras com token de usuário, login/refresh           |
+ * | `export`  | 3          | exportações e leituras em lote de organizadores        |
+ *
+ * Cada lane tem o próprio limite de concorrência, ajustado em AIMD: sobe 1 a cada `limit` respostas
+ * rápidas enquanto a lane está cheia, cai pela metade num 429 e em 20% quando a latência média passa
+ * do dobro da linha de base. Um teto global (`DIRECTUS_MAX_CONCURRENCY`) é dividido por prioridade,
+ * mas toda lane sempre pode ter `min` chamadas em voo, então uma exportação pesada nunca trava as
+ * páginas públicas e também nunca fica parada para sempre.
+ *
+ * 429 é repetido com backoff exponencial com jitter, respeitando `Retry-After` (que também pausa
+ * todas as lanes: o limite do Directus é por IP, não por lane). As chamadas saem por
+ * `directusTransport` (pool keep-alive no Node.js, `fetch` global no middleware).
+ */
+
+export type DirectusLane = 'write' | 'public' | 'auth' | 'export';
+
+interface LaneConfig {
+	priority: number;
+	min: number;
+	max: number;
+	initial: number;
+}
+
+interface LaneState extends LaneConfig {
+	name: DirectusLane;
+	limit: number;
+	inFlight: number;
+	waiting: Array<{ grant: () => void; enqueuedAt: number }>;
+	/** Média móvel da latência e a menor latência recente (linha de base) */
+	latencyMs: number;
+	baselineMs: number;
+	lastDecreaseAt: number;
+	waits: number[];
+	counters: {
+		completed: number;
+		throttled: number;
+		retries: number;
+		errors: number;
+		maxQueued: number;
+	};
+}
+
+const LANES: Record<DirectusLane, LaneConfig> = {
+	write: { priority: 0, min: 2, max: 16, initial: 4 },
+	public: { priority: 1, min: 2, max: 32, initial: 8 },
+	auth: { priority: 2, min: 1, max: 16, initial: 4 },
+	export: { priority: 3, min: 1, max: 4, initial: 1 },
+};
+
+const MAX_IN_FLIGHT = Math.max(4, Number(process.env.DIRECTUS_MAX_CONCURRENCY) || 32);
+const MAX_RETRIES = 3;
+const BACKOFF_BASE_MS = 250;
+const BACKOFF_CAP_MS = 4_000;
+/** `Retry-After` maior que isso devolve o 429 em vez de segurar o request */
+const MAX_RETRY_AFTER_MS = 10_000;
+const DECREASE_ON_THROTTLE = 0.5;
+const DECREASE_ON_LATENCY = 0.8;
+/** Latência média acima de `baseline * TOLERANCE + SLACK` conta como sobrecarga */
+const LATENCY_TOLERANCE = 2;
+const LATENCY_SLACK_MS = 50;
+const EWMA_WEIGHT = 0.2;
+/** Quanto a linha de base sobe por resposta em direção à média (esquece mínimos antigos) */
+const BASELINE_DRIFT = 0.01;
+const WAIT_SAMPLES = 256;
+
+const lanes = new Map<DirectusLane, LaneState>(
+	(Object.keys(LANES) as DirectusLane[]).map((name) => [
+		name,
+		{
+			...LANES[name],
+			name,
+			limit: LANES[name].initial,
+			inFlight: 0,
+			waiting: [],
+			latencyMs: 0,
+			baselineMs: 0,
+			lastDecreaseAt: 0,
+			waits: [],
+			counters: { completed: 0, throttled: 0, retries: 0, errors: 0, maxQueued: 0 },
+		},
+	]),
+);
+const byPriority = [...lanes.values()].sort((a, b) => a.priority - b.priority);
+
+let totalInFlight = 0;
+let pausedUntil = 0;
+let resumeTimer: ReturnType<typeof setTimeout> | null = null;
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+function canStart(lane: LaneState): boolean {
+	if (lane.inFlight >= Math.floor(lane.limit)) {
+		return false;
+	}
+
+	return totalInFlight < MAX_IN_FLIGHT || lane.inFlight < lane.min;
+}
+
+function dispatch(): void {
+	const now = Date.now();
+	if (now < pausedUntil) {
+		resumeTimer ??= setTimeout(() => {
+			resumeTimer = null;
+			dispatch();
+		}, pausedUntil - now);
+
+		return;
+	}
+
+	for (const lane of byPriority) {
+		while (lane.waiting.length > 0 && canStart(lane)) {
+			const next = lane.waiting.shift() as LaneState['waiting'][number];
+			lane.inFlight++;
+			totalInFlight++;
+			recordWait(lane, now - next.enqueuedAt);
+			next.grant();
+		}
+	}
+}
+
+function recordWait(lane: LaneState, waitMs: number): void {
+	lane.waits.push(waitMs);
+	if (lane.waits.length > WAIT_SAMPLES) {
+		lane.waits.shift();
+	}
+}
+
+function acquire(lane: LaneState): Promise<void> {
+	return new Promise((grant) => {
+		lane.waiting.push({ grant, enqueuedAt: Date.now() });
+		lane.counters.maxQueued = Math.max(lane.counters.maxQueued, lane.waiting.length);
+		dispatch();
+	});
+}
+
+function release(lane: LaneState): void {
+	lane.inFlight--;
+	totalInFlight--;
+	dispatch();
+}
+
+/** AIMD: corta no 429 ou na latência alta, cresce devagar enquanto a lane está cheia */
+function adapt(lane: LaneState, latencyMs: number, throttled: boolean): void {
+	const now = Date.now();
+
+	if (throttled) {
+		lane.limit = Math.max(lane.min, lane.limit * DECREASE_ON_THROTTLE);
+		lane.lastDecreaseAt = now;
+
+		return;
+	}
+
+	lane.latencyMs = lane.latencyMs ? lane.latencyMs + (latencyMs - lane.latencyMs) * EWMA_WEIGHT : latencyMs;
+	lane.baselineMs = lane.baselineMs
+		? Math.min(latencyMs, lane.baselineMs + (lane.latencyMs - lane.baselineMs) * BASELINE_DRIFT)
+		: latencyMs;
+
+	const overloaded = lane.latencyMs > lane.baselineMs * LATENCY_TOLERANCE + LATENCY_SLACK_MS;
+	if (overloaded) {
+		// No máximo um corte por "volta" de latência, para uma rajada lenta não zerar o limite
+		if (now - lane.lastDecreaseAt > lane.latencyMs) {
+			lane.limit = Math.max(lane.min, lane.limit * DECREASE_ON_LATENCY);
+			lane.lastDecreaseAt = now;
+		}
+	} else if (lane.waiting.length > 0 || lane.inFlight >= Math.floor(lane.limit)) {
+		lane.limit = Math.min(lane.max, lane.limit + 1 / lane.limit);
+	}
+}
+
+/** `Retry-After` em segundos ou data HTTP; `null` sem header válido */
+function retryAfterMs(response: Response): number | null {
+	const header = response.headers.get('Retry-After');
+	if (!header) {
+		return null;
+	}
+
+	const seconds = Number(header);
+	if (Number.isFinite(seconds)) {
+		return Math.max(0, seconds * 1000);
+	}
+
+	const date = Date.parse(header);
+
+	return Number.isNaN(date) ? null : Math.max(0, date - Date.now());
+}
+
+/** Backoff exponencial com "full jitter" */
+function backoffMs(attempt: number): number {
+	return Math.max(50, Math.random() * Math.min(BACKOFF_CAP_MS, BACKOFF_BASE_MS * 2 ** attempt));
+}
+
+/**
+ * `fetch` pela lane: espera uma vaga, mede a latência para ajustar o limite e repete 429.
+ */
+export async function scheduleFetch(
+	laneName: DirectusLane,
+	input: RequestInfo | URL,
+	init?: RequestInit,
+): Promise<Response> {
+	const lane = lanes.get(laneName) as LaneState;
+
+	for (let attempt = 0; ; attempt++) {
+		await acquire(lane);
+		const started = Date.now();
+		let response: Response;
+
+		try {
+			response = await directusTransport(input, init);
+		} catch (error) {
+			lane.counters.errors++;
+			release(lane);
+			throw error;
+		}
+
+		const throttled = response.status === 429;
+		adapt(lane, Date.now() - started, throttled);
+		release(lane);
+
+		if (!throttled) {
+			lane.counters.completed++;
+
+			return response;
+		}
+
+		lane.counters.throttled++;
+		const retryAfter = retryAfterMs(response);
+		if (attempt >= MAX_RETRIES || (retryAfter !== null && retryAfter > MAX_RETRY_AFTER_MS)) {
+			return response;
+		}
+
+		if (retryAfter !== null) {
+			pausedUntil = Math.max(pausedUntil, Date.now() + retryAfter);
+		}
+
+		const delay = retryAfter !== null ? retryAfter + Math.random() * 100 : backoffMs(attempt);
+		console.warn(
+			`[429] Too Many Requests on ${laneName} lane (attempt ${attempt + 1}), retrying in ${Math.round(delay)}ms`,
+		);
+		lane.counters.retries++;
+		await response.body?.cancel();
+		await sleep(delay);
+	}
+}
+
+function average(values: number[]): number {
+	return values.length ? values.reduce((sum, value) => sum + value, 0) / values.length : 0;
+}
+
+function percentile(values: number[], pct: number): number {
+	if (values.length === 0) {
+		return 0;
+	}
+	const sorted = [...values].sort((a, b) => a - b);
+
+	return sorted[Math.max(0, Math.ceil((pct / 100) * sorted.length) - 1)];
+}
+
+/**
+ * Estado de cada lane: limite atual, fila, espera (últimas 256 vagas) e contadores desde o boot.
+ */
+export function getDirectusSchedulerStats() {
+	return {
+		inFlight: totalInFlight,
+		maxInFlight: MAX_IN_FLIGHT,
+		pausedForMs: Math.max(0, pausedUntil - Date.now()),
+		lanes: Object.fromEntries(
+			byPriority.map((lane) => [
+				lane.name,
+				{
+					priority: lane.priority,
+					limit: Number(lane.limit.toFixed(2)),
+					inFlight: lane.inFlight,
+					queued: lane.waiting.length,
+					latencyMs: Math.round(lane.latencyMs),
+					baselineMs: Math.round(lane.baselineMs),
+					waitMs: { avg: Math.round(average(lane.waits)), p95: percentile(lane.waits, 95) },
+					...lane.counters,
+				},
+			]),
+		),
+	};
+}
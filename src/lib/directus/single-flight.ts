@@ -0,0 +1,133 @@
+/**
+ * Coalescência de leituras ao Directus (single-flight).
+ *
+ * Renders simultâneos da mesma página pedem as mesmas coisas ao mesmo tempo (`fetchSiteData`,
+ * `fetchPageData`, `fetchEventBySlug`...). Em vez de cada um ocupar uma vaga no escalonador e fazer
+ * o próprio round trip, o primeiro GET sai para o Directus e os idênticos que chegam enquanto ele
+ * está em voo esperam a mesma resposta. Cada chamador recebe um `clone()` da Response, então o corpo
+ * é lido de forma independente.
+ *
+ * A chave é a string inteira (método, collection/rota, query canônica, token): parâmetros em
+ * qualquer ordem e JSON com chaves em qualquer ordem dão a mesma chave, e tokens diferentes nunca
+ * compartilham resposta. Não há hash no meio, então uma colisão não pode entregar a resposta
+ * autenticada de um usuário a outro. Nada é guardado depois que a resposta chega; isto não é um cache.
+ */
+
+interface RouteCounters {
+	hits: number;
+	misses: number;
+}
+
+const inFlight = new Map<string, Promise<Response>>();
+const counters = new Map<string, RouteCounters>();
+const totals: RouteCounters = { hits: 0, misses: 0 };
+
+/** JSON com chaves ordenadas, para `filter`/`deep` equivalentes gerarem a mesma string */
+function canonicalJson(value: unknown): string {
+	if (Array.isArray(value)) {
+		return `[${value.map(canonicalJson).join(',')}]`;
+	}
+	if (value && typeof value === 'object') {
+		const entries = Object.keys(value as Record<string, unknown>)
+			.sort()
+			.map((key) => `${JSON.stringify(key)}:${canonicalJson((value as Record<string, unknown>)[key])}`);
+
+		return `{${entries.join(',')}}`;
+	}
+
+	return JSON.stringify(value) ?? 'null';
+}
+
+function canonicalParam(value: string): string {
+	if (value.startsWith('{') || value.startsWith('[')) {
+		try {
+			return canonicalJson(JSON.parse(value));
+		} catch {
+			return value;
+		}
+	}
+
+	return value;
+}
+
+/** `items/events`, `items/events/:id`, `users/me`... para os contadores por rota */
+function routeOf(pathname: string): string {
+	const parts = pathname.split('/').filter(Boolean);
+	if (parts[0] === 'items' && parts.length > 2) {
+		return `items/${parts[1]}/:id`;
+	}
+
+	return parts.join('/');
+}
+
+/** O token como veio (header ou `access_token`); fica na chave só enquanto o pedido está em voo */
+function tokenScope(url: URL, headers: Headers): string {
+	const token = headers.get('Authorization') ?? url.searchParams.get('access_token');
+
+	return token ? `token:${token}` : 'public';
+}
+
+function count(route: string, field: keyof RouteCounters): void {
+	const routeCounters = counters.get(route) ?? { hits: 0, misses: 0 };
+	routeCounters[field]++;
+	counters.set(route, routeCounters);
+	totals[field]++;
+}
+
+/**
+ * Faz o GET através de `doFetch`, compartilhando a resposta com chamadas idênticas em voo.
+ * Outros métodos, e pedidos com AbortSignal (que não podem ser cancelados por outro chamador),
+ * passam direto.
+ */
+export async function singleFlightFetch(
+	input: RequestInfo | URL,
+	init: RequestInit | undefined,
+	doFetch: () => Promise<Response>,
+): Promise<Response> {
+	const method = (init?.method ?? (input instanceof Request ? input.method : 'GET')).toUpperCase();
+	if (method !== 'GET' || init?.signal) {
+		return doFetch();
+	}
+
+	const url = new URL(input instanceof Request ? input.url : input.toString());
+	const headers = new Headers(input instanceof Request ? input.headers : init?.headers);
+	const params = [...url.searchParams.entries()]
+		.filter(([name]) => name !== 'access_token')
+		.map(([name, value]) => `${name}=${canonicalParam(value)}`)
+		.sort();
+	const route = routeOf(url.pathname);
+	const scope = tokenScope(url, headers);
+	const key = `${method} ${url.origin}${url.pathname}?${params.join('&')}|${scope}|${init?.cache ?? ''}`;
+
+	let shared = inFlight.get(key);
+	if (shared) {
+		count(route, 'hits');
+	} else {
+		count(route, 'misses');
+		shared = doFetch();
+		inFlight.set(key, shared);
+		// Só coalesce enquanto está em voo: quem chegar depois faz a própria leitura
+		const settled = () => {
+			if (inFlight.get(key) === shared) {
+				inFlight.delete(key);
+			}
+		};
+		shared.then(settled, settled);
+	}
+
+	return (await shared).clone();
+}
+
+/**
+ * Chamadas economizadas (`hits`) e feitas (`misses`) desde o boot, no total e por rota.
+ */
+export function getSingleFlightStats() {
+	const requests = totals.hits + totals.misses;
+
+	return {
+		...totals,
+		inFlight: inFlight.size,
+		savedRatio: requests ? Number((totals.hits / requests).toFixed(4)) : 0,
+		routes: Object.fromEntries([...counters.entries()].sort((a, b) => b[1].hits - a[1].hits)),
+	};
+}
@@ -0,0 +1,39 @@
+/**
+ * Transporte HTTP de todo o tráfego do servidor para o Directus.
+ *
+ * No Node.js usa o pool keep-alive de `connection-pool.ts`, carregado sob demanda para o bundle do
+ * middleware (Edge Runtime), que também importa `directus.ts`, nunca incluir `node:http`. No Edge, ou
+ * com `DIRECTUS_CONNECTION_POOL=off` (para comparar), usa o `fetch` global.
+ */
+
+type ConnectionPool = typeof import('./connection-pool');
+
+let pool: Promise<ConnectionPool> | null = null;
+
+function loadPool(): Promise<ConnectionPool> | null {
+	if (process.env.NEXT_RUNTIME === 'nodejs' && process.env.DIRECTUS_CONNECTION_POOL !== 'off') {
+		pool ??= import('./connection-pool');
+
+		return pool;
+	}
+
+	return null;
+}
+
+export async function directusTransport(input: RequestInfo | URL, init?: RequestInit): Promise<Response> {
+	const connectionPool = loadPool();
+	if (!connectionPool) {
+		return fetch(input, init);
+	}
+
+	return (await connectionPool).pooledFetch(input, init);
+}
+
+/**
+ * Estatísticas do pool, ou `null` quando o tráfego usa o `fetch` global.
+ */
+export async function getDirectusTransportStats() {
+	const connectionPool = loadPool();
+
+	return connectionPool ? (await connectionPool).getConnectionPoolStats() : null;
+}
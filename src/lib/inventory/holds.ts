@@ -0,0 +1,275 @@
+import { randomUUID } from 'node:crypto';
+import { aggregate, createItems, updateItems } from '@directus/sdk';
+import type { InventoryClient } from './ledger';
+
+/**
+ * Reservas temporárias de ingressos durante o checkout (`ticket_holds`).
+ *
+ * Disponível = quantity − vendido (ledger) − reservas ativas. As reservas ativas vêm de uma soma
+ * agregada sobre `ticket_holds`, então valem para todas as instâncias do Next.js.
+ *
+ * Reservar tem três passos:
+ * 1. Checagem e reserva em memória, sem nenhum `await` no meio: checkouts concorrentes no mesmo
+ *    processo nunca disputam a mesma vaga enquanto a reserva ainda não foi gravada.
+ * 2. `commitReservation` grava a reserva e soma de novo: se outra instância reservou a mesma vaga
+ *    entre a checagem e a gravação, a soma passa do disponível e a reserva é desfeita.
+ * 3. `confirmReservation` associa a reserva à Checkout Session criada.
+ *
+ * A reserva expira junto com a Checkout Session (`expires_at` no Stripe), é convertida quando o
+ * pagamento é confirmado e liberada em `checkout.session.expired`.
+ */
+
+export const HOLD_TTL_MS = Math.max(30, Number(process.env.CHECKOUT_HOLD_TTL_MINUTES) || 30) * 60_000;
+
+/** O Stripe exige `expires_at` a pelo menos 30 minutos da criação da sessão; 1 minuto de folga */
+const MIN_SESSION_TTL_MS = 31 * 60_000;
+
+const HOLDS = 'ticket_holds';
+/** Gravações da mesma reserva quando outra instância disputa a última vaga */
+const MAX_COMMIT_ATTEMPTS = 3;
+const COMMIT_RETRY_MS = 200;
+
+type HoldStatus = 'active' | 'converted' | 'released' | 'expired';
+
+interface Hold {
+	ticketId: string;
+	quantity: number;
+	/** `quantity - vendido` do ingresso, para conferir depois de gravar */
+	available: number;
+}
+
+interface Reservation {
+	holds: Hold[];
+	expiresAt: number;
+	/** Ainda só em memória (contada em `heldQuantity`) */
+	pending: boolean;
+}
+
+export interface HoldRequest {
+	ticketId: string;
+	quantity: number;
+	/** `quantity - vendido` do ingresso, sem descontar reservas */
+	available: number;
+	/** Reservas gravadas do ingresso (`getHeldQuantities`) */
+	held: number;
+}
+
+export type ReserveResult =
+	| { ok: true; key: string; expiresAt: number }
+	| { ok: false; ticketId: string; available: number };
+
+/** Quantidade por ingresso das reservas deste processo que ainda não foram gravadas */
+const pendingByTicket = new Map<string, number>();
+/** Reservas por chave (`pending:<uuid>`) até a Checkout Session ser associada */
+const reservations = new Map<string, Reservation>();
+
+function addPending(ticketId: string, quantity: number): void {
+	const held = (pendingByTicket.get(ticketId) ?? 0) + quantity;
+	if (held > 0) {
+		pendingByTicket.set(ticketId, held);
+	} else {
+		pendingByTicket.delete(ticketId);
+	}
+}
+
+function settle(reservation: Reservation): void {
+	if (reservation.pending) {
+		reservation.pending = false;
+		reservation.holds.forEach((hold) => addPending(hold.ticketId, -hold.quantity));
+	}
+}
+
+/**
+ * Quantidade reservada neste processo e ainda não gravada no Directus (some em `getHeldQuantities`
+ * assim que a gravação termina).
+ */
+export function heldQuantity(ticketId: string): number {
+	return pendingByTicket.get(ticketId) ?? 0;
+}
+
+/**
+ * Soma das reservas ativas e não vencidas de cada ingresso, de todas as instâncias, numa consulta.
+ */
+export async function getHeldQuantities(client: InventoryClient, ticketIds: string[]): Promise<Map<string, number>> {
+	const held = new Map<string, number>();
+	if (ticketIds.length === 0) {
+		return held;
+	}
+
+	const rows: any[] = await client.request(
+		(aggregate as any)(HOLDS, {
+			aggregate: { sum: 'quantity' },
+			groupBy: ['ticket_id'],
+			query: {
+				filter: { ticket_id: { _in: ticketIds }, status: { _eq: 'active' }, expires_at: { _gt: '$NOW' } },
+			},
+		}),
+	);
+
+	for (const row of rows) {
+		// Directus devolve SUM como string em alguns bancos (Postgres numeric)
+		held.set(row.ticket_id, Number(row.sum?.quantity ?? 0));
+	}
+
+	return held;
+}
+
+/**
+ * Checa e reserva em memória todos os ingressos do pedido de forma atômica (tudo ou nada).
+ */
+export function reserveTickets(items: HoldRequest[], now = Date.now()): ReserveResult {
+	for (const item of items) {
+		const available = item.available - item.held - heldQuantity(item.ticketId);
+		if (item.quantity > available) {
+			return { ok: false, ticketId: item.ticketId, available: Math.max(0, available) };
+		}
+	}
+
+	const key = `pending:${randomUUID()}`;
+	const expiresAt = now + HOLD_TTL_MS;
+	reservations.set(key, {
+		holds: items.map(({ ticketId, quantity, available }) => ({ ticketId, quantity, available })),
+		expiresAt,
+		pending: true,
+	});
+	items.forEach((item) => addPending(item.ticketId, item.quantity));
+
+	return { ok: true, key, expiresAt };
+}
+
+async function insertHolds(client: InventoryClient, key: string, reservation: Reservation): Promise<void> {
+	await client.request(
+		(createItems as any)(
+			HOLDS,
+			reservation.holds.map((hold) => ({
+				id: `${randomUUID()}:${hold.ticketId}`,
+				session_id: key,
+				ticket_id: hold.ticketId,
+				quantity: hold.quantity,
+				expires_at: new Date(reservation.expiresAt).toISOString(),
+				status: 'active',
+			})),
+		),
+	);
+}
+
+/** Primeiro ingresso da reserva que não cabe, descontadas as reservas gravadas pelos outros */
+function overbooked(reservation: Reservation, held: Map<string, number>, own: number) {
+	for (const hold of reservation.holds) {
+		const available = hold.available - ((held.get(hold.ticketId) ?? 0) - own * hold.quantity);
+		if (hold.quantity > available) {
+			return { ticketId: hold.ticketId, available: Math.max(0, available) };
+		}
+	}
+
+	return null;
+}
+
+/**
+ * Grava a reserva em `ticket_holds` e confere, somando de novo, que nenhuma outra instância reservou
+ * a mesma vaga no meio. Se passou do disponível, a reserva é liberada e o resultado é `ok: false`.
+ *
+ * Dois checkouts que gravam ao mesmo tempo a última vaga enxergam um ao outro e desistem os dois
+ * (nenhum vende a mais); cada um tenta de novo depois de uma espera aleatória, então um deles fica.
+ */
+export async function commitReservation(client: InventoryClient, key: string): Promise<ReserveResult> {
+	const reservation = reservations.get(key);
+	if (!reservation) {
+		throw new Error(`Reserva ${key} não encontrada`);
+	}
+	const ticketIds = reservation.holds.map((hold) => hold.ticketId);
+
+	try {
+		for (let attempt = 1; ; attempt++) {
+			await insertHolds(client, key, reservation);
+			settle(reservation);
+
+			const conflict = overbooked(reservation, await getHeldQuantities(client, ticketIds), 1);
+			if (!conflict) {
+				return { ok: true, key, expiresAt: reservation.expiresAt };
+			}
+
+			await releaseHolds(client, key);
+			if (attempt >= MAX_COMMIT_ATTEMPTS) {
+				return { ok: false, ...conflict };
+			}
+
+			await new Promise((resolve) => setTimeout(resolve, Math.random() * COMMIT_RETRY_MS * attempt));
+			const stillOverbooked = overbooked(reservation, await getHeldQuantities(client, ticketIds), 0);
+			if (stillOverbooked) {
+				return { ok: false, ...stillOverbooked };
+			}
+			reservations.set(key, reservation);
+		}
+	} catch (error) {
+		settle(reservation);
+		reservations.delete(key);
+		throw error;
+	}
+}
+
+/**
+ * `expires_at` da Checkout Session criada agora: o fim da reserva, ou 31 minutos a partir de agora
+ * se a reserva (feita antes de criar as inscrições) já não cobre o mínimo do Stripe. A reserva é
+ * estendida junto em `confirmReservation`.
+ */
+export function sessionExpiresAt(key: string, now = Date.now()): number {
+	const reservation = reservations.get(key);
+	const expiresAt = Math.max(reservation?.expiresAt ?? 0, now + MIN_SESSION_TTL_MS);
+	if (reservation) {
+		reservation.expiresAt = expiresAt;
+	}
+
+	return expiresAt;
+}
+
+/**
+ * Associa a reserva à Checkout Session criada e grava o fim da reserva igual ao da sessão.
+ */
+export async function confirmReservation(client: InventoryClient, key: string, sessionId: string): Promise<void> {
+	const reservation = reservations.get(key);
+	if (!reservation) {
+		return;
+	}
+	reservations.delete(key);
+
+	try {
+		await client.request(
+			(updateItems as any)(
+				HOLDS,
+				{ filter: { session_id: { _eq: key }, status: { _eq: 'active' } } },
+				{ session_id: sessionId, expires_at: new Date(reservation.expiresAt).toISOString() },
+			),
+		);
+	} catch (error) {
+		// A reserva continua gravada sob a chave `pending:` e vence no horário original
+		console.error(`[Holds] Erro ao associar reserva ${key} à sessão ${sessionId}:`, error);
+	}
+}
+
+/**
+ * Encerra a reserva de uma sessão (ou de uma chave `pending:`). Sem `client`, só libera a memória.
+ */
+export async function releaseHolds(
+	client: InventoryClient | null,
+	key: string,
+	status: Exclude<HoldStatus, 'active'> = 'released',
+): Promise<void> {
+	const reservation = reservations.get(key);
+	if (reservation) {
+		settle(reservation);
+		reservations.delete(key);
+	}
+
+	if (!client) {
+		return;
+	}
+
+	await client.request(
+		(updateItems as any)(
+			HOLDS,
+			{ filter: { session_id: { _eq: key }, status: { _eq: 'active' } } },
+			{ status },
+		),
+	);
+}
@@ -0,0 +1,330 @@
+import {
+	aggregate,
+	createItem,
+	createItems,
+	readItems,
+	updateItemsBatch,
+	type DirectusClient,
+	type RestClient,
+} from '@directus/sdk';
+import type { EventTicket, Schema } from '@/types/directus-schema';
+import { parseDirectusError } from '@/lib/directus/error-utils';
+import { invalidateContentTags } from '@/lib/directus/content-cache';
+
+/**
+ * Ledger de estoque de ingressos (`ticket_inventory_ledger`).
+ *
+ * Cada venda ou estorno é uma linha append-only com `delta` (+quantidade / -quantidade), e o vendido
+ * de um ingresso é a soma dos deltas. Nunca há read-modify-write de um contador, então webhooks
+ * concorrentes não perdem incrementos.
+ *
+ * A chave primária é determinística (`sale:<inscrição>`, `refund:<inscrição>`): uma entrega repetida
+ * do mesmo webhook colide no INSERT (RECORD_NOT_UNIQUE) em vez de contar duas vezes.
+ *
+ * `event_tickets.quantity_sold` continua existindo como projeção para o admin, regravada a partir da
+ * soma após cada movimento. A linha `opening:<ingresso>` congela o `quantity_sold` de antes do ticket
+ * entrar no ledger, de forma que vendas antigas continuam contando.
+ *
+ * Os movimentos de um pedido são gravados em lote: um INSERT para todas as linhas e uma sincronização
+ * da projeção por pedido, não por inscrição.
+ */
+
+export type InventoryClient = DirectusClient<Schema> & RestClient<Schema>;
+
+type LedgerReason = 'opening' | 'sale' | 'refund';
+
+interface LedgerEntry {
+	id: string;
+	ticket_id: string;
+	registration_id?: string | null;
+	delta: number;
+	reason: LedgerReason;
+}
+
+interface TicketBalance {
+	/** Vendas anteriores ao ledger; `null` enquanto a linha de abertura não existe */
+	opening: number | null;
+	/** Soma de vendas e estornos registrados no ledger */
+	movements: number;
+}
+
+const LEDGER = 'ticket_inventory_ledger';
+
+/** Releituras da soma até a projeção `quantity_sold` convergir sob escrita concorrente */
+const PROJECTION_SYNC_ATTEMPTS = 3;
+
+async function appendEntry(client: InventoryClient, entry: LedgerEntry): Promise<boolean> {
+	try {
+		await client.request((createItem as any)(LEDGER, entry));
+
+		return true;
+	} catch (error) {
+		if (parseDirectusError(error).code === 'RECORD_NOT_UNIQUE') {
+			return false;
+		}
+		throw error;
+	}
+}
+
+/**
+ * Grava as linhas num único INSERT e retorna os ids gravados agora (os demais já existiam).
+ */
+async function appendEntries(client: InventoryClient, entries: LedgerEntry[]): Promise<Set<string>> {
+	if (entries.length <= 1) {
+		return new Set(entries.length === 1 && (await appendEntry(client, entries[0])) ? [entries[0].id] : []);
+	}
+
+	try {
+		await client.request((createItems as any)(LEDGER, entries));
+
+		return new Set(entries.map((entry) => entry.id));
+	} catch (error) {
+		if (parseDirectusError(error).code !== 'RECORD_NOT_UNIQUE') {
+			throw error;
+		}
+	}
+
+	// O Directus rejeita o lote inteiro se uma chave já existe: grava só as que faltam
+	const existing: any[] = await client.request(
+		(readItems as any)(LEDGER, {
+			filter: { id: { _in: entries.map((entry) => entry.id) } },
+			fields: ['id'],
+			limit: -1,
+		}),
+	);
+	const known = new Set(existing.map((row) => row.id));
+	const missing = entries.filter((entry) => !known.has(entry.id));
+
+	if (missing.length === entries.length) {
+		// Nenhuma chave conhecida (corrida com outro INSERT): uma a uma
+		const appended = new Set<string>();
+		for (const entry of entries) {
+			if (await appendEntry(client, entry)) {
+				appended.add(entry.id);
+			}
+		}
+
+		return appended;
+	}
+
+	return appendEntries(client, missing);
+}
+
+async function readBalances(client: InventoryClient, ticketIds: string[]): Promise<Map<string, TicketBalance>> {
+	const balances = new Map<string, TicketBalance>();
+	if (ticketIds.length === 0) {
+		return balances;
+	}
+
+	const rows: any[] = await client.request(
+		(aggregate as any)(LEDGER, {
+			aggregate: { sum: 'delta' },
+			groupBy: ['ticket_id', 'reason'],
+			query: { filter: { ticket_id: { _in: ticketIds } } },
+		}),
+	);
+
+	for (const row of rows) {
+		const balance = balances.get(row.ticket_id) ?? { opening: null, movements: 0 };
+		// Directus devolve SUM como string em alguns bancos (Postgres numeric)
+		const sum = Number(row.sum?.delta ?? 0);
+		if (row.reason === 'opening') {
+			balance.opening = sum;
+		} else {
+			balance.movements += sum;
+		}
+		balances.set(row.ticket_id, balance);
+	}
+
+	return balances;
+}
+
+/**
+ * Vendido atual dos ingressos, criando a linha de abertura no primeiro movimento de cada ticket.
+ */
+async function readSold(client: InventoryClient, ticketIds: string[]): Promise<Map<string, number>> {
+	let balances = await readBalances(client, ticketIds);
+	const withoutOpening = ticketIds.filter((ticketId) => balances.get(ticketId)?.opening == null);
+
+	if (withoutOpening.length > 0) {
+		const tickets: any[] = await client.request(
+			(readItems as any)('event_tickets', {
+				filter: { id: { _in: withoutOpening } },
+				fields: ['id', 'quantity_sold'],
+				limit: -1,
+			}),
+		);
+		// Só o primeiro INSERT de cada abertura vence; quem perder a corrida relê o valor gravado
+		await appendEntries(
+			client,
+			tickets.map((ticket) => ({
+				id: `opening:${ticket.id}`,
+				ticket_id: ticket.id,
+				delta: Number(ticket.quantity_sold ?? 0),
+				reason: 'opening' as const,
+			})),
+		);
+		balances = await readBalances(client, ticketIds);
+	}
+
+	return new Map(
+		ticketIds.map((ticketId) => {
+			const balance = balances.get(ticketId);
+
+			return [ticketId, (balance?.opening ?? 0) + (balance?.movements ?? 0)];
+		}),
+	);
+}
+
+/**
+ * Regrava `event_tickets.quantity_sold` com a soma do ledger, num único PATCH em lote.
+ *
+ * Depois de gravar, relê a soma: se outra venda entrou no meio (ou outra sincronização gravou um
+ * valor mais antigo por cima), grava de novo os ingressos que mudaram. Quem escreve por último
+ * sempre confere.
+ */
+export async function syncQuantitiesSold(client: InventoryClient, ticketIds: string[]): Promise<Map<string, number>> {
+	const written = new Map<string, number>();
+	let pending = [...new Set(ticketIds)];
+
+	for (let attempt = 0; attempt < PROJECTION_SYNC_ATTEMPTS && pending.length > 0; attempt++) {
+		const sold = await readSold(client, pending);
+		pending = pending.filter((ticketId) => sold.get(ticketId) !== written.get(ticketId));
+		if (pending.length === 0) {
+			break;
+		}
+
+		await client.request(
+			(updateItemsBatch as any)(
+				'event_tickets',
+				pending.map((ticketId) => ({ id: ticketId, quantity_sold: sold.get(ticketId) })),
+			),
+		);
+		for (const ticketId of pending) {
+			written.set(ticketId, sold.get(ticketId) as number);
+		}
+	}
+
+	// Páginas de evento em cache nesta instância mostram `quantity_sold`. O cache é por instância e o
+	// Flow do PATCH acima só atinge uma delas: nas outras a página fica defasada até vencer o TTL dos
+	// eventos (no máximo 15 s, mais a releitura em segundo plano). A checagem de disponibilidade do
+	// checkout lê o ledger, não o cache
+	if (written.size > 0) {
+		invalidateContentTags(['event_tickets']);
+	}
+
+	return written;
+}
+
+export async function syncQuantitySold(client: InventoryClient, ticketId: string): Promise<number> {
+	return (await syncQuantitiesSold(client, [ticketId])).get(ticketId) ?? 0;
+}
+
+export interface InventoryMovement {
+	ticketId: string;
+	registrationId: string;
+	quantity: number;
+}
+
+async function recordMovements(
+	client: InventoryClient,
+	reason: 'sale' | 'refund',
+	movements: InventoryMovement[],
+): Promise<Set<string>> {
+	if (movements.length === 0) {
+		return new Set();
+	}
+
+	const appended = await appendEntries(
+		client,
+		movements.map((movement) => ({
+			id: `${reason}:${movement.registrationId}`,
+			ticket_id: movement.ticketId,
+			registration_id: movement.registrationId,
+			delta: reason === 'sale' ? movement.quantity : -movement.quantity,
+			reason,
+		})),
+	);
+	// Sincroniza mesmo em duplicata: uma entrega anterior pode ter caído antes de atualizar a projeção
+	await syncQuantitiesSold(
+		client,
+		movements.map((movement) => movement.ticketId),
+	);
+
+	return new Set(
+		movements
+			.filter((movement) => appended.has(`${reason}:${movement.registrationId}`))
+			.map((movement) => movement.registrationId),
+	);
+}
+
+/**
+ * Registra as vendas de um pedido. Retorna as inscrições gravadas agora; as que já estavam no ledger
+ * (webhook repetido) ficam de fora.
+ */
+export function recordSales(client: InventoryClient, sales: InventoryMovement[]): Promise<Set<string>> {
+	return recordMovements(client, 'sale', sales);
+}
+
+/**
+ * Devolve ao estoque os ingressos de inscrições estornadas. Idempotente como `recordSales`.
+ */
+export function recordRefunds(client: InventoryClient, refunds: InventoryMovement[]): Promise<Set<string>> {
+	return recordMovements(client, 'refund', refunds);
+}
+
+/**
+ * Inscrições, entre as informadas, cuja venda está no ledger (`sale:<inscrição>`).
+ *
+ * Uma inscrição parcelada continua `pending` depois da primeira parcela, mas o ingresso já saiu do
+ * estoque: é a linha de venda, e não o `payment_status`, que diz se há algo a devolver no estorno.
+ */
+export async function readRecordedSales(client: InventoryClient, registrationIds: string[]): Promise<Set<string>> {
+	if (registrationIds.length === 0) {
+		return new Set();
+	}
+
+	const rows: any[] = await client.request(
+		(readItems as any)(LEDGER, {
+			filter: { id: { _in: registrationIds.map((registrationId) => `sale:${registrationId}`) } },
+			fields: ['registration_id'],
+			limit: -1,
+		}),
+	);
+
+	return new Set(rows.map((row) => row.registration_id));
+}
+
+/**
+ * Registra a venda de uma inscrição. Retorna `false` se a venda já estava no ledger (webhook repetido).
+ */
+export async function recordSale(client: InventoryClient, sale: InventoryMovement): Promise<boolean> {
+	return (await recordSales(client, [sale])).has(sale.registrationId);
+}
+
+/**
+ * Devolve ao estoque os ingressos de uma inscrição estornada. Idempotente como `recordSale`.
+ */
+export async function recordRefund(client: InventoryClient, refund: InventoryMovement): Promise<boolean> {
+	return (await recordRefunds(client, [refund])).has(refund.registrationId);
+}
+
+/**
+ * Vendido por ingresso para checagem de disponibilidade, numa única consulta agregada.
+ *
+ * Ingressos ainda sem movimento no ledger usam o `quantity_sold` recebido.
+ */
+export async function getSoldQuantities(
+	client: InventoryClient,
+	tickets: Array<Pick<EventTicket, 'id' | 'quantity_sold'>>,
+): Promise<Map<string, number>> {
+	const balances = await readBalances(client, tickets.map((ticket) => ticket.id));
+	const sold = new Map<string, number>();
+
+	for (const ticket of tickets) {
+		const balance = balances.get(ticket.id);
+		sold.set(ticket.id, (balance?.opening ?? ticket.quantity_sold ?? 0) + (balance?.movements ?? 0));
+	}
+
+	return sold;
+}
@@ -0,0 +1,242 @@
+import { tokenize } from './text';
+
+/**
+ * Índice invertido em memória com ranking BM25 e casamento por prefixo.
+ *
+ * Cada documento tem campos com pesos (título vale mais que o corpo); a frequência de um termo é a
+ * soma ponderada das ocorrências nos campos (BM25F simplificado). Todas as palavras da consulta
+ * precisam casar, seja pelo radical exato ou como prefixo de uma palavra indexada ("ingr" encontra
+ * "ingressos"). Casamentos só por prefixo pontuam menos que o radical exato.
+ *
+ * Inserir, atualizar e remover custam proporcional ao tamanho do documento; a consulta não percorre
+ * os documentos, só as listas de postings dos termos consultados.
+ */
+
+export interface IndexedDocument<T> {
+	/** Chave única no índice */
+	key: string;
+	/** Texto de cada campo; o peso vem de `fieldWeights` */
+	fields: Record<string, string | null | undefined>;
+	/** Devolvido nos resultados como está */
+	data: T;
+}
+
+export interface SearchHit<T> {
+	key: string;
+	score: number;
+	data: T;
+}
+
+interface StoredDocument<T> {
+	data: T;
+	length: number;
+	/** Termos do documento, para remover os postings sem reprocessar o texto */
+	terms: Map<string, number>;
+	/** Palavras sem acento → radical */
+	words: Map<string, string>;
+}
+
+const K1 = 1.2;
+const B = 0.75;
+/** Peso de um termo que só casou por prefixo, relativo ao radical exato */
+const PREFIX_WEIGHT = 0.6;
+/** Palavras expandidas por termo da consulta, para prefixos curtos não varrerem o vocabulário */
+const MAX_PREFIX_EXPANSIONS = 64;
+/** Prefixos mais curtos que isso só casam pelo radical exato */
+const MIN_PREFIX_LENGTH = 2;
+
+export class InvertedIndex<T> {
+	private readonly documents = new Map<string, StoredDocument<T>>();
+	/** termo → (documento → frequência ponderada) */
+	private readonly postings = new Map<string, Map<string, number>>();
+	/** palavra sem acento → radical e em quantos documentos aparece */
+	private readonly words = new Map<string, { term: string; documents: number }>();
+	/** `words` ordenado para a busca binária por prefixo; refeito sob demanda */
+	private sortedWords: string[] | null = null;
+	private totalLength = 0;
+
+	constructor(private readonly fieldWeights: Record<string, number>) {}
+
+	get size(): number {
+		return this.documents.size;
+	}
+
+	/** Insere ou substitui o documento */
+	upsert(document: IndexedDocument<T>): void {
+		this.remove(document.key);
+
+		const terms = new Map<string, number>();
+		const words = new Map<string, string>();
+		let length = 0;
+
+		for (const [field, text] of Object.entries(document.fields)) {
+			const weight = this.fieldWeights[field] ?? 1;
+			for (const token of tokenize(text)) {
+				terms.set(token.term, (terms.get(token.term) ?? 0) + weight);
+				words.set(token.word, token.term);
+				length += weight;
+			}
+		}
+
+		for (const [term, frequency] of terms) {
+			let posting = this.postings.get(term);
+			if (!posting) {
+				posting = new Map();
+				this.postings.set(term, posting);
+			}
+			posting.set(document.key, frequency);
+		}
+		for (const [word, term] of words) {
+			const entry = this.words.get(word);
+			if (entry) {
+				entry.documents++;
+			} else {
+				this.words.set(word, { term, documents: 1 });
+				this.sortedWords = null;
+			}
+		}
+
+		this.documents.set(document.key, { data: document.data, length, terms, words });
+		this.totalLength += length;
+	}
+
+	remove(key: string): boolean {
+		const stored = this.documents.get(key);
+		if (!stored) {
+			return false;
+		}
+
+		for (const term of stored.terms.keys()) {
+			const posting = this.postings.get(term);
+			posting?.delete(key);
+			if (posting?.size === 0) {
+				this.postings.delete(term);
+			}
+		}
+		for (const word of stored.words.keys()) {
+			const entry = this.words.get(word);
+			if (entry && --entry.documents === 0) {
+				this.words.delete(word);
+				this.sortedWords = null;
+			}
+		}
+
+		this.documents.delete(key);
+		this.totalLength -= stored.length;
+
+		return true;
+	}
+
+	clear(): void {
+		this.documents.clear();
+		this.postings.clear();
+		this.words.clear();
+		this.sortedWords = null;
+		this.totalLength = 0;
+	}
+
+	keys(): IterableIterator<string> {
+		return this.documents.keys();
+	}
+
+	/**
+	 * Documentos que casam com todas as palavras da consulta, do mais relevante ao menos.
+	 */
+	search(query: string, limit = 20, filter?: (data: T) => boolean): SearchHit<T>[] {
+		const tokens = tokenize(query);
+		if (tokens.length === 0 || this.documents.size === 0) {
+			return [];
+		}
+
+		const averageLength = this.totalLength / this.documents.size || 1;
+		let scores: Map<string, number> | null = null;
+
+		for (const token of tokens) {
+			const tokenScores = new Map<string, number>();
+
+			for (const [term, weight] of this.expand(token.word, token.term)) {
+				const posting = this.postings.get(term);
+				if (!posting) {
+					continue;
+				}
+				const idf = Math.log(1 + (this.documents.size - posting.size + 0.5) / (posting.size + 0.5));
+
+				for (const [key, frequency] of posting) {
+					if (scores && !scores.has(key)) {
+						continue;
+					}
+					const length = (this.documents.get(key) as StoredDocument<T>).length;
+					const score =
+						(weight * idf * frequency * (K1 + 1)) / (frequency + K1 * (1 - B + (B * length) / averageLength));
+					// Um documento conta o melhor casamento de cada palavra da consulta
+					tokenScores.set(key, Math.max(tokenScores.get(key) ?? 0, score));
+				}
+			}
+
+			if (scores) {
+				for (const [key, score] of tokenScores) {
+					tokenScores.set(key, score + (scores.get(key) as number));
+				}
+			}
+			scores = tokenScores;
+			if (scores.size === 0) {
+				return [];
+			}
+		}
+
+		const hits: SearchHit<T>[] = [];
+		for (const [key, score] of scores as Map<string, number>) {
+			const data = (this.documents.get(key) as StoredDocument<T>).data;
+			if (!filter || filter(data)) {
+				hits.push({ key, score, data });
+			}
+		}
+
+		return hits.sort((a, b) => b.score - a.score || a.key.localeCompare(b.key)).slice(0, limit);
+	}
+
+	/** Radical exato (peso 1) e radicais das palavras que começam com `word` */
+	private expand(word: string, term: string): Map<string, number> {
+		const expanded = new Map<string, number>([[term, 1]]);
+		if (word.length < MIN_PREFIX_LENGTH) {
+			return expanded;
+		}
+
+		const sorted = this.getSortedWords();
+		let index = lowerBound(sorted, word);
+		for (let count = 0; index < sorted.length && sorted[index].startsWith(word); index++) {
+			const candidate = (this.words.get(sorted[index]) as { term: string }).term;
+			if (!expanded.has(candidate)) {
+				expanded.set(candidate, PREFIX_WEIGHT);
+				if (++count >= MAX_PREFIX_EXPANSIONS) {
+					break;
+				}
+			}
+		}
+
+		return expanded;
+	}
+
+	private getSortedWords(): string[] {
+		if (!this.sortedWords) {
+			this.sortedWords = [...this.words.keys()].sort();
+		}
+
+		return this.sortedWords;
+	}
+}
+
+function lowerBound(sorted: string[], value: string): number {
+	let low = 0;
+	let high = sorted.length;
+	while (low < high) {
+		const middle = (low + high) >>> 1;
+		if (sorted[middle] < value) {
+			low = middle + 1;
+		} else {
+			high = middle;
+		}
+	}
+
+	return low;
+}
@@ -0,0 +1,258 @@
+import { useDirectus } from '@/lib/directus/directus';
+import { InvertedIndex, type IndexedDocument } from './inverted-index';
+import { stripHtml } from './text';
+import { PrefixTrie } from './trie';
+
+/**
+ * Índice de busca do site (páginas, posts e eventos publicados), em memória por processo.
+ *
+ * É montado no boot (`src/instrumentation.ts`) com uma leitura por collection e mantido em dia pelos
+ * Flows do Directus, que chamam `POST /api/search/index` a cada create/update/delete. Como cada
+ * instância do Next.js tem o próprio índice e o Flow só atinge uma delas, o índice também é refeito
+ * em segundo plano a cada `SEARCH_INDEX_REFRESH_MINUTES` (padrão 30).
+ *
+ * As consultas não tocam o Directus: `/api/search` só lê o índice. O typeahead
+ * (`/api/search/suggest`) usa um trie de títulos por collection, trocado assim que a leitura daquela
+ * collection termina, sem esperar as outras.
+ */
+
+export const SEARCH_COLLECTIONS = ['pages', 'posts', 'events'] as const;
+
+export type SearchCollection = (typeof SEARCH_COLLECTIONS)[number];
+
+export interface SearchResult {
+	id: string;
+	title: string;
+	description: string;
+	type: string;
+	link: string;
+}
+
+const REFRESH_INTERVAL_MS = Math.max(1, Number(process.env.SEARCH_INDEX_REFRESH_MINUTES) || 30) * 60_000;
+
+const FIELD_WEIGHTS = { title: 3, slug: 2, description: 1.5, content: 1 };
+
+interface CollectionSource {
+	fields: string[];
+	/** Filtro do que entra no índice; `null` deixa a decisão para as permissões públicas */
+	filter: Record<string, unknown> | null;
+	toDocument: (item: any) => IndexedDocument<SearchResult>;
+}
+
+const SOURCES: Record<SearchCollection, CollectionSource> = {
+	pages: {
+		fields: ['id', 'title', 'permalink', 'seo'],
+		filter: null,
+		toDocument: (page) => ({
+			key: `pages:${page.id}`,
+			fields: { title: page.title, slug: page.permalink, description: page.seo?.meta_description },
+			data: {
+				id: page.id,
+				title: page.title,
+				description: page.seo?.meta_description || page.title,
+				type: 'Página',
+				link: `/${String(page.permalink ?? '').replace(/^\/+/, '')}`,
+			},
+		}),
+	},
+	posts: {
+		fields: ['id', 'title', 'description', 'slug', 'content'],
+		filter: { status: { _eq: 'published' } },
+		toDocument: (post) => ({
+			key: `posts:${post.id}`,
+			fields: {
+				title: post.title,
+				slug: post.slug,
+				description: post.description,
+				content: post.content ? stripHtml(post.content) : null,
+			},
+			data: {
+				id: post.id,
+				title: post.title,
+				description: post.description || '',
+				type: 'Blog',
+				link: `/blog/${post.slug}`,
+			},
+		}),
+	},
+	events: {
+		fields: ['id', 'title', 'description', 'slug'],
+		filter: { status: { _eq: 'published' } },
+		toDocument: (event) => ({
+			key: `events:${event.id}`,
+			fields: {
+				title: event.title,
+				slug: event.slug,
+				description: event.description ? stripHtml(event.description) : null,
+			},
+			data: {
+				id: event.id,
+				title: event.title,
+				description: event.description || '',
+				type: 'Evento',
+				link: `/eventos/${event.slug}`,
+			},
+		}),
+	},
+};
+
+function createTitleTries(): Record<SearchCollection, PrefixTrie<SearchResult>> {
+	return { pages: new PrefixTrie(), posts: new PrefixTrie(), events: new PrefixTrie() };
+}
+
+let index = new InvertedIndex<SearchResult>(FIELD_WEIGHTS);
+const titleTries = createTitleTries();
+let builtAt = 0;
+let building: Promise<void> | null = null;
+/** Leitura de cada collection no rebuild em andamento */
+let collectionLoads: Partial<Record<SearchCollection, Promise<void>>> = {};
+/** Collections com trie carregado pelo menos uma vez */
+const loadedCollections = new Set<SearchCollection>();
+/** Mudanças recebidas durante um rebuild, reaplicadas sobre o índice novo */
+let changedDuringBuild: Map<SearchCollection, Set<string>> | null = null;
+
+async function fetchItems(collection: SearchCollection, ids?: string[]): Promise<any[]> {
+	const { directus, readItems } = useDirectus();
+	const { fields, filter } = SOURCES[collection];
+	const conditions = [filter, ids ? { id: { _in: ids } } : null].filter(Boolean);
+
+	return directus.request(
+		(readItems as any)(collection, {
+			fields,
+			filter: conditions.length > 1 ? { _and: conditions } : (conditions[0] ?? undefined),
+			limit: -1,
+		}),
+	);
+}
+
+/**
+ * Refaz o índice inteiro com uma leitura por collection. Chamadas simultâneas compartilham o mesmo
+ * rebuild; o índice antigo continua respondendo até o novo ficar pronto.
+ */
+export function buildSearchIndex(): Promise<void> {
+	if (building) {
+		return building;
+	}
+
+	changedDuringBuild = new Map();
+	const next = new InvertedIndex<SearchResult>(FIELD_WEIGHTS);
+	const started = Date.now();
+
+	const loads = SEARCH_COLLECTIONS.map(async (collection) => {
+		const items = await fetchItems(collection);
+		const source = SOURCES[collection];
+		const trie = new PrefixTrie<SearchResult>();
+
+		for (const item of items) {
+			const document = source.toDocument(item);
+			next.upsert(document);
+			trie.upsert(document.key, document.data.title ?? '', document.data);
+		}
+
+		// O typeahead desta collection já pode responder, antes das outras terminarem
+		titleTries[collection] = trie;
+		loadedCollections.add(collection);
+	});
+	collectionLoads = Object.fromEntries(SEARCH_COLLECTIONS.map((collection, position) => [collection, loads[position]]));
+
+	building = (async () => {
+		await Promise.all(loads);
+
+		index = next;
+		builtAt = Date.now();
+		console.log(`[Search] Index built: ${next.size} documents in ${builtAt - started}ms`);
+	})().finally(() => {
+		const changes = changedDuringBuild;
+		changedDuringBuild = null;
+		building = null;
+
+		for (const [collection, keys] of changes ?? []) {
+			void applySearchIndexChange(collection, [...keys]).catch((error) => {
+				console.error(`[Search] Error reapplying ${collection} changes after rebuild:`, error);
+			});
+		}
+	});
+
+	return building;
+}
+
+/**
+ * Atualiza no índice os itens alterados no Directus: relê os ids e insere, substitui ou remove
+ * (item apagado ou despublicado).
+ */
+export async function applySearchIndexChange(
+	collection: SearchCollection,
+	keys: string[],
+	deleted = false,
+): Promise<{ upserted: number; removed: number }> {
+	if (changedDuringBuild) {
+		const pending = changedDuringBuild.get(collection) ?? new Set<string>();
+		keys.forEach((key) => pending.add(key));
+		changedDuringBuild.set(collection, pending);
+	}
+
+	const items = deleted || keys.length === 0 ? [] : await fetchItems(collection, keys);
+	const source = SOURCES[collection];
+	const found = new Set<string>();
+
+	for (const item of items) {
+		const document = source.toDocument(item);
+		index.upsert(document);
+		titleTries[collection].upsert(document.key, document.data.title ?? '', document.data);
+		found.add(String(item.id));
+	}
+
+	let removed = 0;
+	for (const key of keys) {
+		// Itens relidos já tiveram a entrada antiga substituída pelo `upsert`
+		if (found.has(key)) continue;
+
+		titleTries[collection].remove(`${collection}:${key}`);
+		if (index.remove(`${collection}:${key}`)) {
+			removed++;
+		}
+	}
+
+	return { upserted: items.length, removed };
+}
+
+/**
+ * Busca no índice. Espera o primeiro build se o processo acabou de subir; depois disso um índice
+ * vencido continua respondendo enquanto o rebuild roda em segundo plano.
+ */
+export async function searchSite(query: string, limit: number): Promise<SearchResult[]> {
+	if (!builtAt) {
+		await buildSearchIndex();
+	} else if (Date.now() - builtAt > REFRESH_INTERVAL_MS) {
+		buildSearchIndex().catch((error) => console.error('[Search] Error rebuilding index:', error));
+	}
+
+	return index.search(query, limit).map((hit) => hit.data);
+}
+
+/**
+ * Títulos da collection que completam `prefix`, a partir do primeiro caractere. Enquanto o processo
+ * sobe, espera só a leitura desta collection.
+ */
+export async function suggestTitles(
+	collection: SearchCollection,
+	prefix: string,
+	limit: number,
+): Promise<SearchResult[]> {
+	if (!loadedCollections.has(collection)) {
+		// Uma falha desta collection chega por `collectionLoads`; a das outras não interessa aqui
+		buildSearchIndex().catch(() => undefined);
+		await collectionLoads[collection];
+	}
+
+	return titleTries[collection].complete(prefix, limit);
+}
+
+export function getSearchIndexStats() {
+	return {
+		documents: index.size,
+		titles: Object.fromEntries(SEARCH_COLLECTIONS.map((collection) => [collection, titleTries[collection].size])),
+		builtAt: builtAt ? new Date(builtAt).toISOString() : null,
+		building: building !== null,
+	};
+}
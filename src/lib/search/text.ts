@@ -0,0 +1,133 @@
+/**
+ * Análise de texto em português para o índice de busca.
+ *
+ * O texto passa por: remoção de HTML, minúsculas, remoção de acentos ("Música" → "musica"), quebra
+ * em palavras, descarte de stopwords e um stemmer leve (plural, gênero, diminutivo, advérbio em
+ * "-mente"). O stemmer é propositalmente conservador: junta "eventos", "evento" e "eventinho" sem
+ * juntar palavras diferentes que só compartilham o começo.
+ */
+
+const STOPWORDS = new Set([
+	'a',
+	'ao',
+	'aos',
+	'as',
+	'com',
+	'da',
+	'das',
+	'de',
+	'do',
+	'dos',
+	'e',
+	'em',
+	'na',
+	'nas',
+	'no',
+	'nos',
+	'o',
+	'os',
+	'ou',
+	'para',
+	'pela',
+	'pelas',
+	'pelo',
+	'pelos',
+	'por',
+	'que',
+	'se',
+	'um',
+	'uma',
+	'umas',
+	'uns',
+]);
+
+const MIN_STEM_LENGTH = 3;
+
+/** Minúsculas sem acentos ("Ação" → "acao") */
+export function foldText(text: string): string {
+	return text
+		.normalize('NFD')
+		.replace(/[\u0300-\u036f]/g, '')
+		.toLowerCase();
+}
+
+/** Texto puro de um campo rich text (HTML do editor do Directus) */
+export function stripHtml(html: string): string {
+	return html
+		.replace(/<(script|style)[^>]*>[\s\S]*?<\/\1>/gi, ' ')
+		.replace(/<[^>]+>/g, ' ')
+		.replace(/&nbsp;/g, ' ')
+		.replace(/&[a-z]+;|&#\d+;/gi, ' ');
+}
+
+function replaceSuffix(word: string, suffix: string, replacement: string): string | null {
+	if (!word.endsWith(suffix) || word.length - suffix.length + replacement.length < MIN_STEM_LENGTH) {
+		return null;
+	}
+
+	return word.slice(0, word.length - suffix.length) + replacement;
+}
+
+/** Plural → singular ("shows" → "show", "canções" → "cancao", "papéis" → "papel") */
+function removePlural(word: string): string {
+	if (word.length <= MIN_STEM_LENGTH || !word.endsWith('s')) {
+		return word;
+	}
+
+	return (
+		replaceSuffix(word, 'oes', 'ao') ??
+		replaceSuffix(word, 'aes', 'ao') ??
+		replaceSuffix(word, 'ais', 'al') ??
+		replaceSuffix(word, 'eis', 'el') ??
+		replaceSuffix(word, 'ois', 'ol') ??
+		replaceSuffix(word, 'ns', 'm') ??
+		replaceSuffix(word, 'res', 'r') ??
+		replaceSuffix(word, 'zes', 'z') ??
+		(word.endsWith('ss') ? word : word.slice(0, -1))
+	);
+}
+
+/**
+ * Radical de uma palavra já sem acentos.
+ */
+export function stem(word: string): string {
+	if (word.length <= MIN_STEM_LENGTH || /\d/.test(word)) {
+		return word;
+	}
+
+	let result = removePlural(word);
+	result =
+		replaceSuffix(result, 'mente', '') ??
+		replaceSuffix(result, 'zinho', '') ??
+		replaceSuffix(result, 'zinha', '') ??
+		replaceSuffix(result, 'inho', '') ??
+		replaceSuffix(result, 'inha', '') ??
+		result;
+
+	// Vogal temática / gênero: "evento" e "eventa" → "event", "festa" → "fest"
+	if (result.length > MIN_STEM_LENGTH + 1 && /[aeo]$/.test(result)) {
+		result = result.slice(0, -1);
+	}
+
+	return result;
+}
+
+export interface Token {
+	/** Palavra sem acentos, usada no casamento por prefixo */
+	word: string;
+	/** Radical, usado no casamento exato e no ranking */
+	term: string;
+}
+
+/**
+ * Palavras do texto, sem stopwords, na ordem em que aparecem.
+ */
+export function tokenize(text: string | null | undefined): Token[] {
+	if (!text) {
+		return [];
+	}
+
+	const words = foldText(text).match(/[a-z0-9]+/g) ?? [];
+
+	return words.filter((word) => !STOPWORDS.has(word)).map((word) => ({ word, term: stem(word) }));
+}
@@ -0,0 +1,202 @@
+import { foldText } from './text';
+
+/**
+ * Trie compacto (radix) de títulos para o typeahead.
+ *
+ * Cada palavra do título, sem acentos, é inserida apontando para o item, então "ingr" encontra
+ * "Show com ingressos esgotados". Arestas guardam trechos inteiros de palavra e só se dividem onde
+ * duas palavras divergem, o que mantém o número de nós perto do número de palavras distintas.
+ *
+ * A busca desce pelo prefixo e percorre a subárvore em largura: palavras mais curtas (mais próximas
+ * do que foi digitado) aparecem primeiro, e a travessia para assim que junta itens suficientes.
+ */
+
+interface TrieNode {
+	/** Trecho da aresta que chega neste nó */
+	label: string;
+	/** Filhos indexados pelo primeiro caractere do `label` */
+	children: Map<string, TrieNode>;
+	/** Itens com uma palavra que termina neste nó */
+	keys: Set<string> | null;
+}
+
+interface TrieItem<T> {
+	data: T;
+	title: string;
+	words: string[];
+}
+
+/** Candidatos lidos por resultado pedido, para sobrar margem ao reordenar e filtrar */
+const CANDIDATES_PER_RESULT = 4;
+
+function createNode(label: string): TrieNode {
+	return { label, children: new Map(), keys: null };
+}
+
+function commonPrefixLength(a: string, b: string): number {
+	let length = 0;
+	while (length < a.length && length < b.length && a[length] === b[length]) {
+		length++;
+	}
+
+	return length;
+}
+
+function words(text: string): string[] {
+	return [...new Set(foldText(text).match(/[a-z0-9]+/g) ?? [])];
+}
+
+export class PrefixTrie<T> {
+	private readonly root = createNode('');
+	private readonly items = new Map<string, TrieItem<T>>();
+
+	get size(): number {
+		return this.items.size;
+	}
+
+	/** Insere ou substitui o item */
+	upsert(key: string, title: string, data: T): void {
+		this.remove(key);
+
+		const item: TrieItem<T> = { data, title: foldText(title), words: words(title) };
+		for (const word of item.words) {
+			this.insertWord(word, key);
+		}
+		this.items.set(key, item);
+	}
+
+	remove(key: string): boolean {
+		const item = this.items.get(key);
+		if (!item) {
+			return false;
+		}
+
+		for (const word of item.words) {
+			this.removeWord(this.root, word, key);
+		}
+		this.items.delete(key);
+
+		return true;
+	}
+
+	/**
+	 * Itens cujo título tem uma palavra começando com a última palavra da consulta e contém as
+	 * anteriores. Títulos que começam com a consulta vêm antes.
+	 */
+	complete(query: string, limit: number): T[] {
+		const queryWords = foldText(query).match(/[a-z0-9]+/g) ?? [];
+		const last = queryWords.pop();
+		if (!last || limit <= 0) {
+			return [];
+		}
+
+		const node = this.find(last);
+		if (!node) {
+			return [];
+		}
+
+		const folded = foldText(query).trim();
+		const candidates: TrieItem<T>[] = [];
+		const seen = new Set<string>();
+		const queue: TrieNode[] = [node];
+
+		const wanted = limit * CANDIDATES_PER_RESULT;
+
+		// Em largura: palavras mais curtas primeiro
+		for (let position = 0; position < queue.length && candidates.length < wanted; position++) {
+			const current = queue[position];
+			for (const key of current.keys ?? []) {
+				if (candidates.length >= wanted) {
+					break;
+				}
+				const item = this.items.get(key) as TrieItem<T>;
+				if (!seen.has(key) && queryWords.every((word) => item.words.some((candidate) => candidate.startsWith(word)))) {
+					seen.add(key);
+					candidates.push(item);
+				}
+			}
+			queue.push(...current.children.values());
+		}
+
+		return candidates
+			.map((item, order) => ({ item, order, rank: item.title.startsWith(folded) ? 0 : 1 }))
+			.sort((a, b) => a.rank - b.rank || a.order - b.order)
+			.slice(0, limit)
+			.map(({ item }) => item.data);
+	}
+
+	/** Nó onde termina o prefixo (que pode parar no meio de uma aresta) */
+	private find(prefix: string): TrieNode | null {
+		let node = this.root;
+		let rest = prefix;
+
+		while (rest) {
+			const child = node.children.get(rest[0]);
+			if (!child) {
+				return null;
+			}
+			const shared = commonPrefixLength(child.label, rest);
+			if (shared === rest.length) {
+				return child;
+			}
+			if (shared < child.label.length) {
+				return null;
+			}
+			node = child;
+			rest = rest.slice(shared);
+		}
+
+		return node;
+	}
+
+	private insertWord(word: string, key: string): void {
+		let node = this.root;
+		let rest = word;
+
+		while (rest) {
+			const child = node.children.get(rest[0]);
+			if (!child) {
+				const leaf = createNode(rest);
+				node.children.set(rest[0], leaf);
+				node = leaf;
+				break;
+			}
+
+			const shared = commonPrefixLength(child.label, rest);
+			if (shared < child.label.length) {
+				// Divide a aresta: "evento" + "evolucao" → "ev" → ("ento", "olucao")
+				const split = createNode(child.label.slice(0, shared));
+				child.label = child.label.slice(shared);
+				split.children.set(child.label[0], child);
+				node.children.set(split.label[0], split);
+				node = split;
+			} else {
+				node = child;
+			}
+			rest = rest.slice(shared);
+		}
+
+		node.keys ??= new Set();
+		node.keys.add(key);
+	}
+
+	/** Remove a chave da palavra; retorna `true` se o nó ficou vazio e pode sair do pai */
+	private removeWord(node: TrieNode, rest: string, key: string): boolean {
+		if (!rest) {
+			node.keys?.delete(key);
+			if (node.keys?.size === 0) {
+				node.keys = null;
+			}
+		} else {
+			const child = node.children.get(rest[0]);
+			if (!child || !rest.startsWith(child.label)) {
+				return false;
+			}
+			if (this.removeWord(child, rest.slice(child.label.length), key)) {
+				node.children.delete(rest[0]);
+			}
+		}
+
+		return node !== this.root && !node.keys && node.children.size === 0;
+	}
+}
@@ -4,6 +4,12 @@ if (!process.env.STRIPE_SECRET_KEY) {
 	throw new Error('STRIPE_SECRET_KEY is not set in environment variables');
 }
 
+/**
+ * Optional API base override (stripe-mock or the E2E Stripe stand-in).
+ * Unset in production, so requests go to api.stripe.com.
+ */
+const apiBase = process.env.STRIPE_API_BASE ? new URL(process.env.STRIPE_API_BASE) : null;
+
 /**
  * Stripe server-side client
  * Use this for server-side operations (API routes, server components)
@@ -15,6 +21,11 @@ export const stripe = new Stripe(process.env.STRIPE_SECRET_KEY, {
 		name: 'Event Platform',
 		version: '1.0.0',
 	},
+	...(apiBase && {
+		host: apiBase.hostname,
+		port: Number(apiBase.port) || (apiBase.protocol === 'https:' ? 443 : 80),
+		protocol: apiBase.protocol === 'https:' ? 'https' : 'http',
+	}),
 });
 
 /**
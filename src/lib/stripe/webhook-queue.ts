@@ -0,0 +1,370 @@
+import type Stripe from 'stripe';
+import { aggregate, createItem, readItems, updateItem, updateItems, type RestClient } from '@directus/sdk';
+import type { Schema } from '@/types/directus-schema';
+import { parseDirectusError } from '@/lib/directus/error-utils';
+import { getAdminClient, handleStripeEvent } from './webhooks';
+
+/**
+ * Fila de ingestão dos webhooks do Stripe (`stripe_webhook_events`).
+ *
+ * A rota só valida a assinatura e grava o evento, com o id do Stripe como chave primária, antes de
+ * responder 200. Uma entrega repetida colide no INSERT (RECORD_NOT_UNIQUE) e não é processada de novo.
+ *
+ * O processamento roda depois, num pool de `STRIPE_WEBHOOK_WORKERS` workers por processo. O Directus
+ * não tem compare-and-set (um PATCH filtrado lê as chaves e depois atualiza), então o claim é um INSERT
+ * em `stripe_webhook_claims` com a chave `<evento>:<claims + 1>`: só um worker, de qualquer instância,
+ * grava cada número, e quem colide desiste. Falhas voltam para a fila com backoff exponencial; depois
+ * de `STRIPE_WEBHOOK_MAX_ATTEMPTS` tentativas o evento fica em `dead` (dead-letter) até ser
+ * reenfileirado pelo admin. Um evento preso em `processing` (processo caiu no meio) é retomado quando
+ * o lease vence.
+ */
+
+export type WebhookEventStatus = 'queued' | 'processing' | 'processed' | 'failed' | 'dead';
+
+type QueueClient = RestClient<Schema>;
+
+const QUEUE = 'stripe_webhook_events';
+const CLAIMS = 'stripe_webhook_claims';
+const WORKERS = Math.max(1, Number(process.env.STRIPE_WEBHOOK_WORKERS) || 4);
+const MAX_ATTEMPTS = Math.max(1, Number(process.env.STRIPE_WEBHOOK_MAX_ATTEMPTS) || 5);
+const RETRY_BASE_MS = 5_000;
+const RETRY_MAX_MS = 15 * 60_000;
+const PROCESSING_LEASE_MS = 5 * 60_000;
+const POLL_INTERVAL_MS = 5_000;
+/** Acima disso os eventos esperam no Directus e o poller busca quando houver espaço */
+const LOCAL_QUEUE_LIMIT = 500;
+const DEAD_LETTER_LIST_LIMIT = 20;
+
+interface PendingEvent {
+	id: string;
+	/** Payload já em memória (entregue agora); eventos vindos do poller são lidos no claim */
+	event?: Stripe.Event;
+}
+
+const pending: PendingEvent[] = [];
+/** Ids na fila local ou em processamento neste processo */
+const scheduled = new Set<string>();
+let active = 0;
+let poller: ReturnType<typeof setInterval> | null = null;
+let polling = false;
+
+const metrics = {
+	enqueued: 0,
+	duplicates: 0,
+	processed: 0,
+	retried: 0,
+	deadLettered: 0,
+	processingMs: 0,
+	lastProcessedAt: null as string | null,
+};
+
+const iso = (time: number) => new Date(time).toISOString();
+
+/** Eventos que um worker pode pegar agora */
+function claimableFilter(now: number) {
+	return {
+		_or: [
+			{ status: { _eq: 'queued' } },
+			{ status: { _eq: 'failed' }, next_attempt_at: { _lte: iso(now) } },
+			{ status: { _eq: 'processing' }, claimed_at: { _lt: iso(now - PROCESSING_LEASE_MS) } },
+		],
+	};
+}
+
+function retryDelay(attempts: number): number {
+	const delay = Math.min(RETRY_MAX_MS, RETRY_BASE_MS * 2 ** (attempts - 1));
+
+	// Jitter para tentativas de vários eventos não baterem no Directus juntas
+	return delay / 2 + Math.random() * (delay / 2);
+}
+
+/**
+ * Claim que colidiu sem o evento ter passado para `processing`: o worker que o gravou caiu antes do
+ * PATCH. Vencido o lease, o contador avança e o próximo poll tenta o número seguinte.
+ */
+async function skipOrphanedClaim(client: ReturnType<typeof getAdminClient>, id: string, claim: number, now: number) {
+	const existing: any[] = await client.request(
+		(readItems as any)(CLAIMS, {
+			filter: { id: { _eq: `${id}:${claim}` }, claimed_at: { _lt: iso(now - PROCESSING_LEASE_MS) } },
+			fields: ['id'],
+			limit: 1,
+		}),
+	);
+	if (existing.length === 0) {
+		return;
+	}
+
+	// Idempotente: dois workers que cheguem aqui juntos gravam o mesmo valor
+	await client.request(
+		(updateItems as any)(
+			QUEUE,
+			{ filter: { _and: [{ id: { _eq: id } }, { claims: { _eq: claim - 1 } }, claimableFilter(now)] } },
+			{ claims: claim },
+		),
+	);
+}
+
+async function processEvent(item: PendingEvent): Promise<void> {
+	const client = getAdminClient();
+	const claimedAt = Date.now();
+
+	const rows: any[] = await client.request(
+		(readItems as any)(QUEUE, {
+			filter: { _and: [{ id: { _eq: item.id } }, claimableFilter(claimedAt)] },
+			fields: item.event ? ['id', 'attempts', 'claims'] : ['id', 'attempts', 'claims', 'payload'],
+			limit: 1,
+		}),
+	);
+	const row = rows[0];
+	if (!row) {
+		// Outro worker (ou instância) já pegou, ou o evento não está mais pendente
+		return;
+	}
+
+	// Quem leu o evento antes de outro worker reivindicá-lo tenta o mesmo número e colide no INSERT
+	const claim = Number(row.claims ?? 0) + 1;
+	try {
+		await client.request(
+			(createItem as any)(
+				CLAIMS,
+				{ id: `${item.id}:${claim}`, event_id: item.id, claimed_at: iso(claimedAt) },
+				{ fields: ['id'] },
+			),
+		);
+	} catch (error) {
+		if (parseDirectusError(error).code === 'RECORD_NOT_UNIQUE') {
+			await skipOrphanedClaim(client, item.id, claim, claimedAt);
+
+			return;
+		}
+		throw error;
+	}
+
+	await client.request(
+		(updateItem as any)(QUEUE, item.id, { status: 'processing', claimed_at: iso(claimedAt), claims: claim }),
+	);
+
+	const event: Stripe.Event = item.event ?? (typeof row.payload === 'string' ? JSON.parse(row.payload) : row.payload);
+	const attempts = Number(row.attempts ?? 0) + 1;
+
+	try {
+		await handleStripeEvent(event);
+	} catch (error) {
+		const dead = attempts >= MAX_ATTEMPTS;
+		const message = error instanceof Error ? error.message : String(error);
+		console.error(
+			`[Webhook Queue] ${event.type} ${event.id} failed (attempt ${attempts}/${MAX_ATTEMPTS})${dead ? ', moved to dead-letter' : ''}:`,
+			error,
+		);
+
+		await client.request(
+			(updateItem as any)(QUEUE, item.id, {
+				status: dead ? 'dead' : 'failed',
+				attempts,
+				last_error: message.slice(0, 2000),
+				next_attempt_at: dead ? null : iso(Date.now() + retryDelay(attempts)),
+			}),
+		);
+		if (dead) {
+			metrics.deadLettered++;
+		} else {
+			metrics.retried++;
+		}
+
+		return;
+	}
+
+	const processedAt = Date.now();
+	await client.request(
+		(updateItem as any)(QUEUE, item.id, {
+			status: 'processed',
+			attempts,
+			last_error: null,
+			processed_at: iso(processedAt),
+		}),
+	);
+	metrics.processed++;
+	metrics.processingMs += processedAt - claimedAt;
+	metrics.lastProcessedAt = iso(processedAt);
+}
+
+function drain(): void {
+	while (active < WORKERS && pending.length > 0) {
+		const item = pending.shift() as PendingEvent;
+		active++;
+		processEvent(item)
+			.catch((error) => {
+				// Directus indisponível no claim ou no status final: o poller (ou o lease) retoma o evento
+				console.error(`[Webhook Queue] Error processing ${item.id}:`, error);
+			})
+			.finally(() => {
+				active--;
+				scheduled.delete(item.id);
+				drain();
+			});
+	}
+}
+
+function schedule(item: PendingEvent): void {
+	if (scheduled.has(item.id) || pending.length >= LOCAL_QUEUE_LIMIT) {
+		return;
+	}
+	scheduled.add(item.id);
+	pending.push(item);
+	drain();
+}
+
+/**
+ * Busca no Directus eventos pendentes: retentativas vencidas, leases expirados e o que ficou para
+ * trás num restart ou quando a fila local estava cheia.
+ */
+async function poll(): Promise<void> {
+	if (polling || pending.length >= LOCAL_QUEUE_LIMIT) {
+		return;
+	}
+	polling = true;
+
+	try {
+		const rows: any[] = await getAdminClient().request(
+			(readItems as any)(QUEUE, {
+				filter: claimableFilter(Date.now()),
+				fields: ['id'],
+				sort: ['received_at'],
+				limit: LOCAL_QUEUE_LIMIT - pending.length,
+			}),
+		);
+		for (const row of rows) {
+			schedule({ id: row.id });
+		}
+	} catch (error) {
+		console.error('[Webhook Queue] Error polling pending events:', error);
+	} finally {
+		polling = false;
+	}
+}
+
+/**
+ * Liga o poller deste processo (idempotente).
+ */
+export function startWebhookWorkers(): void {
+	if (poller) {
+		return;
+	}
+	poller = setInterval(() => void poll(), POLL_INTERVAL_MS);
+	poller.unref?.();
+	void poll();
+}
+
+/**
+ * Grava o evento na fila e agenda o processamento. Retorna `duplicate` se o evento já foi recebido.
+ *
+ * Erros do Directus sobem para a rota, que responde 500 e deixa o Stripe reenviar.
+ */
+export async function enqueueWebhookEvent(event: Stripe.Event): Promise<'queued' | 'duplicate'> {
+	startWebhookWorkers();
+
+	try {
+		await getAdminClient().request(
+			(createItem as any)(
+				QUEUE,
+				{
+					id: event.id,
+					type: event.type,
+					payload: event,
+					status: 'queued',
+					attempts: 0,
+					claims: 0,
+					stripe_created_at: iso(event.created * 1000),
+					received_at: iso(Date.now()),
+				},
+				{ fields: ['id'] },
+			),
+		);
+	} catch (error) {
+		if (parseDirectusError(error).code === 'RECORD_NOT_UNIQUE') {
+			metrics.duplicates++;
+
+			return 'duplicate';
+		}
+		throw error;
+	}
+
+	metrics.enqueued++;
+	schedule({ id: event.id, event });
+
+	return 'queued';
+}
+
+/**
+ * Profundidade por status, atraso do evento pendente mais antigo, dead-letters recentes e métricas
+ * do pool deste processo.
+ *
+ * Lê com o client recebido: as permissões do Directus em `stripe_webhook_events` decidem quem vê.
+ */
+export async function getWebhookQueueStats(client: QueueClient) {
+	const now = Date.now();
+	const [groups, oldest, deadLetters]: any[][] = await Promise.all([
+		client.request((aggregate as any)(QUEUE, { aggregate: { count: '*' }, groupBy: ['status'] })),
+		client.request(
+			(readItems as any)(QUEUE, {
+				filter: { status: { _in: ['queued', 'processing', 'failed'] } },
+				fields: ['id', 'type', 'status', 'received_at'],
+				sort: ['received_at'],
+				limit: 1,
+			}),
+		),
+		client.request(
+			(readItems as any)(QUEUE, {
+				filter: { status: { _eq: 'dead' } },
+				fields: ['id', 'type', 'attempts', 'last_error', 'received_at'],
+				sort: ['-received_at'],
+				limit: DEAD_LETTER_LIST_LIMIT,
+			}),
+		),
+	]);
+
+	const depth: Record<WebhookEventStatus, number> = { queued: 0, processing: 0, failed: 0, dead: 0, processed: 0 };
+	for (const group of groups) {
+		// Directus devolve `count` como número ou string, e `{ '*': n }` em algumas versões
+		const count = typeof group.count === 'object' ? group.count?.['*'] : group.count;
+		depth[group.status as WebhookEventStatus] = Number(count ?? 0);
+	}
+
+	const oldestPending = oldest[0] ?? null;
+
+	return {
+		depth,
+		backlog: depth.queued + depth.processing + depth.failed,
+		lagSeconds: oldestPending ? Math.max(0, (now - Date.parse(oldestPending.received_at)) / 1000) : 0,
+		oldestPending,
+		deadLetters,
+		workers: {
+			size: WORKERS,
+			active,
+			localQueue: pending.length,
+			maxAttempts: MAX_ATTEMPTS,
+			...metrics,
+			avgProcessingMs: metrics.processed ? Math.round(metrics.processingMs / metrics.processed) : null,
+		},
+	};
+}
+
+/**
+ * Devolve eventos da dead-letter para a fila, zerando as tentativas.
+ */
+export async function requeueDeadEvents(client: QueueClient, ids: string[]): Promise<string[]> {
+	const rows: any[] = await client.request(
+		(updateItems as any)(
+			QUEUE,
+			{ filter: { id: { _in: ids }, status: { _eq: 'dead' } } },
+			{ status: 'queued', attempts: 0, next_attempt_at: null, last_error: null },
+			{ fields: ['id'] },
+		),
+	);
+	startWebhookWorkers();
+	for (const row of rows) {
+		schedule({ id: row.id });
+	}
+
+	return rows.map((row) => row.id);
+}
@@ -1,10 +1,30 @@
 import Stripe from 'stripe';
 import { stripe } from './server';
-import { createDirectus, rest, staticToken, readItem, readItems, updateItem, createItem } from '@directus/sdk';
+import {
+	createDirectus,
+	rest,
+	staticToken,
+	readItem,
+	readItems,
+	updateItem,
+	updateItems,
+	updateItemsBatch,
+	createItems,
+} from '@directus/sdk';
 import type { Schema } from '@/types/directus-schema';
+import {
+	readRecordedSales,
+	recordRefunds,
+	recordSale,
+	recordSales,
+	type InventoryMovement,
+} from '@/lib/inventory/ledger';
+import { releaseHolds } from '@/lib/inventory/holds';
+import { scheduleFetch } from '@/lib/directus/scheduler';
+import { invalidateServerAuth } from '@/lib/auth/auth-cache';
 
 // Create admin Directus client for webhook operations
-const getAdminClient = () => {
+export const getAdminClient = () => {
 	const directusUrl = process.env.NEXT_PUBLIC_DIRECTUS_URL;
 	const adminToken = process.env.DIRECTUS_ADMIN_TOKEN;
 
@@ -12,9 +32,58 @@ const getAdminClient = () => {
 		throw new Error('DIRECTUS_URL or DIRECTUS_ADMIN_TOKEN not configured');
 	}
 
-	return createDirectus<Schema>(directusUrl).with(rest()).with(staticToken(adminToken));
+	// Lane `write`: pagamentos passam na frente das leituras das páginas. Sem single-flight: a
+	// projeção do ledger precisa ler depois da própria escrita, não pegar carona numa leitura anterior
+	return createDirectus<Schema>(directusUrl, { globals: { fetch: (...args) => scheduleFetch('write', ...args) } })
+		.with(rest())
+		.with(staticToken(adminToken));
 };
 
+interface PaymentTransactionLog {
+	eventId: string;
+	eventType: string;
+	objectId: string;
+	amount: number;
+	status: 'succeeded' | 'failed' | 'pending' | 'refunded';
+	metadata: any;
+	registrationId?: string;
+}
+
+/**
+ * Log webhook events to payment_transactions for audit trail, in a single insert
+ */
+async function logPaymentTransactions(entries: PaymentTransactionLog[]): Promise<void> {
+	if (entries.length === 0) {
+		return;
+	}
+
+	try {
+		const client = getAdminClient();
+
+		await client.request(
+			(createItems as any)(
+				'payment_transactions',
+				entries.map((entry) => ({
+					stripe_event_id: entry.eventId,
+					event_type: entry.eventType, // Allow any event type for flexibility
+					stripe_object_id: entry.objectId,
+					amount: entry.amount,
+					status: entry.status,
+					metadata: entry.metadata,
+					registration_id: entry.registrationId || null,
+				})),
+			),
+		);
+
+		for (const entry of entries) {
+			console.log(`[Webhook] ✅ Transaction logged: ${entry.eventId} (${entry.eventType})`);
+		}
+	} catch (error: any) {
+		console.error('[Webhook] ❌ Error logging transaction:', error);
+		// Don't throw - logging failure shouldn't block webhook processing
+	}
+}
+
 /**
  * Log webhook event to payment_transactions for audit trail
  */
@@ -27,26 +96,30 @@ async function logPaymentTransaction(
 	metadata: any,
 	registrationId?: string,
 ): Promise<void> {
-	try {
-		const client = getAdminClient();
+	await logPaymentTransactions([{ eventId, eventType, objectId, amount, status, metadata, registrationId }]);
+}
 
-		await client.request(
-			createItem('payment_transactions', {
-				stripe_event_id: eventId,
-				event_type: eventType as any, // Allow any event type for flexibility
-				stripe_object_id: objectId,
-				amount: amount,
-				status: status,
-				metadata: metadata,
-				registration_id: registrationId || null,
-			}),
-		);
+function generateTicketCode(): string {
+	const timestamp = Date.now().toString(36).toUpperCase();
+	const random = Math.random().toString(36).substring(2, 8).toUpperCase();
 
-		console.log(`[Webhook] ✅ Transaction logged: ${eventId} (${eventType})`);
-	} catch (error: any) {
-		console.error('[Webhook] ❌ Error logging transaction:', error);
-		// Don't throw - logging failure shouldn't block webhook processing
+	return `TKT-${timestamp}-${random}`;
+}
+
+/**
+ * Inventory movement of a registration, or null when it has no ticket type
+ */
+function toInventoryMovement(registration: any): InventoryMovement | null {
+	if (!registration.ticket_type_id) {
+		return null;
 	}
+
+	return {
+		ticketId:
+			typeof registration.ticket_type_id === 'object' ? registration.ticket_type_id.id : registration.ticket_type_id,
+		registrationId: registration.id,
+		quantity: registration.quantity || 1,
+	};
 }
 
 /**
@@ -102,6 +175,26 @@ async function handleInstallmentPayment(
 return;
 		}
 
+		// The first installment sells the ticket. Recorded before the already-paid check below: a
+		// retry after a failed ledger write finds the installment paid, and the `sale:<registration>`
+		// key makes a repeat write harmless
+		const saleRegistration = typeof installment.registration_id === 'object' ? installment.registration_id : null;
+		if (installment.installment_number === 1 && saleRegistration) {
+			const sale = toInventoryMovement(saleRegistration);
+			if (sale) {
+				try {
+					const recorded = await recordSale(client, sale);
+
+					console.log(
+						`[Webhook] Ticket ${sale.ticketId}: sale of registration ${sale.registrationId} ${recorded ? 'recorded' : 'already recorded'}`,
+					);
+				} catch (error: any) {
+					console.error('[Webhook] Error recording ticket sale:', error);
+					throw error;
+				}
+			}
+		}
+
 		// Check if installment already paid (idempotency)
 		if (installment.status === 'paid') {
 			console.log(`[Webhook] ⚠️  Installment ${installmentId} already marked as paid. Skipping.`);
@@ -190,6 +283,10 @@ return;
 			console.log(`[Webhook] Has ${pendingInstallments} pending installments - partial payment`);
 		}
 
+		// If first installment and registration was pending, generate ticket code (same PATCH as the status)
+		const isFirstPayment = installment.installment_number === 1 && paidInstallments === 1;
+		const ticketCode = isFirstPayment ? generateTicketCode() : null;
+
 		// Update registration
 		await client.request(
 			(updateItem as any)('event_registrations', registrationId, {
@@ -197,56 +294,14 @@ return;
 				payment_status: newPaymentStatus,
 				blocked_reason: blockedReason,
 				installment_plan_status: paidInstallments === totalInstallments ? 'completed' : 'active',
+				...(ticketCode ? { ticket_code: ticketCode, stripe_payment_intent_id: paymentIntent.id } : {}),
 			}),
 		);
 
 		console.log(`[Webhook] ✅ Registration ${registrationId} updated to status: ${newStatus}`);
 
-		// If first installment and registration was pending, generate ticket code
-		if (installment.installment_number === 1 && paidInstallments === 1) {
-			const timestamp = Date.now().toString(36).toUpperCase();
-			const random = Math.random().toString(36).substring(2, 8).toUpperCase();
-			const ticketCode = `TKT-${timestamp}-${random}`;
-
-			await client.request(
-				(updateItem as any)('event_registrations', registrationId, {
-					ticket_code: ticketCode,
-					stripe_payment_intent_id: paymentIntent.id,
-				}),
-			);
-
+		if (ticketCode) {
 			console.log(`[Webhook] ✅ First installment paid - ticket code generated: ${ticketCode}`);
-
-			// Increment quantity_sold on ticket (only for first installment)
-			if (installment.registration_id.ticket_type_id) {
-				try {
-					const ticketId =
-						typeof installment.registration_id.ticket_type_id === 'object'
-							? installment.registration_id.ticket_type_id.id
-							: installment.registration_id.ticket_type_id;
-
-					const ticket: any = await client.request(
-						(readItem as any)('event_tickets', ticketId, {
-							fields: ['id', 'quantity_sold', 'title'],
-						}),
-					);
-
-					const currentSold = ticket.quantity_sold || 0;
-					const newSold = currentSold + (installment.registration_id.quantity || 1);
-
-					await client.request(
-						(updateItem as any)('event_tickets', ticketId, {
-							quantity_sold: newSold,
-						}),
-					);
-
-					console.log(
-						`[Webhook] Ticket "${ticket.title}" quantity_sold: ${currentSold} → ${newSold}`,
-					);
-				} catch (error: any) {
-					console.error('[Webhook] Error updating ticket quantity_sold:', error);
-				}
-			}
 		}
 
 		// TODO: Send email notification
@@ -298,120 +353,124 @@ return;
 
 		console.log(`[Webhook] Processing ${registrationIds.length} registration(s)...`);
 
-		// ⚠️ IDEMPOTENCY CHECK: Verify if ANY of these registrations was already processed
-		const processedRegistrations = await client.request(
+		// One read for the whole order instead of one per registration
+		const registrations: any[] = await client.request(
 			(readItems as any)('event_registrations', {
 				filter: {
 					id: { _in: registrationIds },
-					payment_status: { _eq: 'paid' },
 				},
-				fields: ['id'],
+				fields: [
+					'id',
+					'ticket_type_id',
+					'quantity',
+					'status',
+					'payment_status',
+					'participant_name',
+					'participant_email',
+					'total_amount',
+					'event_id',
+					'stripe_checkout_session_id',
+				],
+				limit: -1,
 			}),
 		);
 
-		if (Array.isArray(processedRegistrations) && processedRegistrations.length > 0) {
-			console.log(
-				`[Webhook] ⚠️  ${processedRegistrations.length} registration(s) already processed for Payment Intent ${paymentIntent.id}. Skipping to avoid duplicate quantity_sold increment.`,
+		if (registrations.length < registrationIds.length) {
+			const found = new Set(registrations.map((registration) => registration.id));
+			console.warn(
+				`[Webhook] Registration(s) not found: ${registrationIds.filter((id) => !found.has(id)).join(', ')}`,
 			);
-			
-return;
 		}
 
-		// Process each registration
-		for (const registrationId of registrationIds) {
-			try {
-				// Read current registration
-				const registration: any = await client.request(
-					(readItem as any)('event_registrations', registrationId, {
-						fields: [
-							'id',
-							'ticket_type_id',
-							'quantity',
-							'status',
-							'payment_status',
-							'participant_name',
-							'participant_email',
-							'total_amount',
-							'event_id',
-						],
-					}),
-				);
+		// ⚠️ IDEMPOTENCY CHECK: registrations already paid are not confirmed (nor logged) again
+		const pendingRegistrations = registrations.filter((registration) => registration.payment_status !== 'paid');
 
-				// Skip if already processed (idempotency - secondary check)
-				if (registration.payment_status === 'paid') {
-					console.log(`[Webhook] Registration ${registrationId} already processed`);
-					continue;
-				}
+		if (pendingRegistrations.length < registrations.length) {
+			console.log(
+				`[Webhook] ⚠️  ${registrations.length - pendingRegistrations.length} registration(s) already processed for Payment Intent ${paymentIntent.id}. Skipping confirmation; the ledger ignores repeated sales.`,
+			);
+		}
 
-				// Generate unique ticket code
-				const timestamp = Date.now().toString(36).toUpperCase();
-				const random = Math.random().toString(36).substring(2, 8).toUpperCase();
-				const ticketCode = `TKT-${timestamp}-${random}`;
+		if (pendingRegistrations.length > 0) {
+			const confirmed = pendingRegistrations.map((registration) => ({
+				registration,
+				ticketCode: generateTicketCode(),
+			}));
 
-				// Update registration
-				await client.request(
-					(updateItem as any)('event_registrations', registrationId, {
+			// Each registration gets its own ticket code, so this is a batch PATCH (one request, one transaction)
+			await client.request(
+				(updateItemsBatch as any)(
+					'event_registrations',
+					confirmed.map(({ registration, ticketCode }) => ({
+						id: registration.id,
 						payment_status: 'paid',
 						status: 'confirmed',
 						stripe_payment_intent_id: paymentIntent.id,
 						ticket_code: ticketCode,
-					}),
-				);
+					})),
+				),
+			);
 
-				console.log(`[Webhook] ✅ Registration ${registrationId} confirmed with code: ${ticketCode}`);
+			for (const { registration, ticketCode } of confirmed) {
+				console.log(`[Webhook] ✅ Registration ${registration.id} confirmed with code: ${ticketCode}`);
+			}
 
-				// Log payment transaction for audit
-				await logPaymentTransaction(
-					`evt_${Date.now()}_${registrationId}`, // Unique event ID per registration
-					'payment_intent.succeeded',
-					paymentIntent.id,
-					registration.total_amount || 0,
-					'succeeded',
-					{
+			// Log payment transactions for audit
+			await logPaymentTransactions(
+				confirmed.map(({ registration, ticketCode }) => ({
+					eventId: `evt_${Date.now()}_${registration.id}`, // Unique event ID per registration
+					eventType: 'payment_intent.succeeded',
+					objectId: paymentIntent.id,
+					amount: registration.total_amount || 0,
+					status: 'succeeded',
+					metadata: {
 						payment_intent: paymentIntent.id,
-						registration_id: registrationId,
+						registration_id: registration.id,
 						ticket_code: ticketCode,
 						amount: registration.total_amount,
 						participant_email: registration.participant_email,
 					},
-					registrationId,
+					registrationId: registration.id,
+				})),
+			);
+		}
+
+		// Record the sales in the inventory ledger (atomic, idempotent per registration). Already paid
+		// registrations are included: a previous delivery may have failed before reaching the ledger.
+		const sales = registrations.map(toInventoryMovement).filter((sale): sale is InventoryMovement => sale !== null);
+
+		try {
+			const recorded = await recordSales(client, sales);
+
+			for (const sale of sales) {
+				console.log(
+					`[Webhook] Ticket ${sale.ticketId}: sale of registration ${sale.registrationId} ${recorded.has(sale.registrationId) ? 'recorded' : 'already recorded'}`,
 				);
+			}
+		} catch (error: any) {
+			console.error('[Webhook] Error recording ticket sales:', error);
+			throw error;
+		}
 
-				// Increment quantity_sold on the ticket
-				if (registration.ticket_type_id) {
-					try {
-						const ticketId =
-							typeof registration.ticket_type_id === 'object'
-								? registration.ticket_type_id.id
-								: registration.ticket_type_id;
-
-						const ticket: any = await client.request(
-							(readItem as any)('event_tickets', ticketId, {
-								fields: ['id', 'quantity_sold', 'title'],
-							}),
-						);
-
-						const currentSold = ticket.quantity_sold || 0;
-						const newSold = currentSold + (registration.quantity || 1);
-
-						await client.request(
-							(updateItem as any)('event_tickets', ticketId, {
-								quantity_sold: newSold,
-							}),
-						);
-
-						console.log(
-							`[Webhook] Ticket "${ticket.title}" quantity_sold: ${currentSold} → ${newSold}`,
-						);
-					} catch (error: any) {
-						console.error('[Webhook] Error updating ticket quantity_sold:', error);
-					}
-				}
+		for (const registration of pendingRegistrations) {
+			// TODO: Send confirmation email
+			console.log(`[Webhook] TODO: Send confirmation email to ${registration.participant_email}`);
+		}
 
-				// TODO: Send confirmation email
-				console.log(`[Webhook] TODO: Send confirmation email to ${registration.participant_email}`);
+		// Checkout sessions whose ticket holds become sales
+		const checkoutSessionIds = new Set<string>(
+			registrations
+				.map((registration) => registration.stripe_checkout_session_id)
+				.filter((sessionId): sessionId is string => Boolean(sessionId)),
+		);
+
+		// Sold tickets are now in the ledger; drop the reservation so they are not counted twice
+		for (const sessionId of checkoutSessionIds) {
+			try {
+				await releaseHolds(client, sessionId, 'converted');
 			} catch (error: any) {
-				console.error(`[Webhook] Error processing registration ${registrationId}:`, error);
+				console.error(`[Webhook] Error converting holds of session ${sessionId}:`, error);
+				throw error;
 			}
 		}
 
@@ -448,24 +507,24 @@ export async function handlePaymentIntentFailed(
 			registrationIds[0], // Link to first registration if available
 		);
 
-		// Update registrations to failed status
+		// Update registrations to failed status (single bulk PATCH, same data for all)
 		if (registrationIds.length > 0) {
-			for (const registrationId of registrationIds) {
-				try {
-					await client.request(
-						(updateItem as any)('event_registrations', registrationId, {
-							payment_status: 'pending', // Keep as pending for retry
-							status: 'pending',
-						}),
-					);
-					console.log(`[Webhook] Registration ${registrationId} marked as pending (payment failed)`);
-				} catch (error: any) {
-					console.error(`[Webhook] Error updating registration ${registrationId}:`, error);
-				}
+			try {
+				await client.request(
+					(updateItems as any)('event_registrations', registrationIds, {
+						payment_status: 'pending', // Keep as pending for retry
+						status: 'pending',
+					}),
+				);
+				console.log(`[Webhook] Registration(s) ${registrationIds.join(', ')} marked as pending (payment failed)`);
+			} catch (error: any) {
+				console.error(`[Webhook] Error updating registrations ${registrationIds.join(', ')}:`, error);
+				throw error;
 			}
 		}
 	} catch (error: any) {
 		console.error('[Webhook] Error in handlePaymentIntentFailed:', error);
+		throw error;
 	}
 }
 
@@ -480,6 +539,22 @@ export async function handleCheckoutSessionCompleted(
 	// TODO: Optional early confirmation logic
 }
 
+/**
+ * Handle checkout.session.expired event: return the session's ticket holds to inventory
+ */
+export async function handleCheckoutSessionExpired(
+	session: Stripe.Checkout.Session,
+): Promise<void> {
+	console.log('[Webhook] Checkout session expired:', session.id);
+
+	try {
+		await releaseHolds(getAdminClient(), session.id, 'expired');
+	} catch (error: any) {
+		console.error('[Webhook] Error releasing holds of expired session:', error);
+		throw error;
+	}
+}
+
 /**
  * Handle charge.refunded event
  */
@@ -506,7 +581,8 @@ return;
 				filter: {
 					stripe_payment_intent_id: { _eq: paymentIntentId },
 				},
-				fields: ['id', 'participant_email', 'total_amount'],
+				fields: ['id', 'participant_email', 'total_amount', 'payment_status', 'ticket_type_id', 'quantity'],
+				limit: -1,
 			}),
 		);
 
@@ -525,25 +601,46 @@ return;
 			Array.isArray(registrations) && registrations[0] ? registrations[0].id : undefined,
 		);
 
-		// Update registrations to refunded status
 		if (Array.isArray(registrations) && registrations.length > 0) {
-			for (const registration of registrations) {
-				try {
-					await client.request(
-						(updateItem as any)('event_registrations', registration.id, {
-							payment_status: 'refunded',
-							status: 'cancelled',
-							stripe_refund_id: charge.refunds?.data?.[0]?.id || null,
-						}),
-					);
-					console.log(`[Webhook] ✅ Registration ${registration.id} marked as refunded`);
-				} catch (error: any) {
-					console.error(`[Webhook] Error updating registration ${registration.id}:`, error);
-				}
+			const refundedIds = registrations.map((registration: any) => registration.id);
+
+			// Return the tickets to inventory before changing the status: if the ledger write fails, the
+			// retry still sees the registrations as they were. Installment registrations stay `pending`
+			// after the first installment although their sale is recorded, so the ledger decides which
+			// ones hold stock (`paid` covers sales made before the ledger existed)
+			try {
+				const sold = await readRecordedSales(client, refundedIds);
+				const holdsStock = (registration: any) => registration.payment_status === 'paid' || sold.has(registration.id);
+				await recordRefunds(
+					client,
+					registrations
+						.filter(holdsStock)
+						.map(toInventoryMovement)
+						.filter((refund: InventoryMovement | null): refund is InventoryMovement => refund !== null),
+				);
+			} catch (error: any) {
+				console.error(`[Webhook] Error returning tickets of registrations ${refundedIds.join(', ')}:`, error);
+				throw error;
+			}
+
+			// Update registrations to refunded status (single bulk PATCH, same data for all)
+			try {
+				await client.request(
+					(updateItems as any)('event_registrations', refundedIds, {
+						payment_status: 'refunded',
+						status: 'cancelled',
+						stripe_refund_id: charge.refunds?.data?.[0]?.id || null,
+					}),
+				);
+				console.log(`[Webhook] ✅ Registration(s) ${refundedIds.join(', ')} marked as refunded`);
+			} catch (error: any) {
+				console.error(`[Webhook] Error updating registrations ${refundedIds.join(', ')}:`, error);
+				throw error;
 			}
 		}
 	} catch (error: any) {
 		console.error('[Webhook] Error in handleChargeRefunded:', error);
+		throw error;
 	}
 }
 
@@ -570,7 +667,17 @@ export async function handleAccountUpdated(account: Stripe.Account): Promise<voi
 					stripe_account_id: { _eq: account.id },
 				},
 				limit: 1,
-				fields: ['id', 'name', 'email', 'status', 'stripe_account_id', 'stripe_onboarding_complete', 'stripe_charges_enabled', 'stripe_payouts_enabled'],
+				fields: [
+					'id',
+					'name',
+					'email',
+					'status',
+					'user_id',
+					'stripe_account_id',
+					'stripe_onboarding_complete',
+					'stripe_charges_enabled',
+					'stripe_payouts_enabled',
+				],
 			}),
 		);
 
@@ -611,6 +718,7 @@ export async function handleAccountUpdated(account: Stripe.Account): Promise<voi
 			const result = await client.request(
 				updateItem('organizers', organizer.id, updateData),
 			);
+			invalidateServerAuth(organizer.user_id);
 
 			console.log(`[Webhook] ✅ Organizer ${organizer.id} updated successfully`);
 			console.log('[Webhook] Updated fields:', JSON.stringify(result, null, 2));
@@ -640,3 +748,37 @@ export async function handleAccountUpdated(account: Stripe.Account): Promise<voi
 		throw error;
 	}
 }
+
+/**
+ * Dispatch a verified Stripe event to its handler
+ */
+export async function handleStripeEvent(event: Stripe.Event): Promise<void> {
+	switch (event.type) {
+		case 'payment_intent.succeeded':
+			await handlePaymentIntentSucceeded(event.data.object as Stripe.PaymentIntent);
+			break;
+
+		case 'payment_intent.payment_failed':
+			await handlePaymentIntentFailed(event.data.object as Stripe.PaymentIntent);
+			break;
+
+		case 'checkout.session.completed':
+			await handleCheckoutSessionCompleted(event.data.object as Stripe.Checkout.Session);
+			break;
+
+		case 'checkout.session.expired':
+			await handleCheckoutSessionExpired(event.data.object as Stripe.Checkout.Session);
+			break;
+
+		case 'charge.refunded':
+			await handleChargeRefunded(event.data.object as Stripe.Charge);
+			break;
+
+		case 'account.updated':
+			await handleAccountUpdated(event.data.object as Stripe.Account);
+			break;
+
+		default:
+			console.log(`[Stripe Webhook] Unhandled event type: ${event.type}`);
+	}
+}
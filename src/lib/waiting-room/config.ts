@@ -0,0 +1,98 @@
+import { isWaitingRoomConfigured } from './tokens';
+import { directusTransport } from '@/lib/directus/transport';
+
+/**
+ * Configuração da sala de espera por evento (`events.waiting_room_enabled` / `waiting_room_rate`).
+ *
+ * Lida direto da API REST do Directus, fora das lanes de `scheduler.ts`: durante uma abertura de
+ * vendas essas filas são justamente o gargalo, e o middleware não pode esperar atrás do tráfego que
+ * está tentando conter. O resultado fica em cache por alguns segundos, então cada instância faz no
+ * máximo uma consulta por evento a cada `CONFIG_TTL_MS`.
+ */
+
+export interface WaitingRoomConfig {
+	eventId: string;
+	slug: string;
+	/** Compradores admitidos por minuto */
+	ratePerMinute: number;
+}
+
+type LookupField = 'id' | 'slug';
+
+interface CacheEntry {
+	value: WaitingRoomConfig | null;
+	expiresAt: number;
+}
+
+const CONFIG_TTL_MS = 15_000;
+/** Falhas ficam em cache por menos tempo, para religar a fila assim que o Directus responder */
+const FAILURE_TTL_MS = 3_000;
+const LOOKUP_TIMEOUT_MS = 2_000;
+const MAX_ENTRIES = 500;
+
+const cache = new Map<string, CacheEntry>();
+const inflight = new Map<string, Promise<WaitingRoomConfig | null>>();
+
+function remember(key: string, value: WaitingRoomConfig | null, ttl: number): void {
+	if (cache.size >= MAX_ENTRIES) {
+		cache.delete(cache.keys().next().value as string);
+	}
+	cache.set(key, { value, expiresAt: Date.now() + ttl });
+}
+
+async function lookup(field: LookupField, value: string): Promise<WaitingRoomConfig | null> {
+	const url = new URL('/items/events', process.env.NEXT_PUBLIC_DIRECTUS_URL);
+	url.searchParams.set('filter', JSON.stringify({ [field]: { _eq: value }, status: { _eq: 'published' } }));
+	url.searchParams.set('fields', 'id,slug,waiting_room_enabled,waiting_room_rate');
+	url.searchParams.set('limit', '1');
+
+	try {
+		const response = await directusTransport(url, { signal: AbortSignal.timeout(LOOKUP_TIMEOUT_MS), cache: 'no-store' });
+		if (!response.ok) {
+			throw new Error(`Directus respondeu ${response.status}`);
+		}
+
+		const { data } = await response.json();
+		const event = data?.[0];
+		const config: WaitingRoomConfig | null =
+			event?.waiting_room_enabled && Number(event.waiting_room_rate) > 0
+				? { eventId: event.id, slug: event.slug, ratePerMinute: Number(event.waiting_room_rate) }
+				: null;
+
+		remember(`${field}:${value}`, config, CONFIG_TTL_MS);
+		if (config) {
+			remember(`${field === 'id' ? 'slug' : 'id'}:${field === 'id' ? config.slug : config.eventId}`, config, CONFIG_TTL_MS);
+		}
+
+		return config;
+	} catch (error) {
+		// Sem configuração a página segue aberta: a fila nunca derruba o site
+		console.error(`[WaitingRoom] Erro ao ler configuração do evento (${field}=${value}):`, error);
+		remember(`${field}:${value}`, null, FAILURE_TTL_MS);
+
+		return null;
+	}
+}
+
+/**
+ * Configuração da sala de espera do evento, ou `null` se o evento não usa fila (ou falta `WAITING_ROOM_SECRET`).
+ */
+export function getWaitingRoomConfig(field: LookupField, value: string): Promise<WaitingRoomConfig | null> {
+	if (!isWaitingRoomConfigured()) {
+		return Promise.resolve(null);
+	}
+
+	const key = `${field}:${value}`;
+	const cached = cache.get(key);
+	if (cached && cached.expiresAt > Date.now()) {
+		return Promise.resolve(cached.value);
+	}
+
+	let pending = inflight.get(key);
+	if (!pending) {
+		pending = lookup(field, value).finally(() => inflight.delete(key));
+		inflight.set(key, pending);
+	}
+
+	return pending;
+}
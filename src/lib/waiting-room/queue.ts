@@ -0,0 +1,227 @@
+import { directusTransport } from '@/lib/directus/transport';
+import { parseDirectusError } from '@/lib/directus/error-utils';
+
+/**
+ * Fila de admissão por evento, compartilhada entre instâncias pela collection `waiting_room_tickets`.
+ *
+ * Cada comprador recebe um número sequencial `n`, gravado com a chave `<evento>:<n>`: o Directus não
+ * tem incremento atômico, mas a chave primária é única, então duas instâncias nunca emitem o mesmo
+ * número (quem colide relê o fim da fila e tenta o seguinte). Os pedidos que chegam a uma instância
+ * enquanto uma gravação está em andamento saem juntos no próximo INSERT.
+ *
+ * O horário de admissão é calculado na entrada, como um token bucket (GCRA): `ratePerMinute` por
+ * minuto, com rajada de cerca de um segundo da vazão; uma fila vazia não acumula vagas. Ele vai no
+ * cookie assinado, então consultar a posição não toca o Directus, e uma mudança de vazão vale para
+ * quem entrar depois dela. Um restart não perde a fila.
+ */
+
+export interface QueueStatus {
+	n: number;
+	/** Momento (ms) em que o comprador é admitido */
+	admitAt: number;
+	admitted: boolean;
+	/** Pessoas à frente (0 quando admitido) */
+	position: number;
+	etaSeconds: number;
+}
+
+interface Tail {
+	n: number;
+	/** Horário teórico (ms) a partir do qual o próximo entra sem usar a rajada */
+	nextAt: number;
+}
+
+interface Joiner {
+	resolve: (status: QueueStatus) => void;
+	reject: (error: unknown) => void;
+}
+
+interface Room {
+	/** Último número emitido conhecido por esta instância; `null` até a primeira leitura */
+	tail: Tail | null;
+	waiting: Joiner[];
+	ratePerMinute: number;
+	flushing: boolean;
+}
+
+const TICKETS = 'waiting_room_tickets';
+/** Números gravados num INSERT */
+const MAX_BATCH = 100;
+/** Colisões seguidas com outras instâncias antes de devolver erro (o cliente tenta de novo) */
+const MAX_CLAIM_ATTEMPTS = 5;
+const REQUEST_TIMEOUT_MS = 5_000;
+
+const rooms = new Map<string, Room>();
+
+/** Admissões liberadas de imediato: cerca de um segundo da vazão configurada */
+function burstFor(ratePerMinute: number): number {
+	return Math.max(1, Math.ceil(ratePerMinute / 60));
+}
+
+const intervalFor = (ratePerMinute: number) => 60_000 / ratePerMinute;
+
+function statusOf(n: number, admitAt: number, ratePerMinute: number, now: number): QueueStatus {
+	const wait = Math.max(0, admitAt - now);
+
+	return {
+		n,
+		admitAt,
+		admitted: wait === 0,
+		position: Math.ceil(wait / intervalFor(ratePerMinute)),
+		etaSeconds: Math.ceil(wait / 1000),
+	};
+}
+
+/**
+ * Chamada à API REST do Directus com o token de admin, fora das lanes de `scheduler.ts` (como
+ * `config.ts`): numa abertura de vendas elas estão cheias justamente do tráfego que a fila segura.
+ */
+async function directus(path: string, init?: RequestInit): Promise<any> {
+	const response = await directusTransport(new URL(path, process.env.NEXT_PUBLIC_DIRECTUS_URL), {
+		...init,
+		headers: {
+			Authorization: `Bearer ${process.env.DIRECTUS_ADMIN_TOKEN}`,
+			'Content-Type': 'application/json',
+		},
+		signal: AbortSignal.timeout(REQUEST_TIMEOUT_MS),
+		cache: 'no-store',
+	});
+	const body = await response.json().catch(() => ({}));
+	if (!response.ok) {
+		throw { ...body, status: response.status };
+	}
+
+	return body.data;
+}
+
+async function readTail(eventId: string): Promise<Tail> {
+	const params = new URLSearchParams({
+		filter: JSON.stringify({ event_id: { _eq: eventId } }),
+		fields: 'n,next_at',
+		sort: '-n',
+		limit: '1',
+	});
+	const [last] = await directus(`/items/${TICKETS}?${params}`);
+
+	return last ? { n: Number(last.n), nextAt: Date.parse(last.next_at) || 0 } : { n: 0, nextAt: 0 };
+}
+
+/**
+ * Grava os próximos números da fila para `count` compradores. Devolve `null` se outra instância
+ * gravou algum deles antes (o lote inteiro é rejeitado).
+ */
+async function issue(eventId: string, room: Room, count: number): Promise<QueueStatus[] | null> {
+	const tail = room.tail as Tail;
+	const interval = intervalFor(room.ratePerMinute);
+	const tolerance = (burstFor(room.ratePerMinute) - 1) * interval;
+	const now = Date.now();
+	const rows = [];
+	const statuses: QueueStatus[] = [];
+	let { n, nextAt } = tail;
+
+	for (let joined = 0; joined < count; joined++) {
+		n += 1;
+		const admitAt = Math.max(now, nextAt - tolerance);
+		nextAt = Math.max(nextAt, now) + interval;
+		rows.push({
+			id: `${eventId}:${n}`,
+			event_id: eventId,
+			n,
+			admit_at: new Date(admitAt).toISOString(),
+			next_at: new Date(nextAt).toISOString(),
+		});
+		statuses.push(statusOf(n, admitAt, room.ratePerMinute, now));
+	}
+
+	try {
+		await directus(`/items/${TICKETS}?fields=id`, { method: 'POST', body: JSON.stringify(rows) });
+	} catch (error) {
+		if (parseDirectusError(error).code === 'RECORD_NOT_UNIQUE') {
+			return null;
+		}
+		throw error;
+	}
+	room.tail = { n, nextAt };
+
+	return statuses;
+}
+
+async function flush(eventId: string, room: Room): Promise<void> {
+	room.flushing = true;
+
+	while (room.waiting.length > 0) {
+		const batch = room.waiting.splice(0, MAX_BATCH);
+
+		try {
+			let statuses: QueueStatus[] | null = null;
+			for (let attempt = 0; !statuses && attempt < MAX_CLAIM_ATTEMPTS; attempt++) {
+				if (!room.tail || attempt > 0) {
+					room.tail = await readTail(eventId);
+				}
+				statuses = await issue(eventId, room, batch.length);
+			}
+			if (!statuses) {
+				throw new Error(`Fila do evento ${eventId}: números disputados por outras instâncias`);
+			}
+
+			batch.forEach((joiner, index) => joiner.resolve((statuses as QueueStatus[])[index]));
+		} catch (error) {
+			// O fim da fila pode ter mudado no meio: a próxima gravação relê
+			room.tail = null;
+			batch.forEach((joiner) => joiner.reject(error));
+		}
+	}
+
+	room.flushing = false;
+}
+
+function roomFor(eventId: string, ratePerMinute: number): Room {
+	let room = rooms.get(eventId);
+	if (!room) {
+		room = { tail: null, waiting: [], ratePerMinute, flushing: false };
+		rooms.set(eventId, room);
+	}
+	// Mudanças de vazão no Directus valem para as próximas entradas
+	room.ratePerMinute = ratePerMinute;
+
+	return room;
+}
+
+/**
+ * Coloca um comprador no fim da fila.
+ */
+export function joinQueue(eventId: string, ratePerMinute: number): Promise<QueueStatus> {
+	const room = roomFor(eventId, ratePerMinute);
+
+	return new Promise((resolve, reject) => {
+		room.waiting.push({ resolve, reject });
+		if (!room.flushing) {
+			void flush(eventId, room);
+		}
+	});
+}
+
+/**
+ * Situação de quem já está na fila, a partir do número e do horário de admissão do cookie.
+ */
+export function queueStatus(
+	ticket: { n: number; admitAt: number },
+	ratePerMinute: number,
+	now = Date.now(),
+): QueueStatus {
+	return statusOf(ticket.n, ticket.admitAt, ratePerMinute, now);
+}
+
+/**
+ * Profundidade da fila para logs e monitoramento, pelo último número que esta instância viu.
+ */
+export function queueDepth(eventId: string, now = Date.now()): number {
+	const room = rooms.get(eventId);
+	if (!room?.tail) {
+		return 0;
+	}
+	const interval = intervalFor(room.ratePerMinute);
+	const tolerance = (burstFor(room.ratePerMinute) - 1) * interval;
+
+	return Math.ceil(Math.max(0, room.tail.nextAt - tolerance - now) / interval);
+}
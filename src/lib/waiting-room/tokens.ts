@@ -0,0 +1,119 @@
+/**
+ * Tokens assinados da sala de espera (HMAC-SHA256 com `WAITING_ROOM_SECRET`).
+ *
+ * Formato: `base64url(JSON do payload).base64url(assinatura)`. Usa apenas Web Crypto, então o mesmo
+ * código roda no middleware (Edge Runtime) e nas rotas de API (Node.js).
+ */
+
+export const ADMISSION_COOKIE_PREFIX = 'wr_admit_';
+export const QUEUE_COOKIE_PREFIX = 'wr_queue_';
+
+/** Tempo que um comprador admitido tem para concluir o checkout */
+export const ADMISSION_TTL_MS = Math.max(5, Number(process.env.WAITING_ROOM_ADMISSION_MINUTES) || 20) * 60_000;
+
+/** Entrada na fila: número `n` na fila do evento e o horário (ms) em que ele é admitido */
+export interface QueueTicket {
+	kind: 'queue';
+	eventId: string;
+	n: number;
+	admitAt: number;
+	exp: number;
+}
+
+/** Admissão: libera páginas do evento e o checkout até `exp` */
+export interface AdmissionToken {
+	kind: 'admit';
+	eventId: string;
+	exp: number;
+}
+
+type SignedPayload = QueueTicket | AdmissionToken;
+
+const encoder = new TextEncoder();
+const decoder = new TextDecoder();
+
+let signingKey: Promise<CryptoKey> | null = null;
+
+/**
+ * Sem segredo a sala de espera fica desligada (fail-open): nenhum evento é bloqueado.
+ */
+export function isWaitingRoomConfigured(): boolean {
+	return Boolean(process.env.WAITING_ROOM_SECRET);
+}
+
+function getSigningKey(): Promise<CryptoKey> {
+	signingKey ??= crypto.subtle.importKey(
+		'raw',
+		encoder.encode(process.env.WAITING_ROOM_SECRET as string),
+		{ name: 'HMAC', hash: 'SHA-256' },
+		false,
+		['sign', 'verify'],
+	);
+
+	return signingKey;
+}
+
+function toBase64Url(bytes: Uint8Array): string {
+	let binary = '';
+	for (const byte of bytes) {
+		binary += String.fromCharCode(byte);
+	}
+
+	return btoa(binary).replace(/\+/g, '-').replace(/\//g, '_').replace(/=+$/, '');
+}
+
+function fromBase64Url(value: string): Uint8Array {
+	const binary = atob(value.replace(/-/g, '+').replace(/_/g, '/'));
+
+	return Uint8Array.from(binary, (char) => char.charCodeAt(0));
+}
+
+export async function signToken(payload: SignedPayload): Promise<string> {
+	const body = toBase64Url(encoder.encode(JSON.stringify(payload)));
+	const signature = await crypto.subtle.sign('HMAC', await getSigningKey(), encoder.encode(body));
+
+	return `${body}.${toBase64Url(new Uint8Array(signature))}`;
+}
+
+/**
+ * Valida assinatura, tipo, evento e expiração. Retorna `null` para qualquer token inválido.
+ */
+export async function verifyToken<K extends SignedPayload['kind']>(
+	token: string | undefined,
+	kind: K,
+	eventId: string,
+	now = Date.now(),
+): Promise<Extract<SignedPayload, { kind: K }> | null> {
+	if (!token || !isWaitingRoomConfigured()) {
+		return null;
+	}
+
+	const [body, signature] = token.split('.');
+	if (!body || !signature) {
+		return null;
+	}
+
+	try {
+		const valid = await crypto.subtle.verify('HMAC', await getSigningKey(), fromBase64Url(signature), encoder.encode(body));
+		if (!valid) {
+			return null;
+		}
+
+		const payload = JSON.parse(decoder.decode(fromBase64Url(body))) as SignedPayload;
+		if (payload.kind !== kind || payload.eventId !== eventId || payload.exp <= now) {
+			return null;
+		}
+
+		return payload as Extract<SignedPayload, { kind: K }>;
+	} catch {
+		return null;
+	}
+}
+
+export function admissionCookieName(eventId: string): string {
+	return `${ADMISSION_COOKIE_PREFIX}${eventId}`;
+}
+
+export function queueCookieName(eventId: string): string {
+	return `${QUEUE_COOKIE_PREFIX}${eventId}`;
+}
@@ -2,11 +2,12 @@
  * Next.js Middleware for Server-Side Authentication
  *
  * This middleware runs before every request and:
- * 1. Validates authentication tokens from httpOnly cookies
+ * 1. Validates authentication tokens from httpOnly cookies (locally, with DIRECTUS_SECRET)
  * 2. Auto-refreshes expired tokens
  * 3. Enforces role-based access control (user vs organizer)
  * 4. Redirects unauthorized users to login
  * 5. Adds user context headers for Server Components
+ * 6. Sends buyers of flash-sale events through the waiting room (/fila/[slug])
  *
  * @see https://nextjs.org/docs/app/building-your-application/routing/middleware
  */
@@ -16,6 +17,12 @@ import type { NextRequest } from 'next/server';
 import { readMe, readItems } from '@directus/sdk';
 import { getAuthClient, getAuthenticatedClient } from '@/lib/directus/directus';
 import { isOrganizerRole } from '@/lib/auth/roles';
+import { verifyDirectusToken } from '@/lib/auth/jwt';
+import { coalesceRefresh, type RefreshedTokens } from '@/lib/auth/refresh-coalescing';
+import { cacheSessionProfile, getCachedSessionProfile, type SessionProfile } from '@/lib/auth/session-cache';
+import { AppError } from '@/lib/errors';
+import { getWaitingRoomConfig } from '@/lib/waiting-room/config';
+import { admissionCookieName, verifyToken } from '@/lib/waiting-room/tokens';
 
 /**
  * Generates a UUID v4 compatible with Edge Runtime
@@ -33,6 +40,7 @@ const ROUTES = {
 	public: [
 		'/',
 		'/eventos',
+		'/fila',
 		'/blog',
 		'/login',
 		'/register',
@@ -72,14 +80,73 @@ function isStaticOrInternal(pathname: string): boolean {
 	);
 }
 
+/**
+ * Event pages gated by the waiting room: /eventos/[slug] and /eventos/[slug]/checkout
+ */
+const WAITING_ROOM_PAGE = /^\/eventos\/([^/]+)(?:\/checkout)?\/?$/;
+const CHECKOUT_SESSION_API = '/api/stripe/checkout-session';
+
+function waitingRoomUrl(slug: string, next: string): string {
+	return `/fila/${encodeURIComponent(slug)}?next=${encodeURIComponent(next)}`;
+}
+
+/**
+ * Waiting room gate for events with `waiting_room_enabled`
+ *
+ * Pages without a valid admission cookie are redirected to the queue; the checkout API answers
+ * 403 (RFC 7807) pointing to it. Returns null when the request may continue.
+ */
+async function enforceWaitingRoom(request: NextRequest, requestId: string): Promise<NextResponse | null> {
+	const { pathname } = request.nextUrl;
+
+	if (pathname === CHECKOUT_SESSION_API) {
+		if (request.method !== 'POST') return null;
+
+		const body = await request
+			.clone()
+			.json()
+			.catch(() => null);
+		const eventId = typeof body?.eventId === 'string' ? body.eventId : null;
+		// Invalid payloads are rejected by the route's own validation
+		if (!eventId) return null;
+
+		const config = await getWaitingRoomConfig('id', eventId);
+		if (!config) return null;
+		if (await verifyToken(request.cookies.get(admissionCookieName(eventId))?.value, 'admit', eventId)) return null;
+
+		const problem = new AppError({
+			message: 'Este evento está com sala de espera. Aguarde sua vez na fila para comprar.',
+			status: 403,
+			code: 'WAITING_ROOM_REQUIRED',
+			requestId,
+			context: { waitingRoomUrl: waitingRoomUrl(config.slug, `/eventos/${config.slug}/checkout`) },
+		}).toProblem({ instance: request.url });
+
+		return NextResponse.json(problem, {
+			status: 403,
+			headers: { 'Content-Type': 'application/problem+json', 'x-request-id': requestId },
+		});
+	}
+
+	const match = WAITING_ROOM_PAGE.exec(pathname);
+	if (!match) return null;
+
+	const config = await getWaitingRoomConfig('slug', decodeURIComponent(match[1]));
+	if (!config) return null;
+	if (await verifyToken(request.cookies.get(admissionCookieName(config.eventId))?.value, 'admit', config.eventId)) {
+		return null;
+	}
+
+	const response = NextResponse.redirect(new URL(waitingRoomUrl(config.slug, pathname), request.url));
+	response.headers.set('x-request-id', requestId);
+
+	return response;
+}
+
 /**
  * Refresh access token using refresh token
  */
-async function refreshAccessToken(refreshToken: string): Promise<{
-	access_token: string;
-	refresh_token: string;
-	expires: number;
-} | null> {
+async function requestTokenRefresh(refreshToken: string): Promise<RefreshedTokens | null> {
 	try {
 		const client = getAuthClient();
 		client.setToken(refreshToken);
@@ -102,6 +169,81 @@ return null;
 	}
 }
 
+/**
+ * Refresh shared by every concurrent request carrying the same refresh token
+ *
+ * Directus rotates refresh tokens, so parallel refreshes from one browser would all fail but one.
+ */
+function refreshAccessToken(refreshToken: string): Promise<RefreshedTokens | null> {
+	return coalesceRefresh(refreshToken, requestTokenRefresh);
+}
+
+/**
+ * Tokens expiring within this window are always validated against Directus
+ */
+const NEAR_EXPIRY_SECONDS = 60;
+
+/**
+ * Reads the user and organizer status from Directus and caches them for the next navigations
+ */
+async function loadSessionProfile(accessToken: string): Promise<SessionProfile> {
+	const client = getAuthenticatedClient(accessToken);
+
+	const user = await client.request(
+		readMe({
+			fields: ['id', 'email', 'first_name', 'last_name', { role: ['id', 'name'] }],
+		})
+	);
+
+	const hasOrganizerRole = isOrganizerRole(user.role);
+	let organizerId: string | null = null;
+
+	if (hasOrganizerRole) {
+		const organizers = await client.request(
+			readItems('organizers', {
+				filter: {
+					user_id: { _eq: user.id },
+					status: { _in: ['active', 'pending'] },
+				},
+				fields: ['id', 'name'],
+				limit: 1,
+			})
+		);
+
+		organizerId = organizers.length > 0 ? organizers[0].id : null;
+	}
+
+	const profile: SessionProfile = {
+		userId: user.id,
+		roleId: user.role?.id ?? null,
+		email: user.email || '',
+		isOrganizer: hasOrganizerRole,
+		organizerId,
+	};
+	cacheSessionProfile(profile);
+
+	return profile;
+}
+
+/**
+ * Resolves the session of an access token
+ *
+ * With DIRECTUS_SECRET set, the JWT is verified locally and the cached profile of its user (same
+ * role) is used without calling Directus. Directus is asked only on a cache miss, for tokens close
+ * to expiry, or when the token cannot be verified locally (the remote call is the final word and
+ * throws for invalid tokens).
+ */
+async function resolveSession(accessToken: string): Promise<SessionProfile> {
+	const claims = await verifyDirectusToken(accessToken);
+
+	if (claims && claims.exp * 1000 - Date.now() > NEAR_EXPIRY_SECONDS * 1000) {
+		const cached = getCachedSessionProfile(claims.id, claims.role);
+		if (cached) return cached;
+	}
+
+	return loadSessionProfile(accessToken);
+}
+
 /**
  * Main middleware function
  */
@@ -111,6 +253,12 @@ export async function middleware(request: NextRequest) {
 	// Generate or extract requestId for distributed tracing
 	const requestId = request.headers.get('x-request-id') || generateRequestId();
 
+	// Flash-sale events: only admitted buyers reach the event page and checkout
+	const queued = await enforceWaitingRoom(request, requestId);
+	if (queued) {
+		return queued;
+	}
+
 	// Skip middleware for static files and Next.js internals
 	if (isStaticOrInternal(pathname)) {
 		const response = NextResponse.next();
@@ -177,33 +325,8 @@ return response;
 	// Validate token and get user data
 	try {
 		console.log(`[Middleware] Validating access to: ${pathname}`);
-		const client = getAuthenticatedClient(accessToken);
-
-		const user = await client.request(
-			readMe({
-				fields: ['id', 'email', 'first_name', 'last_name', { role: ['id', 'name'] }],
-			})
-		);
-
-		const hasOrganizerRole = isOrganizerRole(user.role);
-		let organizerId: string | null = null;
-
-		if (hasOrganizerRole) {
-			const organizers = await client.request(
-				readItems('organizers', {
-					filter: {
-						user_id: { _eq: user.id },
-						status: { _in: ['active', 'pending'] },
-					},
-					fields: ['id', 'name'],
-					limit: 1,
-				})
-			);
-
-			organizerId = organizers.length > 0 ? organizers[0].id : null;
-		}
-
-		const isOrganizer = hasOrganizerRole;
+		const session = await resolveSession(accessToken);
+		const { isOrganizer, organizerId } = session;
 
 		// Enforce role-based access control
 		if (matchesRoute(pathname, ROUTES.admin)) {
@@ -220,8 +343,8 @@ return response;
 		const response = NextResponse.next();
 
 		response.headers.set('x-request-id', requestId);
-		response.headers.set('x-user-id', user.id);
-		response.headers.set('x-user-email', user.email || '');
+		response.headers.set('x-user-id', session.userId);
+		response.headers.set('x-user-email', session.email);
 		response.headers.set('x-is-organizer', isOrganizer.toString());
 
 		if (organizerId) {
@@ -276,7 +399,8 @@ return response;
  * Middleware matcher configuration
  *
  * Run middleware on all routes except:
- * - API routes (handled separately)
+ * - API routes (handled separately), apart from the checkout session
+ *   endpoint, which the waiting room gate protects
  * - Static files (_next/static, images, etc)
  * - Favicon
  */
@@ -291,5 +415,6 @@ export const config = {
 		 * - public files (images, fonts, etc)
 		 */
 		'/((?!api/|_next/static|_next/image|favicon.ico|.*\\..*|uploads/).*)',
+		'/api/stripe/checkout-session',
 	],
 };
@@ -388,6 +388,10 @@ export interface Event {
 	tags?: string[] | null;
 	/** @description Destacar evento? */
 	featured?: boolean | null;
+	/** @description Sala de espera na abertura de vendas (eventos com alta demanda) */
+	waiting_room_enabled?: boolean | null;
+	/** @description Compradores admitidos por minuto pela sala de espera */
+	waiting_room_rate?: number | null;
 	registrations?: EventRegistration[] | string[];
 	/** @description Tipos de ingressos disponíveis */
 	tickets?: EventTicket[] | string[];
@@ -761,6 +765,86 @@ export interface Redirect {
 	user_updated?: DirectusUser | string | null;
 }
 
+export interface StripeWebhookEvent {
+	/** @primaryKey @description Id do evento no Stripe (`evt_...`), chave de deduplicação */
+	id: string;
+	/** @description Tipo do evento (ex: payment_intent.succeeded) @required */
+	type: string;
+	/** @description Evento completo recebido do Stripe @required */
+	payload: Record<string, any>;
+	/** @description Situação na fila de processamento @required */
+	status: 'queued' | 'processing' | 'processed' | 'failed' | 'dead';
+	/** @description Tentativas de processamento já feitas */
+	attempts?: number | null;
+	/** @description Próxima tentativa após falha */
+	next_attempt_at?: string | null;
+	/** @description Início do processamento atual (lease) */
+	claimed_at?: string | null;
+	/** @description Número do último claim (`stripe_webhook_claims`) */
+	claims?: number | null;
+	/** @description Fim do processamento */
+	processed_at?: string | null;
+	/** @description Erro da última tentativa */
+	last_error?: string | null;
+	/** @description Criação do evento no Stripe */
+	stripe_created_at?: string | null;
+	/** @description Recebimento pelo webhook @required */
+	received_at: string;
+}
+
+export interface StripeWebhookClaim {
+	/** @primaryKey @description `<evento>:<número do claim>`, único por tentativa */
+	id: string;
+	/** @description Evento reivindicado @required */
+	event_id: StripeWebhookEvent | string;
+	/** @description Momento do claim @required */
+	claimed_at: string;
+}
+
+export interface TicketHold {
+	/** @primaryKey @description `<reserva>:<ingresso>` */
+	id: string;
+	/** @description Checkout Session do Stripe que segura a reserva (`pending:<reserva>` antes dela) @required */
+	session_id: string;
+	/** @description Ingresso reservado @required */
+	ticket_id: EventTicket | string;
+	/** @description Quantidade reservada @required */
+	quantity: number;
+	/** @description Fim da reserva (igual ao expires_at da sessão) @required */
+	expires_at: string;
+	/** @description Situação da reserva @required */
+	status: 'active' | 'converted' | 'released' | 'expired';
+	date_created?: string | null;
+}
+
+export interface WaitingRoomTicket {
+	/** @primaryKey @description `<evento>:<n>`, único por número da fila */
+	id: string;
+	/** @description Evento da fila @required */
+	event_id: Event | string;
+	/** @description Número na fila, em ordem de chegada @required */
+	n: number;
+	/** @description Horário de admissão do comprador @required */
+	admit_at: string;
+	/** @description A partir de quando o próximo número entra sem usar a rajada @required */
+	next_at: string;
+	date_created?: string | null;
+}
+
+export interface TicketInventoryLedger {
+	/** @primaryKey @description `sale:<inscrição>`, `refund:<inscrição>` ou `opening:<ingresso>` */
+	id: string;
+	/** @description Ingresso movimentado @required */
+	ticket_id: EventTicket | string;
+	/** @description Inscrição que originou o movimento */
+	registration_id?: EventRegistration | string | null;
+	/** @description Variação do vendido (+venda, -estorno) @required */
+	delta: number;
+	/** @description Origem do movimento @required */
+	reason: 'opening' | 'sale' | 'refund';
+	date_created?: string | null;
+}
+
 export interface DirectusAccess {
 	/** @primaryKey */
 	id: string;
@@ -1240,6 +1324,11 @@ export interface Schema {
 	payment_transactions: PaymentTransaction[];
 	posts: Post[];
 	redirects: Redirect[];
+	stripe_webhook_claims: StripeWebhookClaim[];
+	stripe_webhook_events: StripeWebhookEvent[];
+	ticket_holds: TicketHold[];
+	ticket_inventory_ledger: TicketInventoryLedger[];
+	waiting_room_tickets: WaitingRoomTicket[];
 	directus_access: DirectusAccess[];
 	directus_activity: DirectusActivity[];
 	directus_collections: DirectusCollection[];
@@ -1302,6 +1391,11 @@ export enum CollectionNames {
 	payment_transactions = 'payment_transactions',
 	posts = 'posts',
 	redirects = 'redirects',
+	stripe_webhook_claims = 'stripe_webhook_claims',
+	stripe_webhook_events = 'stripe_webhook_events',
+	ticket_holds = 'ticket_holds',
+	ticket_inventory_ledger = 'ticket_inventory_ledger',
+	waiting_room_tickets = 'waiting_room_tickets',
 	directus_access = 'directus_access',
 	directus_activity = 'directus_activity',
 	directus_collections = 'directus_collections',
@@ -1,35 +1,16 @@
 import asyncio
 from playwright import async_api
+from harness import BASE_URL, open_context
+from steps import Steps
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
+async def run_test(context=None):
+    async with open_context(context) as context:
         # Open a new page in the browser context
         page = await context.new_page()
+        steps = Steps(context)
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3001", wait_until="commit", timeout=10000)
+        await page.goto(BASE_URL, wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -48,63 +29,55 @@ async def run_test():
         # Click on 'Entrar' button to go to login page to authenticate and obtain access and refresh tokens
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/header/div/nav/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem)
         
 
         # Input valid email and password and submit login form to authenticate and obtain access and refresh tokens
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('user@example.com')
+        await steps.fill(elem, 'user@example.com')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('correct_password')
+        await steps.fill(elem, 'correct_password')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, navigates=True)
         
 
         # Check for alternative valid credentials or reset password to obtain valid credentials for authentication
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div[2]/form/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem)
         
 
         # Input valid email into password reset email field and submit to initiate password reset
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/main/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('user@example.com')
+        await steps.fill(elem, 'user@example.com')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/main/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, navigates=True)
         
 
         # Input a valid password in the password field and submit the form to complete password reset
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/main/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('new_secure_password')
+        await steps.fill(elem, 'new_secure_password')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/main/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, navigates=True)
         
 
         assert False, 'Test failed: JWT token refresh API did not issue a new access token as expected.'
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
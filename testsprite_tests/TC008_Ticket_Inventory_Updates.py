@@ -1,35 +1,16 @@
 import asyncio
 from playwright import async_api
+from harness import BASE_URL, open_context
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
+ROLE = "organizer"
+
+async def run_test(context=None):
+    async with open_context(context, ROLE) as context:
         # Open a new page in the browser context
         page = await context.new_page()
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3001", wait_until="commit", timeout=10000)
+        await page.goto(BASE_URL, wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -45,113 +26,11 @@ async def run_test():
                 pass
         
         # Interact with the page elements to simulate user flow
-        # Click on 'Entrar' button to log in as organizer to create event
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/header/div/nav/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Input organizer email and password and click 'Entrar' to log in
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('organizer@example.com')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('correctpassword')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Retry login with correct organizer credentials or find alternative login method
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('correct_organizer@example.com')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('correct_password')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Try password reset flow by clicking 'Esqueceu a senha?' link to recover organizer account access
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/form/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Try to log in as organizer from this page or find password reset option
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/main/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('correct_organizer@example.com')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/main/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('correct_password')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/main/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Check if 'Criar conta' link can be used to create a new organizer account or find alternative way to access organizer functions
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/main/div/div/div[2]/div[2]/p/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Fill in account creation form with valid data and submit to create new organizer account
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/main/div/div/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/main/div/div/div[2]/form/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Organizer')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/main/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test.organizer@example.com')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/main/div/div/div[2]/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('StrongPassword123')
-        
+        # Open /admin/ingressos directly with the cached organizer session instead of driving the login form
+        await page.goto(f"{BASE_URL}/admin/ingressos", timeout=10000)
+        assert '/login' not in page.url, 'Cached organizer session was rejected by the middleware'
+        assert False, 'Test plan execution failed: generic failure assertion.'
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/main/div/div/div[2]/form/div[4]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('StrongPassword123')
-        
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/main/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        assert False, 'Test plan execution failed: generic failure assertion.'
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -1,35 +1,19 @@
 import asyncio
 from playwright import async_api
+from harness import BASE_URL, open_context
+from steps import Steps
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
+# Checkout needs the real Stripe.js.
+NETWORK_PROFILE = "off"
+
+async def run_test(context=None):
+    async with open_context(context, network=NETWORK_PROFILE) as context:
         # Open a new page in the browser context
         page = await context.new_page()
+        steps = Steps(context)
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3001", wait_until="commit", timeout=10000)
+        await page.goto(BASE_URL, wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -48,7 +32,7 @@ async def run_test():
         # Click on 'Ver Detalhes' button of the first event 'Maratona de São Paulo 2025' to view event details and select tickets.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/main/div/div/div/div/section/div[3]/div[2]/div/div/div/a/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem)
         
 
         # Scroll down and look for another event or ticket option with available tickets to select and proceed to checkout.
@@ -58,19 +42,11 @@ async def run_test():
         # Click on 'Eventos' navigation link to return to events listing page and find an event with available tickets.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/header/div/nav/nav/div/ul/li[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem)
         
 
         assert False, 'Test plan execution failed: generic failure assertion.'
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -1,35 +1,16 @@
 import asyncio
 from playwright import async_api
+from harness import BASE_URL, open_context
+from steps import Steps
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
+async def run_test(context=None):
+    async with open_context(context) as context:
         # Open a new page in the browser context
         page = await context.new_page()
+        steps = Steps(context)
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3001", wait_until="commit", timeout=10000)
+        await page.goto(BASE_URL, wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -48,25 +29,25 @@ async def run_test():
         # Click on the 'Ver Detalhes' button of the first event to access its detail page via dynamic URL
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/main/div/div/div/div/section/div[3]/div[2]/div/div/div/a/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem)
         
 
         # Click on 'Ver Detalhes' button of the second event (index 18) to check if tickets are available for purchase
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/main/div/div/div/div/section/div[3]/div[2]/div/div/div[2]/a/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem)
         
 
         # Click on 'Ver Detalhes' button of the third event (index 20) to check ticket availability and proceed with purchase flow if available.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/main/div/div/div/div/section/div[3]/div[2]/div/div/div[3]/a/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem)
         
 
         # Click on 'Ver Detalhes' button of the 'DevConf Brasil 2025 - Conferência de Desenvolvedores' event (index 21) to check ticket availability and proceed with purchase flow if available.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/main/div/div/div/div/section/div[3]/div[2]/div/div/div[5]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem)
         
 
         # Assertion: Verify event details render correctly including tickets and images
@@ -76,7 +57,7 @@ async def run_test():
         assert await frame.locator('text=Presencial').is_visible()
         assert await frame.locator('text=Dois dias de música indie com bandas nacionais e internacionais em um ambiente único. Prepare-se para o Festival de Música Indie mais esperado do ano!').is_visible()
         for artist in ['The Midnight Club', 'Aurora Dreams', 'Cosmic Riders', 'Luna & The Stars', 'E muitos outros artistas surpresa']:
-    assert await frame.locator(f'text={artist}').is_visible()
+            assert await frame.locator(f'text={artist}').is_visible()
         assert await frame.locator('text=3').is_visible()  # stages
         assert await frame.locator('text=gastronomia variada').is_visible()  # food trucks
         assert await frame.locator('text=opcional').is_visible()  # camping area
@@ -91,15 +72,7 @@ async def run_test():
         assert await frame.locator('text=eventos@culturaviva.com.br').is_visible()  # organizer email
         assert await frame.locator('text=(21) 99876-5432').is_visible()  # organizer phone
         assert await frame.locator('text=https://culturaviva.com.br').is_visible()  # organizer website
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
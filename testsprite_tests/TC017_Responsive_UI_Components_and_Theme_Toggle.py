@@ -1,35 +1,16 @@
 import asyncio
 from playwright import async_api
+from harness import BASE_URL, open_context
+from steps import Steps
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
+async def run_test(context=None):
+    async with open_context(context) as context:
         # Open a new page in the browser context
         page = await context.new_page()
+        steps = Steps(context)
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3001", wait_until="commit", timeout=10000)
+        await page.goto(BASE_URL, wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -46,11 +27,11 @@ async def run_test():
         
         # Interact with the page elements to simulate user flow
         # Resize viewport to tablet size and verify UI responsiveness
-        await page.goto('http://localhost:3001/', timeout=10000)
+        await page.goto(f"{BASE_URL}/", timeout=10000)
         
 
         # Resize viewport to tablet size and verify UI responsiveness
-        await page.goto('http://localhost:3001/', timeout=10000)
+        await page.goto(f"{BASE_URL}/", timeout=10000)
         
 
         await page.mouse.wheel(0, 500)
@@ -59,71 +40,63 @@ async def run_test():
         # Resize viewport to tablet size and verify UI responsiveness
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/header/div/nav/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem)
         
 
         # Resize viewport to tablet size and verify UI responsiveness
-        await page.goto('http://localhost:3001/', timeout=10000)
+        await page.goto(f"{BASE_URL}/", timeout=10000)
         
 
         # Resize viewport to tablet size and verify UI responsiveness
-        await page.goto('http://localhost:3001/', timeout=10000)
+        await page.goto(f"{BASE_URL}/", timeout=10000)
         
 
         # Resize viewport to tablet size and verify UI responsiveness
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/header/div/nav/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem)
         
 
         # Resize viewport to tablet size and verify UI responsiveness
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/footer/div[2]/div[3]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem)
         
 
         # Resize viewport to tablet size and verify UI responsiveness
-        await page.goto('http://localhost:3001/', timeout=10000)
+        await page.goto(f"{BASE_URL}/", timeout=10000)
         
 
         # Resize viewport to tablet size and verify UI responsiveness
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/header/div/nav/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem)
         
 
         # Resize viewport to tablet size and verify UI responsiveness
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/header/div/nav/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem)
         
 
         # Resize viewport to tablet size and verify UI responsiveness
-        await page.goto('http://localhost:3001/', timeout=10000)
+        await page.goto(f"{BASE_URL}/", timeout=10000)
         
 
         # Resize viewport to tablet size and verify UI responsiveness
-        await page.goto('http://localhost:3001/', timeout=10000)
+        await page.goto(f"{BASE_URL}/", timeout=10000)
         
 
         # Resize viewport to tablet size and verify UI responsiveness
-        await page.goto('http://localhost:3001/', timeout=10000)
+        await page.goto(f"{BASE_URL}/", timeout=10000)
         
 
         # Resize viewport to tablet size and verify UI responsiveness
-        await page.goto('http://localhost:3001/', timeout=10000)
+        await page.goto(f"{BASE_URL}/", timeout=10000)
         
 
         assert False, 'Test plan execution failed: generic failure assertion.'
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -1,35 +1,16 @@
 import asyncio
 from playwright import async_api
+from harness import BASE_URL, open_context
+from steps import Steps
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
+async def run_test(context=None):
+    async with open_context(context) as context:
         # Open a new page in the browser context
         page = await context.new_page()
+        steps = Steps(context)
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3001", wait_until="commit", timeout=10000)
+        await page.goto(BASE_URL, wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -48,94 +29,86 @@ async def run_test():
         # Navigate to user login or admin interface to find file upload functionality for testing.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/header/div/nav/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem)
         
 
         # Input valid user credentials and submit login form to access user interface.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('user@example.com')
+        await steps.fill(elem, 'user@example.com')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('correct_password')
+        await steps.fill(elem, 'correct_password')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, navigates=True)
         
 
         # Try to navigate to registration or password reset to verify or recover credentials, or explore admin interface for file upload testing.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div[2]/form/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem)
         
 
         # Input admin credentials and attempt login to access admin interface for file upload testing.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/main/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@example.com')
+        await steps.fill(elem, 'admin@example.com')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/main/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin_password')
+        await steps.fill(elem, 'admin_password')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/main/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, navigates=True)
         
 
         # Explore 'Criar conta' (Create account) link to attempt account creation for access to file upload functionality.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/main/div/div/div[2]/div[2]/p/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem)
         
 
         # Fill in account creation form with valid data and submit to create new user account for access to user interface.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/main/div/div/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('João')
+        await steps.fill(elem, 'João')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/main/div/div/div[2]/form/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Silva')
+        await steps.fill(elem, 'Silva')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/main/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('joao.silva@example.com')
+        await steps.fill(elem, 'joao.silva@example.com')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/main/div/div/div[2]/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('StrongPassword123')
+        await steps.fill(elem, 'StrongPassword123')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/main/div/div/div[2]/form/div[4]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('StrongPassword123')
+        await steps.fill(elem, 'StrongPassword123')
         
 
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/main/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, navigates=True)
         
 
         assert False, 'Test plan execution failed: generic failure assertion.'
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
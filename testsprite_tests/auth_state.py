@@ -0,0 +1,121 @@
+"""Per-role authenticated storageState cache.
+
+Logs each role in once through ``POST /api/auth/login`` and persists the
+resulting Playwright storageState (the httpOnly ``access_token`` and
+``refresh_token`` cookies the middleware reads) under ``tmp/auth/``. Later
+callers reuse the file until the access token is about to expire; it is then
+rotated through ``/api/auth/refresh``, falling back to a fresh login when the
+refresh token is gone too.
+
+Credentials come from ``TESTSPRITE_<ROLE>_EMAIL`` / ``TESTSPRITE_<ROLE>_PASSWORD``.
+A TC script opts in by declaring a module-level ``ROLE``.
+"""
+
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+STATE_DIR = Path(__file__).resolve().parent / "tmp" / "auth"
+
+# Re-authenticate this long before the access token cookie expires.
+EXPIRY_MARGIN_S = 60
+
+DEFAULT_CREDENTIALS = {
+    "user": ("attendee@example.com", "correct_password"),
+    "organizer": ("organizer@example.com", "correct_password"),
+    "admin": ("admin@example.com", "correct_password"),
+}
+
+_locks: Dict[str, asyncio.Lock] = {}
+
+
+class AuthStateError(RuntimeError):
+    """Raised when a role cannot be logged in or refreshed."""
+
+
+def credentials_for(role: str):
+    if role not in DEFAULT_CREDENTIALS:
+        raise AuthStateError(f"Unknown role {role!r}; expected one of {sorted(DEFAULT_CREDENTIALS)}")
+    default_email, default_password = DEFAULT_CREDENTIALS[role]
+    prefix = f"TESTSPRITE_{role.upper()}"
+    return (
+        os.environ.get(f"{prefix}_EMAIL", default_email),
+        os.environ.get(f"{prefix}_PASSWORD", default_password),
+    )
+
+
+def state_path(role: str, base_url: str) -> Path:
+    # Keyed by port as well so parallel app servers never share cookies.
+    return STATE_DIR / f"{role}-{urlsplit(base_url).port or 'default'}.json"
+
+
+def _cookie_expiry(state: dict, name: str) -> Optional[float]:
+    for cookie in state.get("cookies", []):
+        if cookie.get("name") == name:
+            expires = cookie.get("expires", -1)
+            return float("inf") if expires in (None, -1) else float(expires)
+    return None
+
+
+def is_fresh(state: dict, cookie: str = "access_token") -> bool:
+    expiry = _cookie_expiry(state, cookie)
+    return expiry is not None and expiry - time.time() > EXPIRY_MARGIN_S
+
+
+def _load(path: Path) -> Optional[dict]:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+async def _request_state(playwright, base_url: str, endpoint: str, storage_state=None, payload=None) -> dict:
+    api = await playwright.request.new_context(base_url=base_url, storage_state=storage_state)
+    try:
+        response = await api.post(endpoint, data=payload or {})
+        if not response.ok:
+            raise AuthStateError(f"POST {endpoint} returned {response.status}: {await response.text()}")
+        state = await api.storage_state()
+    finally:
+        await api.dispose()
+    if not is_fresh(state):
+        raise AuthStateError(f"POST {endpoint} did not set an access_token cookie")
+    return state
+
+
+async def login(playwright, role: str, base_url: str) -> dict:
+    email, password = credentials_for(role)
+    return await _request_state(playwright, base_url, "/api/auth/login", payload={"email": email, "password": password})
+
+
+async def refresh(playwright, state: dict, base_url: str) -> dict:
+    return await _request_state(playwright, base_url, "/api/auth/refresh", storage_state=state)
+
+
+async def storage_state(playwright, role: str, base_url: str) -> str:
+    """Return the path of a valid storageState file for ``role``.
+
+    Concurrent callers for the same role share a single login or refresh.
+    """
+    path = state_path(role, base_url)
+    lock = _locks.setdefault(str(path), asyncio.Lock())
+    async with lock:
+        state = _load(path)
+        if state and is_fresh(state):
+            return str(path)
+
+        if state and is_fresh(state, "refresh_token"):
+            try:
+                state = await refresh(playwright, state, base_url)
+            except AuthStateError:
+                state = await login(playwright, role, base_url)
+        else:
+            state = await login(playwright, role, base_url)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(state, indent=2))
+        return str(path)
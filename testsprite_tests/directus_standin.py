@@ -0,0 +1,890 @@
+"""Local Directus stand-in for hermetic E2E runs.
+
+Serves the subset of the Directus REST API the app uses through
+``src/lib/directus/directus.ts`` in one of three modes:
+
+``seed``
+    Answers from an in-memory store loaded from ``fixtures/directus/seed.json``
+    (events, event_tickets, event_registrations, organizers, pages, posts and
+    the globals/navigation the layout needs). Supports ``filter``, ``fields``
+    (including relational and many-to-any paths), ``sort``, ``limit``/``page``,
+    ``deep``, ``aggregate[count]`` and item create/update/delete.
+``record``
+    Proxies every request to a real Directus (``--upstream``) and saves the
+    response under ``fixtures/directus/recordings/``, keyed by method,
+    collection and the canonical form of filter, fields and the other query
+    parameters.
+``replay``
+    Serves recorded responses from memory; misses fall through to the seed
+    store so writes and unrecorded reads still work offline.
+
+Authentication is emulated for the seeded users (``/auth/login``,
+``/auth/refresh``, ``/auth/logout``, ``/users/me``) and static tokens listed in
+the seed; those routes are never recorded and always answer from the seed. Request counters are exposed at ``GET /__standin/stats`` and cleared
+with ``POST /__standin/reset``; ``connections`` counts accepted TCP connections,
+so requests per connection show how well the app reuses keep-alive sockets.
+
+``POST /__standin/faults`` with ``{"method": "POST", "route":
+"items/ticket_inventory_ledger", "count": 1}`` makes the next ``count``
+matching requests fail with 503 (``route`` is the label used in the stats), so
+tests can check how the app retries a failed write. ``POST /__standin/reset``
+clears pending faults.
+
+Point the app at it with ``NEXT_PUBLIC_DIRECTUS_URL=http://localhost:8055``::
+
+    python testsprite_tests/directus_standin.py --mode seed --port 8055
+    python testsprite_tests/directus_standin.py --mode record --upstream https://cms.example.com
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import re
+import secrets
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "directus"
+DEFAULT_SEED = FIXTURES_DIR / "seed.json"
+DEFAULT_RECORDINGS = FIXTURES_DIR / "recordings"
+
+ACCESS_TOKEN_TTL_MS = 15 * 60 * 1000
+
+# Directus system collections are served under their own routes.
+SYSTEM_ROUTES = {"users": "directus_users", "roles": "directus_roles", "files": "directus_files"}
+
+# (collection, field) -> ("m2o", target) or ("o2m", target, foreign key)
+RELATIONS: Dict[Tuple[str, str], tuple] = {
+    ("events", "organizer_id"): ("m2o", "organizers"),
+    ("events", "category_id"): ("m2o", "event_categories"),
+    ("events", "tickets"): ("o2m", "event_tickets", "event_id"),
+    ("events", "registrations"): ("o2m", "event_registrations", "event_id"),
+    ("event_categories", "events"): ("o2m", "events", "category_id"),
+    ("event_tickets", "event_id"): ("m2o", "events"),
+    ("event_registrations", "event_id"): ("m2o", "events"),
+    ("event_registrations", "ticket_type_id"): ("m2o", "event_tickets"),
+    ("event_registrations", "user_id"): ("m2o", "directus_users"),
+    ("event_registrations", "installments"): ("o2m", "payment_installments", "registration_id"),
+    ("payment_installments", "registration_id"): ("m2o", "event_registrations"),
+    ("stripe_webhook_claims", "event_id"): ("m2o", "stripe_webhook_events"),
+    ("ticket_holds", "ticket_id"): ("m2o", "event_tickets"),
+    ("ticket_inventory_ledger", "ticket_id"): ("m2o", "event_tickets"),
+    ("ticket_inventory_ledger", "registration_id"): ("m2o", "event_registrations"),
+    ("waiting_room_tickets", "event_id"): ("m2o", "events"),
+    ("organizers", "user_id"): ("m2o", "directus_users"),
+    ("organizers", "events"): ("o2m", "events", "organizer_id"),
+    ("pages", "blocks"): ("o2m", "page_blocks", "page"),
+    ("page_blocks", "page"): ("m2o", "pages"),
+    ("posts", "author"): ("m2o", "directus_users"),
+    ("navigation", "items"): ("o2m", "navigation_items", "navigation"),
+    ("navigation_items", "page"): ("m2o", "pages"),
+    ("navigation_items", "post"): ("m2o", "posts"),
+    ("navigation_items", "children"): ("o2m", "navigation_items", "parent"),
+    ("directus_users", "role"): ("m2o", "directus_roles"),
+}
+
+# Transparent 1x1 PNG served for /assets/<id>.
+PLACEHOLDER_PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082"
+)
+
+
+class DirectusError(Exception):
+    def __init__(self, status: int, code: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+
+    def body(self) -> dict:
+        return {"errors": [{"message": str(self), "extensions": {"code": self.code}}]}
+
+
+# --------------------------------------------------------------------------- #
+# Query parsing
+# --------------------------------------------------------------------------- #
+
+JSON_PARAMS = ("filter", "deep", "aggregate", "alias")
+LIST_PARAMS = ("fields", "sort", "groupBy")
+INT_PARAMS = ("limit", "page", "offset")
+
+
+def assign_bracketed(query: dict, key: str, value: str) -> None:
+    """Store ``key`` (plain or bracket notation such as ``aggregate[count]``)."""
+    if "[" not in key:
+        query[key] = value
+        return
+    name, rest = key.split("[", 1)
+    path = re.findall(r"\[([^\]]*)\]", "[" + rest)
+    target = query.setdefault(name, {} if path[0] else [])
+    for index, part in enumerate(path):
+        last = index == len(path) - 1
+        if part == "":
+            if isinstance(target, list):
+                target.append(value)
+            return
+        if last:
+            target[part] = value
+        else:
+            target = target.setdefault(part, {} if path[index + 1] else [])
+
+
+def parse_query(query_string: str) -> dict:
+    query: dict = {}
+    for key, value in urllib.parse.parse_qsl(query_string, keep_blank_values=True):
+        assign_bracketed(query, key, value)
+    for name in JSON_PARAMS:
+        if isinstance(query.get(name), str):
+            try:
+                query[name] = json.loads(query[name])
+            except ValueError:
+                raise DirectusError(400, "INVALID_QUERY", f"Invalid JSON in {name!r}")
+    for name in LIST_PARAMS:
+        if isinstance(query.get(name), str):
+            query[name] = [item for item in query[name].split(",") if item]
+    for name in INT_PARAMS:
+        if name in query:
+            try:
+                query[name] = int(query[name])
+            except (TypeError, ValueError):
+                raise DirectusError(400, "INVALID_QUERY", f"Invalid integer in {name!r}")
+    return query
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            return _canonical(json.loads(value))
+        except ValueError:
+            return value
+    if isinstance(value, dict):
+        return {key: _canonical(value[key]) for key in sorted(value)}
+    if isinstance(value, list):
+        return [_canonical(item) for item in value]
+    return value
+
+
+def is_session_route(parts: List[str]) -> bool:
+    """Login, refresh and ``/users/me`` depend on rotating tokens and are never recorded."""
+    return parts[:1] == ["auth"] or parts[:2] == ["users", "me"]
+
+
+def recording_key(method: str, path: str, query_string: str, body: bytes = b"") -> Tuple[str, str]:
+    """Return ``(collection, digest)`` identifying a request for record/replay."""
+    parts = [segment for segment in path.split("/") if segment]
+    collection = parts[1] if len(parts) > 1 and parts[0] == "items" else (parts[0] if parts else "root")
+    params: Dict[str, Any] = {}
+    for key, value in urllib.parse.parse_qsl(query_string, keep_blank_values=True):
+        if key == "access_token":
+            continue
+        params[key] = value
+    canonical = {
+        "method": method.upper(),
+        "path": "/" + "/".join(parts),
+        "query": _canonical(params),
+        "body": _canonical(body.decode("utf-8", "replace")) if body and method.upper() != "GET" else None,
+    }
+    digest = hashlib.sha1(json.dumps(canonical, sort_keys=True).encode()).hexdigest()[:16]
+    return collection, digest
+
+
+# --------------------------------------------------------------------------- #
+# Filters, projection and sorting
+# --------------------------------------------------------------------------- #
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _resolve(value: Any) -> Any:
+    if isinstance(value, str) and value.startswith("$NOW"):
+        return _now_iso()
+    if isinstance(value, list):
+        return [_resolve(item) for item in value]
+    return value
+
+
+def _comparable(a: Any, b: Any):
+    try:
+        return float(a), float(b)
+    except (TypeError, ValueError):
+        return str(a), str(b)
+
+
+def _eq(a: Any, b: Any) -> bool:
+    if a is None or b is None:
+        return a is b
+    if isinstance(a, bool) or isinstance(b, bool):
+        return str(a).lower() == str(b).lower()
+    return str(a) == str(b)
+
+
+def _compare(op):
+    def check(value, arg):
+        if value is None:
+            return False
+        left, right = _comparable(value, arg)
+        return op(left, right)
+
+    return check
+
+
+OPERATORS = {
+    "_eq": _eq,
+    "_neq": lambda value, arg: not _eq(value, arg),
+    "_in": lambda value, arg: any(_eq(value, item) for item in (arg if isinstance(arg, list) else str(arg).split(","))),
+    "_nin": lambda value, arg: not any(_eq(value, item) for item in (arg if isinstance(arg, list) else str(arg).split(","))),
+    "_contains": lambda value, arg: value is not None and str(arg) in str(value),
+    "_ncontains": lambda value, arg: value is None or str(arg) not in str(value),
+    "_icontains": lambda value, arg: value is not None and str(arg).lower() in str(value).lower(),
+    "_starts_with": lambda value, arg: value is not None and str(value).startswith(str(arg)),
+    "_gt": _compare(lambda a, b: a > b),
+    "_gte": _compare(lambda a, b: a >= b),
+    "_lt": _compare(lambda a, b: a < b),
+    "_lte": _compare(lambda a, b: a <= b),
+    "_null": lambda value, arg: (value is None) == _truthy(arg),
+    "_nnull": lambda value, arg: (value is not None) == _truthy(arg),
+    "_empty": lambda value, arg: (value in (None, "", [])) == _truthy(arg),
+    "_nempty": lambda value, arg: (value not in (None, "", [])) == _truthy(arg),
+}
+
+
+def _numbers(rows: List[dict], field: str) -> List[float]:
+    return [float(row[field]) for row in rows if row.get(field) is not None]
+
+
+AGGREGATES = {
+    "count": lambda rows, field: sum(1 for row in rows if row.get(field) is not None),
+    "countDistinct": lambda rows, field: len({row.get(field) for row in rows if row.get(field) is not None}),
+    "sum": lambda rows, field: sum(_numbers(rows, field)),
+    "avg": lambda rows, field: (sum(_numbers(rows, field)) / len(_numbers(rows, field))) if _numbers(rows, field) else None,
+    "min": lambda rows, field: min(_numbers(rows, field), default=None),
+    "max": lambda rows, field: max(_numbers(rows, field), default=None),
+}
+
+
+def _truthy(value: Any) -> bool:
+    return value not in (False, "false", "0", 0, None)
+
+
+def _field_tree(fields: List[str]) -> dict:
+    tree: dict = {}
+    for field in fields or ["*"]:
+        node = tree
+        for part in field.split("."):
+            node = node.setdefault(part, {})
+    return tree
+
+
+def _sort_rows(rows: List[dict], sort: List[str]) -> List[dict]:
+    for field in reversed(sort or []):
+        descending = field.startswith("-")
+        name = field.lstrip("-")
+        present = [row for row in rows if row.get(name) is not None]
+        missing = [row for row in rows if row.get(name) is None]
+        present.sort(key=lambda row: _comparable(row[name], row[name])[0], reverse=descending)
+        rows = present + missing
+    return rows
+
+
+# --------------------------------------------------------------------------- #
+# Seed store
+# --------------------------------------------------------------------------- #
+
+
+class SeedStore:
+    """In-memory collections with enough Directus query semantics for the app."""
+
+    def __init__(self, data: dict):
+        data = copy.deepcopy(data)
+        self.static_tokens: Dict[str, str] = data.pop("_static_tokens", {})
+        self.passwords: Dict[str, str] = data.pop("_passwords", {})
+        self.collections: Dict[str, Any] = data
+        self.lock = threading.RLock()
+        self.sessions: Dict[str, str] = {}  # access token -> user id
+        self.refresh_tokens: Dict[str, str] = {}  # refresh token -> user id
+
+    @classmethod
+    def from_file(cls, path: Path) -> "SeedStore":
+        return cls(json.loads(path.read_text()))
+
+    # -- helpers ------------------------------------------------------------ #
+
+    def _rows(self, collection: str) -> List[dict]:
+        rows = self.collections.get(collection)
+        if rows is None:
+            raise DirectusError(403, "FORBIDDEN", f"You don't have permission to access collection {collection!r}")
+        return rows if isinstance(rows, list) else [rows]
+
+    def _find(self, collection: str, key: Any) -> Optional[dict]:
+        for row in self.collections.get(collection) or []:
+            if isinstance(row, dict) and _eq(row.get("id"), key):
+                return row
+        return None
+
+    def _children(self, target: str, foreign_key: str, parent_id: Any) -> List[dict]:
+        return [row for row in self.collections.get(target) or [] if _eq(row.get(foreign_key), parent_id)]
+
+    def matches(self, row: dict, flt: dict, collection: str) -> bool:
+        for key, condition in (flt or {}).items():
+            if key == "_and":
+                if not all(self.matches(row, sub, collection) for sub in condition):
+                    return False
+                continue
+            if key == "_or":
+                if not any(self.matches(row, sub, collection) for sub in condition):
+                    return False
+                continue
+            if not isinstance(condition, dict):
+                if not _eq(row.get(key), condition):
+                    return False
+                continue
+            operators = {op: arg for op, arg in condition.items() if op.startswith("_")}
+            nested = {name: arg for name, arg in condition.items() if not name.startswith("_")}
+            for op, arg in operators.items():
+                check = OPERATORS.get(op)
+                if check is None:
+                    raise DirectusError(400, "INVALID_QUERY", f"Unsupported filter operator {op!r}")
+                if not check(row.get(key), _resolve(arg)):
+                    return False
+            if nested and not self._matches_related(row, key, nested, collection):
+                return False
+        return True
+
+    def _matches_related(self, row: dict, field: str, flt: dict, collection: str) -> bool:
+        relation = RELATIONS.get((collection, field))
+        if not relation:
+            return False
+        if relation[0] == "m2o":
+            related = self._find(relation[1], row.get(field))
+            return related is not None and self.matches(related, flt, relation[1])
+        children = self._children(relation[1], relation[2], row.get("id"))
+        return any(self.matches(child, flt, relation[1]) for child in children)
+
+    def project(self, row: dict, tree: dict, collection: str, deep: Optional[dict] = None) -> dict:
+        deep = deep or {}
+        out: dict = {}
+        if "*" in tree:
+            out.update(row)
+            for (owner, name), relation in RELATIONS.items():
+                if owner == collection and relation[0] == "o2m" and name not in out:
+                    out[name] = [child["id"] for child in self._children(relation[1], relation[2], row.get("id"))]
+        for name, subtree in tree.items():
+            if name == "*":
+                continue
+            if ":" in name:
+                # many-to-any: "item:block_hero" expands only rows of that collection
+                field, target = name.split(":", 1)
+                if row.get("collection") == target:
+                    related = self._find(target, row.get(field))
+                    if related is not None:
+                        out[field] = self.project(related, subtree, target, deep.get(field))
+                elif field not in out:
+                    out[field] = row.get(field)
+                continue
+            relation = RELATIONS.get((collection, name))
+            if relation and relation[0] == "o2m":
+                children = self._children(relation[1], relation[2], row.get("id"))
+                children = self._apply_deep(children, deep.get(name) or {}, relation[1])
+                if subtree:
+                    out[name] = [self.project(child, subtree, relation[1], deep.get(name)) for child in children]
+                else:
+                    out[name] = [child["id"] for child in children]
+            elif relation and subtree:
+                related = self._find(relation[1], row.get(name))
+                out[name] = self.project(related, subtree, relation[1], deep.get(name)) if related else row.get(name)
+            else:
+                out[name] = row.get(name)
+        return out
+
+    def _apply_deep(self, rows: List[dict], options: dict, collection: str) -> List[dict]:
+        if options.get("_filter"):
+            rows = [row for row in rows if self.matches(row, options["_filter"], collection)]
+        if options.get("_sort"):
+            sort = options["_sort"]
+            rows = _sort_rows(rows, sort if isinstance(sort, list) else str(sort).split(","))
+        if options.get("_limit") not in (None, -1):
+            rows = rows[: int(options["_limit"])]
+        return rows
+
+    # -- REST operations ---------------------------------------------------- #
+
+    def read_many(self, collection: str, query: dict):
+        with self.lock:
+            raw = self.collections.get(collection)
+            if isinstance(raw, dict):
+                return self.project(raw, _field_tree(query.get("fields")), collection, query.get("deep"))
+            rows = [row for row in self._rows(collection) if self.matches(row, query.get("filter"), collection)]
+            if query.get("search"):
+                needle = str(query["search"]).lower()
+                rows = [row for row in rows if any(needle in str(value).lower() for value in row.values())]
+            if query.get("aggregate"):
+                return self._aggregate(rows, query["aggregate"], query.get("groupBy"))
+            rows = _sort_rows(rows, query.get("sort") or [])
+            limit = query.get("limit", 100)
+            if limit is not None and limit >= 0:
+                offset = query.get("offset") or (max(query.get("page", 1), 1) - 1) * limit
+                rows = rows[offset: offset + limit]
+            tree = _field_tree(query.get("fields"))
+            return [self.project(row, tree, collection, query.get("deep")) for row in rows]
+
+    def _aggregate(self, rows: List[dict], aggregate: dict, group_by: Optional[List[str]] = None) -> List[dict]:
+        groups: Dict[tuple, List[dict]] = {}
+        for row in rows:
+            groups.setdefault(tuple(row.get(field) for field in group_by or []), []).append(row)
+        if not groups and not group_by:
+            groups[()] = []
+
+        results = []
+        for values, members in groups.items():
+            result: dict = dict(zip(group_by or [], values))
+            for function, fields in aggregate.items():
+                if function not in AGGREGATES:
+                    raise DirectusError(400, "INVALID_QUERY", f"Unsupported aggregate {function!r}")
+                if fields in ("*", ["*"]):
+                    result[function] = len(members)
+                    continue
+                names = fields if isinstance(fields, list) else str(fields).split(",")
+                result[function] = {name: AGGREGATES[function](members, name) for name in names}
+            results.append(result)
+        return results
+
+    def read_one(self, collection: str, key: str, query: dict) -> dict:
+        with self.lock:
+            self._rows(collection)
+            row = self._find(collection, key)
+            if row is None:
+                raise DirectusError(403, "FORBIDDEN", "You don't have permission to access this.")
+            return self.project(row, _field_tree(query.get("fields")), collection, query.get("deep"))
+
+    def create(self, collection: str, payload: Any, query: dict):
+        with self.lock:
+            rows = self.collections.setdefault(collection, [])
+            items = payload if isinstance(payload, list) else [payload]
+            # Like Directus, a batch with a duplicate primary key is rejected as a whole.
+            keys = [item["id"] for item in items if item.get("id") is not None]
+            for key in keys:
+                if self._find(collection, key) is not None or keys.count(key) > 1:
+                    raise DirectusError(
+                        400, "RECORD_NOT_UNIQUE", f'Value "{key}" for field "id" in collection "{collection}" has to be unique.'
+                    )
+            created = []
+            for item in items:
+                row = dict(item)
+                row.setdefault("id", str(uuid.uuid4()))
+                row.setdefault("date_created", _now_iso())
+                rows.append(row)
+                created.append(self.project(row, _field_tree(query.get("fields")), collection))
+            return created if isinstance(payload, list) else created[0]
+
+    def update(self, collection: str, key: str, payload: dict, query: dict) -> dict:
+        with self.lock:
+            row = self._find(collection, key)
+            if row is None:
+                raise DirectusError(403, "FORBIDDEN", "You don't have permission to access this.")
+            row.update(payload)
+            row["date_updated"] = _now_iso()
+            return self.project(row, _field_tree(query.get("fields")), collection)
+
+    def update_many(self, collection: str, payload: Any, query: dict) -> List[dict]:
+        if isinstance(payload, list):
+            # Batch update: every item carries its own primary key and data.
+            return [
+                self.update(collection, item["id"], {k: v for k, v in item.items() if k != "id"}, query) for item in payload
+            ]
+        keys = payload.get("keys")
+        data = payload.get("data", {})
+        if keys is None and payload.get("query"):
+            with self.lock:
+                keys = [row["id"] for row in self._rows(collection) if self.matches(row, payload["query"].get("filter"), collection)]
+        return [self.update(collection, key, data, query) for key in keys or []]
+
+    def delete(self, collection: str, key: str) -> None:
+        with self.lock:
+            rows = self._rows(collection)
+            row = self._find(collection, key)
+            if row is None:
+                raise DirectusError(403, "FORBIDDEN", "You don't have permission to access this.")
+            rows.remove(row)
+
+    # -- authentication ----------------------------------------------------- #
+
+    def _issue(self, user_id: str) -> dict:
+        access_token = secrets.token_urlsafe(24)
+        refresh_token = secrets.token_urlsafe(32)
+        self.sessions[access_token] = user_id
+        self.refresh_tokens[refresh_token] = user_id
+        return {"access_token": access_token, "refresh_token": refresh_token, "expires": ACCESS_TOKEN_TTL_MS}
+
+    def login(self, email: str, password: str) -> dict:
+        with self.lock:
+            for user in self.collections.get("directus_users", []):
+                if str(user.get("email", "")).lower() == str(email).lower() and self.passwords.get(user["id"]) == password:
+                    return self._issue(user["id"])
+        raise DirectusError(401, "INVALID_CREDENTIALS", "Invalid user credentials.")
+
+    def refresh(self, refresh_token: str) -> dict:
+        with self.lock:
+            user_id = self.refresh_tokens.pop(refresh_token or "", None)
+            if user_id is None:
+                raise DirectusError(401, "INVALID_CREDENTIALS", "Invalid user credentials.")
+            return self._issue(user_id)
+
+    def logout(self, refresh_token: str) -> None:
+        with self.lock:
+            self.refresh_tokens.pop(refresh_token or "", None)
+
+    def user_for_token(self, token: Optional[str]) -> Optional[str]:
+        if not token:
+            return None
+        if token in self.static_tokens:
+            return self.static_tokens[token]
+        return self.sessions.get(token)
+
+
+# --------------------------------------------------------------------------- #
+# Record / replay
+# --------------------------------------------------------------------------- #
+
+
+class Recordings:
+    """Responses on disk, one JSON file per request key, cached in memory."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self._cache: Dict[Tuple[str, str], dict] = {}
+        if root.exists():
+            for path in root.glob("*/*.json"):
+                self._cache[(path.parent.name, path.stem)] = json.loads(path.read_text())
+
+    def get(self, key: Tuple[str, str]) -> Optional[dict]:
+        return self._cache.get(key)
+
+    def save(self, key: Tuple[str, str], entry: dict) -> None:
+        self._cache[key] = entry
+        path = self.root / key[0] / f"{key[1]}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(entry, indent=2, ensure_ascii=False))
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+# --------------------------------------------------------------------------- #
+# HTTP server
+# --------------------------------------------------------------------------- #
+
+
+class StandIn:
+    def __init__(self, mode: str, store: Optional[SeedStore], recordings: Optional[Recordings], upstream: Optional[str]):
+        self.mode = mode
+        self.store = store
+        self.recordings = recordings
+        self.upstream = upstream.rstrip("/") if upstream else None
+        self.counters: Counter = Counter()
+        self.connections = 0
+        self.counter_lock = threading.Lock()
+        self.started = time.time()
+        self.faults: List[dict] = []
+
+    def count(self, method: str, route: str) -> None:
+        with self.counter_lock:
+            self.counters[f"{method} {route}"] += 1
+            self.counters["total"] += 1
+
+    def count_connection(self) -> None:
+        with self.counter_lock:
+            self.connections += 1
+
+    def stats(self) -> dict:
+        with self.counter_lock:
+            return {
+                "mode": self.mode,
+                "uptime_s": round(time.time() - self.started, 1),
+                "requests": dict(self.counters),
+                "connections": self.connections,
+            }
+
+    def reset(self) -> None:
+        with self.counter_lock:
+            self.counters.clear()
+            self.connections = 0
+            self.faults.clear()
+
+    def add_fault(self, method: str, route: str, count: int = 1, status: int = 503) -> None:
+        with self.counter_lock:
+            self.faults.append({"method": method.upper(), "route": route, "count": count, "status": status})
+
+    def take_fault(self, method: str, route: str) -> Optional[int]:
+        """Status to fail this request with, consuming one pending fault; ``None`` to serve it."""
+        with self.counter_lock:
+            for fault in self.faults:
+                if fault["method"] == method and fault["route"] == route:
+                    fault["count"] -= 1
+                    if fault["count"] <= 0:
+                        self.faults.remove(fault)
+                    return fault["status"]
+        return None
+
+
+def _route_label(parts: List[str]) -> str:
+    if not parts:
+        return "/"
+    if parts[0] == "items" and len(parts) > 1:
+        return f"items/{parts[1]}" + ("/:id" if len(parts) > 2 else "")
+    return "/".join(parts[:2]) if parts[0] in ("auth", "users") else parts[0]
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The socketserver default backlog (5) resets connections under the stress tools' bursts.
+    request_queue_size = 1024
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    server_version = "DirectusStandIn/1.0"
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # keep-alive responses otherwise stall on delayed ACKs
+    standin: StandIn
+
+    def log_message(self, format, *args):  # noqa: A002 - signature from BaseHTTPRequestHandler
+        pass
+
+    def setup(self):
+        super().setup()
+        self.standin.count_connection()
+
+    # -- plumbing ----------------------------------------------------------- #
+
+    def _body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send(self, status: int, payload: Any = None, raw: Optional[bytes] = None, content_type: str = "application/json"):
+        body = raw if raw is not None else (b"" if payload is None else json.dumps(payload).encode())
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def _token(self, query: dict) -> Optional[str]:
+        header = self.headers.get("Authorization", "")
+        if header.lower().startswith("bearer "):
+            return header[7:].strip()
+        return query.get("access_token")
+
+    # -- dispatch ----------------------------------------------------------- #
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PATCH(self):
+        self._handle("PATCH")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+    def do_SEARCH(self):
+        self._handle("SEARCH")
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Allow-Methods", "GET, POST, PATCH, DELETE, SEARCH, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type, Authorization")
+        self.end_headers()
+
+    def _handle(self, method: str):
+        standin = self.standin
+        split = urllib.parse.urlsplit(self.path)
+        parts = [urllib.parse.unquote(part) for part in split.path.split("/") if part]
+        body = self._body()
+
+        if parts[:1] == ["__standin"]:
+            if parts[1:] == ["stats"]:
+                return self._send(200, standin.stats())
+            if parts[1:] == ["reset"] and method == "POST":
+                standin.reset()
+                return self._send(204)
+            if parts[1:] == ["faults"] and method == "POST":
+                fault = json.loads(body or b"{}")
+                standin.add_fault(fault["method"], fault["route"], int(fault.get("count", 1)), int(fault.get("status", 503)))
+                return self._send(204)
+            return self._send(404, DirectusError(404, "ROUTE_NOT_FOUND", "Unknown stand-in route").body())
+
+        route = _route_label(parts)
+        standin.count(method, route)
+        fault = standin.take_fault(method, route)
+        if fault is not None:
+            return self._send(fault, DirectusError(fault, "SERVICE_UNAVAILABLE", "Injected by the stand-in").body())
+        key = recording_key(method, split.path, split.query, body)
+
+        if standin.mode == "record":
+            return self._proxy(method, split, body, None if is_session_route(parts) else key)
+        if standin.mode == "replay" and not is_session_route(parts):
+            entry = standin.recordings.get(key)
+            if entry is not None:
+                return self._send(entry["status"], raw=entry["body"].encode(), content_type=entry.get("content_type", "application/json"))
+        if standin.store is None:
+            return self._send(404, DirectusError(404, "ROUTE_NOT_FOUND", f"No recording for {method} {split.path}").body())
+
+        try:
+            status, payload, raw, content_type = self._serve_store(method, parts, split.query, body)
+        except DirectusError as error:
+            return self._send(error.status, error.body())
+        except ValueError:
+            return self._send(400, DirectusError(400, "INVALID_PAYLOAD", "Invalid JSON body").body())
+        self._send(status, payload, raw, content_type)
+
+    def _proxy(self, method: str, split, body: bytes, key):
+        url = f"{self.standin.upstream}{split.path}" + (f"?{split.query}" if split.query else "")
+        headers = {name: value for name, value in self.headers.items() if name.lower() not in ("host", "content-length", "accept-encoding", "connection")}
+        request = urllib.request.Request(url, data=body or None, method=method, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                status, content, content_type = response.status, response.read(), response.headers.get("Content-Type", "application/json")
+        except urllib.error.HTTPError as error:
+            status, content, content_type = error.code, error.read(), error.headers.get("Content-Type", "application/json")
+        if key is not None and "json" in (content_type or ""):
+            self.standin.recordings.save(key, {
+                "request": {"method": method, "path": split.path, "query": split.query},
+                "status": status,
+                "content_type": content_type,
+                "body": content.decode("utf-8", "replace"),
+            })
+        self._send(status, raw=content, content_type=content_type)
+
+    def _serve_store(self, method: str, parts: List[str], query_string: str, body: bytes):
+        store = self.standin.store
+        query = parse_query(query_string)
+        payload = json.loads(body) if body else {}
+
+        if parts == ["server", "ping"]:
+            return 200, None, b"pong", "text/plain"
+        if parts[:1] == ["assets"]:
+            return 200, None, PLACEHOLDER_PNG, "image/png"
+        if parts[:1] == ["auth"]:
+            return self._serve_auth(parts[1:], payload)
+
+        if parts[:2] == ["users", "me"]:
+            user_id = store.user_for_token(self._token(query))
+            if user_id is None:
+                raise DirectusError(401, "TOKEN_EXPIRED" if self._token(query) else "FORBIDDEN", "Invalid user credentials.")
+            if method == "PATCH":
+                return 200, {"data": store.update("directus_users", user_id, payload, query)}, None, "application/json"
+            return 200, {"data": store.read_one("directus_users", user_id, query)}, None, "application/json"
+
+        if parts and parts[0] in SYSTEM_ROUTES:
+            collection, key = SYSTEM_ROUTES[parts[0]], (parts[1] if len(parts) > 1 else None)
+        elif parts[:1] == ["items"] and len(parts) > 1:
+            collection, key = parts[1], (parts[2] if len(parts) > 2 else None)
+        else:
+            raise DirectusError(404, "ROUTE_NOT_FOUND", f"Route /{'/'.join(parts)} doesn't exist.")
+
+        if method in ("GET", "SEARCH"):
+            if method == "SEARCH":
+                query.update(payload.get("query", {}))
+            data = store.read_one(collection, key, query) if key else store.read_many(collection, query)
+            return 200, {"data": data}, None, "application/json"
+        if method == "POST":
+            return 200, {"data": store.create(collection, payload, query)}, None, "application/json"
+        if method == "PATCH":
+            data = store.update(collection, key, payload, query) if key else store.update_many(collection, payload, query)
+            return 200, {"data": data}, None, "application/json"
+        if method == "DELETE":
+            keys = [key] if key else (payload if isinstance(payload, list) else payload.get("keys", []))
+            for item in keys:
+                store.delete(collection, item)
+            return 204, None, None, "application/json"
+        raise DirectusError(405, "METHOD_NOT_ALLOWED", f"{method} is not supported")
+
+    def _serve_auth(self, parts: List[str], payload: dict):
+        store = self.standin.store
+        if parts == ["login"]:
+            return 200, {"data": store.login(payload.get("email"), payload.get("password"))}, None, "application/json"
+        if parts == ["refresh"]:
+            return 200, {"data": store.refresh(payload.get("refresh_token"))}, None, "application/json"
+        if parts == ["logout"]:
+            store.logout(payload.get("refresh_token"))
+            return 204, None, None, "application/json"
+        if parts[:2] == ["password", "request"] or parts[:2] == ["password", "reset"]:
+            return 204, None, None, "application/json"
+        raise DirectusError(404, "ROUTE_NOT_FOUND", f"Route /auth/{'/'.join(parts)} doesn't exist.")
+
+
+def create_server(
+    mode: str = "seed",
+    host: str = "127.0.0.1",
+    port: int = 8055,
+    seed: Optional[Path] = DEFAULT_SEED,
+    recordings: Path = DEFAULT_RECORDINGS,
+    upstream: Optional[str] = None,
+) -> ThreadingHTTPServer:
+    """Build (but do not start) a stand-in server; ``port=0`` picks a free port."""
+    if mode == "record" and not upstream:
+        raise ValueError("record mode needs an upstream Directus URL")
+    store = SeedStore.from_file(seed) if seed and mode != "record" else None
+    recorded = Recordings(recordings) if mode in ("record", "replay") else None
+    standin = StandIn(mode, store, recorded, upstream)
+    handler = type("BoundStandInHandler", (StandInHandler,), {"standin": standin})
+    server = StandInServer((host, port), handler)
+    server.standin = standin
+    return server
+
+
+def start_in_thread(**kwargs) -> ThreadingHTTPServer:
+    """Start a stand-in on a background thread and return the server."""
+    server = create_server(**kwargs)
+    threading.Thread(target=server.serve_forever, name="directus-standin", daemon=True).start()
+    return server
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=("seed", "record", "replay"), default="seed")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8055)
+    parser.add_argument("--seed", type=Path, default=DEFAULT_SEED, help="seed fixture file")
+    parser.add_argument("--recordings", type=Path, default=DEFAULT_RECORDINGS, help="recordings directory")
+    parser.add_argument("--upstream", help="real Directus URL (record mode)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    server = create_server(args.mode, args.host, args.port, args.seed, args.recordings, args.upstream)
+    recordings = server.standin.recordings
+    print(
+        f"Directus stand-in ({args.mode}) on http://{args.host}:{server.server_address[1]}"
+        + (f", {len(recordings)} recordings" if recordings is not None else ""),
+        flush=True,
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
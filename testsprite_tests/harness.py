@@ -0,0 +1,70 @@
+"""Shared browser plumbing for the TC scripts.
+
+Every TC script exposes ``run_test(context=None)``. When ``runner.py`` drives
+the suite it passes a fresh context from a shared browser; when a script is
+executed directly it falls back to launching its own Chromium, exactly as the
+generated scripts used to.
+"""
+
+import os
+from contextlib import asynccontextmanager
+
+from playwright import async_api
+
+import auth_state
+import network_profile
+
+# Where the Next.js app under test is served.
+BASE_URL = os.environ.get("TESTSPRITE_BASE_URL", "http://localhost:3001")
+
+# Timeout applied to every locator action unless a step overrides it.
+DEFAULT_TIMEOUT_MS = 5000
+
+# Arguments for a browser that hosts many concurrent contexts. The generated
+# scripts used ``--single-process``, which is only safe for one context at a
+# time, so it is kept for standalone runs only.
+BROWSER_ARGS = [
+    "--window-size=1280,720",
+    "--disable-dev-shm-usage",
+    "--ipc=host",
+]
+STANDALONE_BROWSER_ARGS = BROWSER_ARGS + ["--single-process"]
+
+
+async def launch_browser(pw, args=None):
+    """Launch a headless Chromium with the suite's default arguments."""
+    return await pw.chromium.launch(headless=True, args=args or BROWSER_ARGS)
+
+
+@asynccontextmanager
+async def open_context(context=None, role=None, network=None):
+    """Yield a browser context for a single test.
+
+    A context handed in by the runner is yielded as-is and left for the runner
+    to close. Without one, a private Playwright session and browser are
+    started and torn down around the test, logged in as ``role`` if given and
+    routed through the ``network`` profile (the suite default if omitted).
+    """
+    if context is not None:
+        context.set_default_timeout(DEFAULT_TIMEOUT_MS)
+        yield context
+        return
+
+    pw = None
+    browser = None
+    context = None
+    try:
+        pw = await async_api.async_playwright().start()
+        browser = await launch_browser(pw, STANDALONE_BROWSER_ARGS)
+        state = await auth_state.storage_state(pw, role, BASE_URL) if role else None
+        context = await browser.new_context(storage_state=state)
+        await network_profile.apply(context, network, BASE_URL)
+        context.set_default_timeout(DEFAULT_TIMEOUT_MS)
+        yield context
+    finally:
+        if context:
+            await context.close()
+        if browser:
+            await browser.close()
+        if pw:
+            await pw.stop()
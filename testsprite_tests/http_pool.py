@@ -0,0 +1,211 @@
+"""Minimal asyncio HTTP/1.1 client with a keep-alive connection pool.
+
+The load tools drive the app at the HTTP level and must measure the server,
+not the client: connections are opened once per pool slot and reused, and
+nothing outside the standard library is needed, so the tools run wherever the
+TC scripts run.
+
+Only what the app's routes need is implemented: plain and chunked bodies,
+``Set-Cookie`` collection and JSON helpers. HTTPS is supported through
+``ssl.create_default_context``.
+"""
+
+import asyncio
+import json
+import ssl
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+
+class HttpError(Exception):
+    """Raised on a malformed response or a connection that dropped mid-request."""
+
+
+@dataclass
+class Response:
+    status: int
+    headers: List[Tuple[str, str]]
+    body: bytes
+    elapsed_s: float
+
+    def header(self, name: str) -> Optional[str]:
+        name = name.lower()
+        for key, value in self.headers:
+            if key == name:
+                return value
+        return None
+
+    def cookies(self) -> Dict[str, str]:
+        jar = {}
+        for key, value in self.headers:
+            if key == "set-cookie":
+                pair = value.split(";", 1)[0]
+                if "=" in pair:
+                    cookie, content = pair.split("=", 1)
+                    jar[cookie.strip()] = content.strip()
+        return jar
+
+    def json(self):
+        return json.loads(self.body or b"null")
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 400
+
+
+@dataclass
+class PoolStats:
+    opened: int = 0
+    reused: int = 0
+    requests: int = 0
+    wait_s: float = 0.0  # time spent waiting for a free connection
+
+    def as_dict(self) -> dict:
+        return {
+            "connections_opened": self.opened,
+            "connections_reused": self.reused,
+            "requests": self.requests,
+            "pool_wait_s": round(self.wait_s, 3),
+        }
+
+
+class _Connection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+@dataclass
+class HttpPool:
+    """Up to ``size`` persistent connections to one origin."""
+
+    base_url: str
+    size: int = 32
+    timeout_s: float = 30.0
+    stats: PoolStats = field(default_factory=PoolStats)
+
+    def __post_init__(self):
+        parts = urlsplit(self.base_url)
+        self.host = parts.hostname or "localhost"
+        self.tls = parts.scheme == "https"
+        self.port = parts.port or (443 if self.tls else 80)
+        self.authority = parts.netloc
+        self._idle: List[_Connection] = []
+        self._slots = asyncio.Semaphore(self.size)
+
+    async def _acquire(self) -> _Connection:
+        started = time.perf_counter()
+        await self._slots.acquire()
+        self.stats.wait_s += time.perf_counter() - started
+        while self._idle:
+            connection = self._idle.pop()
+            if not connection.writer.is_closing() and not connection.reader.at_eof():
+                self.stats.reused += 1
+                return connection
+            connection.close()
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port, ssl=ssl.create_default_context() if self.tls else None),
+                self.timeout_s,
+            )
+        except BaseException:
+            self._slots.release()
+            raise
+        self.stats.opened += 1
+        return _Connection(reader, writer)
+
+    def _release(self, connection: _Connection, reusable: bool) -> None:
+        if reusable:
+            self._idle.append(connection)
+        else:
+            connection.close()
+        self._slots.release()
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Optional[dict] = None,
+        json_body=None,
+        body: bytes = b"",
+        headers: Optional[Dict[str, str]] = None,
+        cookies: Optional[Dict[str, str]] = None,
+    ) -> Response:
+        if params:
+            path = f"{path}{'&' if '?' in path else '?'}{urlencode(params)}"
+        headers = dict(headers or {})
+        if json_body is not None:
+            body = json.dumps(json_body).encode()
+            headers.setdefault("Content-Type", "application/json")
+        if cookies:
+            headers["Cookie"] = "; ".join(f"{name}={value}" for name, value in cookies.items())
+        head = [f"{method} {path} HTTP/1.1", f"Host: {self.authority}", "Connection: keep-alive"]
+        head += [f"{name}: {value}" for name, value in headers.items()]
+        if body or method in ("POST", "PUT", "PATCH"):
+            head.append(f"Content-Length: {len(body)}")
+        payload = ("\r\n".join(head) + "\r\n\r\n").encode() + body
+
+        connection = await self._acquire()
+        reusable = False
+        started = time.perf_counter()
+        try:
+            connection.writer.write(payload)
+            await connection.writer.drain()
+            status, response_headers, response_body, reusable = await asyncio.wait_for(
+                self._read_response(connection.reader, method), self.timeout_s
+            )
+        except (ConnectionError, asyncio.IncompleteReadError) as exc:
+            raise HttpError(f"{method} {path}: connection dropped ({exc})") from exc
+        finally:
+            self._release(connection, reusable)
+        self.stats.requests += 1
+        return Response(status, response_headers, response_body, time.perf_counter() - started)
+
+    async def _read_response(self, reader: asyncio.StreamReader, method: str):
+        status_line = await reader.readline()
+        if not status_line:
+            raise HttpError("connection closed before the status line")
+        try:
+            version, status = status_line.split(b" ", 2)[:2]
+            status = int(status)
+        except ValueError:
+            raise HttpError(f"malformed status line {status_line!r}")
+
+        headers: List[Tuple[str, str]] = []
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers.append((name.strip().lower(), value.strip()))
+        lookup = dict(headers)
+        # HTTP/1.0 servers (http.server stand-ins) close unless they opt in.
+        connection = lookup.get("connection", "").lower()
+        keep_alive = connection == "keep-alive" if version == b"HTTP/1.0" else connection != "close"
+
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            return status, headers, b"", keep_alive
+        if lookup.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";", 1)[0].strip() or b"0", 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass  # trailers
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            return status, headers, b"".join(chunks), keep_alive
+        if "content-length" in lookup:
+            return status, headers, await reader.readexactly(int(lookup["content-length"])), keep_alive
+        return status, headers, await reader.read(), False
+
+    async def close(self) -> None:
+        while self._idle:
+            self._idle.pop().close()
@@ -0,0 +1,358 @@
+"""Open-model load generator built on the TC user journeys.
+
+Replays the flows the TC scripts walk through a browser, at the HTTP level:
+
+``browse``    ``GET /`` then ``GET /eventos/[slug]`` (TC013)
+``search``    ``GET /api/search`` (TC018)
+``login``     ``POST /api/auth/login`` (TC002)
+``checkout``  ``POST /api/stripe/checkout-session`` (TC009)
+``tickets``   ``GET /api/user/tickets`` (TC011)
+
+Sessions arrive as a Poisson process at ``--rate`` per second for
+``--duration`` seconds and are served by ``--users`` virtual users, each with
+its own cookie jar; a session that finds every virtual user busy waits, and
+that wait is reported separately so a saturated server is visible instead of
+silently lowering the offered load. All traffic goes through one keep-alive
+``http_pool.HttpPool``.
+
+The report (``tmp/load_report.json``) has p50/p95/p99 latency, error rate and
+status counts per endpoint. Event and ticket ids default to the first
+purchasable ticket in the stand-in seed; point ``--event-id``/``--ticket-id``
+at real rows when testing against a real Directus. The checkout flow creates
+Stripe test-mode sessions unless the app is configured with a Stripe stand-in.
+
+With ``--directus-url`` pointing at ``directus_standin.py`` the stand-in
+counters are reset before the run and read after it, and the report gains the
+Directus requests the app made (``directus.qps``, per session and per route)
+and the TCP connections it opened (``directus.connections``). Run the same load
+twice to compare: with ``CONTENT_CACHE_TTL_SECONDS=0`` and the default for the
+content cache, or with ``DIRECTUS_CONNECTION_POOL=off`` and the default for
+connection reuse (handshakes and the endpoints' p95).
+
+Usage::
+
+    python testsprite_tests/loadgen.py --rate 20 --duration 60 --users 50
+    python testsprite_tests/loadgen.py --flows browse=1,search=1 --rate 100
+    python testsprite_tests/loadgen.py --flows browse=1 --rate 20 --directus-url http://localhost:8055
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+TESTS_DIR = Path(__file__).resolve().parent
+DEFAULT_REPORT = TESTS_DIR / "tmp" / "load_report.json"
+
+if str(TESTS_DIR) not in sys.path:
+    sys.path.insert(0, str(TESTS_DIR))
+
+import auth_state  # noqa: E402
+from directus_standin import DEFAULT_SEED  # noqa: E402
+from http_pool import HttpError, HttpPool  # noqa: E402
+
+DEFAULT_BASE_URL = "http://localhost:3001"
+DEFAULT_FLOWS = "browse=5,search=3,login=1,checkout=1,tickets=2"
+DEFAULT_TERMS = ("festival", "evento", "ingresso", "samba", "conferência")
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def seed_defaults(path: Path = DEFAULT_SEED) -> dict:
+    """Pick a published event with an active ticket from the stand-in seed."""
+    try:
+        seed = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    for event in seed.get("events", []):
+        if event.get("status") != "published":
+            continue
+        for ticket in seed.get("event_tickets", []):
+            if ticket["event_id"] == event["id"] and ticket.get("status") == "active" and ticket.get("price"):
+                return {"slug": event["slug"], "event_id": event["id"], "ticket_id": ticket["id"]}
+    return {}
+
+
+@dataclass
+class EndpointStats:
+    latencies_ms: List[float] = field(default_factory=list)
+    errors: int = 0
+    statuses: Counter = field(default_factory=Counter)
+
+    def summary(self) -> dict:
+        count = len(self.latencies_ms)
+        return {
+            "count": count,
+            "errors": self.errors,
+            "error_rate": round(self.errors / count, 4) if count else 0.0,
+            "p50_ms": _round(percentile(self.latencies_ms, 50)),
+            "p95_ms": _round(percentile(self.latencies_ms, 95)),
+            "p99_ms": _round(percentile(self.latencies_ms, 99)),
+            "max_ms": _round(max(self.latencies_ms, default=None)),
+            "statuses": dict(sorted(self.statuses.items())),
+        }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 1)
+
+
+class Recorder:
+    def __init__(self):
+        self.endpoints: Dict[str, EndpointStats] = defaultdict(EndpointStats)
+        self.flows: Counter = Counter()
+        self.failed_flows: Counter = Counter()
+        self.user_wait_ms: List[float] = []
+
+    def record(self, label: str, latency_s: float, status: Optional[int], error: bool) -> None:
+        stats = self.endpoints[label]
+        stats.latencies_ms.append(latency_s * 1000)
+        stats.statuses[str(status) if status is not None else "exception"] += 1
+        if error:
+            stats.errors += 1
+
+
+class VirtualUser:
+    """One simulated visitor: a cookie jar and, once logged in, a user id."""
+
+    def __init__(self, index: int, pool: HttpPool, recorder: Recorder, args):
+        self.index = index
+        self.pool = pool
+        self.recorder = recorder
+        self.args = args
+        self.cookies: Dict[str, str] = {}
+        self.user_id: Optional[str] = None
+
+    async def call(self, label: str, method: str, path: str, ok=(200,), **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await self.pool.request(method, path, cookies=self.cookies, **kwargs)
+        except (HttpError, OSError, asyncio.TimeoutError):
+            self.recorder.record(label, time.perf_counter() - started, None, True)
+            raise
+        self.cookies.update(response.cookies())
+        self.recorder.record(label, response.elapsed_s, response.status, response.status not in ok)
+        return response
+
+    async def ensure_login(self) -> None:
+        if self.user_id is None:
+            await self.login()
+
+    # -- flows -------------------------------------------------------------- #
+
+    async def browse(self) -> None:
+        await self.call("GET /", "GET", "/")
+        await self.call("GET /eventos/[slug]", "GET", f"/eventos/{self.args.slug}")
+
+    async def search(self) -> None:
+        term = random.choice(self.args.terms)
+        await self.call("GET /api/search", "GET", "/api/search", params={"search": term})
+
+    async def login(self) -> None:
+        email, password = auth_state.credentials_for(self.args.role)
+        response = await self.call(
+            "POST /api/auth/login", "POST", "/api/auth/login", json_body={"email": email, "password": password}
+        )
+        if response.status == 200:
+            self.user_id = response.json()["user"]["id"]
+
+    async def checkout(self) -> None:
+        await self.ensure_login()
+        await self.call(
+            "POST /api/stripe/checkout-session",
+            "POST",
+            "/api/stripe/checkout-session",
+            json_body={
+                "eventId": self.args.event_id,
+                "tickets": [{"ticketId": self.args.ticket_id, "quantity": 1}],
+                "participantInfo": {"name": f"Load User {self.index}", "email": f"load{self.index}@example.com"},
+            },
+        )
+
+    async def tickets(self) -> None:
+        await self.ensure_login()
+        if self.user_id:
+            await self.call("GET /api/user/tickets", "GET", "/api/user/tickets", params={"userId": self.user_id})
+
+
+FLOWS = ("browse", "search", "login", "checkout", "tickets")
+
+
+def parse_flows(value: str) -> Dict[str, float]:
+    weights = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in FLOWS:
+            raise argparse.ArgumentTypeError(f"unknown flow {name!r}; expected one of {', '.join(FLOWS)}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+async def standin_stats(directus: Optional[HttpPool], reset: bool = False) -> Optional[dict]:
+    """Reset or read the Directus stand-in counters; ``None`` without ``--directus-url``."""
+    if directus is None:
+        return None
+    try:
+        if reset:
+            response = await directus.request("POST", "/__standin/reset")
+            return {} if response.ok else None
+        response = await directus.request("GET", "/__standin/stats")
+    except (HttpError, OSError, asyncio.TimeoutError):
+        return None
+    return response.json() if response.ok else None
+
+
+def directus_summary(stats: Optional[dict], sessions: int, wall_s: float) -> Optional[dict]:
+    if stats is None:
+        return None
+    counters = Counter(stats["requests"])
+    total = counters.pop("total", 0)
+    connections = stats.get("connections", 0)
+    return {
+        "requests": total,
+        "qps": round(total / wall_s, 2) if wall_s else None,
+        "per_session": round(total / sessions, 2) if sessions else None,
+        "connections": connections,
+        "requests_per_connection": round(total / connections, 2) if connections else None,
+        "routes": dict(counters.most_common()),
+    }
+
+
+async def run_load(args) -> dict:
+    pool = HttpPool(args.base_url, size=args.connections)
+    directus = HttpPool(args.directus_url, size=2) if args.directus_url else None
+    await standin_stats(directus, reset=True)
+    recorder = Recorder()
+    users: asyncio.Queue = asyncio.Queue()
+    for index in range(args.users):
+        users.put_nowait(VirtualUser(index, pool, recorder, args))
+    names, weights = zip(*args.flows.items())
+
+    async def session(flow: str) -> None:
+        queued = time.perf_counter()
+        user = await users.get()
+        recorder.user_wait_ms.append((time.perf_counter() - queued) * 1000)
+        try:
+            await getattr(user, flow)()
+            recorder.flows[flow] += 1
+        except (HttpError, OSError, asyncio.TimeoutError, ValueError, KeyError):
+            recorder.failed_flows[flow] += 1
+        finally:
+            users.put_nowait(user)
+
+    tasks = []
+    started = time.perf_counter()
+    next_arrival = started
+    deadline = started + args.duration
+    while True:
+        next_arrival += random.expovariate(args.rate)
+        if next_arrival >= deadline:
+            break
+        await asyncio.sleep(max(0.0, next_arrival - time.perf_counter()))
+        tasks.append(asyncio.ensure_future(session(random.choices(names, weights)[0])))
+    offered_s = time.perf_counter() - started
+    await asyncio.gather(*tasks)
+    wall_s = time.perf_counter() - started
+    await pool.close()
+    directus_stats = await standin_stats(directus)
+    if directus is not None:
+        await directus.close()
+
+    total = sum(len(stats.latencies_ms) for stats in recorder.endpoints.values())
+    errors = sum(stats.errors for stats in recorder.endpoints.values())
+    return {
+        "settings": {
+            "base_url": args.base_url,
+            "rate": args.rate,
+            "duration_s": args.duration,
+            "users": args.users,
+            "connections": args.connections,
+            "flows": args.flows,
+        },
+        "arrivals": len(tasks),
+        "offered_rate": round(len(tasks) / offered_s, 2) if offered_s else None,
+        "wall_clock_s": round(wall_s, 3),
+        "requests": total,
+        "throughput_rps": round(total / wall_s, 2) if wall_s else None,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "user_wait_ms": {
+            "p50": _round(percentile(recorder.user_wait_ms, 50)),
+            "p95": _round(percentile(recorder.user_wait_ms, 95)),
+            "p99": _round(percentile(recorder.user_wait_ms, 99)),
+        },
+        "flows": {flow: {"completed": recorder.flows[flow], "failed": recorder.failed_flows[flow]} for flow in names},
+        "pool": pool.stats.as_dict(),
+        "directus": directus_summary(directus_stats, len(tasks), wall_s),
+        "endpoints": {label: stats.summary() for label, stats in sorted(recorder.endpoints.items())},
+    }
+
+
+def print_summary(report: dict) -> None:
+    print(
+        f"{report['arrivals']} sessions at {report['offered_rate']}/s, {report['requests']} requests in "
+        f"{report['wall_clock_s']}s ({report['throughput_rps']} req/s), error rate {report['error_rate']:.2%}"
+    )
+    print(f"{'endpoint':40} {'count':>6} {'err%':>6} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for label, stats in report["endpoints"].items():
+        print(
+            f"{label:40} {stats['count']:>6} {stats['error_rate'] * 100:>5.1f}% "
+            f"{stats['p50_ms'] or 0:>7.0f}ms {stats['p95_ms'] or 0:>6.0f}ms {stats['p99_ms'] or 0:>6.0f}ms"
+        )
+    wait = report["user_wait_ms"]
+    print(f"virtual-user wait p95 {wait['p95'] or 0:.0f}ms, pool {report['pool']}")
+    if report["directus"]:
+        directus = report["directus"]
+        print(
+            f"directus: {directus['requests']} requests, {directus['qps']}/s, {directus['per_session']} per session, "
+            f"{directus['connections']} connections ({directus['requests_per_connection']} requests each)"
+        )
+
+
+def parse_args(argv=None):
+    defaults = seed_defaults()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--directus-url", help="directus_standin.py base URL, to report the Directus requests made")
+    parser.add_argument("--rate", type=float, default=10.0, help="session arrivals per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of arrivals")
+    parser.add_argument("--users", type=int, default=20, help="virtual users (max concurrent sessions)")
+    parser.add_argument("--connections", type=int, default=64, help="keep-alive connections in the pool")
+    parser.add_argument("--flows", type=parse_flows, default=parse_flows(DEFAULT_FLOWS), help="flow=weight,...")
+    parser.add_argument("--role", default="user", help="auth_state role whose credentials log in")
+    parser.add_argument("--slug", default=defaults.get("slug"), help="event slug for the browse flow")
+    parser.add_argument("--event-id", default=defaults.get("event_id"), help="event id for checkout")
+    parser.add_argument("--ticket-id", default=defaults.get("ticket_id"), help="ticket type id for checkout")
+    parser.add_argument("--terms", type=lambda value: value.split(","), default=list(DEFAULT_TERMS))
+    parser.add_argument("--seed", type=int, help="random seed for a reproducible arrival schedule")
+    parser.add_argument("--report", type=Path, default=DEFAULT_REPORT)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.seed is not None:
+        random.seed(args.seed)
+    report = asyncio.run(run_load(args))
+    args.report.parent.mkdir(parents=True, exist_ok=True)
+    args.report.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    print_summary(report)
+    print(f"Report written to {args.report}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
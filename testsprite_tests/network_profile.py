@@ -0,0 +1,205 @@
+"""Request blocking and asset stubbing for E2E runs.
+
+Most TC assertions only look at text, yet page loads are dominated by Directus
+``/assets/**`` images (requested straight from the browser through
+``directus-image-loader.ts``), third-party scripts such as Stripe.js, the
+Google Places autocomplete behind ``/api/places/search`` and web fonts. The
+``lean`` profile installs ``context.route`` handlers that
+
+* answer Directus assets with a 1x1 placeholder PNG,
+* answer ``/api/places/search`` with an empty prediction list,
+* serve ``/fonts/*.woff2`` straight from ``public/fonts`` on disk,
+* abort every request to a host that is neither the app nor Directus.
+
+A TC opts out by declaring ``NETWORK_PROFILE = "off"`` (the Stripe checkout
+flows do, since they need Stripe.js). Requests and bytes saved are counted per
+context; sizes of stubbed responses are learned from runs where the profile is
+off and kept in ``tmp/network/sizes.json``, so ``bytes_saved`` only counts
+responses whose real size has been seen at least once.
+"""
+
+import asyncio
+import json
+import os
+import re
+import weakref
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from directus_standin import PLACEHOLDER_PNG
+
+TESTS_DIR = Path(__file__).resolve().parent
+FONTS_DIR = TESTS_DIR.parent / "public" / "fonts"
+SIZES_PATH = TESTS_DIR / "tmp" / "network" / "sizes.json"
+
+PROFILES = ("lean", "off")
+DEFAULT_PROFILE = os.environ.get("TESTSPRITE_NETWORK_PROFILE", "lean")
+DIRECTUS_URL = os.environ.get("NEXT_PUBLIC_DIRECTUS_URL", "http://localhost:8055")
+
+# Hosts that are always part of the system under test.
+LOCAL_HOSTS = ("localhost", "127.0.0.1")
+
+PLACES_STUB = json.dumps({"predictions": []}).encode()
+
+_stats_by_context: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_sizes: Optional[Dict[str, int]] = None
+
+
+@dataclass
+class NetworkStats:
+    profile: str
+    stubbed: int = 0
+    blocked: int = 0
+    fonts_from_disk: int = 0
+    bytes_saved: int = 0
+    unknown_size: int = 0  # intercepted responses never seen unstubbed
+
+    @property
+    def requests_saved(self) -> int:
+        return self.stubbed + self.blocked + self.fonts_from_disk
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "requests_saved": self.requests_saved}
+
+
+def _host(url: str) -> str:
+    return urlsplit(url).hostname or ""
+
+
+def _size_key(url: str) -> str:
+    # Tokens rotate between runs; the asset and its transformation do not.
+    parts = urlsplit(url)
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query) if k != "access_token"))
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, query, ""))
+
+
+def classify(url: str, app_url: str) -> Optional[str]:
+    """Return how the lean profile treats ``url``, or None to let it through."""
+    host, path = _host(url), urlsplit(url).path
+    directus_host = _host(DIRECTUS_URL)
+    if host == directus_host and path.startswith("/assets/"):
+        return "asset"
+    if host in (_host(app_url), *LOCAL_HOSTS):
+        if path == "/api/places/search":
+            return "places"
+        if path.startswith("/fonts/") and path.endswith(".woff2"):
+            return "font"
+        return None
+    if host == directus_host:
+        return None
+    return "third_party"
+
+
+def load_sizes(path: Path = SIZES_PATH) -> Dict[str, int]:
+    global _sizes
+    if _sizes is None:
+        try:
+            _sizes = {key: int(value) for key, value in json.loads(path.read_text()).items()}
+        except (OSError, ValueError):
+            _sizes = {}
+    return _sizes
+
+
+def save_sizes(path: Path = SIZES_PATH) -> None:
+    """Merge the sizes learned in this process into the ledger on disk."""
+    if not _sizes:
+        return
+    try:
+        on_disk = json.loads(path.read_text())
+    except (OSError, ValueError):
+        on_disk = {}
+    on_disk.update(_sizes)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(dict(sorted(on_disk.items())), indent=2))
+
+
+def stats_for(context) -> Optional[dict]:
+    stats = _stats_by_context.get(context)
+    return stats.as_dict() if stats else None
+
+
+async def apply(context, profile: Optional[str], app_url: str) -> None:
+    """Install ``profile`` on a fresh browser context."""
+    profile = profile or DEFAULT_PROFILE
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown network profile {profile!r}; expected one of {PROFILES}")
+    stats = NetworkStats(profile)
+    _stats_by_context[context] = stats
+    sizes = load_sizes()
+
+    if profile == "off":
+        _observe_sizes(context, app_url, sizes)
+        return
+
+    def saved(url: str, served: int = 0) -> None:
+        size = sizes.get(_size_key(url))
+        if size is None:
+            stats.unknown_size += 1
+        else:
+            stats.bytes_saved += max(0, size - served)
+
+    async def block(route):
+        stats.blocked += 1
+        saved(route.request.url)
+        await route.abort("blockedbyclient")
+
+    async def stub_asset(route):
+        stats.stubbed += 1
+        saved(route.request.url, len(PLACEHOLDER_PNG))
+        await route.fulfill(status=200, content_type="image/png", body=PLACEHOLDER_PNG)
+
+    async def stub_places(route):
+        stats.stubbed += 1
+        saved(route.request.url, len(PLACES_STUB))
+        await route.fulfill(status=200, content_type="application/json", body=PLACES_STUB)
+
+    async def font_from_disk(route):
+        font = FONTS_DIR / Path(urlsplit(route.request.url).path).name
+        if not font.is_file():
+            await route.fallback()
+            return
+        stats.fonts_from_disk += 1
+        stats.bytes_saved += font.stat().st_size
+        await route.fulfill(
+            status=200, path=str(font), headers={"Cache-Control": "public, max-age=31536000, immutable"}
+        )
+
+    allowed = {_host(app_url), _host(DIRECTUS_URL), *LOCAL_HOSTS}
+    third_party = re.compile(
+        r"^(?:https?|wss?)://(?!(?:" + "|".join(re.escape(host) for host in sorted(allowed)) + r")(?:[:/]|$))"
+    )
+    # Handlers registered later take precedence.
+    await context.route(third_party, block)
+    await context.route(f"{DIRECTUS_URL.rstrip('/')}/assets/**", stub_asset)
+    await context.route("**/api/places/search*", stub_places)
+    await context.route("**/fonts/*.woff2", font_from_disk)
+
+
+def _observe_sizes(context, app_url: str, sizes: Dict[str, int]) -> None:
+    """Learn the real size of responses the lean profile would intercept."""
+
+    async def record(request):
+        try:
+            request_sizes = await request.sizes()
+        except Exception:
+            return  # the context closed under us
+        sizes[_size_key(request.url)] = request_sizes["responseBodySize"] + request_sizes["responseHeadersSize"]
+
+    def on_finished(request):
+        if classify(request.url, app_url) in ("asset", "places", "third_party"):
+            asyncio.ensure_future(record(request))
+
+    context.on("requestfinished", on_finished)
+
+
+def summarize(summaries) -> dict:
+    """Aggregate per-test ``stats_for`` dicts for the suite report."""
+    summaries = [summary for summary in summaries if summary]
+    return {
+        "profiled_tests": sum(1 for summary in summaries if summary["profile"] != "off"),
+        "requests_saved": sum(summary["requests_saved"] for summary in summaries),
+        "bytes_saved": sum(summary["bytes_saved"] for summary in summaries),
+        "unknown_size": sum(summary["unknown_size"] for summary in summaries),
+    }
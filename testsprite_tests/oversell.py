@@ -0,0 +1,355 @@
+"""Flash-sale stress test that detects ticket oversell and lost updates.
+
+1. Creates a fresh ``event_tickets`` row with a small ``quantity`` through the
+   Directus REST API (admin token).
+2. Logs a buyer in and fires ``--checkouts`` concurrent
+   ``POST /api/stripe/checkout-session`` requests for one ticket each.
+3. Fires a signed ``payment_intent.succeeded`` webhook at
+   ``/api/stripe/webhook`` for every accepted session, ``--concurrency`` at a
+   time, recording handler latency and throughput.
+4. Waits for the webhook ingestion queue (``stripe_webhook_events``) to
+   drain, then reads the ticket back and compares ``quantity_sold`` with the
+   quantity on paid registrations.
+
+``lost_updates`` counts paid tickets missing from ``quantity_sold``, and
+``ledger_drift`` counts those missing from the ``ticket_inventory_ledger``
+sum. ``oversold`` counts paid tickets beyond ``quantity``, and
+``overbooked_checkouts`` counts accepted checkout sessions beyond it (checkout
+holds should keep it at zero). The exit status is non-zero when any of them is
+found.
+
+``--sales N`` skips checkout. It creates N pending registrations directly in
+Directus and delivers N sale webhooks in parallel, which isolates the
+inventory write path::
+
+    python testsprite_tests/oversell.py --sales 500 --concurrency 500
+
+Offline, run the app against ``directus_standin.py`` (``DIRECTUS_ADMIN_TOKEN=
+standin-admin-token``) and ``stripe_standin.py`` (``STRIPE_API_BASE``), with
+``STRIPE_WEBHOOK_SECRET`` matching ``--webhook-secret``::
+
+    python testsprite_tests/oversell.py --quantity 10 --checkouts 300 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import List, Optional
+
+TESTS_DIR = Path(__file__).resolve().parent
+DEFAULT_REPORT = TESTS_DIR / "tmp" / "oversell_report.json"
+
+if str(TESTS_DIR) not in sys.path:
+    sys.path.insert(0, str(TESTS_DIR))
+
+import auth_state  # noqa: E402
+import stripe_events  # noqa: E402
+from http_pool import HttpError, HttpPool  # noqa: E402
+from loadgen import DEFAULT_BASE_URL, percentile, seed_defaults  # noqa: E402
+
+DEFAULT_DIRECTUS_URL = "http://localhost:8055"
+DEFAULT_ADMIN_TOKEN = "standin-admin-token"
+TICKET_PRICE = 50
+WEBHOOK_QUEUE = "stripe_webhook_events"
+PENDING_WEBHOOK_STATUSES = ("queued", "processing", "failed")
+
+
+def latency_summary(latencies_s: List[float]) -> dict:
+    values = [latency * 1000 for latency in latencies_s]
+    return {
+        "p50_ms": _round(percentile(values, 50)),
+        "p95_ms": _round(percentile(values, 95)),
+        "p99_ms": _round(percentile(values, 99)),
+        "max_ms": _round(max(values, default=None)),
+    }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 1)
+
+
+def _problem_code(response) -> str:
+    """Error code from a ``withApi`` RFC 7807 body (``type`` ends in the code)."""
+    try:
+        problem = response.json()
+    except ValueError:
+        return str(response.status)
+    if isinstance(problem, dict) and problem.get("type"):
+        return str(problem["type"]).rsplit("/", 1)[-1].upper()
+    return str(response.status)
+
+
+class Directus:
+    def __init__(self, url: str, token: str, connections: int):
+        self.pool = HttpPool(url, size=connections)
+        self.headers = {"Authorization": f"Bearer {token}"}
+
+    async def call(self, method: str, path: str, **kwargs):
+        response = await self.pool.request(method, path, headers=self.headers, **kwargs)
+        if not response.ok:
+            raise RuntimeError(f"Directus {method} {path} returned {response.status}: {response.body[:200]!r}")
+        return response.json()["data"] if response.body else None
+
+    async def create_ticket(self, event_id: str, quantity: int) -> dict:
+        return await self.call("POST", "/items/event_tickets", json_body={
+            "event_id": event_id,
+            "title": f"Flash sale {int(time.time())}",
+            "status": "active",
+            "visibility": "public",
+            "quantity": quantity,
+            "quantity_sold": 0,
+            "price": TICKET_PRICE,
+            "service_fee_type": "absorbed",
+            "max_quantity_per_purchase": 1,
+        })
+
+    async def create_registrations(
+        self, count: int, ticket_id: str, event_id: str, paid: bool = False, order_size: int = 1
+    ) -> List[dict]:
+        """Pending (or paid) registrations; paid ones share a payment intent per ``order_size`` rows."""
+        stamp = time.time_ns()
+        return await self.call("POST", "/items/event_registrations", json_body=[
+            {
+                "event_id": event_id,
+                "ticket_type_id": ticket_id,
+                "participant_name": f"Flash Buyer {index}",
+                "participant_email": f"flash{index}@example.com",
+                "quantity": 1,
+                "total_amount": TICKET_PRICE,
+                "status": "confirmed" if paid else "pending",
+                "payment_status": "paid" if paid else "pending",
+                "stripe_payment_intent_id": f"pi_flash_{stamp}_{index // order_size}" if paid else None,
+            }
+            for index in range(count)
+        ])
+
+    async def sold_and_paid(self, ticket_id: str):
+        ticket = await self.call("GET", f"/items/event_tickets/{ticket_id}", params={"fields": "id,quantity,quantity_sold"})
+        paid = await self.call("GET", "/items/event_registrations", params={
+            "filter": json.dumps({"ticket_type_id": {"_eq": ticket_id}, "payment_status": {"_eq": "paid"}}),
+            "fields": "id,quantity",
+            "limit": "-1",
+        })
+        return ticket, sum(int(registration.get("quantity") or 1) for registration in paid)
+
+    async def ledger_sold(self, ticket_id: str) -> Optional[int]:
+        """Sum of ``ticket_inventory_ledger`` deltas; ``None`` when the collection does not exist."""
+        try:
+            rows = await self.call("GET", "/items/ticket_inventory_ledger", params={
+                "aggregate": json.dumps({"sum": "delta"}),
+                "filter": json.dumps({"ticket_id": {"_eq": ticket_id}}),
+            })
+        except RuntimeError:
+            return None
+        return int(float((rows[0].get("sum") or {}).get("delta") or 0)) if rows else 0
+
+    async def webhook_queue_depth(self) -> Optional[Counter]:
+        """``stripe_webhook_events`` rows per status; ``None`` when the collection does not exist."""
+        try:
+            rows = await self.call("GET", f"/items/{WEBHOOK_QUEUE}", params={
+                "aggregate": json.dumps({"count": "*"}),
+                "groupBy": "status",
+            })
+        except RuntimeError:
+            return None
+        depth = Counter()
+        for row in rows:
+            count = row.get("count")
+            depth[row["status"]] = int(count.get("*", 0) if isinstance(count, dict) else count or 0)
+        return depth
+
+
+async def wait_for_webhook_drain(directus: Directus, timeout_s: float, interval_s: float = 0.25) -> Optional[dict]:
+    """Wait until the webhook ingestion queue has nothing queued, processing or awaiting a retry.
+
+    Returns the final depth per status, the wait and how many polls it took
+    (each one a Directus call the caller may want to discount), or ``None``
+    when the app has no ingestion queue.
+    """
+    started, polls = time.perf_counter(), 0
+    while True:
+        depth = await directus.webhook_queue_depth()
+        polls += 1
+        if depth is None:
+            return None
+        backlog = sum(depth[status] for status in PENDING_WEBHOOK_STATUSES)
+        if not backlog or time.perf_counter() - started >= timeout_s:
+            return {
+                "drained": not backlog,
+                "wait_s": round(time.perf_counter() - started, 3),
+                "polls": polls,
+                "depth": dict(depth),
+            }
+        await asyncio.sleep(interval_s)
+
+
+async def checkout_burst(app: HttpPool, cookies: dict, args, ticket_id: str):
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies, outcomes, sessions = [], Counter(), []
+
+    async def one(index: int):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await app.request("POST", "/api/stripe/checkout-session", cookies=cookies, json_body={
+                    "eventId": args.event_id,
+                    "tickets": [{"ticketId": ticket_id, "quantity": 1}],
+                    "participantInfo": {"name": f"Flash Buyer {index}", "email": f"flash{index}@example.com"},
+                })
+            except (HttpError, OSError, asyncio.TimeoutError):
+                outcomes["exception"] += 1
+                return
+            latencies.append(time.perf_counter() - started)
+            if response.status == 200:
+                outcomes["accepted"] += 1
+                sessions.append(response.json())
+            else:
+                outcomes[_problem_code(response)] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(args.checkouts)))
+    return sessions, outcomes, latencies, time.perf_counter() - started
+
+
+async def webhook_burst(app: HttpPool, sessions: List[dict], args):
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies, statuses = [], Counter()
+
+    async def one(session: dict):
+        metadata = {"checkout_session_id": session["sessionId"]} if session["sessionId"] else None
+        event = stripe_events.payment_intent_succeeded(session["registrationIds"], amount=TICKET_PRICE * 100, metadata=metadata)
+        body, headers = stripe_events.signed(event, args.webhook_secret)
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await app.request("POST", "/api/stripe/webhook", body=body, headers=headers)
+            except (HttpError, OSError, asyncio.TimeoutError):
+                statuses["exception"] += 1
+                return
+            latencies.append(time.perf_counter() - started)
+            statuses[str(response.status)] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(session) for session in sessions))
+    return statuses, latencies, time.perf_counter() - started
+
+
+async def run(args) -> dict:
+    directus = Directus(args.directus_url, args.admin_token, args.concurrency)
+    app = HttpPool(args.base_url, size=args.concurrency)
+    try:
+        ticket = await directus.create_ticket(args.event_id, args.quantity)
+        print(f"Created ticket {ticket['id']} with quantity {args.quantity}", flush=True)
+
+        if args.sales:
+            # Sales mode: pending registrations straight into Directus, no checkout or Stripe involved.
+            rows = await directus.create_registrations(args.sales, ticket["id"], args.event_id)
+            sessions = [{"sessionId": None, "registrationIds": [row["id"]]} for row in rows]
+            outcomes, checkout_latencies, checkout_s = Counter(direct=len(rows)), [], 0.0
+        else:
+            email, password = auth_state.credentials_for(args.role)
+            login = await app.request("POST", "/api/auth/login", json_body={"email": email, "password": password})
+            if login.status != 200:
+                raise RuntimeError(f"login as {email} failed with {login.status}: {login.body[:200]!r}")
+            sessions, outcomes, checkout_latencies, checkout_s = await checkout_burst(app, login.cookies(), args, ticket["id"])
+            print(f"{outcomes['accepted']}/{args.checkouts} checkouts accepted in {checkout_s:.2f}s {dict(outcomes)}", flush=True)
+
+        statuses, webhook_latencies, webhook_s = await webhook_burst(app, sessions, args)
+        print(f"{len(sessions)} webhooks delivered in {webhook_s:.2f}s {dict(statuses)}", flush=True)
+        # Webhooks are acknowledged once queued; count sales only after the workers caught up.
+        drain = await wait_for_webhook_drain(directus, args.drain_timeout)
+        if drain:
+            print(f"Webhook queue {'drained' if drain['drained'] else 'NOT drained'} after {drain['wait_s']:.2f}s {drain['depth']}", flush=True)
+
+        ticket, paid = await directus.sold_and_paid(ticket["id"])
+        ledger = await directus.ledger_sold(ticket["id"])
+    finally:
+        await app.close()
+        await directus.pool.close()
+
+    sold = int(ticket.get("quantity_sold") or 0)
+    return {
+        "settings": {
+            "base_url": args.base_url,
+            "directus_url": args.directus_url,
+            "event_id": args.event_id,
+            "quantity": args.quantity,
+            "checkouts": 0 if args.sales else args.checkouts,
+            "sales": args.sales,
+            "concurrency": args.concurrency,
+        },
+        "ticket_id": ticket["id"],
+        "checkout": {
+            "outcomes": dict(outcomes),
+            "wall_clock_s": round(checkout_s, 3),
+            "latency": latency_summary(checkout_latencies),
+        },
+        "webhooks": {
+            "sent": len(sessions),
+            "statuses": dict(statuses),
+            "wall_clock_s": round(webhook_s, 3),
+            "throughput_per_s": round(len(sessions) / webhook_s, 2) if webhook_s else None,
+            "latency": latency_summary(webhook_latencies),
+            "queue_drain": drain,
+        },
+        "inventory": {
+            "quantity": int(ticket.get("quantity") or args.quantity),
+            "quantity_sold": sold,
+            "ledger_sold": ledger,
+            "paid_quantity": paid,
+            "lost_updates": paid - sold,
+            "ledger_drift": None if ledger is None else paid - ledger,
+            "oversold": max(0, paid - int(ticket.get("quantity") or args.quantity)),
+            # With checkout holds, accepted sessions can never exceed the stock on sale.
+            "overbooked_checkouts": max(0, outcomes["accepted"] - args.quantity),
+        },
+    }
+
+
+def parse_args(argv=None):
+    defaults = seed_defaults()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--directus-url", default=DEFAULT_DIRECTUS_URL)
+    parser.add_argument("--admin-token", default=DEFAULT_ADMIN_TOKEN)
+    parser.add_argument("--event-id", default=defaults.get("event_id"), help="event the flash-sale ticket belongs to")
+    parser.add_argument("--quantity", type=int, help="tickets on sale (default 10, or --sales)")
+    parser.add_argument("--checkouts", type=int, default=300, help="concurrent checkout attempts")
+    parser.add_argument("--sales", type=int, help="skip checkout and deliver this many sale webhooks for direct registrations")
+    parser.add_argument("--concurrency", type=int, default=100, help="requests in flight")
+    parser.add_argument("--role", default="user", help="auth_state role that buys")
+    parser.add_argument("--webhook-secret", default=stripe_events.DEFAULT_SECRET)
+    parser.add_argument("--drain-timeout", type=float, default=120.0, help="seconds to wait for the webhook queue to drain")
+    parser.add_argument("--report", type=Path, default=DEFAULT_REPORT)
+    args = parser.parse_args(argv)
+    if args.quantity is None:
+        args.quantity = args.sales or 10
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+    args.report.parent.mkdir(parents=True, exist_ok=True)
+    args.report.write_text(json.dumps(report, indent=2))
+
+    inventory, webhooks = report["inventory"], report["webhooks"]
+    print(
+        f"quantity {inventory['quantity']}, sold {inventory['quantity_sold']}, ledger {inventory['ledger_sold']}, "
+        f"paid {inventory['paid_quantity']}: {inventory['lost_updates']} lost updates, {inventory['oversold']} oversold"
+    )
+    print(
+        f"webhooks {webhooks['throughput_per_s']}/s, p50 {webhooks['latency']['p50_ms']}ms "
+        f"p95 {webhooks['latency']['p95_ms']}ms p99 {webhooks['latency']['p99_ms']}ms"
+    )
+    print(f"Report written to {args.report}")
+    failed = inventory["lost_updates"] or inventory["ledger_drift"] or inventory["oversold"] or inventory["overbooked_checkouts"]
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
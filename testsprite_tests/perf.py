@@ -0,0 +1,267 @@
+"""Web-performance budgets for E2E page visits.
+
+Every context gets an init script that watches the document with
+``PerformanceObserver`` and records, per page load (visit):
+
+* Navigation Timing: ``ttfb_ms``, ``dcl_ms``, ``load_ms``
+* paint and experience metrics: ``fcp_ms``, ``lcp_ms``, ``cls`` and ``tbt_ms``
+  (long-task time beyond 50 ms after first contentful paint)
+* ``js_bytes`` (transfer size of scripts) and ``requests`` (document plus
+  resources)
+
+Snapshots reach Python through an exposed binding when a document is hidden
+and through ``flush`` before the context closes. Visits are grouped by the
+Next.js route template they hit (``/eventos/[slug]``, derived from
+``src/app``), the median of each metric is compared with
+``perf_budgets.json`` and a metric at or above ``baseline * (1 + relative) +
+absolute`` is a regression that fails the run: with ``relative`` 0.3 and no
+``absolute`` slack, an LCP 30% over the baseline fails.
+
+The baseline is versioned with the suite. Record it from a production build
+with ``runner.py --perf record`` (or ``shard.py --perf record``). A route listed
+in ``perf_budgets.json`` that is visited without recorded metrics fails the
+check, so the gate never passes without comparing; other routes are only
+reported.
+"""
+
+import json
+import re
+import statistics
+import time
+import weakref
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from playwright import async_api
+
+TESTS_DIR = Path(__file__).resolve().parent
+APP_DIR = TESTS_DIR.parent / "src" / "app"
+BUDGET_PATH = TESTS_DIR / "perf_budgets.json"
+
+MODES = ("check", "record", "off")
+METRICS = ("ttfb_ms", "dcl_ms", "load_ms", "fcp_ms", "lcp_ms", "cls", "tbt_ms", "js_bytes", "requests")
+
+BINDING = "__testsprite_perf_report"
+
+COLLECTOR_JS = """
+(() => {
+	if (window.__testsprite_perf) return;
+	const state = { url: location.href, fcp: null, lcp: null, cls: 0, longTasks: [] };
+	let session = 0, sessionStart = 0, sessionLast = 0;
+	const observe = (type, callback) => {
+		try {
+			new PerformanceObserver((list) => list.getEntries().forEach(callback)).observe({ type, buffered: true });
+		} catch (error) {}
+	};
+	observe('paint', (entry) => {
+		if (entry.name === 'first-contentful-paint') state.fcp = entry.startTime;
+	});
+	observe('largest-contentful-paint', (entry) => { state.lcp = entry.startTime; });
+	observe('layout-shift', (entry) => {
+		if (entry.hadRecentInput) return;
+		// Session windows: shifts less than 1s apart, at most 5s long.
+		if (session && entry.startTime - sessionLast < 1000 && entry.startTime - sessionStart < 5000) {
+			session += entry.value;
+		} else {
+			session = entry.value;
+			sessionStart = entry.startTime;
+		}
+		sessionLast = entry.startTime;
+		state.cls = Math.max(state.cls, session);
+	});
+	observe('longtask', (entry) => state.longTasks.push([entry.startTime, entry.duration]));
+	const snapshot = () => {
+		const nav = performance.getEntriesByType('navigation')[0];
+		const resources = performance.getEntriesByType('resource');
+		const fcp = state.fcp ?? 0;
+		return {
+			id: String(performance.timeOrigin),
+			url: state.url,
+			metrics: {
+				ttfb_ms: nav ? nav.responseStart : null,
+				dcl_ms: nav && nav.domContentLoadedEventEnd ? nav.domContentLoadedEventEnd : null,
+				load_ms: nav && nav.loadEventEnd ? nav.loadEventEnd : null,
+				fcp_ms: state.fcp,
+				lcp_ms: state.lcp,
+				cls: state.cls,
+				tbt_ms: state.longTasks
+					.filter(([start]) => start >= fcp)
+					.reduce((total, [, duration]) => total + Math.max(0, duration - 50), 0),
+				js_bytes: resources
+					.filter((entry) => entry.initiatorType === 'script')
+					.reduce((total, entry) => total + (entry.transferSize || 0), 0),
+				requests: resources.length + 1,
+			},
+		};
+	};
+	window.__testsprite_perf = { snapshot };
+	addEventListener('pagehide', () => {
+		try { window.__testsprite_perf_report(snapshot()); } catch (error) {}
+	});
+})();
+"""
+
+_visits_by_context: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_routes: Optional[List[Tuple["re.Pattern", str]]] = None
+
+
+def _segment_pattern(segment: str) -> str:
+    if segment.startswith("[[...") and segment.endswith("]]"):
+        return r"(?:/.*)?"
+    if segment.startswith("[...") and segment.endswith("]"):
+        return r"/.+"
+    if segment.startswith("[") and segment.endswith("]"):
+        return r"/[^/]+"
+    return "/" + re.escape(segment)
+
+
+def route_patterns(app_dir: Path = APP_DIR) -> List[Tuple["re.Pattern", str]]:
+    """Return ``(regex, template)`` for every App Router page, most specific first."""
+    global _routes
+    if _routes is not None and app_dir == APP_DIR:
+        return _routes
+    entries = []
+    for page in app_dir.rglob("page.[jt]s*"):
+        segments = [
+            part for part in page.parent.relative_to(app_dir).parts if not part.startswith(("(", "@"))
+        ]
+        template = "/" + "/".join(segments)
+        regex = re.compile("^" + "".join(_segment_pattern(segment) for segment in segments) + "/?$")
+        dynamic = sum(segment.startswith("[") for segment in segments)
+        catch_all = any(segment.startswith(("[...", "[[...")) for segment in segments)
+        entries.append(((catch_all, dynamic, -len(segments)), regex, template))
+    routes = [(regex, template) for _, regex, template in sorted(entries, key=lambda entry: entry[0])]
+    if app_dir == APP_DIR:
+        _routes = routes
+    return routes
+
+
+def route_for(url: str) -> str:
+    path = urlsplit(url).path or "/"
+    for regex, template in route_patterns():
+        if regex.match(path):
+            return template
+    return path
+
+
+async def install(context) -> None:
+    """Start collecting visit metrics for every page of ``context``."""
+    visits: Dict[str, dict] = {}
+    _visits_by_context[context] = visits
+
+    def report(source, payload):
+        if payload and payload.get("id"):
+            visits[payload["id"]] = payload
+
+    await context.expose_binding(BINDING, report)
+    await context.add_init_script(COLLECTOR_JS)
+
+
+async def flush(context) -> None:
+    """Snapshot the documents still open in ``context``."""
+    visits = _visits_by_context.get(context)
+    if visits is None:
+        return
+    for page in context.pages:
+        try:
+            payload = await page.evaluate("() => window.__testsprite_perf && window.__testsprite_perf.snapshot()")
+        except async_api.Error:
+            continue
+        if payload:
+            visits[payload["id"]] = payload
+
+
+def visits_for(context) -> Optional[List[dict]]:
+    visits = _visits_by_context.get(context)
+    if visits is None:
+        return None
+    return [
+        {"url": visit["url"], "route": route_for(visit["url"]), "metrics": visit["metrics"]}
+        for visit in sorted(visits.values(), key=lambda visit: float(visit["id"]))
+    ]
+
+
+def load_budgets(path: Path = BUDGET_PATH) -> dict:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {"version": 1, "network_profile": None, "tolerance": {}, "routes": {}}
+
+
+def _medians(visits: List[dict]) -> dict:
+    medians = {}
+    for metric in METRICS:
+        values = [visit["metrics"].get(metric) for visit in visits]
+        values = [value for value in values if value is not None]
+        medians[metric] = round(statistics.median(values), 4) if values else None
+    return medians
+
+
+def evaluate(visits: Iterable[dict], budgets: dict, network: Optional[str] = None) -> dict:
+    """Group visits by route and compare their medians with the baseline."""
+    by_route: Dict[str, List[dict]] = {}
+    for visit in visits:
+        by_route.setdefault(visit["route"], []).append(visit)
+
+    comparable = budgets.get("network_profile") in (None, network)
+    routes, regressions, missing_baseline = {}, [], []
+    for route, route_visits in sorted(by_route.items()):
+        medians = _medians(route_visits)
+        baseline = (budgets.get("routes", {}).get(route) or {}).get("metrics")
+        if not baseline and route in budgets.get("routes", {}):
+            missing_baseline.append(route)
+        tolerance = {**budgets.get("tolerance", {}), **(budgets.get("routes", {}).get(route) or {}).get("tolerance", {})}
+        route_regressions = []
+        for metric, value in medians.items():
+            reference = (baseline or {}).get(metric)
+            if not comparable or value is None or reference is None or metric not in tolerance:
+                continue
+            limit = reference * (1 + tolerance[metric].get("relative", 0)) + tolerance[metric].get("absolute", 0)
+            if value >= limit and value > reference:
+                route_regressions.append({
+                    "route": route,
+                    "metric": metric,
+                    "value": value,
+                    "baseline": reference,
+                    "limit": round(limit, 4),
+                    "change_pct": round((value / reference - 1) * 100, 1) if reference else None,
+                })
+        routes[route] = {
+            "samples": len(route_visits),
+            "metrics": medians,
+            "baseline": baseline,
+            "regressions": [regression["metric"] for regression in route_regressions],
+        }
+        regressions.extend(route_regressions)
+    return {
+        "compared": comparable,
+        "baseline_network_profile": budgets.get("network_profile"),
+        "routes": routes,
+        "regressions": regressions,
+        "missing_baseline": missing_baseline,
+    }
+
+
+def record_baseline(summary: dict, network: Optional[str], path: Path = BUDGET_PATH) -> dict:
+    """Write the medians of this run as the new baseline, keeping tolerances."""
+    budgets = load_budgets(path)
+    budgets["version"] = int(budgets.get("version", 0)) + 1
+    budgets["recorded_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    budgets["network_profile"] = network
+    routes = budgets.setdefault("routes", {})
+    for route, data in summary["routes"].items():
+        routes.setdefault(route, {})
+        routes[route]["samples"] = data["samples"]
+        routes[route]["metrics"] = data["metrics"]
+    budgets["routes"] = dict(sorted(routes.items()))
+    path.write_text(json.dumps(budgets, indent=2, ensure_ascii=False) + "\n")
+    return budgets
+
+
+def describe(regression: dict) -> str:
+    change = f", {regression['change_pct']:+.0f}%" if regression["change_pct"] is not None else ""
+    return (
+        f"{regression['route']} {regression['metric']} {regression['value']:g} "
+        f">= {regression['limit']:g} (baseline {regression['baseline']:g}{change})"
+    )
@@ -0,0 +1,131 @@
+"""Concurrent token refresh test for the middleware.
+
+When an access token expires, a browser fires several requests at once (RSC
+payloads, prefetches, API calls), all with the same refresh token. Directus
+rotates refresh tokens, so the middleware must share one refresh between them.
+
+1. Logs ``--role`` in through ``POST /api/auth/login`` and keeps its refresh
+   token.
+2. Resets the ``directus_standin.py`` counters.
+3. Fires ``--requests`` concurrent ``GET --path`` with an expired access token
+   and that refresh token.
+4. Reads the stand-in counters and checks that Directus saw exactly one
+   ``POST /auth/refresh``, and that every response rotated the cookies to the
+   same new refresh token.
+
+The exit status is non-zero when either check fails. Run the app against the
+stand-in (``NEXT_PUBLIC_DIRECTUS_URL=http://localhost:8055``)::
+
+    python testsprite_tests/refresh_storm.py --requests 50
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+TESTS_DIR = Path(__file__).resolve().parent
+
+if str(TESTS_DIR) not in sys.path:
+    sys.path.insert(0, str(TESTS_DIR))
+
+import auth_state  # noqa: E402
+from http_pool import HttpError, HttpPool  # noqa: E402
+from loadgen import DEFAULT_BASE_URL, standin_stats  # noqa: E402
+
+DEFAULT_DIRECTUS_URL = "http://localhost:8055"
+REFRESH_ROUTE = "POST auth/refresh"
+
+
+def _b64url(value: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).rstrip(b"=").decode()
+
+
+def expired_access_token(user_id: str) -> str:
+    """A Directus-shaped JWT that expired a minute ago (the signature is not valid either)."""
+    now = int(time.time())
+    claims = {"id": user_id, "role": None, "app_access": False, "admin_access": False, "iat": now - 960, "exp": now - 60}
+    return f"{_b64url({'alg': 'HS256', 'typ': 'JWT'})}.{_b64url({**claims, 'iss': 'directus'})}.expired"
+
+
+async def login(pool: HttpPool, role: str) -> tuple:
+    email, password = auth_state.credentials_for(role)
+    response = await pool.request("POST", "/api/auth/login", json_body={"email": email, "password": password})
+    refresh_token = response.cookies().get("refresh_token")
+    if response.status != 200 or not refresh_token:
+        raise SystemExit(f"login as {role} failed: HTTP {response.status}")
+    return response.json()["user"]["id"], refresh_token
+
+
+async def run_storm(args) -> dict:
+    pool = HttpPool(args.base_url, size=args.requests)
+    directus = HttpPool(args.directus_url, size=2)
+
+    user_id, refresh_token = await login(pool, args.role)
+    if await standin_stats(directus, reset=True) is None:
+        raise SystemExit(f"could not reset the Directus stand-in at {args.directus_url}")
+
+    cookies = {"access_token": expired_access_token(user_id), "refresh_token": refresh_token}
+
+    async def hit():
+        try:
+            return await pool.request("GET", args.path, cookies=cookies)
+        except (HttpError, OSError, asyncio.TimeoutError) as exc:
+            return exc
+
+    started = time.perf_counter()
+    responses = await asyncio.gather(*(hit() for _ in range(args.requests)))
+    wall_s = time.perf_counter() - started
+
+    stats = await standin_stats(directus)
+    if stats is None:
+        raise SystemExit(f"could not read the Directus stand-in stats at {args.directus_url}")
+
+    failed = [response for response in responses if isinstance(response, Exception)]
+    answered = [response for response in responses if not isinstance(response, Exception)]
+    rotated = Counter(response.cookies().get("refresh_token") for response in answered)
+    upstream_refreshes = stats["requests"].get(REFRESH_ROUTE, 0)
+
+    return {
+        "requests": args.requests,
+        "path": args.path,
+        "wall_s": round(wall_s, 3),
+        "transport_errors": len(failed),
+        "statuses": dict(sorted(Counter(response.status for response in answered).items())),
+        "upstream_refreshes": upstream_refreshes,
+        "refresh_tokens_issued": len([token for token in rotated if token]),
+        "responses_without_rotation": rotated.get(None, 0),
+        "passed": upstream_refreshes == 1 and not failed and len(rotated) == 1 and None not in rotated,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--directus-url", default=DEFAULT_DIRECTUS_URL, help="directus_standin.py base URL")
+    parser.add_argument("--requests", type=int, default=50, help="concurrent requests with the expired token")
+    parser.add_argument("--path", default="/perfil", help="protected page the requests hit")
+    parser.add_argument("--role", default="user", help="auth_state role that logs in")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    report = asyncio.run(run_storm(args))
+    print(json.dumps(report, indent=2))
+    if not report["passed"]:
+        print(
+            f"FAIL: {report['upstream_refreshes']} upstream refreshes and {report['refresh_tokens_issued']} "
+            f"refresh tokens for {args.requests} concurrent requests (expected 1 and 1)",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
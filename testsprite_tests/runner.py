@@ -0,0 +1,307 @@
+"""Concurrent runner for the TC scripts.
+
+Starts one Playwright session and a small pool of Chromium browsers, then runs
+each script's ``run_test`` coroutine in its own ``browser.new_context()`` with
+a bounded number of tests in flight. Scripts that declare a ``ROLE`` get a
+context pre-authenticated from the ``auth_state`` cache, so each role logs in
+once per run instead of once per test. Every context gets the
+``network_profile`` routing profile unless the script declares
+``NETWORK_PROFILE = "off"``, and ``perf`` records web-performance metrics
+for each page it loads. A per-test wall-clock report, including the step
+timings recorded by ``steps.Steps``, the requests and bytes the network
+profile saved and the per-route performance medians checked against
+``perf_budgets.json``, is written to ``tmp/runner_report.json``.
+
+Usage::
+
+    python testsprite_tests/runner.py --parallel 6 --browsers 2
+    python testsprite_tests/runner.py --only TC002,TC013
+    python testsprite_tests/runner.py --network off   # learn real asset sizes
+    python testsprite_tests/runner.py --perf record   # refresh the perf baseline
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import itertools
+import json
+import sys
+import time
+import traceback
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from playwright import async_api
+
+TESTS_DIR = Path(__file__).resolve().parent
+REPORT_DIR = TESTS_DIR / "tmp"
+DEFAULT_REPORT = REPORT_DIR / "runner_report.json"
+
+if str(TESTS_DIR) not in sys.path:
+    sys.path.insert(0, str(TESTS_DIR))
+
+import auth_state  # noqa: E402
+import network_profile  # noqa: E402
+import perf  # noqa: E402
+from harness import BASE_URL, launch_browser  # noqa: E402
+from steps import summarize, timings_for  # noqa: E402
+
+
+@dataclass
+class TestResult:
+    test_id: str
+    file: str
+    status: str  # "passed", "failed" (assertion) or "error" (anything else)
+    duration_s: float
+    started_at_s: float  # offset from the start of the suite
+    error: Optional[str] = None
+    steps: Optional[dict] = None
+    network: Optional[dict] = None
+    perf: Optional[List[dict]] = None
+
+
+def discover_tests(only: Optional[List[str]] = None) -> List[Path]:
+    """Return the TC scripts in id order, optionally filtered by id prefix."""
+    paths = sorted(TESTS_DIR.glob("TC[0-9]*.py"))
+    if only:
+        wanted = {test_id.strip().upper() for test_id in only if test_id.strip()}
+        paths = [path for path in paths if path.name.split("_", 1)[0] in wanted]
+    return paths
+
+
+def test_id_for(path: Path) -> str:
+    return path.name.split("_", 1)[0]
+
+
+def load_test(path: Path):
+    """Import a TC script without executing its ``__main__`` block."""
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class BrowserPool:
+    """A fixed set of browsers handed out to the least busy one first."""
+
+    def __init__(self, browsers):
+        self._browsers = list(browsers)
+        self._load = [0] * len(self._browsers)
+        self._order = itertools.count()
+
+    @classmethod
+    async def start(cls, pw, size: int) -> "BrowserPool":
+        browsers = await asyncio.gather(*(launch_browser(pw) for _ in range(max(1, size))))
+        return cls(browsers)
+
+    def acquire(self):
+        index = min(range(len(self._browsers)), key=lambda i: (self._load[i], next(self._order)))
+        self._load[index] += 1
+        return index, self._browsers[index]
+
+    def release(self, index: int) -> None:
+        self._load[index] -= 1
+
+    async def close(self) -> None:
+        await asyncio.gather(*(browser.close() for browser in self._browsers), return_exceptions=True)
+
+
+async def run_one(
+    pw,
+    path: Path,
+    pool: BrowserPool,
+    semaphore: asyncio.Semaphore,
+    suite_start: float,
+    network: str,
+    perf_mode: str,
+) -> TestResult:
+    test_id = test_id_for(path)
+    async with semaphore:
+        index, browser = pool.acquire()
+        started = time.perf_counter()
+        status, error = "passed", None
+        context = None
+        step_summary = None
+        network_summary = None
+        visits = None
+        try:
+            module = load_test(path)
+            role = getattr(module, "ROLE", None)
+            state = await auth_state.storage_state(pw, role, BASE_URL) if role else None
+            context = await browser.new_context(storage_state=state)
+            await network_profile.apply(context, getattr(module, "NETWORK_PROFILE", network), BASE_URL)
+            if perf_mode != "off":
+                await perf.install(context)
+            await module.run_test(context)
+        except AssertionError as exc:
+            status, error = "failed", str(exc) or "AssertionError"
+        except Exception:
+            status, error = "error", traceback.format_exc(limit=3)
+        finally:
+            if context:
+                step_summary = summarize(timings_for(context))
+                network_summary = network_profile.stats_for(context)
+                await perf.flush(context)
+                visits = perf.visits_for(context)
+                try:
+                    await context.close()
+                except async_api.Error:
+                    pass
+            pool.release(index)
+        duration = time.perf_counter() - started
+
+    saved = ""
+    if network_summary and network_summary["profile"] != "off":
+        saved = f"  ({network_summary['requests_saved']} requests, {network_summary['bytes_saved'] / 1024:.0f} KiB saved)"
+    print(f"[{test_id}] {status.upper():6} {duration:7.2f}s{saved}", flush=True)
+    return TestResult(
+        test_id=test_id,
+        file=path.name,
+        status=status,
+        duration_s=round(duration, 3),
+        started_at_s=round(started - suite_start, 3),
+        error=error,
+        steps=step_summary,
+        network=network_summary,
+        perf=visits,
+    )
+
+
+async def run_suite(
+    paths: List[Path],
+    parallel: int = 4,
+    browsers: int = 1,
+    network: str = network_profile.DEFAULT_PROFILE,
+    perf_mode: str = "check",
+) -> List[TestResult]:
+    semaphore = asyncio.Semaphore(max(1, parallel))
+    pw = await async_api.async_playwright().start()
+    pool = None
+    try:
+        pool = await BrowserPool.start(pw, browsers)
+        suite_start = time.perf_counter()
+        return list(await asyncio.gather(*(run_one(pw, path, pool, semaphore, suite_start, network, perf_mode) for path in paths)))
+    finally:
+        if pool:
+            await pool.close()
+        await pw.stop()
+
+
+def write_report(results: List[TestResult], wall_s: float, path: Path, **settings) -> dict:
+    serial_s = sum(result.duration_s for result in results)
+    step_summaries = [result.steps for result in results if result.steps]
+    report = {
+        "settings": settings,
+        "wall_clock_s": round(wall_s, 3),
+        "sum_of_tests_s": round(serial_s, 3),
+        "speedup": round(serial_s / wall_s, 2) if wall_s else None,
+        "counts": {
+            status: sum(1 for result in results if result.status == status)
+            for status in ("passed", "failed", "error")
+        },
+        "steps": {
+            "count": sum(summary["count"] for summary in step_summaries),
+            "saved_s": round(sum(summary["saved_ms"] for summary in step_summaries) / 1000, 3),
+            "fallbacks": sum(summary["fallbacks"] for summary in step_summaries),
+        },
+        "network": network_profile.summarize(result.network for result in results),
+        "perf": perf.evaluate(
+            (visit for result in results for visit in result.perf or []), perf.load_budgets(), settings.get("network")
+        ),
+        "tests": [asdict(result) for result in sorted(results, key=lambda r: r.test_id)],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    return report
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--parallel", type=int, default=4, help="maximum tests in flight")
+    parser.add_argument("--browsers", type=int, default=1, help="size of the shared browser pool")
+    parser.add_argument("--only", type=lambda value: value.split(","), help="comma-separated test ids")
+    parser.add_argument(
+        "--network",
+        choices=network_profile.PROFILES,
+        default=network_profile.DEFAULT_PROFILE,
+        help="routing profile for tests that do not set NETWORK_PROFILE",
+    )
+    parser.add_argument(
+        "--perf",
+        choices=perf.MODES,
+        default="check",
+        help="compare page metrics with perf_budgets.json, record them as the new baseline, or skip them",
+    )
+    parser.add_argument("--report", type=Path, default=DEFAULT_REPORT, help="where to write the JSON report")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    paths = discover_tests(args.only)
+    if not paths:
+        print("No TC scripts matched.", file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+    results = asyncio.run(
+        run_suite(paths, parallel=args.parallel, browsers=args.browsers, network=args.network, perf_mode=args.perf)
+    )
+    wall = time.perf_counter() - started
+    network_profile.save_sizes()
+
+    report = write_report(
+        results, wall, args.report, parallel=args.parallel, browsers=args.browsers, network=args.network, perf=args.perf
+    )
+    counts = report["counts"]
+    print(
+        f"\n{len(results)} tests in {report['wall_clock_s']}s "
+        f"(sum {report['sum_of_tests_s']}s, x{report['speedup']}): "
+        f"{counts['passed']} passed, {counts['failed']} failed, {counts['error']} errors"
+    )
+    print(
+        f"{report['steps']['count']} steps saved {report['steps']['saved_s']}s against fixed sleeps "
+        f"({report['steps']['fallbacks']} hit the ceiling)"
+    )
+    network = report["network"]
+    print(
+        f"Network profile saved {network['requests_saved']} requests and {network['bytes_saved'] / 1024:.0f} KiB "
+        f"over {network['profiled_tests']} tests ({network['unknown_size']} of unknown size)"
+    )
+    regressions = report_perf(report["perf"], args.perf, args.network)
+    print(f"Report written to {args.report}")
+    return 0 if counts["failed"] == counts["error"] == 0 and not regressions else 1
+
+
+def report_perf(summary: dict, mode: str, network: str) -> int:
+    """Print the perf outcome, recording the baseline if asked; return the failure count.
+
+    Regressions fail the run, and so do budgeted routes without a recorded baseline.
+    """
+    if mode == "off" or not summary["routes"]:
+        return 0
+    if mode == "record":
+        budgets = perf.record_baseline(summary, network)
+        print(f"Perf baseline v{budgets['version']} recorded for {len(summary['routes'])} routes in {perf.BUDGET_PATH}")
+        return 0
+    if not summary["compared"]:
+        print(
+            f"Perf not compared: baseline was recorded with network profile "
+            f"{summary['baseline_network_profile']!r}, this run used {network!r}"
+        )
+        return 0
+    for regression in summary["regressions"]:
+        print(f"PERF REGRESSION {perf.describe(regression)}")
+    missing = summary.get("missing_baseline", [])
+    for route in missing:
+        print(f"PERF NO BASELINE {route}: record one with --perf record against a production build")
+    print(
+        f"Perf checked on {len(summary['routes'])} routes: {len(summary['regressions'])} regressions, "
+        f"{len(missing)} without baseline"
+    )
+    return len(summary["regressions"]) + len(missing)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,303 @@
+"""Sharded execution of the TC suite across worker processes.
+
+Each worker gets its own Next.js server on its own port and runs ``runner.py``
+over its bucket of tests with ``TESTSPRITE_BASE_URL`` pointing at that server.
+Tests are assigned longest-processing-time-first using the durations recorded
+in ``tmp/timings.json`` by previous runs, and the worker reports are merged
+into a single ``tmp/runner_report.json``.
+
+Usage::
+
+    # build once, then fan out over 4 local workers
+    pnpm build && python testsprite_tests/shard.py --workers 4
+
+    # run only bucket 2 of 3 (e.g. on another CI machine)
+    python testsprite_tests/shard.py --workers 3 --shard 2
+
+    # servers already running on 3101..3104
+    python testsprite_tests/shard.py --workers 4 --base-port 3101 --no-server
+
+    # fully offline: one seeded Directus stand-in per worker
+    python testsprite_tests/shard.py --workers 4 --standin seed --server-cmd "npx next dev -p {port}"
+
+``NEXT_PUBLIC_DIRECTUS_URL`` is inlined by ``next build``, so per-worker
+stand-ins only take effect with a dev server (or one build per worker).
+"""
+
+import argparse
+import asyncio
+import heapq
+import json
+import os
+import shlex
+import signal
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Dict, List, Optional
+
+TESTS_DIR = Path(__file__).resolve().parent
+REPO_DIR = TESTS_DIR.parent
+TMP_DIR = TESTS_DIR / "tmp"
+SHARD_DIR = TMP_DIR / "shards"
+HISTORY_PATH = TMP_DIR / "timings.json"
+MERGED_REPORT = TMP_DIR / "runner_report.json"
+
+if str(TESTS_DIR) not in sys.path:
+    sys.path.insert(0, str(TESTS_DIR))
+
+import directus_standin  # noqa: E402
+import network_profile  # noqa: E402
+import perf  # noqa: E402
+from runner import discover_tests, report_perf, test_id_for  # noqa: E402
+
+DEFAULT_SERVER_CMD = "npx next start -p {port}"
+DEFAULT_DURATION_S = 30.0
+SERVER_READY_TIMEOUT_S = 120
+# Static token the seeded stand-in accepts for the webhook/admin client.
+STANDIN_ADMIN_TOKEN = "standin-admin-token"
+# Weight of the latest run when updating the timing history.
+HISTORY_ALPHA = 0.5
+
+
+def load_history(path: Path = HISTORY_PATH) -> Dict[str, float]:
+    try:
+        return {key: float(value) for key, value in json.loads(path.read_text()).items()}
+    except (OSError, ValueError):
+        return {}
+
+
+def update_history(results: List[dict], path: Path = HISTORY_PATH) -> Dict[str, float]:
+    history = load_history(path)
+    for result in results:
+        previous = history.get(result["test_id"])
+        duration = float(result["duration_s"])
+        history[result["test_id"]] = round(
+            duration if previous is None else HISTORY_ALPHA * duration + (1 - HISTORY_ALPHA) * previous, 3
+        )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(dict(sorted(history.items())), indent=2))
+    return history
+
+
+def plan_shards(test_ids: List[str], workers: int, history: Dict[str, float]) -> List[List[str]]:
+    """Assign tests to workers longest-processing-time-first.
+
+    Tests without history are estimated at the mean of the known durations.
+    """
+    known = [history[test_id] for test_id in test_ids if test_id in history]
+    fallback = sum(known) / len(known) if known else DEFAULT_DURATION_S
+    estimates = {test_id: history.get(test_id, fallback) for test_id in test_ids}
+
+    buckets: List[List[str]] = [[] for _ in range(max(1, workers))]
+    loads = [(0.0, index) for index in range(len(buckets))]
+    heapq.heapify(loads)
+    for test_id in sorted(test_ids, key=lambda tid: (-estimates[tid], tid)):
+        load, index = heapq.heappop(loads)
+        buckets[index].append(test_id)
+        heapq.heappush(loads, (load + estimates[test_id], index))
+    return buckets
+
+
+def _responds(url: str) -> bool:
+    try:
+        with urllib.request.urlopen(url, timeout=2):
+            return True
+    except urllib.error.HTTPError:
+        return True  # the server is up, it just did not like "/"
+    except (urllib.error.URLError, OSError):
+        return False
+
+
+async def wait_for_server(url: str, timeout_s: float = SERVER_READY_TIMEOUT_S) -> None:
+    loop = asyncio.get_running_loop()
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        if await loop.run_in_executor(None, _responds, url):
+            return
+        await asyncio.sleep(0.5)
+    raise TimeoutError(f"{url} did not come up within {timeout_s:.0f}s")
+
+
+class Worker:
+    """One app server plus one runner process over a bucket of tests."""
+
+    def __init__(self, index: int, port: int, test_ids: List[str], args):
+        self.index = index
+        self.port = port
+        self.test_ids = test_ids
+        self.args = args
+        self.base_url = f"http://localhost:{port}"
+        self.report_path = SHARD_DIR / f"worker-{index}.json"
+        self.log_path = SHARD_DIR / f"worker-{index}-server.log"
+        self.server: Optional[asyncio.subprocess.Process] = None
+        self.standin = None
+        self.standin_port = args.standin_base_port + index - 1 if args.standin else None
+
+    def env(self) -> dict:
+        env = dict(os.environ)
+        env["TESTSPRITE_BASE_URL"] = self.base_url
+        env["PORT"] = str(self.port)
+        if self.standin_port:
+            env["NEXT_PUBLIC_DIRECTUS_URL"] = f"http://127.0.0.1:{self.standin_port}"
+            env["DIRECTUS_ADMIN_TOKEN"] = STANDIN_ADMIN_TOKEN
+        return env
+
+    def start_standin(self) -> None:
+        if self.args.standin:
+            self.standin = directus_standin.start_in_thread(mode=self.args.standin, port=self.standin_port)
+
+    def stop_standin(self) -> None:
+        if self.standin:
+            self.standin.shutdown()
+            self.standin.server_close()
+
+    async def start_server(self) -> None:
+        if self.args.no_server:
+            return
+        command = shlex.split(self.args.server_cmd.format(port=self.port))
+        log = open(self.log_path, "wb")
+        self.server = await asyncio.create_subprocess_exec(
+            *command, cwd=REPO_DIR, env=self.env(), stdout=log, stderr=asyncio.subprocess.STDOUT, start_new_session=True
+        )
+        log.close()
+
+    async def stop_server(self) -> None:
+        if not self.server or self.server.returncode is not None:
+            return
+        try:
+            os.killpg(self.server.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            return
+        try:
+            await asyncio.wait_for(self.server.wait(), timeout=10)
+        except asyncio.TimeoutError:
+            os.killpg(self.server.pid, signal.SIGKILL)
+
+    async def run(self) -> int:
+        self.start_standin()
+        await self.start_server()
+        try:
+            await wait_for_server(self.base_url)
+            print(f"[worker {self.index}] {self.base_url}: {', '.join(self.test_ids)}", flush=True)
+            runner = await asyncio.create_subprocess_exec(
+                sys.executable,
+                str(TESTS_DIR / "runner.py"),
+                "--only", ",".join(self.test_ids),
+                "--parallel", str(self.args.parallel),
+                "--browsers", str(self.args.browsers),
+                "--network", self.args.network,
+                # Workers only collect; the baseline is compared or recorded on the merged report.
+                "--perf", "off" if self.args.perf == "off" else "check",
+                "--report", str(self.report_path),
+                env=self.env(),
+            )
+            return await runner.wait()
+        finally:
+            await self.stop_server()
+            self.stop_standin()
+
+
+def merge_reports(workers: List[Worker], wall_s: float, network: str, path: Path = MERGED_REPORT) -> dict:
+    tests, shards = [], []
+    for worker in workers:
+        try:
+            report = json.loads(worker.report_path.read_text())
+        except (OSError, ValueError):
+            report = {"tests": [], "wall_clock_s": None}
+        tests.extend(report["tests"])
+        shards.append({
+            "worker": worker.index,
+            "base_url": worker.base_url,
+            "directus_standin": worker.standin_port and f"http://127.0.0.1:{worker.standin_port}",
+            "tests": worker.test_ids,
+            "wall_clock_s": report["wall_clock_s"],
+        })
+
+    serial_s = sum(test["duration_s"] for test in tests)
+    merged = {
+        "settings": {"workers": len(workers)},
+        "wall_clock_s": round(wall_s, 3),
+        "sum_of_tests_s": round(serial_s, 3),
+        "speedup": round(serial_s / wall_s, 2) if wall_s else None,
+        "counts": {
+            status: sum(1 for test in tests if test["status"] == status)
+            for status in ("passed", "failed", "error")
+        },
+        "network": network_profile.summarize(test.get("network") for test in tests),
+        "perf": perf.evaluate(
+            (visit for test in tests for visit in test.get("perf") or []), perf.load_budgets(), network
+        ),
+        "shards": shards,
+        "tests": sorted(tests, key=lambda test: test["test_id"]),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(merged, indent=2, ensure_ascii=False))
+    return merged
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="number of worker processes")
+    parser.add_argument("--shard", type=int, help="run only this 1-based bucket of the plan")
+    parser.add_argument("--base-port", type=int, default=3101, help="port of the first worker's app server")
+    parser.add_argument("--server-cmd", default=DEFAULT_SERVER_CMD, help="app server command; {port} is substituted")
+    parser.add_argument("--no-server", action="store_true", help="reuse servers already listening on the ports")
+    parser.add_argument(
+        "--standin", choices=("seed", "replay"), help="give each worker its own local Directus stand-in in this mode"
+    )
+    parser.add_argument("--standin-base-port", type=int, default=8101, help="port of the first worker's stand-in")
+    parser.add_argument("--parallel", type=int, default=2, help="tests in flight per worker")
+    parser.add_argument("--browsers", type=int, default=1, help="browsers per worker")
+    parser.add_argument("--network", choices=network_profile.PROFILES, default=network_profile.DEFAULT_PROFILE)
+    parser.add_argument("--perf", choices=perf.MODES, default="check")
+    parser.add_argument("--only", type=lambda value: value.split(","), help="comma-separated test ids")
+    parser.add_argument("--plan", action="store_true", help="print the shard plan and exit")
+    return parser.parse_args(argv)
+
+
+async def run_workers(workers: List[Worker]) -> List[int]:
+    return list(await asyncio.gather(*(worker.run() for worker in workers)))
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    test_ids = [test_id_for(path) for path in discover_tests(args.only)]
+    if not test_ids:
+        print("No TC scripts matched.", file=sys.stderr)
+        return 2
+
+    history = load_history()
+    buckets = plan_shards(test_ids, args.workers, history)
+    if args.plan:
+        print(json.dumps({f"worker-{index + 1}": bucket for index, bucket in enumerate(buckets)}, indent=2))
+        return 0
+
+    workers = [
+        Worker(index + 1, args.base_port + index, bucket, args)
+        for index, bucket in enumerate(buckets)
+        if bucket and (args.shard is None or args.shard == index + 1)
+    ]
+    SHARD_DIR.mkdir(parents=True, exist_ok=True)
+
+    started = time.perf_counter()
+    asyncio.run(run_workers(workers))
+    wall = time.perf_counter() - started
+
+    merged = merge_reports(workers, wall, args.network)
+    update_history(merged["tests"])
+    counts = merged["counts"]
+    print(
+        f"\n{len(merged['tests'])} tests on {len(workers)} workers in {merged['wall_clock_s']}s "
+        f"(sum {merged['sum_of_tests_s']}s, x{merged['speedup']}): "
+        f"{counts['passed']} passed, {counts['failed']} failed, {counts['error']} errors"
+    )
+    regressions = report_perf(merged["perf"], args.perf, args.network)
+    print(f"Report written to {MERGED_REPORT}")
+    return 0 if counts["failed"] == counts["error"] == 0 and not regressions else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+"""Condition-driven step execution for the TC scripts.
+
+The generated scripts slept a fixed 3 s before every click and fill. ``Steps``
+instead waits on what the step actually needs:
+
+* the Next.js app has hydrated (``<html data-hydrated="true">``, set by
+  ``HydrationMarker``),
+* the target locator is visible (Playwright's own actionability checks cover
+  the rest),
+* after a click, the URL changed (for submits) and the page's document/XHR
+  traffic has gone quiet.
+
+Each wait is capped by ``ceiling_ms``, so the old fixed sleep survives only as
+the worst case. Every step is timed; ``runner.py`` folds the timings into its
+report together with the time saved against the fixed-sleep baseline.
+"""
+
+import asyncio
+import time
+import weakref
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+from playwright import async_api
+
+from harness import DEFAULT_TIMEOUT_MS
+
+# The fixed pause the generated scripts used before every action.
+LEGACY_SLEEP_MS = 3000
+
+# Quiet period after which the page's network is considered settled.
+NETWORK_QUIET_MS = 100
+POLL_INTERVAL_S = 0.02
+
+# Traffic that never settles or does not gate interaction.
+IGNORED_RESOURCE_TYPES = {"image", "media", "font", "eventsource", "websocket", "manifest", "other"}
+IGNORED_URL_PARTS = ("/_next/webpack-hmr", "/__nextjs_original-stack-frame")
+
+HYDRATED_JS = "() => document.documentElement.dataset.hydrated === 'true'"
+
+_timings_by_context: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+@dataclass
+class StepTiming:
+    index: int
+    action: str
+    target: str
+    wait_ms: float  # condition waits before the action
+    action_ms: float  # the action itself
+    settle_ms: float  # post-conditions after the action
+    conditions: List[str]
+    fallback: bool  # True if any wait ran into the ceiling
+
+
+class _NetworkTracker:
+    """Counts in-flight requests that matter for the current route."""
+
+    def __init__(self, page):
+        self._inflight = set()
+        self.last_activity = time.perf_counter()
+        page.on("request", self._on_start)
+        page.on("requestfinished", self._on_done)
+        page.on("requestfailed", self._on_done)
+
+    def _on_start(self, request) -> None:
+        if request.resource_type in IGNORED_RESOURCE_TYPES:
+            return
+        if any(part in request.url for part in IGNORED_URL_PARTS):
+            return
+        self._inflight.add(request)
+        self.last_activity = time.perf_counter()
+
+    def _on_done(self, request) -> None:
+        if request in self._inflight:
+            self._inflight.discard(request)
+            self.last_activity = time.perf_counter()
+
+    def mark(self) -> None:
+        self.last_activity = time.perf_counter()
+
+    async def wait_quiet(self, ceiling_s: float) -> bool:
+        deadline = time.perf_counter() + ceiling_s
+        quiet_s = NETWORK_QUIET_MS / 1000
+        while True:
+            now = time.perf_counter()
+            if not self._inflight and now - self.last_activity >= quiet_s:
+                return True
+            if now >= deadline:
+                return False
+            await asyncio.sleep(POLL_INTERVAL_S)
+
+
+class Steps:
+    """Runs clicks and fills for one browser context, recording their timings."""
+
+    def __init__(self, context, ceiling_ms: int = LEGACY_SLEEP_MS, action_timeout_ms: int = DEFAULT_TIMEOUT_MS):
+        self.context = context
+        self.ceiling_ms = ceiling_ms
+        self.action_timeout_ms = action_timeout_ms
+        self.timings: List[StepTiming] = _timings_by_context.setdefault(context, [])
+        self._trackers: Dict[int, _NetworkTracker] = {}
+        self._hydration_marker = True
+
+    def _tracker(self, page) -> _NetworkTracker:
+        key = id(page)
+        if key not in self._trackers:
+            self._trackers[key] = _NetworkTracker(page)
+        return self._trackers[key]
+
+    async def _wait_hydrated(self, page, conditions: List[str]) -> bool:
+        if not self._hydration_marker:
+            return True
+        try:
+            await page.wait_for_function(HYDRATED_JS, timeout=self.ceiling_ms)
+            conditions.append("hydrated")
+            return True
+        except async_api.Error:
+            # Builds without HydrationMarker would pay the ceiling on every
+            # step; stop asking once the marker is known to be missing.
+            self._hydration_marker = False
+            conditions.append("hydrated:ceiling")
+            return False
+
+    async def _wait_actionable(self, elem, conditions: List[str]) -> bool:
+        try:
+            await elem.wait_for(state="visible", timeout=self.ceiling_ms)
+            conditions.append("visible")
+            return True
+        except async_api.Error:
+            conditions.append("visible:ceiling")
+            return False
+
+    async def _prepare(self, elem, conditions: List[str]):
+        page = elem.page
+        self._tracker(page)
+        hydrated = await self._wait_hydrated(page, conditions)
+        actionable = await self._wait_actionable(elem, conditions)
+        return page, not (hydrated and actionable)
+
+    def _record(self, action: str, elem, marks: List[float], conditions: List[str], fallback: bool):
+        started, ready, acted, settled = marks
+        timing = StepTiming(
+            index=len(self.timings),
+            action=action,
+            target=getattr(elem, "_selector", repr(elem)),
+            wait_ms=round((ready - started) * 1000, 1),
+            action_ms=round((acted - ready) * 1000, 1),
+            settle_ms=round((settled - acted) * 1000, 1),
+            conditions=conditions,
+            fallback=fallback,
+        )
+        self.timings.append(timing)
+        return timing
+
+    async def click(self, elem, navigates: bool = False, timeout: Optional[int] = None) -> StepTiming:
+        """Click once ``elem`` is actionable, then wait for the page to settle.
+
+        With ``navigates=True`` (form submits, links) the URL change is awaited
+        before the network settle.
+        """
+        conditions: List[str] = []
+        started = time.perf_counter()
+        page, fallback = await self._prepare(elem, conditions)
+        ready = time.perf_counter()
+
+        url_before = page.url
+        tracker = self._tracker(page)
+        await elem.click(timeout=timeout or self.action_timeout_ms)
+        tracker.mark()
+        acted = time.perf_counter()
+
+        if navigates:
+            try:
+                await page.wait_for_url(lambda url: url != url_before, wait_until="commit", timeout=self.ceiling_ms)
+                conditions.append("url-changed")
+            except async_api.Error:
+                conditions.append("url-changed:ceiling")
+                fallback = True
+
+        if await tracker.wait_quiet(self.ceiling_ms / 1000):
+            conditions.append("network-quiet")
+        else:
+            conditions.append("network-quiet:ceiling")
+            fallback = True
+
+        return self._record("click", elem, [started, ready, acted, time.perf_counter()], conditions, fallback)
+
+    async def fill(self, elem, value: str, timeout: Optional[int] = None) -> StepTiming:
+        """Fill ``elem`` once the page has hydrated and the field is visible."""
+        conditions: List[str] = []
+        started = time.perf_counter()
+        _, fallback = await self._prepare(elem, conditions)
+        ready = time.perf_counter()
+        await elem.fill(value, timeout=timeout or self.action_timeout_ms)
+        acted = time.perf_counter()
+        return self._record("fill", elem, [started, ready, acted, acted], conditions, fallback)
+
+
+def timings_for(context) -> List[StepTiming]:
+    """Return the steps recorded against ``context`` (empty if none)."""
+    return list(_timings_by_context.get(context, []))
+
+
+def summarize(timings: List[StepTiming]) -> dict:
+    """Aggregate step timings and the time saved against the fixed sleeps.
+
+    The baseline paid ``LEGACY_SLEEP_MS`` per step and had no settle phase, so
+    the saving is the fixed sleeps minus everything spent waiting here.
+    """
+    waited_ms = sum(timing.wait_ms + timing.settle_ms for timing in timings)
+    return {
+        "count": len(timings),
+        "wait_ms": round(sum(timing.wait_ms for timing in timings), 1),
+        "settle_ms": round(sum(timing.settle_ms for timing in timings), 1),
+        "action_ms": round(sum(timing.action_ms for timing in timings), 1),
+        "legacy_sleep_ms": LEGACY_SLEEP_MS * len(timings),
+        "saved_ms": round(LEGACY_SLEEP_MS * len(timings) - waited_ms, 1),
+        "fallbacks": sum(1 for timing in timings if timing.fallback),
+        "steps": [asdict(timing) for timing in timings],
+    }
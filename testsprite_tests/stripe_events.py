@@ -0,0 +1,142 @@
+"""Signed Stripe webhook events for driving ``/api/stripe/webhook`` offline.
+
+Builds event envelopes shaped like the ones Stripe delivers and signs them the
+way ``stripe.webhooks.constructEvent`` verifies: the ``Stripe-Signature``
+header is ``t=<unix>,v1=<hex HMAC-SHA256(secret, "<t>.<payload>")>``. Use the
+same secret the app reads from ``STRIPE_WEBHOOK_SECRET``.
+
+There is one builder per event type ``/api/stripe/webhook`` handles; each
+returns an unsigned envelope to pass to ``signed``.
+"""
+
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+DEFAULT_SECRET = os.environ.get("STRIPE_WEBHOOK_SECRET", "whsec_testsprite")
+API_VERSION = "2025-09-30.clover"
+
+
+def new_id(prefix: str) -> str:
+    return f"{prefix}_test_{secrets.token_hex(12)}"
+
+
+def sign(payload: bytes, secret: str = DEFAULT_SECRET, timestamp: Optional[int] = None) -> str:
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    digest = hmac.new(secret.encode(), f"{timestamp}.".encode() + payload, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+def envelope(event_type: str, obj: dict, event_id: Optional[str] = None) -> dict:
+    return {
+        "id": event_id or new_id("evt"),
+        "object": "event",
+        "api_version": API_VERSION,
+        "created": int(time.time()),
+        "livemode": False,
+        "pending_webhooks": 1,
+        "request": {"id": None, "idempotency_key": None},
+        "type": event_type,
+        "data": {"object": obj},
+    }
+
+
+def signed(event: dict, secret: str = DEFAULT_SECRET) -> Tuple[bytes, Dict[str, str]]:
+    """Serialise ``event`` and return ``(body, headers)`` ready to POST."""
+    body = json.dumps(event, separators=(",", ":")).encode()
+    return body, {"Content-Type": "application/json", "Stripe-Signature": sign(body, secret)}
+
+
+def payment_intent(
+    status: str = "succeeded",
+    amount: int = 5000,
+    registration_ids: Iterable[str] = (),
+    metadata: Optional[dict] = None,
+    intent_id: Optional[str] = None,
+) -> dict:
+    meta = dict(metadata or {})
+    ids = list(registration_ids)
+    if ids:
+        meta["registration_ids"] = ",".join(ids)
+    return {
+        "id": intent_id or new_id("pi"),
+        "object": "payment_intent",
+        "amount": amount,
+        "amount_received": amount if status == "succeeded" else 0,
+        "currency": "brl",
+        "status": status,
+        "metadata": meta,
+        "last_payment_error": None
+        if status == "succeeded"
+        else {"code": "card_declined", "message": "Your card was declined."},
+        "livemode": False,
+    }
+
+
+def payment_intent_succeeded(registration_ids: Iterable[str], amount: int = 5000, **kwargs) -> dict:
+    return envelope("payment_intent.succeeded", payment_intent("succeeded", amount, registration_ids, **kwargs))
+
+
+def payment_intent_failed(registration_ids: Iterable[str], amount: int = 5000, **kwargs) -> dict:
+    return envelope("payment_intent.payment_failed", payment_intent("failed", amount, registration_ids, **kwargs))
+
+
+def charge_refunded(payment_intent_id: str, amount: int = 5000, reason: str = "requested_by_customer") -> dict:
+    charge_id = new_id("ch")
+    return envelope("charge.refunded", {
+        "id": charge_id,
+        "object": "charge",
+        "amount": amount,
+        "amount_refunded": amount,
+        "currency": "brl",
+        "paid": True,
+        "refunded": True,
+        "payment_intent": payment_intent_id,
+        "refunds": {
+            "object": "list",
+            "data": [{"id": new_id("re"), "object": "refund", "amount": amount, "charge": charge_id, "reason": reason, "status": "succeeded"}],
+        },
+        "livemode": False,
+    })
+
+
+def checkout_session_completed(registration_ids: Iterable[str], amount: int = 5000, payment_intent_id: Optional[str] = None) -> dict:
+    return envelope("checkout.session.completed", {
+        "id": new_id("cs"),
+        "object": "checkout.session",
+        "mode": "payment",
+        "status": "complete",
+        "payment_status": "paid",
+        "amount_total": amount,
+        "currency": "brl",
+        "payment_intent": payment_intent_id or new_id("pi"),
+        "metadata": {"registration_ids": ",".join(registration_ids)},
+        "livemode": False,
+    })
+
+
+def checkout_session_expired(session_id: Optional[str] = None) -> dict:
+    return envelope("checkout.session.expired", {
+        "id": session_id or new_id("cs"),
+        "object": "checkout.session",
+        "mode": "payment",
+        "status": "expired",
+        "payment_status": "unpaid",
+        "livemode": False,
+    })
+
+
+def account_updated(account_id: str, complete: bool = True) -> dict:
+    return envelope("account.updated", {
+        "id": account_id,
+        "object": "account",
+        "type": "express",
+        "details_submitted": complete,
+        "charges_enabled": complete,
+        "payouts_enabled": complete,
+        "livemode": False,
+    })
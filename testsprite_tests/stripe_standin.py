@@ -0,0 +1,184 @@
+"""Local Stripe API stand-in for offline checkout runs.
+
+Answers the calls ``/api/stripe/checkout-session`` makes through the Stripe
+SDK when the app runs with ``STRIPE_API_BASE=http://127.0.0.1:12111``:
+
+* ``POST /v1/checkout/sessions`` creates an open session (with a payment
+  intent id and the metadata the app sent)
+* ``GET /v1/checkout/sessions/<id>`` and ``GET /v1/payment_intents/<id>``
+
+Sessions are kept in memory and listed at ``GET /__standin/sessions`` so a
+harness can build the matching webhooks; counters are at
+``GET /__standin/stats`` as in ``directus_standin``. For broader API coverage
+use ``stripe-mock``.
+
+    python testsprite_tests/stripe_standin.py --port 12111
+"""
+
+import argparse
+import json
+import secrets
+import sys
+import threading
+import time
+import urllib.parse
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+from directus_standin import StandInServer, assign_bracketed
+
+
+def _form(body: bytes) -> dict:
+    data: dict = {}
+    for key, value in urllib.parse.parse_qsl(body.decode(), keep_blank_values=True):
+        assign_bracketed(data, key, value)
+    return data
+
+
+def _error(message: str, code: str = "resource_missing") -> dict:
+    return {"error": {"type": "invalid_request_error", "code": code, "message": message}}
+
+
+class StripeStandIn:
+    def __init__(self):
+        self.sessions: Dict[str, dict] = {}
+        self.intents: Dict[str, dict] = {}
+        self.counters: Counter = Counter()
+        self.lock = threading.Lock()
+
+    def create_session(self, form: dict, base_url: str) -> dict:
+        session_id = f"cs_test_{secrets.token_hex(12)}"
+        intent_id = f"pi_test_{secrets.token_hex(12)}"
+        intent_data = form.get("payment_intent_data", {})
+        # The SDK form-encodes arrays as line_items[0][...], parsed into a dict keyed by index.
+        amount = sum(
+            int(item.get("price_data", {}).get("unit_amount", 0)) * int(item.get("quantity", 1))
+            for item in (form.get("line_items") or {}).values()
+        )
+        intent = {
+            "id": intent_id,
+            "object": "payment_intent",
+            "amount": amount,
+            "currency": "brl",
+            "status": "requires_payment_method",
+            "metadata": intent_data.get("metadata", {}),
+        }
+        session = {
+            "id": session_id,
+            "object": "checkout.session",
+            "mode": form.get("mode", "payment"),
+            "status": "open",
+            "payment_status": "unpaid",
+            "amount_total": amount,
+            "currency": "brl",
+            "customer_email": form.get("customer_email"),
+            "payment_intent": intent_id,
+            "metadata": form.get("metadata", {}),
+            "success_url": form.get("success_url"),
+            "cancel_url": form.get("cancel_url"),
+            "url": f"{base_url}/pay/{session_id}",
+            "created": int(time.time()),
+            "expires_at": int(form.get("expires_at") or time.time() + 86400),
+            "livemode": False,
+        }
+        with self.lock:
+            self.sessions[session_id] = session
+            self.intents[intent_id] = intent
+        return session
+
+
+class StripeHandler(BaseHTTPRequestHandler):
+    server_version = "StripeStandIn/1.0"
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # keep-alive responses otherwise stall on delayed ACKs
+    standin: StripeStandIn
+
+    def log_message(self, format, *args):  # noqa: A002 - signature from BaseHTTPRequestHandler
+        pass
+
+    def _send(self, status: int, payload) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Request-Id", f"req_{secrets.token_hex(8)}")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, method: str) -> None:
+        standin = self.standin
+        parts = [part for part in urllib.parse.urlsplit(self.path).path.split("/") if part]
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+
+        if parts[:1] == ["__standin"]:
+            with standin.lock:
+                if parts[1:] == ["stats"]:
+                    return self._send(200, {"requests": dict(standin.counters)})
+                if parts[1:] == ["sessions"]:
+                    return self._send(200, {"data": list(standin.sessions.values())})
+                if parts[1:] == ["reset"] and method == "POST":
+                    standin.counters.clear()
+                    standin.sessions.clear()
+                    standin.intents.clear()
+                    return self._send(200, {"reset": True})
+            return self._send(404, _error("Unknown stand-in route"))
+
+        with standin.lock:
+            standin.counters[f"{method} /{'/'.join(parts[:3])}"] += 1
+            standin.counters["total"] += 1
+
+        if parts[:3] == ["v1", "checkout", "sessions"]:
+            if method == "POST" and len(parts) == 3:
+                host = self.headers.get("Host", "127.0.0.1")
+                return self._send(200, standin.create_session(_form(body), f"http://{host}"))
+            if method == "GET" and len(parts) == 4 and parts[3] in standin.sessions:
+                return self._send(200, standin.sessions[parts[3]])
+        if parts[:2] == ["v1", "payment_intents"] and method == "GET" and len(parts) == 3:
+            if parts[2] in standin.intents:
+                return self._send(200, standin.intents[parts[2]])
+        self._send(404, _error(f"Unrecognized request URL ({method}: {self.path})"))
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+
+def create_server(host: str = "127.0.0.1", port: int = 12111) -> ThreadingHTTPServer:
+    standin = StripeStandIn()
+    handler = type("BoundStripeHandler", (StripeHandler,), {"standin": standin})
+    server = StandInServer((host, port), handler)
+    server.standin = standin
+    return server
+
+
+def start_in_thread(**kwargs) -> ThreadingHTTPServer:
+    server = create_server(**kwargs)
+    threading.Thread(target=server.serve_forever, name="stripe-standin", daemon=True).start()
+    return server
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=12111)
+    args = parser.parse_args(argv)
+    server = create_server(args.host, args.port)
+    print(f"Stripe stand-in on http://{args.host}:{server.server_address[1]}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,288 @@
+"""Flash-sale waiting room test: admission rate, queue order and site responsiveness.
+
+1. Turns the waiting room on for ``--slug`` through the Directus REST API
+   (``waiting_room_enabled`` / ``waiting_room_rate``) and waits until the app
+   redirects ``/eventos/[slug]`` to ``/fila/[slug]`` (the middleware caches
+   the event config for about 15 s).
+2. Checks the gates without an admission cookie: the event page redirects to
+   the queue and ``POST /api/stripe/checkout-session`` answers 403
+   ``WAITING_ROOM_REQUIRED``.
+3. ``--buyers`` virtual buyers, each with its own cookie jar, join through
+   ``POST /api/waiting-room/[slug]`` and poll it like the queue page does
+   until they are admitted. Each admitted buyer then opens the event page.
+4. Meanwhile ``GET --probe-path`` (``/blog`` by default) is timed once per
+   ``--probe-interval`` to show whether the rest of the site stays responsive.
+
+The report has the observed admission rate against ``--rate``, FIFO
+inversions (a buyer admitted more than one poll interval after someone who
+joined later), position and wait percentiles, and probe latency. The exit
+status is non-zero when a gate lets a buyer through, an admitted buyer is
+still redirected, the rate is exceeded or the order is broken. The event's
+previous settings are restored at the end.
+
+Offline, run the app against ``directus_standin.py`` with
+``WAITING_ROOM_SECRET`` set::
+
+    python testsprite_tests/waiting_room.py --buyers 200 --rate 120
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+
+TESTS_DIR = Path(__file__).resolve().parent
+DEFAULT_REPORT = TESTS_DIR / "tmp" / "waiting_room_report.json"
+
+if str(TESTS_DIR) not in sys.path:
+    sys.path.insert(0, str(TESTS_DIR))
+
+from http_pool import HttpError, HttpPool  # noqa: E402
+from loadgen import DEFAULT_BASE_URL, percentile, seed_defaults  # noqa: E402
+from oversell import DEFAULT_ADMIN_TOKEN, DEFAULT_DIRECTUS_URL, Directus, _problem_code, latency_summary  # noqa: E402
+
+CONFIG_FIELDS = "id,slug,waiting_room_enabled,waiting_room_rate"
+POLL_MIN_S, POLL_MAX_S = 2.0, 10.0
+
+
+def poll_delay(eta_seconds: float) -> float:
+    """Same back-off as ``WaitingRoom.tsx``."""
+    return min(POLL_MAX_S, max(POLL_MIN_S, eta_seconds / 4))
+
+
+def store_cookies(jar: Dict[str, str], response) -> None:
+    for name, value in response.cookies().items():
+        if value:
+            jar[name] = value
+        else:
+            jar.pop(name, None)
+
+
+def redirects_to_queue(response, slug: str) -> bool:
+    return response.status in (302, 303, 307, 308) and f"/fila/{slug}" in (response.header("location") or "")
+
+
+async def wait_for_gate(app: HttpPool, slug: str, timeout_s: float) -> float:
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout_s:
+        response = await app.request("GET", f"/eventos/{slug}")
+        if redirects_to_queue(response, slug):
+            return time.perf_counter() - started
+        await asyncio.sleep(1)
+    raise RuntimeError(f"/eventos/{slug} was not redirected to /fila/{slug} within {timeout_s:.0f}s; is WAITING_ROOM_SECRET set?")
+
+
+async def check_gates(app: HttpPool, event: dict) -> dict:
+    page = await app.request("GET", f"/eventos/{event['slug']}/checkout")
+    checkout = await app.request("POST", "/api/stripe/checkout-session", json_body={
+        "eventId": event["id"],
+        "tickets": [{"ticketId": "00000000-0000-0000-0000-000000000000", "quantity": 1}],
+        "participantInfo": {"name": "Queue Jumper", "email": "jumper@example.com"},
+    })
+    return {
+        "checkout_page_redirected": redirects_to_queue(page, event["slug"]),
+        "checkout_api_status": checkout.status,
+        "checkout_api_code": _problem_code(checkout),
+    }
+
+
+async def buyer(app: HttpPool, index: int, slug: str, started: float, results: List[dict]) -> None:
+    cookies: Dict[str, str] = {}
+    result = {"buyer": index, "polls": 0, "errors": 0}
+    while True:
+        try:
+            response = await app.request("POST", f"/api/waiting-room/{slug}", cookies=cookies)
+        except (HttpError, OSError, asyncio.TimeoutError):
+            result["errors"] += 1
+            await asyncio.sleep(POLL_MIN_S)
+            continue
+        store_cookies(cookies, response)
+        result["polls"] += 1
+        if response.status != 200:
+            result["errors"] += 1
+            await asyncio.sleep(POLL_MIN_S)
+            continue
+        status = response.json()
+        if "joined_at" not in result:
+            result.update(joined_at=time.perf_counter() - started, initial_position=status["position"])
+        if status["admitted"]:
+            result["admitted_at"] = time.perf_counter() - started
+            break
+        await asyncio.sleep(poll_delay(status["etaSeconds"]))
+
+    page = await app.request("GET", f"/eventos/{slug}", cookies=cookies)
+    result["event_page_status"] = page.status
+    results.append(result)
+
+
+async def probe(app: HttpPool, path: str, interval_s: float, stop: asyncio.Event, latencies: List[float], statuses: Counter) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            response = await app.request("GET", path)
+            statuses[str(response.status)] += 1
+            latencies.append(time.perf_counter() - started)
+        except (HttpError, OSError, asyncio.TimeoutError):
+            statuses["exception"] += 1
+        try:
+            await asyncio.wait_for(stop.wait(), interval_s)
+        except asyncio.TimeoutError:
+            pass
+
+
+def fifo_inversions(results: List[dict], rate: int) -> int:
+    """Buyers admitted more than one poll interval before someone who joined ahead of them."""
+    # Queue number ~ position at join + how far the admission line had moved by then.
+    ordered = sorted(results, key=lambda result: result["initial_position"] + result["joined_at"] * rate / 60)
+    inversions, latest_ahead = 0, float("-inf")
+    for result in ordered:
+        inversions += latest_ahead > result["admitted_at"] + POLL_MAX_S
+        latest_ahead = max(latest_ahead, result["admitted_at"])
+    return inversions
+
+
+def admission_rate(results: List[dict]) -> Optional[float]:
+    """Fastest the admission line moved, in admissions per minute.
+
+    A buyer who joined at position ``p`` and was admitted ``w`` seconds later
+    saw the line advance ``p`` places in at most ``w`` seconds. Polling only
+    delays admission, so the largest ``p / w`` is an upper bound on the rate.
+    """
+    rates = [
+        result["initial_position"] / (result["admitted_at"] - result["joined_at"]) * 60
+        for result in results
+        if result["initial_position"] > 0 and result["admitted_at"] > result["joined_at"]
+    ]
+    return round(max(rates), 1) if rates else None
+
+
+async def run(args) -> dict:
+    directus = Directus(args.directus_url, args.admin_token, 2)
+    app = HttpPool(args.base_url, size=args.buyers + 2)
+    probe_pool = HttpPool(args.base_url, size=1)
+    events = await directus.call("GET", "/items/events", params={
+        "filter": json.dumps({"slug": {"_eq": args.slug}}),
+        "fields": CONFIG_FIELDS,
+        "limit": "1",
+    })
+    if not events:
+        raise RuntimeError(f"event {args.slug!r} not found in Directus")
+    event = events[0]
+    previous = {"waiting_room_enabled": event.get("waiting_room_enabled"), "waiting_room_rate": event.get("waiting_room_rate")}
+
+    results: List[dict] = []
+    probe_latencies: List[float] = []
+    probe_statuses: Counter = Counter()
+    try:
+        await directus.call("PATCH", f"/items/events/{event['id']}", json_body={"waiting_room_enabled": True, "waiting_room_rate": args.rate})
+        settle_s = await wait_for_gate(app, args.slug, args.settle_timeout)
+        print(f"Waiting room active for {args.slug} after {settle_s:.1f}s at {args.rate}/min", flush=True)
+        gates = await check_gates(app, event)
+
+        stop = asyncio.Event()
+        prober = asyncio.create_task(probe(probe_pool, args.probe_path, args.probe_interval, stop, probe_latencies, probe_statuses))
+        started = time.perf_counter()
+        await asyncio.gather(*(buyer(app, index, args.slug, started, results) for index in range(args.buyers)))
+        wall_s = time.perf_counter() - started
+        stop.set()
+        await prober
+    finally:
+        await directus.call("PATCH", f"/items/events/{event['id']}", json_body=previous)
+        await app.close()
+        await probe_pool.close()
+        await directus.pool.close()
+
+    waits = [result["admitted_at"] - result["joined_at"] for result in results]
+    rate = admission_rate(results)
+    return {
+        "settings": {
+            "base_url": args.base_url,
+            "directus_url": args.directus_url,
+            "slug": args.slug,
+            "rate_per_minute": args.rate,
+            "buyers": args.buyers,
+            "probe_path": args.probe_path,
+        },
+        "gates": gates,
+        "queue": {
+            "wall_clock_s": round(wall_s, 3),
+            "admitted": len(results),
+            "admitted_immediately": sum(1 for result in results if result["initial_position"] == 0),
+            "max_initial_position": max((result["initial_position"] for result in results), default=0),
+            "observed_rate_per_minute": rate,
+            "fifo_inversions": fifo_inversions(results, args.rate),
+            "wait_s": {
+                "p50": percentile(waits, 50),
+                "p95": percentile(waits, 95),
+                "max": max(waits, default=None),
+            },
+            "polls": sum(result["polls"] for result in results),
+            "poll_errors": sum(result["errors"] for result in results),
+            "event_page_statuses": dict(Counter(str(result["event_page_status"]) for result in results)),
+        },
+        "probe": {
+            "requests": sum(probe_statuses.values()),
+            "statuses": dict(probe_statuses),
+            "latency": latency_summary(probe_latencies),
+        },
+    }
+
+
+def failures(report: dict, args) -> List[str]:
+    gates, queue = report["gates"], report["queue"]
+    found = []
+    if not gates["checkout_page_redirected"]:
+        found.append("checkout page served without admission")
+    if gates["checkout_api_code"] != "WAITING_ROOM_REQUIRED":
+        found.append(f"checkout API answered {gates['checkout_api_status']} {gates['checkout_api_code']} without admission")
+    if set(queue["event_page_statuses"]) - {"200"}:
+        found.append(f"admitted buyers got {queue['event_page_statuses']} on the event page")
+    if queue["observed_rate_per_minute"] and queue["observed_rate_per_minute"] > args.rate * (1 + args.tolerance):
+        found.append(f"admitted {queue['observed_rate_per_minute']}/min, above {args.rate}/min")
+    if queue["fifo_inversions"]:
+        found.append(f"{queue['fifo_inversions']} buyers admitted out of order")
+    return found
+
+
+def parse_args(argv=None):
+    defaults = seed_defaults()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--directus-url", default=DEFAULT_DIRECTUS_URL)
+    parser.add_argument("--admin-token", default=DEFAULT_ADMIN_TOKEN)
+    parser.add_argument("--slug", default=defaults.get("slug"), help="event put behind the waiting room")
+    parser.add_argument("--buyers", type=int, default=100, help="virtual buyers joining at once")
+    parser.add_argument("--rate", type=int, default=120, help="waiting_room_rate: admissions per minute")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed excess over --rate (polling jitter)")
+    parser.add_argument("--settle-timeout", type=float, default=30.0, help="seconds to wait for the config cache to pick up the change")
+    parser.add_argument("--probe-path", default="/blog", help="page timed while the queue drains")
+    parser.add_argument("--probe-interval", type=float, default=0.5)
+    parser.add_argument("--report", type=Path, default=DEFAULT_REPORT)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+    args.report.parent.mkdir(parents=True, exist_ok=True)
+    args.report.write_text(json.dumps(report, indent=2))
+
+    queue, probe_latency = report["queue"], report["probe"]["latency"]
+    print(
+        f"{queue['admitted']} admitted in {queue['wall_clock_s']:.1f}s ({queue['admitted_immediately']} immediately), "
+        f"{queue['observed_rate_per_minute']}/min observed vs {args.rate}/min, {queue['fifo_inversions']} out of order"
+    )
+    print(f"{args.probe_path} while queued: p50 {probe_latency['p50_ms']}ms p99 {probe_latency['p99_ms']}ms")
+    print(f"Report written to {args.report}")
+    found = failures(report, args)
+    for failure in found:
+        print(f"FAIL: {failure}")
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
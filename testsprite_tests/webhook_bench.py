@@ -0,0 +1,293 @@
+"""Replay and throughput benchmark for ``/api/stripe/webhook``.
+
+Sends correctly signed Stripe events to the app at ``--rate`` events per
+second (``0`` sends as fast as ``--concurrency`` allows) and reports
+events/sec, latency percentiles and Directus round trips per event.
+
+Events come from one of two sources:
+
+* synthetic (default): ``--count`` events of each ``--types`` entry. Fixture
+  registrations are created first through the Directus admin API, so
+  ``payment_intent.succeeded`` and ``.payment_failed`` find pending
+  registrations and ``charge.refunded`` finds paid ones. ``account.updated``
+  targets the organizers that have a ``stripe_account_id``. Each type runs as
+  its own phase so Directus calls can be attributed to it. ``--order-sizes``
+  puts several registrations in each payment and refund event (one phase per
+  size), showing how round trips grow with the order. ``--save`` writes the
+  generated stream as JSON lines.
+* ``--replay FILE``: Stripe events as JSON lines, a JSON array, or the
+  ``{"data": [...]}`` list from ``stripe events list``, sent in file order
+  as one phase. Events are re-signed with a fresh timestamp, because recorded
+  signatures fall outside the SDK's 300 s tolerance.
+
+The webhook route acknowledges events once they are in the ingestion queue
+(``stripe_webhook_events``), so after sending a phase the benchmark waits for
+the queue to drain (``--drain-timeout``) and reports ``processed_per_s`` next
+to the acknowledgement latency.
+
+Directus calls come from the stand-in counters. They are reset before each
+phase through ``POST /__standin/reset`` and read back from
+``GET /__standin/stats`` once the queue has drained, minus the benchmark's
+own drain polls. To run fully offline, run the app against
+``directus_standin.py`` with ``DIRECTUS_ADMIN_TOKEN=standin-admin-token`` and
+an ``STRIPE_WEBHOOK_SECRET`` matching ``--webhook-secret``.
+
+    python testsprite_tests/webhook_bench.py --count 200 --rate 50
+    python testsprite_tests/webhook_bench.py --types payment_intent.succeeded,charge.refunded --order-sizes 1,5,10
+    python testsprite_tests/webhook_bench.py --replay tmp/webhooks.jsonl --rate 0
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+TESTS_DIR = Path(__file__).resolve().parent
+DEFAULT_REPORT = TESTS_DIR / "tmp" / "webhook_report.json"
+
+if str(TESTS_DIR) not in sys.path:
+    sys.path.insert(0, str(TESTS_DIR))
+
+import stripe_events  # noqa: E402
+from http_pool import HttpError, HttpPool  # noqa: E402
+from loadgen import DEFAULT_BASE_URL, seed_defaults  # noqa: E402
+from oversell import (  # noqa: E402
+    DEFAULT_ADMIN_TOKEN,
+    DEFAULT_DIRECTUS_URL,
+    TICKET_PRICE,
+    WEBHOOK_QUEUE,
+    Directus,
+    latency_summary,
+    wait_for_webhook_drain,
+)
+
+EVENT_TYPES = (
+    "payment_intent.succeeded",
+    "payment_intent.payment_failed",
+    "charge.refunded",
+    "checkout.session.completed",
+    "checkout.session.expired",
+    "account.updated",
+)
+AMOUNT = TICKET_PRICE * 100
+# Types whose events carry a whole order (one or more registrations)
+ORDER_TYPES = ("payment_intent.succeeded", "payment_intent.payment_failed", "charge.refunded")
+
+
+def load_stream(path: Path) -> List[dict]:
+    text = path.read_text()
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    if isinstance(data, dict):
+        return data.get("data", [data])
+    return data
+
+
+def _orders(rows: List[dict], size: int) -> List[List[dict]]:
+    return [rows[start:start + size] for start in range(0, len(rows), size)]
+
+
+async def synthetic_phases(directus: Directus, args) -> Tuple[Dict[str, List[dict]], Dict[str, int]]:
+    """Create fixture rows and build ``count`` events for each requested type.
+
+    Types that carry registrations get one phase per ``--order-sizes`` entry,
+    named ``"<type> x<size>"`` when more than one size is requested. Returns
+    the phases and the registrations per event of those order phases.
+    """
+    phases: Dict[str, List[dict]] = {}
+    order_sizes: Dict[str, int] = {}
+    for event_type in args.types:
+        if event_type in ORDER_TYPES:
+            for size in args.order_sizes:
+                name = f"{event_type} x{size}" if len(args.order_sizes) > 1 else event_type
+                if event_type == "charge.refunded":
+                    rows = await directus.create_registrations(
+                        args.count * size, args.ticket_id, args.event_id, paid=True, order_size=size
+                    )
+                    phases[name] = [
+                        stripe_events.charge_refunded(order[0]["stripe_payment_intent_id"], AMOUNT * size)
+                        for order in _orders(rows, size)
+                    ]
+                else:
+                    rows = await directus.create_registrations(args.count * size, args.ticket_id, args.event_id)
+                    build = stripe_events.payment_intent_succeeded if event_type.endswith("succeeded") else stripe_events.payment_intent_failed
+                    phases[name] = [build([row["id"] for row in order], amount=AMOUNT * size) for order in _orders(rows, size)]
+                order_sizes[name] = size
+        elif event_type == "checkout.session.completed":
+            phases[event_type] = [stripe_events.checkout_session_completed([], AMOUNT) for _ in range(args.count)]
+        elif event_type == "checkout.session.expired":
+            phases[event_type] = [stripe_events.checkout_session_expired() for _ in range(args.count)]
+        else:
+            organizers = await directus.call("GET", "/items/organizers", params={
+                "filter": json.dumps({"stripe_account_id": {"_nnull": True}}),
+                "fields": "stripe_account_id",
+            })
+            accounts = [row["stripe_account_id"] for row in organizers] or ["acct_bench_unknown"]
+            phases[event_type] = [stripe_events.account_updated(accounts[index % len(accounts)]) for index in range(args.count)]
+    return phases, order_sizes
+
+
+async def standin_counters(directus: Directus, reset: bool = False) -> Optional[Counter]:
+    """Reset or read the stand-in counters; ``None`` when Directus is not the stand-in."""
+    try:
+        if reset:
+            response = await directus.pool.request("POST", "/__standin/reset")
+            return Counter() if response.ok else None
+        response = await directus.pool.request("GET", "/__standin/stats")
+    except (HttpError, OSError, asyncio.TimeoutError):
+        return None
+    return Counter(response.json()["requests"]) if response.ok else None
+
+
+async def send_phase(app: HttpPool, events: List[dict], args) -> dict:
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies, statuses = [], Counter()
+
+    async def one(event: dict, due: float):
+        await asyncio.sleep(max(0.0, due - time.perf_counter()))
+        async with semaphore:
+            # Signed when sent, so a slow phase never ages signatures past the tolerance.
+            body, headers = stripe_events.signed(event, args.webhook_secret)
+            started = time.perf_counter()
+            try:
+                response = await app.request("POST", "/api/stripe/webhook", body=body, headers=headers)
+            except (HttpError, OSError, asyncio.TimeoutError):
+                statuses["exception"] += 1
+                return
+            latencies.append(time.perf_counter() - started)
+            statuses[str(response.status)] += 1
+
+    interval = 1 / args.rate if args.rate > 0 else 0.0
+    started = time.perf_counter()
+    await asyncio.gather(*(one(event, started + index * interval) for index, event in enumerate(events)))
+    wall_s = time.perf_counter() - started
+    return {
+        "events": len(events),
+        "statuses": dict(sorted(statuses.items())),
+        "wall_clock_s": round(wall_s, 3),
+        "events_per_s": round(len(events) / wall_s, 2) if wall_s else None,
+        "latency": latency_summary(latencies),
+    }
+
+
+async def run(args) -> dict:
+    directus = Directus(args.directus_url, args.admin_token, 4)
+    app = HttpPool(args.base_url, size=args.concurrency)
+    try:
+        if args.replay:
+            phases, order_sizes = {"replay": load_stream(args.replay)}, {}
+        else:
+            phases, order_sizes = await synthetic_phases(directus, args)
+        if args.save:
+            args.save.parent.mkdir(parents=True, exist_ok=True)
+            args.save.write_text("".join(json.dumps(event) + "\n" for events in phases.values() for event in events))
+
+        results = {}
+        for name, events in phases.items():
+            counting = await standin_counters(directus, reset=True) is not None
+            result = await send_phase(app, events, args)
+            drain = await wait_for_webhook_drain(directus, args.drain_timeout)
+            counters = await standin_counters(directus) if counting else None
+            if drain:
+                result["queue_drain"] = drain
+                drained_s = result["wall_clock_s"] + drain["wait_s"]
+                result["processed_per_s"] = round(len(events) / drained_s, 2) if drained_s else None
+            if counters is not None:
+                if drain:
+                    # The drain polls are the benchmark's own reads, not the app's.
+                    counters[f"GET items/{WEBHOOK_QUEUE}"] -= drain["polls"]
+                    counters["total"] -= drain["polls"]
+                    counters = +counters
+                calls = counters.pop("total", 0)
+                result["directus_calls"] = calls
+                result["directus_calls_per_event"] = round(calls / len(events), 2) if events else None
+                result["directus_routes"] = dict(counters.most_common())
+            if name in order_sizes:
+                result["order_size"] = order_sizes[name]
+            results[name] = result
+            print(
+                f"{name:32} {result['events']:>5} events {result['events_per_s'] or 0:>8.1f}/s "
+                f"p50 {result['latency']['p50_ms'] or 0:>6.0f}ms p99 {result['latency']['p99_ms'] or 0:>6.0f}ms "
+                f"processed {result.get('processed_per_s') or '-'}/s directus/event {result.get('directus_calls_per_event', '-')}",
+                flush=True,
+            )
+    finally:
+        await app.close()
+        await directus.pool.close()
+
+    return {
+        "settings": {
+            "base_url": args.base_url,
+            "directus_url": args.directus_url,
+            "rate": args.rate,
+            "concurrency": args.concurrency,
+            "source": str(args.replay) if args.replay else "synthetic",
+        },
+        "pool": app.stats.as_dict(),
+        "phases": results,
+    }
+
+
+def _types(value: str) -> List[str]:
+    types = [item.strip() for item in value.split(",") if item.strip()]
+    unknown = sorted(set(types) - set(EVENT_TYPES))
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown event type(s) {', '.join(unknown)}; expected {', '.join(EVENT_TYPES)}")
+    return types
+
+
+def _sizes(value: str) -> List[int]:
+    try:
+        sizes = [int(item) for item in value.split(",") if item.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated integers, got {value!r}")
+    if not sizes or min(sizes) < 1:
+        raise argparse.ArgumentTypeError("order sizes must be positive")
+    return sizes
+
+
+def parse_args(argv=None):
+    defaults = seed_defaults()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--directus-url", default=DEFAULT_DIRECTUS_URL)
+    parser.add_argument("--admin-token", default=DEFAULT_ADMIN_TOKEN)
+    parser.add_argument("--webhook-secret", default=stripe_events.DEFAULT_SECRET)
+    parser.add_argument("--types", type=_types, default=list(EVENT_TYPES), help="comma-separated event types")
+    parser.add_argument("--count", type=int, default=100, help="synthetic events per type")
+    parser.add_argument(
+        "--order-sizes", type=_sizes, default=[1],
+        help="registrations per order for payment and refund events, e.g. 1,2,5,10 (one phase each)",
+    )
+    parser.add_argument("--rate", type=float, default=0.0, help="events per second; 0 sends a burst")
+    parser.add_argument("--concurrency", type=int, default=32, help="deliveries in flight")
+    parser.add_argument("--event-id", default=defaults.get("event_id"), help="event for fixture registrations")
+    parser.add_argument("--ticket-id", default=defaults.get("ticket_id"), help="ticket type for fixture registrations")
+    parser.add_argument("--drain-timeout", type=float, default=120.0, help="seconds to wait for the webhook queue to drain per phase")
+    parser.add_argument("--replay", type=Path, help="recorded Stripe events to replay instead of synthetic ones")
+    parser.add_argument("--save", type=Path, help="write the event stream as JSON lines for later --replay")
+    parser.add_argument("--report", type=Path, default=DEFAULT_REPORT)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+    args.report.parent.mkdir(parents=True, exist_ok=True)
+    args.report.write_text(json.dumps(report, indent=2))
+    print(f"Report written to {args.report}")
+    failed = sum(count for phase in report["phases"].values() for status, count in phase["statuses"].items() if status != "200")
+    undrained = [name for name, phase in report["phases"].items() if phase.get("queue_drain", {}).get("drained") is False]
+    for name in undrained:
+        print(f"FAIL: {name} events still pending after {report['phases'][name]['queue_drain']['wait_s']}s")
+    return 1 if failed or undrained else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+"""Webhook retry test: a failed ledger write must reach the ledger on retry.
+
+The webhook queue retries an event whenever its handler throws. That only
+helps if the retry does the work the first attempt could not; a handler that
+marks its rows done before the failing write finds them done on the retry and
+skips the write for good.
+
+``installment`` scenario:
+
+1. Creates a ticket, a registration on a two-installment plan and its two
+   ``payment_installments`` rows through the Directus REST API (admin token).
+2. Makes the next write to ``ticket_inventory_ledger`` fail with 503
+   (``POST /__standin/faults`` on ``directus_standin.py``).
+3. Delivers a signed ``payment_intent.succeeded`` for the first installment
+   and waits until the queue marks the event ``processed``.
+4. Checks that the first attempt failed, that the retry wrote
+   ``sale:<registration>`` to the ledger and that the installment is paid.
+
+``refund`` scenario: pays the first installment of a new plan (the
+registration stays ``pending`` with its sale recorded), makes the next ledger
+write fail and delivers ``charge.refunded`` for that payment intent. Checks
+that the first attempt failed, that the retry wrote ``refund:<registration>``
+and that the registration ends up ``refunded``.
+
+The exit status is non-zero when any check fails. Run the app against the
+stand-ins (``DIRECTUS_ADMIN_TOKEN=standin-admin-token``) with
+``STRIPE_WEBHOOK_SECRET`` matching ``--webhook-secret``::
+
+    python testsprite_tests/webhook_retry.py
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+TESTS_DIR = Path(__file__).resolve().parent
+
+if str(TESTS_DIR) not in sys.path:
+    sys.path.insert(0, str(TESTS_DIR))
+
+import stripe_events  # noqa: E402
+from http_pool import HttpPool  # noqa: E402
+from loadgen import DEFAULT_BASE_URL, seed_defaults  # noqa: E402
+from oversell import DEFAULT_ADMIN_TOKEN, DEFAULT_DIRECTUS_URL, TICKET_PRICE, WEBHOOK_QUEUE, Directus  # noqa: E402
+
+LEDGER_ROUTE = "items/ticket_inventory_ledger"
+SCENARIOS = ("installment", "refund")
+
+
+async def inject_fault(directus: Directus, method: str, route: str, count: int = 1) -> None:
+    response = await directus.pool.request(
+        "POST", "/__standin/faults", json_body={"method": method, "route": route, "count": count}
+    )
+    if response.status != 204:
+        raise SystemExit(f"the Directus stand-in does not support fault injection (HTTP {response.status})")
+
+
+async def deliver(app: HttpPool, event: dict, secret: str) -> None:
+    body, headers = stripe_events.signed(event, secret)
+    response = await app.request("POST", "/api/stripe/webhook", body=body, headers=headers)
+    if response.status != 200:
+        raise RuntimeError(f"webhook {event['type']} answered {response.status}: {response.body[:200]!r}")
+
+
+async def wait_processed(directus: Directus, event_id: str, timeout_s: float) -> dict:
+    """The queue row of ``event_id`` once it leaves the pending statuses (or at the timeout)."""
+    started = time.perf_counter()
+    while True:
+        rows = await directus.call("GET", f"/items/{WEBHOOK_QUEUE}", params={
+            "filter": json.dumps({"id": {"_eq": event_id}}),
+            "fields": "id,status,attempts,last_error",
+        })
+        row = rows[0] if rows else {}
+        if row.get("status") in ("processed", "dead") or time.perf_counter() - started > timeout_s:
+            return {**row, "wait_s": round(time.perf_counter() - started, 2)}
+        await asyncio.sleep(0.5)
+
+
+async def ledger_row(directus: Directus, entry_id: str) -> Optional[dict]:
+    rows = await directus.call("GET", f"/{LEDGER_ROUTE}", params={
+        "filter": json.dumps({"id": {"_eq": entry_id}}),
+        "fields": "id,ticket_id,delta,reason",
+    })
+    return rows[0] if rows else None
+
+
+async def create_installment_plan(directus: Directus, args) -> Tuple[dict, dict]:
+    """A registration on a two-installment plan and its first installment."""
+    ticket = await directus.create_ticket(args.event_id, 10)
+    registration = await directus.call("POST", "/items/event_registrations", json_body={
+        "event_id": args.event_id,
+        "ticket_type_id": ticket["id"],
+        "participant_name": "Installment Buyer",
+        "participant_email": "installments@example.com",
+        "quantity": 1,
+        "total_amount": TICKET_PRICE,
+        "status": "pending",
+        "payment_status": "pending",
+        "is_installment_payment": True,
+        "total_installments": 2,
+    })
+    installments = await directus.call("POST", "/items/payment_installments", json_body=[
+        {
+            "registration_id": registration["id"],
+            "installment_number": number,
+            "amount": TICKET_PRICE / 2,
+            "status": "pending",
+            "due_date": (date.today() + timedelta(days=30 * (number - 1))).isoformat(),
+        }
+        for number in (1, 2)
+    ])
+    return registration, next(row for row in installments if row["installment_number"] == 1)
+
+
+async def installment_scenario(directus: Directus, app: HttpPool, args) -> dict:
+    registration, first = await create_installment_plan(directus, args)
+
+    await inject_fault(directus, "POST", LEDGER_ROUTE)
+    event = stripe_events.payment_intent_succeeded(
+        [], amount=TICKET_PRICE * 50, metadata={"installment_id": first["id"]}
+    )
+    await deliver(app, event, args.webhook_secret)
+    queued = await wait_processed(directus, event["id"], args.timeout)
+
+    sale = await ledger_row(directus, f"sale:{registration['id']}")
+    installment = await directus.call("GET", f"/items/payment_installments/{first['id']}", params={"fields": "id,status"})
+    checks = {
+        "event_processed": queued.get("status") == "processed",
+        "first_attempt_failed": int(queued.get("attempts") or 0) >= 2,
+        "sale_recorded": bool(sale) and int(sale.get("delta") or 0) == 1,
+        "installment_paid": installment.get("status") == "paid",
+    }
+    return {"registration_id": registration["id"], "queue": queued, "sale": sale, "checks": checks}
+
+
+async def refund_scenario(directus: Directus, app: HttpPool, args) -> dict:
+    registration, first = await create_installment_plan(directus, args)
+    paid = stripe_events.payment_intent_succeeded(
+        [], amount=TICKET_PRICE * 50, metadata={"installment_id": first["id"]}
+    )
+    await deliver(app, paid, args.webhook_secret)
+    await wait_processed(directus, paid["id"], args.timeout)
+
+    await inject_fault(directus, "POST", LEDGER_ROUTE)
+    event = stripe_events.charge_refunded(paid["data"]["object"]["id"], amount=TICKET_PRICE * 50)
+    await deliver(app, event, args.webhook_secret)
+    queued = await wait_processed(directus, event["id"], args.timeout)
+
+    refund = await ledger_row(directus, f"refund:{registration['id']}")
+    refunded = await directus.call(
+        "GET", f"/items/event_registrations/{registration['id']}", params={"fields": "id,payment_status"}
+    )
+    checks = {
+        "event_processed": queued.get("status") == "processed",
+        "first_attempt_failed": int(queued.get("attempts") or 0) >= 2,
+        "refund_recorded": bool(refund) and int(refund.get("delta") or 0) == -1,
+        "registration_refunded": refunded.get("payment_status") == "refunded",
+    }
+    return {"registration_id": registration["id"], "queue": queued, "refund": refund, "checks": checks}
+
+
+RUNNERS = {"installment": installment_scenario, "refund": refund_scenario}
+
+
+async def run(args) -> dict:
+    directus = Directus(args.directus_url, args.admin_token, 2)
+    app = HttpPool(args.base_url, size=2)
+    try:
+        results = {}
+        for scenario in args.scenarios:
+            results[scenario] = await RUNNERS[scenario](directus, app, args)
+            print(f"{scenario}: {results[scenario]['checks']}", flush=True)
+    finally:
+        await app.close()
+        await directus.pool.close()
+    return results
+
+
+def failures(results: dict) -> List[str]:
+    return [f"{scenario}: {check}" for scenario, result in results.items() for check, ok in result["checks"].items() if not ok]
+
+
+def parse_args(argv=None):
+    defaults = seed_defaults()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--directus-url", default=DEFAULT_DIRECTUS_URL, help="directus_standin.py base URL")
+    parser.add_argument("--admin-token", default=DEFAULT_ADMIN_TOKEN)
+    parser.add_argument("--event-id", default=defaults.get("event_id"), help="event the test ticket belongs to")
+    parser.add_argument("--scenario", dest="scenarios", action="append", choices=SCENARIOS, help="default: all")
+    parser.add_argument("--webhook-secret", default=stripe_events.DEFAULT_SECRET)
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds to wait for each event to be processed")
+    args = parser.parse_args(argv)
+    args.scenarios = args.scenarios or list(SCENARIOS)
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    results = asyncio.run(run(args))
+    print(json.dumps(results, indent=2))
+    found = failures(results)
+    for failure in found:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())